@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Times wifiscan.batch.analyze() on a generated backup/ archive with different
+numbers of worker processes.
+
+The archive holds --files airodump-ng CSV files named the way dos-wifi.py
+names them in backup/ ("<timestamp>-file-01.csv"), one scan each, of the
+same --aps APs (wifiscan.synthetic) with about 5% of them updated and a
+few moved to another channel between files. It is analyzed with 1 worker
+(in process) and then with each count in --workers.
+
+Reported per worker count: seconds, files/s, rows/s and the speed-up over
+one worker, and whether the histories (first/last sightings, channel runs)
+are identical to the single-process ones. The number of CPUs is printed
+first: the speed-up cannot exceed it.
+
+Usage:
+    python3 benchmarks/batch.py [--files 400] [--aps 2000] [--workers 2,4,8]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from wifiscan.batch import analyze
+from wifiscan.synthetic import write_archive
+
+
+def snapshot(result):
+    return {bssid: history.as_dict() for bssid, history in result.histories.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--files", type=int, default=400)
+    parser.add_argument("--aps", type=int, default=2000)
+    parser.add_argument("--workers", default="2,4,8")
+    args = parser.parse_args()
+
+    print(f"CPUs: {os.cpu_count()}")
+    with tempfile.TemporaryDirectory() as directory:
+        moves = write_archive(directory, args.files, args.aps)
+        print(f"archive: {args.files} files of {args.aps} APs, {moves} channel moves planted")
+        baseline = analyze([directory], workers=1)
+        expected = snapshot(baseline)
+        print(f"{'workers':>7} {'s':>8} {'files/s':>9} {'rows/s':>10} {'speed-up':>9}  same histories")
+        print(f"{1:7d} {baseline.elapsed:8.2f} {baseline.files_per_second:9.0f} {baseline.rows_per_second:10.0f} {1.0:8.2f}x  -")
+        same = True
+        for workers in (int(workers) for workers in args.workers.split(",")):
+            result = analyze([directory], workers=workers)
+            identical = snapshot(result) == expected
+            same = same and identical
+            print(f"{workers:7d} {result.elapsed:8.2f} {result.files_per_second:9.0f} {result.rows_per_second:10.0f} "
+                  f"{baseline.elapsed / result.elapsed:8.2f}x  {'yes' if identical else 'NO'}")
+    changes = sum(history.channel_changes for history in baseline.histories.values())
+    print(f"channel changes found: {changes} (planted: {moves})")
+    return 0 if same and changes == moves else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
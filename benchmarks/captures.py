@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Writes synthetic pcap / pcapng captures of 802.11 beacons, for exercising and
+timing wifiscan.pcap without a monitor-mode adapter (wifiscan.synthetic).
+
+Usage:
+    python3 benchmarks/captures.py output.pcap [frames] [aps] [--pcapng]
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from wifiscan.synthetic import write_beacon_capture
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    if not args:
+        print(__doc__)
+        return 2
+    frames = int(args[1]) if len(args) > 1 else 100000
+    aps = int(args[2]) if len(args) > 2 else 500
+    write_beacon_capture(args[0], frames, aps, pcapng="--pcapng" in sys.argv)
+    print(f"Wrote {frames} beacons from {aps} APs to {args[0]} ({os.path.getsize(args[0])} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
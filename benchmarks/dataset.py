@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Writes realistic airodump-ng CSV files (wifiscan.synthetic) without a
+monitor-mode adapter.
+
+Usage:
+    python3 benchmarks/dataset.py output-dir [aps] [stations] [ticks]
+
+writes output-dir/file-01.csv and, with ticks > 1, output-dir/snapshots/NNNN.csv
+with a fraction of the APs updated between snapshots.
+"""
+
+import os
+import random
+import sys
+from datetime import timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from wifiscan.synthetic import generate_aps, generate_stations, mutate, write_csv
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        return 2
+    directory = sys.argv[1]
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+    station_count = int(sys.argv[3]) if len(sys.argv) > 3 else count // 2
+    ticks = int(sys.argv[4]) if len(sys.argv) > 4 else 1
+    os.makedirs(directory, exist_ok=True)
+    aps = generate_aps(count)
+    stations = generate_stations(station_count, aps)
+    write_csv(os.path.join(directory, "file-01.csv"), aps, stations)
+    if ticks > 1:
+        rng = random.Random(4)
+        snapshots = os.path.join(directory, "snapshots")
+        os.makedirs(snapshots, exist_ok=True)
+        now = max(ap.last_seen for ap in aps)
+        for tick in range(ticks):
+            now += timedelta(seconds=1)
+            mutate(aps, 0.05, rng, now)
+            write_csv(os.path.join(snapshots, f"{tick:04d}.csv"), aps, stations)
+    print(f"Wrote {count} APs and {station_count} stations to {directory}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
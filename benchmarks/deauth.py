@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Times wifiscan.deauth.DeauthMonitor on generated captures and checks that it
+finds the deauthentication floods planted in them.
+
+The capture (wifiscan.synthetic) holds beacons from --aps APs at 5000
+frames per second of capture time, an occasional legitimate deauthentication
+(one every 30 s), and --floods floods of 100 frames/s for 20 s each, of
+three kinds in turn:
+
+- broadcast deauthentication spoofing the AP (as aireplay-ng --deauth does);
+- unicast deauthentication from the attacker's own address;
+- disassociation spoofing the AP.
+
+Reported: frames/s, the floods found per BSSID and any flood alert for a BSSID
+that was not attacked, and the peak memory (tracemalloc) while reading a
+quarter of the capture and the whole of it, which should be the same.
+
+Usage:
+    python3 benchmarks/deauth.py [--frames 1000000] [--aps 500] [--floods 6] [--pcapng]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from wifiscan.deauth import FLOOD_STARTED, DeauthMonitor
+from wifiscan.synthetic import PcapWriter, beacon, deauthentication, mac_bytes
+
+FRAMES_PER_SECOND = 5000
+FLOOD_RATE = 100
+FLOOD_SECONDS = 20
+START = 1700000000.0
+
+
+def write_capture(path, frames, aps, floods, pcapng=False, seed=1):
+    """Writes the capture; returns the attacked BSSIDs (as text) in flood order."""
+    rng = random.Random(seed)
+    bssids = [mac_bytes(i) for i in range(aps)]
+    beacons = [beacon(bssid, f"net-{i}", rng.choice((1, 6, 11)), -rng.randrange(30, 90)) for i, bssid in enumerate(bssids)]
+    attacker = bytes.fromhex("de:ad:be:ef:00:01".replace(":", ""))
+    duration = frames / FRAMES_PER_SECOND
+    # Floods spread evenly over the capture, as (start time, kind, bssid).
+    planted = [(START + duration * (i + 1) / (floods + 1), i % 3, bssids[rng.randrange(aps)]) for i in range(floods)]
+    flood_frames = []
+    for start, kind, bssid in planted:
+        for n in range(FLOOD_RATE * FLOOD_SECONDS):
+            client = b"\xff" * 6 if kind == 0 else mac_bytes(n % 8, 0x5C)
+            source = attacker if kind == 1 else bssid
+            flood_frames.append((start + n / FLOOD_RATE,
+                                 deauthentication(client, source, bssid, disassociation=kind == 2, seq=n & 0xFFF)))
+    flood_frames.reverse()
+    with open(path, "wb") as fh:
+        writer = PcapWriter(fh, pcapng=pcapng)
+        next_legit = START + 30
+        for n in range(frames - len(flood_frames)):
+            ts = START + n / FRAMES_PER_SECOND
+            while flood_frames and flood_frames[-1][0] <= ts:
+                writer.write(*flood_frames.pop())
+            if ts >= next_legit:
+                bssid = bssids[rng.randrange(aps)]
+                writer.write(ts, deauthentication(mac_bytes(rng.randrange(1000), 0x5C), bssid, bssid, reason=3))
+                next_legit += 30
+            writer.write(ts, beacons[n % aps])
+        while flood_frames:
+            writer.write(*flood_frames.pop())
+    return [bssid.hex(":").upper() for _start, _kind, bssid in planted]
+
+
+def scan(path, measure_memory=False):
+    monitor = DeauthMonitor(window=10, threshold=50)
+    alerts = []
+    monitor.subscribe(alerts.append)
+    if measure_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    monitor.feed_file(path)
+    monitor.flush()
+    elapsed = time.perf_counter() - start
+    peak = None
+    if measure_memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return monitor, alerts, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--frames", type=int, default=1000000)
+    parser.add_argument("--aps", type=int, default=500)
+    parser.add_argument("--floods", type=int, default=6)
+    parser.add_argument("--pcapng", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        small = os.path.join(directory, "small.pcap")
+        large = os.path.join(directory, "large.pcap")
+        write_capture(small, args.frames // 4, args.aps, max(1, args.floods // 4), args.pcapng)
+        attacked = write_capture(large, args.frames, args.aps, args.floods, args.pcapng)
+        size = os.path.getsize(large)
+
+        monitor, alerts, elapsed, _ = scan(large)
+        _, _, _, small_peak = scan(small, measure_memory=True)
+        _, _, _, large_peak = scan(large, measure_memory=True)
+
+    started = [alert for alert in alerts if alert.kind == FLOOD_STARTED and alert.scope == "bssid"]
+    found = {alert.address for alert in started} & set(attacked)
+    false = [alert for alert in started if alert.address not in attacked]
+    print(f"capture: {monitor.frames} frames, {size / 1e6:.0f} MB, {monitor.management} deauthentication/disassociation")
+    print(f"speed:   {elapsed:.2f} s, {monitor.frames / elapsed:.0f} frames/s, {size / elapsed / 1e6:.0f} MB/s")
+    print(f"floods:  {len(found)}/{len(set(attacked))} attacked BSSIDs found, {len(false)} alerts for other BSSIDs")
+    for alert in alerts:
+        print(f"  {alert.describe()}")
+    print(f"memory:  peak {small_peak / 1e6:.2f} MB for {args.frames // 4} frames, "
+          f"{large_peak / 1e6:.2f} MB for {args.frames} frames; counters {monitor.nbytes()} bytes")
+    return 0 if len(found) == len(set(attacked)) and not false else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Runs dos-wifi.py from start to end with the stand-in tools in
+benchmarks/fake-tools/, without root or a WiFi adapter, and reports:
+
+- startup: seconds from launch until the first frame of the scan table;
+- the scan loop: ticks, rows processed and tick latency (from --stats);
+- shutdown: seconds from Ctrl+C (SIGINT) until the script exits, its exit
+  status, and whether the stand-in airodump-ng kept writing afterwards.
+
+The script runs in a temporary directory, answers the interface prompt with
+"0" and is interrupted after --duration seconds. The FAKE_* variables
+described in the stand-ins (e.g. FAKE_AIRODUMP_APS=5000) are passed through.
+
+Usage:
+    python3 benchmarks/endtoend.py [--duration 5] [--aps 1000] [--interval 1] [-- dos-wifi.py options]
+"""
+
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+FAKE_TOOLS = os.path.join(ROOT, "benchmarks", "fake-tools")
+SCRIPT = os.path.join(ROOT, "dos-wifi.py")
+FIRST_FRAME_MARKER = b"Currently scanning networks"
+
+
+def _read_output(stream, first_frame, output):
+    while True:
+        chunk = stream.read1(64 * 1024)
+        if not chunk:
+            return
+        output.append(chunk)
+        if not first_frame.is_set() and FIRST_FRAME_MARKER in b"".join(output[-2:]):
+            first_frame.set()
+
+
+def _csv_signature(directory):
+    return {name: os.stat(os.path.join(directory, name)).st_mtime_ns
+            for name in os.listdir(directory) if name.endswith(".csv")}
+
+
+def run(duration, aps, interval, script_args=()):
+    env = dict(os.environ, FAKE_AIRODUMP_APS=str(aps), FAKE_AIRODUMP_INTERVAL=str(interval))
+    env.pop("SUDO_UID", None)
+    with tempfile.TemporaryDirectory() as directory:
+        stats_path = os.path.join(directory, "stats.json")
+        started = time.monotonic()
+        process = subprocess.Popen([sys.executable, SCRIPT, "--tools", FAKE_TOOLS, "--stats", stats_path, *script_args],
+                                   cwd=directory, env=env, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                   stderr=subprocess.STDOUT)
+        process.stdin.write(b"0\n")
+        process.stdin.flush()
+        first_frame = threading.Event()
+        output = []
+        reader = threading.Thread(target=_read_output, args=(process.stdout, first_frame, output), daemon=True)
+        reader.start()
+        first_frame.wait(30)
+        startup = time.monotonic() - started if first_frame.is_set() else None
+        time.sleep(duration)
+        interrupted = time.monotonic()
+        process.send_signal(signal.SIGINT)
+        try:
+            status = process.wait(30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            status = process.wait()
+        shutdown = time.monotonic() - interrupted
+        reader.join(5)
+        before = _csv_signature(directory)
+        time.sleep(max(2 * interval, 0.5))
+        orphaned = _csv_signature(directory) != before
+        stats = None
+        if os.path.exists(stats_path):
+            with open(stats_path) as fh:
+                stats = json.load(fh)
+    return startup, shutdown, status, orphaned, stats, b"".join(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run dos-wifi.py end to end with the stand-in aircrack-ng tools.")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds to scan before Ctrl+C (default: 5)")
+    parser.add_argument("--aps", type=int, default=1000, help="access points reported by the stand-in airodump-ng")
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between airodump-ng writes")
+    parser.add_argument("script_args", nargs=argparse.REMAINDER, help="further dos-wifi.py options, after --")
+    args = parser.parse_args()
+    script_args = args.script_args[1:] if args.script_args[:1] == ["--"] else args.script_args
+
+    startup, shutdown, status, orphaned, stats, output = run(args.duration, args.aps, args.interval, script_args)
+    print(f"startup:  {'no scan table within 30 s' if startup is None else f'{startup:.3f} s to the first frame'}")
+    if stats:
+        tick = stats["tick"]
+        print(f"scan:     {stats['ticks']} ticks, {stats['rows_total']} rows "
+              f"({stats['rows_total'] / args.duration:.0f} rows/s), tick mean {tick['mean_ms']} ms, "
+              f"p90 {tick['p90_ms']} ms, max {tick['max_ms']} ms")
+    else:
+        print("scan:     no statistics written")
+    print(f"shutdown: {shutdown:.3f} s after Ctrl+C, exit status {status}, "
+          f"airodump-ng {'still writing' if orphaned else 'stopped'}")
+    if status != 0 or startup is None:
+        print(output.decode(errors="replace")[-2000:])
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
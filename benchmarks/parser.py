@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Compares wifiscan.airodump.parse_csv() with the csv module on complete
+airodump-ng CSV files.
+
+For each size, a file with that many APs and half as many stations is
+generated (wifiscan.synthetic, with commas, quotes and non-ASCII in some
+ESSIDs) and parsed by:
+
+- "DictReader": csv.DictReader with AP_FIELDNAMES up to the "Station MAC"
+  row, as the original scan loop did (dicts, no records);
+- "csv.reader": csv.reader and AccessPoint.from_fields(), as CsvIngestor did
+  before wifiscan/airodump.py;
+- "parse_csv": the access point section only, and both sections.
+
+Reported: the best of --repeat runs in ms, APs/s, the speed-up over
+DictReader, and how many ESSIDs came out wrong (not matching their ID-length
+column, i.e. cut at a comma or a quote). A torn copy of the largest file
+checks that its last row is dropped rather than parsed.
+
+In the scan loop the file is rewritten every second with a few rows
+changed, and CsvIngestor hands only those to parse_ap_line(). The last table
+times one such tick (5% of the APs updated) against DictReader re-reading
+the whole file, as the original loop did.
+
+Usage:
+    python3 benchmarks/parser.py [--sizes 1000,10000,50000] [--repeat 5]
+"""
+
+import argparse
+import csv
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from wifiscan.airodump import parse_csv
+from wifiscan.ingest import AP_FIELDNAMES, STATION_MARKER, CsvIngestor
+from wifiscan.records import AccessPoint
+from wifiscan.synthetic import generate_aps, generate_stations, mutate, render_csv, write_csv
+
+
+def with_dictreader(data):
+    rows = []
+    for row in csv.DictReader(io.StringIO(data.decode(errors="replace"), newline=""), fieldnames=AP_FIELDNAMES):
+        if row["BSSID"].startswith(STATION_MARKER):
+            break
+        if row["BSSID"] and row["BSSID"] != "BSSID":
+            rows.append(row)
+    return rows
+
+
+def with_csv_reader(data):
+    aps = []
+    for fields in csv.reader(io.StringIO(data.decode(errors="replace"), newline="")):
+        if not fields or fields[0] == "BSSID":
+            continue
+        if fields[0].startswith(STATION_MARKER):
+            break
+        ap = AccessPoint.from_fields(fields)
+        if ap is not None:
+            aps.append(ap)
+    return aps
+
+
+def wrong_essids(rows):
+    """Rows whose ESSID does not have the length given in their ID-length column."""
+    wrong = 0
+    for row in rows:
+        if isinstance(row, dict):
+            essid = (row["ESSID"] or "")[1:]
+            length = int(row["ID_length"] or 0)
+        else:
+            essid, length = row.essid, row.id_length
+        wrong += len(essid.encode()) != length
+    return wrong
+
+
+def best_time(parse, data, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = parse(data)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def rewritten_tick(size, repeat):
+    """Best time of DictReader over the whole file and of CsvIngestor.poll() after a rewrite with 5% of the APs changed."""
+    rng = random.Random(7)
+    aps = generate_aps(size)
+    stations = generate_stations(size // 2, aps)
+    now = max(ap.last_seen for ap in aps)
+    dict_best = ingest_best = None
+    changed = 0
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "file-01.csv")
+        write_csv(path, aps, stations)
+        ingestor = CsvIngestor(directory)
+        ingestor.poll()
+        for _ in range(repeat):
+            now += timedelta(seconds=1)
+            mutate(aps, 0.05, rng, now)
+            write_csv(path, aps, stations)
+            start = time.perf_counter()
+            changed = len(ingestor.poll())
+            elapsed = time.perf_counter() - start
+            ingest_best = elapsed if ingest_best is None else min(ingest_best, elapsed)
+            with open(path, "rb") as fh:
+                elapsed, _ = best_time(with_dictreader, fh.read(), 1)
+            dict_best = elapsed if dict_best is None else min(dict_best, elapsed)
+    return dict_best, ingest_best, changed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", default="1000,10000,50000")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    methods = (
+        ("DictReader", with_dictreader),
+        ("csv.reader", with_csv_reader),
+        ("parse_csv (APs)", lambda data: parse_csv(data, stations=False).aps),
+        ("parse_csv (all)", lambda data: parse_csv(data).aps),
+    )
+    data = b""
+    print(f"{'APs':>6}  {'method':16} {'ms':>8} {'APs/s':>10} {'speed-up':>9} {'wrong ESSIDs':>13}")
+    for size in (int(size) for size in args.sizes.split(",")):
+        aps = generate_aps(size)
+        data = render_csv(aps, generate_stations(size // 2, aps)).encode()
+        baseline = None
+        for name, parse in methods:
+            elapsed, rows = best_time(parse, data, args.repeat)
+            baseline = baseline or elapsed
+            print(f"{size:6d}  {name:16} {elapsed * 1e3:8.1f} {len(rows) / elapsed:10.0f} "
+                  f"{baseline / elapsed:8.1f}x {wrong_essids(rows):13d}")
+
+    print(f"\n{'APs':>6}  {'DictReader ms':>13} {'CsvIngestor ms':>15} {'changed rows':>13} {'speed-up':>9}   (one rewritten tick)")
+    for size in (int(size) for size in args.sizes.split(",")):
+        dict_time, ingest_time, changed = rewritten_tick(size, args.repeat)
+        print(f"{size:6d}  {dict_time * 1e3:13.1f} {ingest_time * 1e3:15.1f} {changed:13d} {dict_time / ingest_time:8.1f}x")
+
+    torn = parse_csv(data[:data.rfind(b"\r\n", 0, data.find(b"Station MAC") - 4) - 20])
+    print(f"torn copy: torn={torn.torn}, {len(torn.aps)} APs, {torn.rejected} rejected, "
+          f"{wrong_essids(torn.aps)} wrong ESSIDs")
+    return 0 if torn.torn and not wrong_essids(torn.aps) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Benchmarks the scan pipeline of dos-wifi.py on synthetic airodump-ng output,
+without a WiFi adapter or root.
+
+For each table size, a file-01.csv is generated (wifiscan.synthetic) and
+rewritten once per tick with about 5% of the APs updated, like airodump-ng
+does. Each tick is then processed twice:
+
+- "old": os.listdir(), csv.DictReader over the whole file, check_for_essid()
+  against a list, `clear` + print of the whole table (the fork of `clear` is
+  not included);
+- "new": CsvIngestor.changed_files(), CsvIngestor.read(),
+  AccessPointRegistry.update_many(), TableRenderer.render().
+
+The time of each stage is reported per tick, along with rows/s and the peak
+memory (tracemalloc) of each pipeline.
+
+Usage:
+    python3 benchmarks/pipeline.py [--sizes 100,1000,10000,50000] [--ticks 10] [--quick]
+
+--quick runs 100 and 1000 APs for 3 ticks, for CI.
+"""
+
+import argparse
+import csv
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from wifiscan.ingest import AP_FIELDNAMES, CsvIngestor
+from wifiscan.registry import AccessPointRegistry
+from wifiscan.render import CLEAR_SCREEN, TableRenderer
+from wifiscan.synthetic import generate_aps, generate_stations, mutate, write_csv
+
+STAGES = ("listdir", "parse", "dedup", "render")
+# check_for_essid() is quadratic; above this many APs it would dominate the run.
+OLD_DEDUP_LIMIT = 5000
+
+
+def check_for_essid(essid, lst):
+    check_status = True
+    if len(lst) == 0:
+        return check_status
+    for item in lst:
+        if essid == item["ESSID"]:
+            check_status = False
+    return check_status
+
+
+class OldPipeline:
+    def __init__(self, directory, dedup):
+        self.directory = directory
+        self.dedup = dedup
+        self.networks = []
+
+    def tick(self, timings):
+        start = time.perf_counter()
+        names = [name for name in os.listdir(self.directory) if ".csv" in name]
+        timings["listdir"] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        rows = []
+        for name in names:
+            with open(os.path.join(self.directory, name)) as csv_h:
+                for row in csv.DictReader(csv_h, fieldnames=AP_FIELDNAMES):
+                    if row["BSSID"] == "BSSID":
+                        pass
+                    elif row["BSSID"] == "Station MAC":
+                        break
+                    else:
+                        rows.append(row)
+        timings["parse"] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        if self.dedup:
+            for row in rows:
+                if check_for_essid(row["ESSID"], self.networks):
+                    self.networks.append(row)
+        timings["dedup"] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        out = io.StringIO()
+        out.write(CLEAR_SCREEN)
+        out.write("Currently scanning networks. Hit Ctrl+C to pick a target for the attack.\n\n")
+        for index, item in enumerate(self.networks if self.dedup else rows):
+            out.write(f"{index}\t{item['BSSID']}\t{item['channel'].strip()}\t\t{item['ESSID']}\n")
+        timings["render"] += time.perf_counter() - start
+        return len(rows)
+
+
+class NewPipeline:
+    def __init__(self, directory):
+        self.ingestor = CsvIngestor(directory)
+        self.registry = AccessPointRegistry()
+        self.renderer = TableRenderer(out=io.StringIO(), max_fps=0, keyboard=False, size=(120, 50))
+
+    def tick(self, timings):
+        start = time.perf_counter()
+        changed = self.ingestor.changed_files()
+        timings["listdir"] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        rows = []
+        for path, state, signature in changed:
+            rows.extend(self.ingestor.read(path, state, signature))
+        timings["parse"] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        self.registry.update_many(rows)
+        timings["dedup"] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        self.renderer.invalidate()
+        self.renderer.render(self.registry)
+        timings["render"] += time.perf_counter() - start
+        return len(rows)
+
+
+def run(pipeline_factory, size, ticks, trace=False):
+    """Runs one pipeline over ticks rewrites of a size-AP file; returns (timings, rows, peak bytes)."""
+    rng = random.Random(5)
+    aps = generate_aps(size)
+    stations = generate_stations(size // 2, aps)
+    now = max(ap.last_seen for ap in aps)
+    timings = dict.fromkeys(STAGES, 0.0)
+    rows = 0
+    with tempfile.TemporaryDirectory() as directory:
+        # A few unrelated files, as in a real working directory.
+        for i in range(20):
+            open(os.path.join(directory, f"notes-{i}.txt"), "w").close()
+        path = os.path.join(directory, "file-01.csv")
+        write_csv(path, aps, stations)
+        pipeline = pipeline_factory(directory)
+        if trace:
+            tracemalloc.start()
+        for _ in range(ticks):
+            rows += pipeline.tick(timings)
+            now += timedelta(seconds=1)
+            mutate(aps, 0.05, rng, now)
+            write_csv(path, aps, stations)
+            # Make sure the rewrite is visible as a change even on filesystems with coarse mtimes.
+            os.utime(path, ns=(time.time_ns(), time.time_ns() + 1))
+        peak = tracemalloc.get_traced_memory()[1] if trace else 0
+        if trace:
+            tracemalloc.stop()
+    return timings, rows, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the dos-wifi.py scan pipeline on synthetic airodump-ng output.")
+    parser.add_argument("--sizes", default="100,1000,10000,50000", help="comma-separated numbers of APs")
+    parser.add_argument("--ticks", type=int, default=10)
+    parser.add_argument("--quick", action="store_true", help="100 and 1000 APs, 3 ticks")
+    args = parser.parse_args()
+    sizes = [100, 1000] if args.quick else [int(size) for size in args.sizes.split(",")]
+    ticks = 3 if args.quick else args.ticks
+
+    print(f"{'APs':>6} {'pipeline':>8} " + " ".join(f"{stage + ' ms':>11}" for stage in STAGES) + f" {'total ms':>9} {'rows/s':>10} {'peak MB':>8}")
+    for size in sizes:
+        dedup = size <= OLD_DEDUP_LIMIT
+        for name, factory in (("old", lambda d: OldPipeline(d, dedup)), ("new", NewPipeline)):
+            timings, rows, _ = run(factory, size, ticks)
+            _, _, peak = run(factory, size, min(ticks, 3), trace=True)
+            total = sum(timings.values())
+            cells = " ".join(f"{1e3 * timings[stage] / ticks:11.3f}" for stage in STAGES)
+            note = "" if name == "new" or dedup else "  (dedup skipped: quadratic)"
+            print(f"{size:6d} {name:>8} {cells} {1e3 * total / ticks:9.3f} {rows / total if total else 0:10.0f} {peak / 1e6:8.2f}{note}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Measures the memory used per access point by the csv.DictReader rows the
+script used to keep and by wifiscan.records.AccessPoint.
+
+Usage:
+    python3 benchmarks/records.py [number_of_aps]
+"""
+
+import csv
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from wifiscan.ingest import AP_FIELDNAMES
+from wifiscan.records import AccessPoint
+
+PRIVACY = [("WPA2", "CCMP", "PSK"), ("WPA2 WPA", "CCMP TKIP", "PSK"), ("WPA3 WPA2", "CCMP", "SAE PSK"), ("OPN", "", "")]
+
+
+def make_lines(count, seed=1):
+    rng = random.Random(seed)
+    lines = []
+    for i in range(count):
+        bssid = ":".join(f"{b:02X}" for b in (0x02, i >> 24 & 0xFF, i >> 16 & 0xFF, i >> 8 & 0xFF, i & 0xFF, rng.randrange(256)))
+        privacy, cipher, auth = rng.choice(PRIVACY)
+        essid = f"net-{rng.randrange(count)}"
+        lines.append(f"{bssid}, 2025-03-13 15:00:00, 2025-03-13 15:05:{i % 60:02d}, {rng.choice((1, 6, 11, 36, 44)):2d}, "
+                     f" 54, {privacy}, {cipher}, {auth}, {-rng.randrange(30, 95)}, {rng.randrange(1, 5000):8d}, "
+                     f"       0,   0.  0.  0.  0, {len(essid):3d}, {essid}, ")
+    return lines
+
+
+def measure(build, lines):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build(lines)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / len(kept)
+
+
+def as_dicts(lines):
+    return list(csv.DictReader(lines, fieldnames=AP_FIELDNAMES))
+
+
+def as_records(lines):
+    return [AccessPoint.from_fields(fields) for fields in csv.reader(lines)]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    lines = make_lines(count)
+    dict_bytes = measure(as_dicts, lines)
+    record_bytes = measure(as_records, lines)
+    print(f"APs measured:           {count}")
+    print(f"csv.DictReader row:     {dict_bytes:8.0f} bytes/AP")
+    print(f"AccessPoint record:     {record_bytes:8.0f} bytes/AP")
+    print(f"Saving:                 {100 * (1 - record_bytes / dict_bytes):8.1f} %")
+
+
+if __name__ == "__main__":
+    main()
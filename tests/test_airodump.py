@@ -0,0 +1,74 @@
+from wifiscan.airodump import join_rows, parse_ap_line, parse_csv, parse_station_line
+
+AP_HEADER = ("BSSID, First time seen, Last time seen, channel, Speed, Privacy, Cipher, Authentication, Power, "
+             "# beacons, # IV, LAN IP, ID-length, ESSID, Key")
+STATION_HEADER = "Station MAC, First time seen, Last time seen, Power, # packets, BSSID, Probed ESSIDs"
+
+
+def ap_line(bssid, essid, channel=6):
+    return (f"{bssid}, 2025-03-13 15:00:00, 2025-03-13 15:00:09, {channel:2d}, 130, WPA2, CCMP, PSK, -60, "
+            f"      12,        0,   0.  0.  0.  0, {len(essid.encode()):3d}, {essid}, ")
+
+
+def station_line(mac, bssid="(not associated) ", probed=""):
+    return f"{mac}, 2025-03-13 15:00:01, 2025-03-13 15:00:08, -50,        4, {bssid}, {probed}"
+
+
+def csv_text(ap_lines, station_lines=()):
+    return "\r\n".join(["", AP_HEADER, *ap_lines, "", STATION_HEADER, *station_lines, "", ""])
+
+
+def test_fields():
+    ap = parse_ap_line(ap_line("02:00:00:00:00:01", "office", channel=11) + "\r")
+    assert (ap.bssid, ap.first_seen, ap.last_seen) == ("02:00:00:00:00:01", "2025-03-13 15:00:00", "2025-03-13 15:00:09")
+    assert (ap.channel, ap.speed, ap.privacy, ap.cipher, ap.authentication) == (11, 130, "WPA2", "CCMP", "PSK")
+    assert (ap.power, ap.beacons, ap.iv, ap.lan_ip, ap.id_length, ap.essid, ap.key) == (
+        -60, 12, 0, "0.0.0.0", 6, "office", "")
+
+
+def test_essids_with_commas_and_quotes():
+    for essid in ("Office, 2nd floor", '"quoted"', 'a "b", c', ", ,", " leading space", "trailing, "):
+        ap = parse_ap_line(ap_line("02:00:00:00:00:01", essid))
+        assert (ap.essid, ap.key, ap.id_length) == (essid, "", len(essid.encode()))
+
+
+def test_essid_spanning_lines():
+    text = csv_text([ap_line("02:00:00:00:00:01", "first\nsecond\r\nthird"), ap_line("02:00:00:00:00:02", "next")])
+    parsed = parse_csv(text)
+    assert [ap.essid for ap in parsed.aps] == ["first\nsecond\nthird", "next"]
+    assert (parsed.rejected, parsed.torn) == (0, False)
+    # join_rows() keeps the rows apart at each MAC address or header.
+    rows = list(join_rows(["02:00:00:00:00:01, x", "continued", "", STATION_HEADER, "stray"]))
+    assert rows == ["02:00:00:00:00:01, x\ncontinued", STATION_HEADER, "stray"]
+
+
+def test_torn_last_row_is_not_parsed():
+    text = csv_text([ap_line("02:00:00:00:00:01", "office")])
+    torn = text + ap_line("02:00:00:00:00:02", "lobby")[:40]
+    parsed = parse_csv(torn.encode(), stations=False)
+    assert (parsed.torn, parsed.rejected) == (True, 0)
+    assert [ap.bssid for ap in parsed.aps] == ["02:00:00:00:00:01"]
+    # Torn in the middle of the AP section, without the station header yet.
+    parsed = parse_csv("\r\n".join(["", AP_HEADER, ap_line("02:00:00:00:00:01", "office"), "02:00:00:00:00:02, 20"]))
+    assert (parsed.torn, len(parsed.aps), parsed.rejected) == (True, 1, 0)
+
+
+def test_malformed_rows_are_rejected():
+    # "garbage" does not start with a MAC address, so it continues the row before it, rejected as a whole.
+    text = csv_text([ap_line("02:00:00:00:00:01", "office"), "02:00:00:00:00:02, 2025-03-13", "garbage"])
+    parsed = parse_csv(text)
+    assert (len(parsed.aps), parsed.rejected) == (1, 1)
+    assert parse_csv(text.replace("garbage", "\r\ngarbage")).rejected == 2
+    assert parse_ap_line("02:00:00:00:00:01, not a time, x, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, essid, ") is None
+
+
+def test_stations():
+    text = csv_text([ap_line("02:00:00:00:00:01", "office")], [
+        station_line("02:00:00:00:01:01", "02:00:00:00:00:01", "office"),
+        station_line("02:00:00:00:01:02", probed="home,Office, 2nd floor")])
+    parsed = parse_csv(text)
+    associated, probing = parsed.stations
+    assert (associated.bssid, associated.probed) == ("02:00:00:00:00:01", ("office",))
+    assert (probing.bssid, probing.probed) == (None, ("home", "Office", "2nd floor"))
+    assert parse_csv(text, stations=False).stations == []
+    assert parse_station_line("02:00:00:00:01:01, yesterday") is None
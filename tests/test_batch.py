@@ -0,0 +1,49 @@
+import os
+
+from wifiscan.batch import analyze, archive_files
+from wifiscan.synthetic import generate_aps, write_archive, write_csv
+
+
+def histories(result):
+    return {bssid: history.as_dict() for bssid, history in result.histories.items()}
+
+
+def test_workers_give_the_same_histories(tmp_path):
+    moves = write_archive(str(tmp_path), 12, 100)
+    single = analyze([str(tmp_path)], workers=1)
+    pooled = analyze([str(tmp_path)], workers=3, chunks_per_worker=2)
+    assert (single.files, single.rows) == (12, 1200)
+    assert histories(pooled) == histories(single)
+    assert sum(history.channel_changes for history in single.histories.values()) == moves
+
+
+def test_merged_history(tmp_path):
+    ap = generate_aps(1)[0]
+    bssid = ap.bssid
+    first_seen = ap.first_seen
+    for index, (channel, essid) in enumerate(((1, "lab"), (1, "lab"), (6, "lab"), (6, "lab-2"), (1, "lab-2"))):
+        ap.channel, ap.essid = channel, essid
+        ap.last_seen = first_seen.replace(hour=16 + index, minute=0, second=0)
+        write_csv(os.path.join(tmp_path, f"2025-03-{13 + index} 10:00:00-file-01.csv"), [ap])
+    # Chunks of one file each, so every channel run crosses a chunk boundary.
+    history = analyze([str(tmp_path)], workers=2, chunks_per_worker=3).histories[bssid]
+    assert history.files == 5
+    assert history.essid == "lab-2"
+    assert history.first_seen == f"{first_seen:%Y-%m-%d %H:%M:%S}"
+    assert history.last_seen == "2025-03-13 20:00:00"
+    assert [channel for _time, channel in history.channels] == [1, 6, 1]
+    assert history.channel_changes == 2
+
+
+def test_unreadable_files_are_reported(tmp_path):
+    write_csv(os.path.join(tmp_path, "a-file-01.csv"), generate_aps(10))
+    missing = os.path.join(tmp_path, "b-file-01.csv")
+    result = analyze([os.path.join(tmp_path, "a-file-01.csv"), missing], workers=1)
+    assert (result.files, result.rows, result.unreadable) == (1, 10, [missing])
+
+
+def test_archive_files_in_name_order(tmp_path):
+    for name in ("2025-03-14 09:00:00-file-01.csv", "2025-03-13 09:00:00-file-02.csv", "notes.txt"):
+        (tmp_path / name).write_text("")
+    assert [os.path.basename(path) for path in archive_files([str(tmp_path)])] == [
+        "2025-03-13 09:00:00-file-02.csv", "2025-03-14 09:00:00-file-01.csv"]
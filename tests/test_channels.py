@@ -0,0 +1,63 @@
+import pytest
+
+from wifiscan.channels import ChannelOccupancy, overlap_24, power_mw
+from wifiscan.records import AccessPoint
+from wifiscan.synthetic import generate_aps
+
+
+def access_point(index, channel, power, last_seen="2025-03-13 15:00:00"):
+    return AccessPoint(f"02:00:00:00:00:{index:02X}", last_seen=last_seen, channel=channel, power=power)
+
+
+def synthetic_aps(count=500):
+    aps = []
+    for index, ap in enumerate(generate_aps(count)):
+        # Some APs with an unknown channel, as airodump-ng reports them (-1).
+        channel = -1 if index % 17 == 0 else ap.channel
+        aps.append(AccessPoint(ap.bssid, last_seen=f"{ap.last_seen:%Y-%m-%d %H:%M:%S}", channel=channel, power=ap.power))
+    return aps
+
+
+def test_congestion_sums_overlapping_channels():
+    occupancy = ChannelOccupancy(use_numpy=False)
+    occupancy.update([access_point(1, 1, -40), access_point(2, 3, -50)])
+    analysis = occupancy.analyze()
+    assert analysis.counts == {1: 1, 3: 1}
+    assert analysis.congestion[1] == pytest.approx(power_mw(-40) + power_mw(-50) * overlap_24(2))
+    assert analysis.congestion[6] == pytest.approx(power_mw(-50) * overlap_24(3))
+    assert analysis.congestion.get(11, 0.0) == 0.0
+    assert analysis.recommended_24 == 11
+
+
+def test_unknown_channel_adds_no_congestion():
+    occupancy = ChannelOccupancy(use_numpy=False)
+    occupancy.update([access_point(1, -1, -30), access_point(2, 6, -60)])
+    analysis = occupancy.analyze()
+    assert analysis.aps == 2
+    assert 1 not in analysis.congestion
+    assert analysis.congestion[6] == pytest.approx(power_mw(-60))
+
+
+def test_update_moves_an_ap_between_channels():
+    occupancy = ChannelOccupancy(use_numpy=False)
+    occupancy.update([access_point(1, 1, -40)])
+    occupancy.update([access_point(1, 11, -40)])
+    assert occupancy.analyze().counts == {11: 1}
+
+
+@pytest.mark.parametrize("max_age", [None, 30])
+def test_numpy_and_python_paths_agree(max_age):
+    pytest.importorskip("numpy")
+    aps = synthetic_aps()
+    results = []
+    for use_numpy in (False, True):
+        occupancy = ChannelOccupancy(use_numpy=use_numpy)
+        occupancy.update(aps)
+        results.append(occupancy.analyze(max_age))
+    python, vectorized = results
+    assert python.counts == vectorized.counts
+    assert python.aps == vectorized.aps
+    assert python.congestion.keys() == vectorized.congestion.keys()
+    for channel, value in python.congestion.items():
+        assert vectorized.congestion[channel] == pytest.approx(value, rel=1e-9, abs=1e-15)
+    assert (python.recommended_24, python.recommended_5) == (vectorized.recommended_24, vectorized.recommended_5)
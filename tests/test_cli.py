@@ -0,0 +1,118 @@
+import pytest
+
+from wifiscan import deauth, rogue, store
+from wifiscan.synthetic import consistent_baseline, generate_aps, write_beacon_capture, write_csv
+
+
+def exit_status(main, argv):
+    with pytest.raises(SystemExit) as excinfo:
+        main(argv)
+    return excinfo.value.code
+
+
+@pytest.mark.parametrize("argv", [
+    [],
+    ["--window"],
+    ["--window", "ten", "capture.pcap"],
+    ["--window", "0", "capture.pcap"],
+    ["--widnow", "5", "capture.pcap"],
+])
+def test_deauth_rejects_bad_arguments(argv, capsys):
+    assert exit_status(deauth.main, argv) == 2
+    assert "usage:" in capsys.readouterr().err
+
+
+def test_deauth_reports_unreadable_capture(tmp_path, capsys):
+    assert exit_status(deauth.main, [str(tmp_path / "missing.pcap")]) == 2
+    assert "cannot read capture" in capsys.readouterr().err
+
+
+def test_deauth_options_after_paths(tmp_path, capsys):
+    path = str(tmp_path / "beacons.pcap")
+    write_beacon_capture(path, 200, 5)
+    assert deauth.main([path, "--window", "5", "--threshold", "20"]) == 0
+    assert "200 frames" in capsys.readouterr().err
+
+
+def test_deauth_reads_every_capture(tmp_path, capsys):
+    paths = [str(tmp_path / "beacons-01.pcap"), str(tmp_path / "beacons-02.pcap")]
+    write_beacon_capture(paths[0], 200, 5)
+    write_beacon_capture(paths[1], 100, 5)
+    assert deauth.main(paths) == 0
+    assert "300 frames" in capsys.readouterr().err
+
+
+def test_deauth_follows_only_the_last_capture(tmp_path, monkeypatch):
+    paths = [str(tmp_path / "beacons-01.pcap"), str(tmp_path / "beacons-02.pcap")]
+    for path in paths:
+        write_beacon_capture(path, 10, 5)
+    followed = []
+    monkeypatch.setattr(deauth.DeauthMonitor, "feed_file", lambda self, path, follow=False: followed.append(follow))
+    assert deauth.main(["--follow"] + paths) == 0
+    assert followed == [False, True]
+
+
+def test_deauth_interface_excludes_captures(capsys):
+    assert exit_status(deauth.main, ["--interface", "wlan0mon", "capture.pcap"]) == 2
+    assert "not allowed with" in capsys.readouterr().err
+
+
+def test_store_commands(tmp_path, capsys):
+    csv_path = tmp_path / "scan-01.csv"
+    aps = generate_aps(20)
+    write_csv(str(csv_path), aps)
+    db = str(tmp_path / "survey.db")
+    assert store.main([db, "import", str(csv_path)]) == 0
+    assert "20 APs" in capsys.readouterr().out
+    assert store.main([db, "first-seen", aps[0].bssid]) == 0
+    assert capsys.readouterr().out.strip() != "None"
+    assert store.main([db, "channel", str(aps[0].channel)]) == 0
+    assert aps[0].bssid in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("argv", [
+    ["survey.db"],
+    ["survey.db", "history"],
+    ["survey.db", "channel", "six"],
+    ["survey.db", "fist-seen", "00:11:22:33:44:55"],
+])
+def test_store_rejects_bad_arguments(argv, tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    assert exit_status(store.main, argv) == 2
+    assert "usage:" in capsys.readouterr().err
+    assert not (tmp_path / "survey.db").exists()
+
+
+def test_store_does_not_create_database_for_queries(tmp_path, capsys):
+    db = tmp_path / "survey.db"
+    assert exit_status(store.main, [str(db), "essid", "Office"]) == 2
+    assert "no survey database" in capsys.readouterr().err
+    assert not db.exists()
+
+
+def test_rogue_checks_files(tmp_path, capsys):
+    aps = consistent_baseline(30)
+    baseline = tmp_path / "scan-01.csv"
+    write_csv(str(baseline), aps)
+    assert rogue.main([str(baseline)]) == 0
+    assert "0 alerts for 30 BSSIDs" in capsys.readouterr().err
+
+    clone = next(ap for ap in generate_aps(30) if ap.essid and ap.privacy == "OPN")
+    clone.essid, clone.bssid = next(ap.essid for ap in aps if ap.essid and ap.privacy != "OPN"), "DE:AD:00:00:00:01"
+    later = tmp_path / "scan-02.csv"
+    write_csv(str(later), aps + [clone])
+    assert rogue.main([str(baseline), str(later)]) == 1
+    assert "DE:AD:00:00:00:01" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("argv", [
+    [],
+    ["--min-severity", "critical", "scan-01.csv"],
+    ["--oui", "missing.txt", "scan-01.csv"],
+    ["missing.csv"],
+])
+def test_rogue_rejects_bad_arguments(argv, tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    write_csv("scan-01.csv", generate_aps(5))
+    assert exit_status(rogue.main, argv) == 2
+    assert "usage:" in capsys.readouterr().err
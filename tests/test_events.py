@@ -0,0 +1,51 @@
+from wifiscan.events import APPEARED, DISAPPEARED, UPDATED, ChangeTracker
+from wifiscan.records import AccessPoint
+
+A = "02:00:00:00:00:0A"
+B = "02:00:00:00:00:0B"
+
+
+def access_point(bssid, second, essid="office"):
+    return AccessPoint(bssid, last_seen=f"2025-03-13 15:00:{second:02d}", essid=essid)
+
+
+def test_appeared_updated_disappeared():
+    tracker = ChangeTracker(age_out=10)
+    events = tracker.update([access_point(A, 0)])
+    assert [(event.kind, event.bssid) for event in events] == [(APPEARED, A)]
+    events = tracker.update([access_point(A, 1, "lobby")])
+    assert [(event.kind, event.changes) for event in events] == [(UPDATED, {"essid": ("office", "lobby")})]
+    assert tracker.update([access_point(A, 2, "lobby")]) == []
+    events = tracker.expire(tracker.now + 11)
+    assert [(event.kind, event.bssid) for event in events] == [(DISAPPEARED, A)]
+    assert A not in tracker
+
+
+def test_change_without_newer_sighting_keeps_age():
+    tracker = ChangeTracker(age_out=10)
+    tracker.update([access_point(A, 0), access_point(B, 5)])
+    # A's ESSID changes, but its Last time seen did not move.
+    events = tracker.update([access_point(A, 0, "lobby")])
+    assert [event.kind for event in events] == [UPDATED]
+    # 14 s after A was last seen and 9 s after B: only A has aged out.
+    events = tracker.expire(tracker.now + 9)
+    assert [(event.kind, event.bssid) for event in events] == [(DISAPPEARED, A)]
+    assert B in tracker
+
+
+def test_older_sighting_does_not_rejuvenate():
+    tracker = ChangeTracker(age_out=10)
+    tracker.update([access_point(A, 6)])
+    # A restarted airodump-ng reporting an earlier time for the same AP.
+    tracker.update([access_point(A, 1)])
+    assert [event.kind for event in tracker.expire(tracker.now + 5)] == []
+    assert [event.kind for event in tracker.expire(tracker.now + 11)] == [DISAPPEARED]
+
+
+def test_expiry_in_order_of_last_sighting():
+    tracker = ChangeTracker(age_out=10)
+    tracker.update([access_point(A, 0), access_point(B, 2)])
+    tracker.update([access_point(A, 4)])
+    events = tracker.expire(tracker.now + 20)
+    assert [event.bssid for event in events] == [B, A]
+    assert len(tracker) == 0
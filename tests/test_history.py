@@ -0,0 +1,78 @@
+import collections
+import random
+
+import pytest
+
+from wifiscan.history import SignalHistory
+from wifiscan.records import AccessPoint
+
+A = "02:00:00:00:00:0A"
+B = "02:00:00:00:00:0B"
+
+
+def update(bssid, power, beacons=0):
+    return AccessPoint(bssid, power=power, beacons=beacons)
+
+
+def test_rolling_statistics_over_the_window():
+    history = SignalHistory(window=3)
+    for power in (-40, -60, -80):
+        history.record([update(A, power)])
+    assert history.summary(A) == (-60, -80, -60, -40)
+    # -40 falls out of the window.
+    history.record([update(A, -50)])
+    assert history.summary(A) == (pytest.approx(-63.33, abs=0.01), -80, -60, -50)
+    assert (history.samples(A), len(history), A in history, B in history) == (3, 1, True, False)
+
+
+def test_missing_readings_and_beacon_counter():
+    history = SignalHistory(window=4)
+    history.record([update(A, -1, beacons=100)])
+    assert (history.samples(A), history.mean(A), history.summary(A)) == (0, None, None)
+    assert history.beacons_per_update(A) == 0
+    history.record([update(A, -70, beacons=130)])
+    history.record([update(A, -1, beacons=150)])
+    assert (history.samples(A), history.mean(A)) == (1, -70)
+    assert history.beacons_per_update(A) == 50 / 3
+    # airodump-ng restarted: the counter starts again from zero.
+    history.record([update(A, -72, beacons=5)])
+    assert history.beacons_per_update(A) == 50 / 4
+    assert history.beacons_per_update(B) is history.mean(B) is history.percentile(B, 0.5) is None
+
+
+def test_matches_a_list_per_access_point():
+    rng = random.Random(1)
+    window = 7
+    history = SignalHistory(window)
+    bssids = [f"02:00:00:00:00:{index:02X}" for index in range(20)]
+    readings = {bssid: collections.deque(maxlen=window) for bssid in bssids}
+    beacons = dict.fromkeys(bssids, 0)
+    for _ in range(200):
+        aps = []
+        for bssid in rng.sample(bssids, 5):
+            power = rng.choice((-1, -127, 0, -128)) if rng.random() < 0.1 else rng.randrange(-126, -1)
+            beacons[bssid] += rng.randrange(0, 30)
+            aps.append(update(bssid, power, beacons[bssid]))
+            readings[bssid].append(power if -128 < power < -1 else None)
+        history.record(aps)
+    for bssid in bssids:
+        powers = sorted(power for power in readings[bssid] if power is not None)
+        assert history.samples(bssid) == len(powers)
+        if not powers:
+            continue
+        assert history.mean(bssid) == pytest.approx(sum(powers) / len(powers))
+        for fraction in (0.0, 0.1, 0.5, 0.9, 1.0):
+            assert history.percentile(bssid, fraction) == powers[max(1, round(fraction * len(powers))) - 1]
+
+
+def test_window_bounds_and_memory():
+    with pytest.raises(ValueError):
+        SignalHistory(window=0)
+    with pytest.raises(ValueError):
+        SignalHistory(window=65536)
+    history = SignalHistory(window=60)
+    history.record([update(f"02:00:00:00:{index >> 8:02X}:{index & 0xFF:02X}", -60) for index in range(100)])
+    before = history.nbytes()
+    for _ in range(500):
+        history.record([update("02:00:00:00:00:01", -60)])
+    assert history.nbytes() == before
@@ -0,0 +1,64 @@
+import os
+
+from wifiscan.interfaces import ARPHRD_IEEE80211_RADIOTAP, discover_interfaces, read_sysfs
+
+
+def add_interface(root, name, phy=None, driver=None, type=1, wireless=False, address="02:00:00:00:00:01"):
+    """Lays out root/class/net/name as the kernel does, with relative links to the phy and the driver."""
+    base = root / "class" / "net" / name
+    base.mkdir(parents=True)
+    (base / "type").write_text(f"{type}\n")
+    (base / "address").write_text(f"{address}\n")
+    (base / "operstate").write_text("up\n")
+    if wireless:
+        (base / "wireless").mkdir()
+    if phy is not None:
+        (root / "class" / "ieee80211" / phy).mkdir(parents=True, exist_ok=True)
+        os.symlink(os.path.join("..", "..", "ieee80211", phy), base / "phy80211")
+    if driver is not None:
+        (root / "bus" / "usb" / "drivers" / driver).mkdir(parents=True, exist_ok=True)
+        (base / "device").mkdir()
+        os.symlink(os.path.join("..", "..", "..", "..", "bus", "usb", "drivers", driver), base / "device" / "driver")
+    return base
+
+
+def test_reads_wireless_interfaces_by_sysfs_not_name(tmp_path):
+    add_interface(tmp_path, "wlp3s0", phy="phy1", driver="iwlwifi")
+    add_interface(tmp_path, "wlan0", phy="phy0", driver="ath9k_htc", address="02:00:00:00:00:02")
+    add_interface(tmp_path, "eth0", driver="e1000e")
+    # A "wireless" directory without a phy link is still a wireless interface.
+    add_interface(tmp_path, "ra0", wireless=True)
+    interfaces = read_sysfs(str(tmp_path), {"phy0": {"managed", "monitor"}, "phy1": {"managed"}})
+    assert [interface.name for interface in interfaces] == ["ra0", "wlan0", "wlp3s0"]
+    ra0, wlan0, wlp3s0 = interfaces
+    assert (wlp3s0.phy, wlp3s0.driver, wlp3s0.mode, wlp3s0.monitor_capable) == ("phy1", "iwlwifi", "managed", False)
+    assert (wlan0.phy, wlan0.driver, wlan0.address, wlan0.operstate) == ("phy0", "ath9k_htc", "02:00:00:00:00:02", "up")
+    assert wlan0.monitor_capable is True
+    assert (ra0.phy, ra0.driver, ra0.monitor_capable) == (None, None, None)
+    assert ra0.describe() == "no phy, driver unknown, monitor mode unknown"
+
+
+def test_monitor_mode_interface(tmp_path):
+    add_interface(tmp_path, "wlan0mon", phy="phy0", driver="ath9k_htc", type=ARPHRD_IEEE80211_RADIOTAP)
+    [interface] = read_sysfs(str(tmp_path))
+    # No capabilities known, but an interface in monitor mode is capable of it.
+    assert (interface.mode, interface.iftypes, interface.monitor_capable) == ("monitor", None, True)
+    assert interface.describe() == "phy0, driver ath9k_htc, in monitor mode"
+
+
+def test_missing_tree(tmp_path):
+    assert read_sysfs(str(tmp_path / "missing")) == []
+
+
+def test_discovery_is_cached_until_refreshed(tmp_path):
+    root = str(tmp_path)
+    add_interface(tmp_path, "wlan0", phy="phy0")
+    first = discover_interfaces(root, refresh=True)
+    assert [interface.name for interface in first] == ["wlan0"]
+    # airmon-ng start adds a monitor interface: not seen until refresh=True.
+    add_interface(tmp_path, "wlan0mon", phy="phy0", type=ARPHRD_IEEE80211_RADIOTAP)
+    assert discover_interfaces(root) is first
+    refreshed = discover_interfaces(root, refresh=True)
+    assert [(interface.name, interface.mode) for interface in refreshed] == [("wlan0", "managed"),
+                                                                             ("wlan0mon", "monitor")]
+    assert discover_interfaces(root) is refreshed
@@ -0,0 +1,138 @@
+import io
+import struct
+
+import pytest
+
+from wifiscan.deauth import DeauthMonitor
+from wifiscan.pcap import LINKTYPE_IEEE802_11_RADIOTAP, BeaconDecoder, CaptureFormatError, iter_frames, parse_radiotap
+from wifiscan.registry import AccessPointRegistry
+from wifiscan.synthetic import PcapWriter, beacon, deauthentication, mac_bytes, radiotap
+
+BSSID = mac_bytes(1)
+RADIOTAP_LENGTH = len(radiotap(1, -40))
+
+
+def capture(frames, pcapng=False):
+    fh = io.BytesIO()
+    writer = PcapWriter(fh, pcapng=pcapng)
+    for n, frame in enumerate(frames):
+        writer.write(1700000000.0 + n, frame)
+    fh.seek(0)
+    return fh
+
+
+def decode(frames, pcapng=False):
+    registry = AccessPointRegistry()
+    decoder = BeaconDecoder(registry)
+    for ts, linktype, frame in iter_frames(capture(frames, pcapng)):
+        decoder.feed(ts, linktype, frame)
+    return registry, decoder
+
+
+def truncated_radiotap(claimed_length=40, size=10):
+    """A radiotap header that claims claimed_length bytes, cut to size bytes."""
+    frame = bytearray(beacon(BSSID, "home", 1, -40))
+    struct.pack_into("<H", frame, 2, claimed_length)
+    return bytes(frame[:size])
+
+
+@pytest.mark.parametrize("pcapng", [False, True])
+def test_beacon_is_decoded(pcapng):
+    registry, decoder = decode([beacon(BSSID, "home", 6, -42)], pcapng)
+    ap = registry.get("02:00:00:00:00:01")
+    assert (ap.essid, ap.channel, ap.power, ap.privacy, ap.cipher, ap.authentication) == ("home", 6, -42, "WPA2", "CCMP", "PSK")
+    assert decoder.decoded == 1
+
+
+def test_same_length_essid_and_channel_change_is_seen():
+    registry, _ = decode([beacon(BSSID, "home1", 1, -40), beacon(BSSID, "home2", 6, -40)])
+    ap = registry.get("02:00:00:00:00:01")
+    assert (ap.essid, ap.channel, ap.beacons) == ("home2", 6, 2)
+
+
+def test_ds_channel_change_is_seen_when_radiotap_channel_stays():
+    moved = radiotap(1, -40) + beacon(BSSID, "home", 6, -40)[RADIOTAP_LENGTH:]
+    registry, _ = decode([beacon(BSSID, "home", 1, -40), moved])
+    assert registry.get("02:00:00:00:00:01").channel == 6
+
+
+def test_encryption_change_is_seen():
+    registry, _ = decode([beacon(BSSID, "home", 1, -40), beacon(BSSID, "home", 1, -40, privacy=False)])
+    assert registry.get("02:00:00:00:00:01").privacy == "OPN"
+
+
+def test_repeated_beacons_update_power_and_count():
+    registry, _ = decode([beacon(BSSID, "home", 1, -40), beacon(BSSID, "home", 1, -55, seq=1)])
+    ap = registry.get("02:00:00:00:00:01")
+    assert (ap.power, ap.beacons) == (-55, 2)
+
+
+@pytest.mark.parametrize("claimed_length, size", [(40, 10), (7, 30), (8, 7), (300, 60)])
+def test_parse_radiotap_rejects_truncated_headers(claimed_length, size):
+    assert parse_radiotap(truncated_radiotap(claimed_length, size)) is None
+
+
+def test_parse_radiotap_rejects_fields_past_the_header():
+    # Present flags announce Flags, Channel and signal, but the header ends after 8 bytes.
+    frame = struct.pack("<BBHI", 0, 0, 8, (1 << 1) | (1 << 3) | (1 << 5)) + b"\0" * 40
+    assert parse_radiotap(frame) is None
+
+
+def test_parse_radiotap_rejects_unterminated_present_words():
+    frame = struct.pack("<BBHII", 0, 0, 12, 0x80000000, 0x80000000) + b"\0" * 40
+    assert parse_radiotap(frame) is None
+
+
+def test_parse_radiotap_fhss_is_byte_aligned():
+    # Flags, FHSS (two u8) and dBm signal: FHSS starts right after Flags, at an odd offset.
+    frame = struct.pack("<BBHIBBBb", 0, 0, 12, (1 << 1) | (1 << 4) | (1 << 5), 0, 3, 7, -42)
+    assert parse_radiotap(frame) == (12, -42, -1, False)
+
+
+def enhanced_packet_block(frame, caplen=None, block_len=None):
+    padded = frame + b"\0" * (-len(frame) % 4)
+    block_len = 32 + len(padded) if block_len is None else block_len
+    caplen = len(frame) if caplen is None else caplen
+    return struct.pack("<IIIIIII", 6, block_len, 0, 0, 0, caplen, caplen) + padded + struct.pack("<I", block_len)
+
+
+def test_pcapng_caplen_is_clamped_to_the_block():
+    fh = capture([], pcapng=True)
+    fh.seek(0, io.SEEK_END)
+    fh.write(enhanced_packet_block(b"\1" * 8, caplen=1000))
+    fh.write(enhanced_packet_block(b"\2" * 4))
+    fh.seek(0)
+    assert [bytes(frame) for _ts, _linktype, frame in iter_frames(fh)] == [b"\1" * 8, b"\2" * 4]
+
+
+def test_pcapng_short_enhanced_packet_block():
+    fh = capture([], pcapng=True)
+    fh.seek(0, io.SEEK_END)
+    fh.write(struct.pack("<IIIIII", 6, 24, 0, 0, 0, 0) + struct.pack("<I", 24))
+    fh.seek(0)
+    with pytest.raises(CaptureFormatError):
+        list(iter_frames(fh))
+
+
+def test_truncated_frames_do_not_stop_the_capture():
+    frames = [truncated_radiotap(), beacon(BSSID, "home", 11, -40), truncated_radiotap(300, 60)]
+    registry, decoder = decode(frames)
+    assert decoder.frames == 3
+    assert registry.get("02:00:00:00:00:01").channel == 11
+
+
+def test_deauth_monitor_skips_truncated_frames():
+    monitor = DeauthMonitor(window=10, threshold=2)
+    alerts = []
+    monitor.subscribe(alerts.append)
+    attacker = deauthentication(b"\xff" * 6, BSSID, BSSID)
+    monitor.feed_frames(iter_frames(capture([truncated_radiotap(), attacker, attacker[:30], attacker])))
+    assert monitor.frames == 4
+    assert monitor.management == 2
+    assert [alert.address for alert in alerts] == ["02:00:00:00:00:01", "02:00:00:00:00:01"]
+
+
+def test_feed_ignores_unknown_linktypes():
+    decoder = BeaconDecoder(AccessPointRegistry())
+    assert decoder.feed(0.0, 1, beacon(BSSID, "home", 1, -40)) is None
+    assert decoder.feed(0.0, LINKTYPE_IEEE802_11_RADIOTAP, b"") is None
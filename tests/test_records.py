@@ -0,0 +1,56 @@
+from datetime import datetime
+
+from wifiscan.records import AccessPoint, Station, parse_time
+
+
+def ap_fields(bssid, essid, privacy="WPA2"):
+    line = (f"{bssid}, 2025-03-13 15:00:00, 2025-03-13 15:00:09,  6, 130, {privacy}, CCMP, PSK, -60, "
+            f"      12,        0,   0.  0.  0.  0, {len(essid):3d}, {essid}, ")
+    return line.split(",")
+
+
+def test_access_point_from_fields():
+    ap = AccessPoint.from_fields(ap_fields("02:00:00:00:00:01", "office"))
+    assert (ap.bssid, ap.first_seen, ap.last_seen) == ("02:00:00:00:00:01", "2025-03-13 15:00:00", "2025-03-13 15:00:09")
+    assert (ap.channel, ap.speed, ap.power, ap.beacons, ap.iv, ap.id_length) == (6, 130, -60, 12, 0, 6)
+    assert (ap.privacy, ap.cipher, ap.authentication, ap.lan_ip, ap.essid, ap.key) == (
+        "WPA2", "CCMP", "PSK", "0.0.0.0", "office", "")
+    # Only the separating space before the ESSID is dropped.
+    assert AccessPoint.from_fields(ap_fields("02:00:00:00:00:01", " lobby ")).essid == " lobby "
+    assert AccessPoint.from_fields(ap_fields("02:00:00:00:00:01", "office")[:13]) is None
+
+
+def test_access_point_numbers_and_interning():
+    fields = ap_fields("02:00:00:00:00:01", "office")
+    fields[3], fields[9] = " -1", " x"
+    ap = AccessPoint.from_fields(fields)
+    assert (ap.channel, ap.beacons) == (-1, 0)
+    # The encryption columns of different rows share one string object.
+    other = AccessPoint.from_fields(ap_fields("02:00:00:00:00:02", "lobby", privacy="".join(["WP", "A2"])))
+    assert other.privacy is ap.privacy
+
+
+def test_access_point_update_and_as_dict():
+    ap = AccessPoint("02:00:00:00:00:01", power=-70, essid="office")
+    ap.update_from(AccessPoint("02:00:00:00:00:01", power=-40, essid="lobby"))
+    data = ap.as_dict()
+    assert list(data) == list(AccessPoint.__slots__)
+    assert (data["power"], data["essid"]) == (-40, "lobby")
+
+
+def test_station_from_fields():
+    line = "02:00:00:00:01:01, 2025-03-13 15:00:01, 2025-03-13 15:00:08, -50,        4, 02:00:00:00:00:01, home,Office"
+    station = Station.from_fields(line.split(","))
+    assert (station.mac, station.first_seen, station.last_seen) == (
+        "02:00:00:00:01:01", "2025-03-13 15:00:01", "2025-03-13 15:00:08")
+    assert (station.power, station.packets, station.bssid, station.probed) == (-50, 4, "02:00:00:00:00:01", ("home", "Office"))
+    probing = Station.from_fields(line.replace("02:00:00:00:00:01", "(not associated) ").split(",") + [" "])
+    assert (probing.bssid, probing.probed) == (None, ("home", "Office"))
+    assert probing.as_dict()["probed"] == ["home", "Office"]
+    assert Station.from_fields(line.split(",")[:5]) is None
+
+
+def test_parse_time():
+    assert parse_time("2025-03-13 15:00:09") == datetime(2025, 3, 13, 15, 0, 9).timestamp()
+    assert parse_time("2025-03-13 15:00:09") - parse_time("2025-03-13 15:00:00") == 9
+    assert parse_time("") == parse_time("not a time") == parse_time(None) == 0.0
@@ -0,0 +1,49 @@
+from wifiscan.records import AccessPoint
+from wifiscan.registry import AccessPointRegistry
+
+A = "02:00:00:00:00:0A"
+B = "02:00:00:00:00:0B"
+C = "02:00:00:00:00:0C"
+
+
+def test_keyed_by_bssid_in_first_seen_order():
+    registry = AccessPointRegistry()
+    assert registry.upsert(AccessPoint(B, essid="office", power=-70)) is True
+    assert registry.upsert(AccessPoint(A, essid="office", power=-50)) is True
+    # Two BSSIDs sharing an ESSID are both kept, a repeated BSSID is not added again.
+    assert registry.upsert(AccessPoint(B, essid="office", power=-40)) is False
+    assert len(registry) == 2
+    assert [ap.bssid for ap in registry] == [B, A]
+    assert (registry[0].bssid, registry[-1].bssid) == (B, A)
+    assert B in registry and C not in registry
+    assert registry.get(C) is None
+    assert registry.bssids_for_essid("office") == {A, B}
+
+
+def test_update_in_place():
+    registry = AccessPointRegistry()
+    stored = AccessPoint(A, first_seen="2025-03-13 15:00:00", last_seen="2025-03-13 15:00:01", power=-70, essid="office")
+    registry.upsert(stored)
+    registry.upsert(AccessPoint(A, first_seen="2025-03-13 15:00:00", last_seen="2025-03-13 15:00:09", power=-45,
+                                essid="office"))
+    # The table keeps pointing at the same record, now with the latest sighting.
+    assert registry.get(A) is stored
+    assert (stored.last_seen, stored.power) == ("2025-03-13 15:00:09", -45)
+
+
+def test_essid_index_follows_renames():
+    registry = AccessPointRegistry()
+    registry.update_many([AccessPoint(A, essid="office"), AccessPoint(B, essid="office")])
+    registry.upsert(AccessPoint(A, essid="lobby"))
+    assert registry.bssids_for_essid("office") == {B}
+    assert registry.bssids_for_essid("lobby") == {A}
+    registry.upsert(AccessPoint(B, essid=""))
+    assert registry.bssids_for_essid("office") == frozenset()
+    assert registry.bssids_for_essid("") == {B}
+
+
+def test_update_many_counts_new_aps():
+    registry = AccessPointRegistry()
+    assert registry.update_many([AccessPoint(A), AccessPoint(B)]) == 2
+    assert registry.update_many([AccessPoint(B), AccessPoint(C), AccessPoint(C)]) == 1
+    assert [ap.bssid for ap in registry] == [A, B, C]
@@ -0,0 +1,45 @@
+import io
+
+from wifiscan.records import AccessPoint
+from wifiscan.render import TableRenderer, _format_cells, _width
+
+
+def render(aps):
+    out = io.StringIO()
+    renderer = TableRenderer(out, max_fps=0, keyboard=False, size=(80, 24))
+    renderer.render(aps)
+    return renderer, out
+
+
+def test_control_characters_are_escaped():
+    [no, bssid, essid] = _format_cells((1, "02:00:00:00:00:01", "evil\x1b[2J\nname\x9b"),
+                                       (("No", 4, ">"), ("BSSID", 17, "<"), ("ESSID", 32, "<")))
+    assert essid == "evil\\x1b[2J\\x0aname\\x9b".ljust(32) + " "
+    _renderer, out = render([AccessPoint("02:00:00:00:00:01", essid="a\x1b]0;title\x07b\nc")])
+    text = out.getvalue()
+    assert "\x07" not in text and "\n" not in text and "\x1b]" not in text
+
+
+def test_wide_characters_are_padded_by_display_width():
+    cells = _format_cells(("東京", "Büro", "é"), (("A", 6, "<"), ("B", 6, ">"), ("C", 3, "<")))
+    assert cells == ("東京   ", "  Büro ", "é   ")
+    assert [_width(cell) for cell in cells] == [7, 7, 4]
+    # Cut at a character boundary and still as wide as the column.
+    [cut] = _format_cells(("東京東京",), (("A", 6, "<"),))
+    assert (cut, _width(cut)) == ("東京~  ", 7)
+
+
+class Vendors:
+    def lookup(self, bssid):
+        return "東京電機"
+
+
+def test_cell_updates_are_positioned_by_display_width():
+    out = io.StringIO()
+    renderer = TableRenderer(out, max_fps=0, keyboard=False, size=(80, 24), vendors=Vendors())
+    renderer.render([AccessPoint("02:00:00:00:00:01", essid="office")])
+    out.truncate(0)
+    out.seek(0)
+    renderer.render([AccessPoint("02:00:00:00:00:01", essid="lobby")], force=True)
+    # Only the ESSID cell of the first row (line 5) is rewritten, after No, BSSID, CH, PWR and VENDOR.
+    assert out.getvalue().startswith(f"\x1b[5;{5 + 18 + 4 + 5 + 13 + 1}Hlobby ")
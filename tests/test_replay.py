@@ -0,0 +1,66 @@
+import os
+
+from wifiscan.airodump import parse_csv
+from wifiscan.records import AccessPoint, Station
+from wifiscan.replay import Replayer, write_airodump_csv
+from wifiscan.synthetic import generate_aps, write_beacon_capture, write_csv
+
+
+def read_output(replayer):
+    with open(replayer.output, "rb") as fh:
+        return parse_csv(fh.read())
+
+
+def test_written_csv_reads_back(tmp_path):
+    path = str(tmp_path / "file-01.csv")
+    ap = AccessPoint("02:00:00:00:00:01", "2025-03-13 15:00:00", "2025-03-13 15:00:09", 6, 130, "WPA2", "CCMP", "PSK",
+                     -60, 12, 0, "192.168.1.1", 7, "a, b \"c\"", "")
+    station = Station("02:00:00:00:01:01", "2025-03-13 15:00:01", "2025-03-13 15:00:08", -50, 4, None, ("home", "lab"))
+    write_airodump_csv(path, [ap], [station])
+    with open(path, "rb") as fh:
+        parsed = parse_csv(fh.read())
+    assert [read.as_dict() for read in parsed.aps] == [ap.as_dict()]
+    assert [read.as_dict() for read in parsed.stations] == [station.as_dict()]
+
+
+def test_snapshots_replayed_in_name_order(tmp_path):
+    snapshots = tmp_path / "snapshots"
+    snapshots.mkdir()
+    for index in range(3):
+        write_csv(str(snapshots / f"{index:04d}.csv"), generate_aps(index + 1))
+    (snapshots / "notes.txt").write_text("not a snapshot")
+    replayer = Replayer(str(snapshots), str(tmp_path), speed=0).start()
+    assert replayer.finished.wait(5)
+    replayer.stop()
+    assert replayer.snapshots_written == 3
+    assert replayer.output == str(tmp_path / "replay-01.csv")
+    assert len(read_output(replayer).aps) == 3
+
+
+def test_stop_before_the_next_snapshot_is_due(tmp_path):
+    for index in range(2):
+        path = str(tmp_path / f"{index:04d}.csv")
+        write_csv(path, generate_aps(index + 1))
+        os.utime(path, (1000.0 + 100 * index, 1000.0 + 100 * index))
+    output = tmp_path / "out"
+    output.mkdir()
+    replayer = Replayer(str(tmp_path), str(output), speed=1).start()
+    # The second snapshot is due 100 s after the first one.
+    assert not replayer.finished.wait(0.3)
+    replayer.stop()
+    assert replayer.finished.is_set()
+    assert replayer.snapshots_written == 1
+    assert len(read_output(replayer).aps) == 1
+
+
+def test_capture_written_once_per_second_of_capture_time(tmp_path):
+    capture = str(tmp_path / "beacons.pcap")
+    # 2500 beacons 1 ms apart, from 10 APs.
+    write_beacon_capture(capture, 2500, 10)
+    replayer = Replayer(capture, str(tmp_path), speed=0).start()
+    assert replayer.finished.wait(5)
+    replayer.stop()
+    assert replayer.snapshots_written == 3
+    aps = read_output(replayer).aps
+    assert len(aps) == 10
+    assert all(ap.beacons == 250 for ap in aps)
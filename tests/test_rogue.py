@@ -0,0 +1,91 @@
+from wifiscan.airodump import parse_csv
+from wifiscan.events import ChangeTracker
+from wifiscan.rogue import CHANNEL, ENCRYPTION, NEW_BSSID, RogueDetector
+from wifiscan.synthetic import generate_aps, render_csv
+
+
+def detector_for(tracker):
+    detector = RogueDetector()
+    tracker.subscribe(detector.on_events)
+    return detector
+
+
+def network(essid, count=2):
+    """count BSSIDs of one vendor broadcasting essid with WPA2, as parse_csv() reads them."""
+    aps = generate_aps(count)
+    for index, ap in enumerate(aps):
+        ap.essid = essid
+        ap.privacy, ap.cipher, ap.authentication = "WPA2", "CCMP", "PSK"
+        ap.bssid = f"00:11:22:00:00:{index:02X}"
+        ap.channel = 6
+    return aps
+
+
+def test_twin_with_comma_in_essid():
+    aps = network("Office, Office")
+    tracker = ChangeTracker(age_out=None)
+    detector = detector_for(tracker)
+    tracker.update(parse_csv(render_csv(aps)).aps)
+    assert detector.bssids("Office, Office").keys() == {ap.bssid for ap in aps}
+    assert detector.alerts == []
+
+    twin = generate_aps(1, seed=2)[0]
+    twin.essid, twin.bssid = "Office, Office", "DE:AD:00:00:00:01"
+    twin.privacy, twin.cipher, twin.authentication = "WPA2", "CCMP", "PSK"
+    tracker.update(parse_csv(render_csv(aps + [twin])).aps)
+    assert [(alert.kind, alert.essid, alert.bssid) for alert in detector.alerts] == [(NEW_BSSID, "Office, Office", twin.bssid)]
+
+
+def test_open_clone_with_quotes_in_essid():
+    aps = network('"Guest"')
+    tracker = ChangeTracker(age_out=None)
+    detector = detector_for(tracker)
+    tracker.update(parse_csv(render_csv(aps)).aps)
+    clone = generate_aps(1, seed=3)[0]
+    clone.essid, clone.bssid = '"Guest"', "DE:AD:00:00:00:02"
+    clone.privacy, clone.cipher, clone.authentication = "OPN", "", ""
+    tracker.update(parse_csv(render_csv(aps + [clone])).aps)
+    assert [(alert.kind, alert.bssid) for alert in detector.alerts] == [(ENCRYPTION, clone.bssid)]
+
+
+def test_same_vendor_adds_no_alert():
+    aps = network("Lab, 2nd floor", 3)
+    tracker = ChangeTracker(age_out=None)
+    detector = detector_for(tracker)
+    tracker.update(parse_csv(render_csv(aps[:2])).aps)
+    tracker.update(parse_csv(render_csv(aps)).aps)
+    assert len(detector.bssids("Lab, 2nd floor")) == 3
+    assert detector.alerts == []
+
+
+def test_twin_cloning_the_oui():
+    aps = network("Office")
+    tracker = ChangeTracker(age_out=None)
+    detector = RogueDetector(min_severity="low")
+    tracker.subscribe(detector.on_events)
+    tracker.update(parse_csv(render_csv(aps)).aps)
+    # The first BSSID creates the network, the second one is related to it.
+    assert [(alert.kind, alert.severity) for alert in detector.alerts] == [(NEW_BSSID, "low")]
+    twin = network("Office", 3)[2]
+    twin.bssid = "00:11:22:7F:00:01"
+    hopper = network("Office", 4)[3]
+    hopper.bssid, hopper.channel = "00:11:22:7F:00:02", 11
+    tracker.update(parse_csv(render_csv(aps + [twin, hopper])).aps)
+    assert sorted((alert.bssid, alert.kind, alert.severity) for alert in detector.alerts[1:]) == [
+        (twin.bssid, NEW_BSSID, "low"), (hopper.bssid, CHANNEL, "medium")]
+
+
+def test_encryption_is_compared_with_every_bssid():
+    aps = network("Lab", 2)
+    aps[1].privacy = "WPA3 WPA2"
+    tracker = ChangeTracker(age_out=None)
+    detector = detector_for(tracker)
+    tracker.update(parse_csv(render_csv(aps)).aps)
+    assert [alert.kind for alert in detector.alerts] == [ENCRYPTION]
+    # Both encryptions are used now, the open clones are not and never become so.
+    more = network("Lab", 5)[2:]
+    more[0].privacy = "WPA3 WPA2"
+    more[1].privacy = more[2].privacy = "OPN"
+    tracker.update(parse_csv(render_csv(aps + more)).aps)
+    assert sorted((alert.bssid, alert.kind) for alert in detector.alerts[1:]) == [
+        (more[1].bssid, ENCRYPTION), (more[2].bssid, ENCRYPTION)]
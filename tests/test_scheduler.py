@@ -0,0 +1,117 @@
+import pytest
+
+from wifiscan.scheduler import CadenceAdapter, CostAdapter, Scheduler
+from wifiscan.stats import ScanStats
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds or 0.0
+
+
+def test_trigger_respects_interval():
+    clock = FakeClock()
+    scheduler = Scheduler(clock=clock)
+    runs = []
+    scheduler.add("render", lambda: runs.append(clock.now), interval=0.25)
+    assert scheduler.next_delay() is None
+    scheduler.trigger("render")
+    scheduler.run_due()
+    scheduler.trigger("render")
+    assert scheduler.run_due() == 0
+    assert scheduler.next_delay() == pytest.approx(0.25)
+    clock.sleep(0.25)
+    scheduler.run_due()
+    assert runs == [100.0, 100.25]
+
+
+def test_idle_task_runs_untriggered():
+    clock = FakeClock()
+    scheduler = Scheduler(clock=clock)
+    runs = []
+    scheduler.add("ingest", lambda: runs.append(clock.now), idle=5.0)
+    for _ in range(3):
+        scheduler.run_due()
+        clock.sleep(scheduler.next_delay())
+    assert runs == [100.0, 105.0, 110.0]
+
+
+def test_run_until_stopped_draws_last_frame():
+    clock = FakeClock()
+    scheduler = Scheduler(clock=clock)
+    frames = []
+    passes = []
+
+    def ingest():
+        passes.append(clock.now)
+        scheduler.trigger("render")
+        if len(passes) == 3:
+            scheduler.stop()
+        return 1
+
+    scheduler.add("ingest", ingest, idle=0.1)
+    scheduler.add("render", lambda: frames.append(clock.now), interval=1.0)
+    scheduler.run(clock.sleep)
+    # Frames at most once a second, and the one asked for before stopping.
+    assert passes == pytest.approx([100.0, 100.1, 100.2])
+    assert frames == pytest.approx([100.0, 100.2])
+
+
+def test_cadence_adapter_follows_writes_and_backs_off():
+    clock = FakeClock()
+    scheduler = Scheduler(clock=clock)
+    rows = iter([10, 10, 10, 0, 0, 0])
+    adapter = CadenceAdapter(min_idle=0.5, max_idle=30.0)
+    task = scheduler.add("ingest", lambda: next(rows), idle=1.0, adapter=adapter)
+    # A write every 2 s, each waking the task (as the watcher does).
+    for _ in range(3):
+        scheduler.trigger("ingest")
+        scheduler.run_due()
+        clock.sleep(2.0)
+    assert adapter.cadence == pytest.approx(2.0)
+    assert task.idle == pytest.approx(4.0)
+    for _ in range(3):
+        clock.now = task.next_due
+        scheduler.run_due()
+    assert task.idle == pytest.approx(4.0 * 1.5 ** 3)
+
+
+def test_cost_adapter_spaces_slow_frames():
+    clock = FakeClock()
+    scheduler = Scheduler(clock=clock)
+
+    def slow_frame():
+        clock.sleep(0.05)
+        return True
+
+    task = scheduler.add("render", slow_frame, interval=0.25, adapter=CostAdapter(budget=0.1, max_interval=2.0))
+    scheduler.trigger("render")
+    scheduler.run_due()
+    assert task.interval == pytest.approx(0.5)
+
+
+def test_overruns_are_counted():
+    clock = FakeClock()
+    stats = ScanStats()
+    scheduler = Scheduler(stats, clock=clock)
+
+    def slow():
+        clock.sleep(0.5)
+
+    scheduler.add("analysis", slow, interval=1.0)
+    scheduler.add("render", lambda: None, interval=0.25)
+    scheduler.trigger("analysis")
+    scheduler.trigger("render")
+    scheduler.run_due()
+    # The render task was due at 100.0 and started after the 0.5 s analysis: more than one interval late.
+    assert stats.tasks["render"].overruns == 1
+    assert stats.tasks["render"].late_max == pytest.approx(0.5)
+    assert stats.tasks["analysis"].overruns == 0
+    assert "overruns 1" in stats.status_line()
+    assert stats.as_dict()["tasks"]["render"]["runs"] == 1
@@ -0,0 +1,164 @@
+import base64
+import hashlib
+import json
+import os
+import socket
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from wifiscan.events import ChangeEvent, DISAPPEARED
+from wifiscan.records import AccessPoint
+from wifiscan.server import OP_PING, OP_PONG, WEBSOCKET_GUID, StatusServer
+
+A = "02:00:00:00:00:0A"
+B = "02:00:00:00:00:0B"
+
+
+def access_point(bssid, power=-60, essid="office", channel=6):
+    return AccessPoint(bssid, last_seen="2025-03-13 15:00:00", channel=channel, power=power, essid=essid)
+
+
+@pytest.fixture
+def server():
+    server = StatusServer(port=0).start()
+    yield server
+    server.stop(5)
+
+
+def get(server, path):
+    with urllib.request.urlopen(f"http://127.0.0.1:{server.port}{path}", timeout=5) as response:
+        return json.loads(response.read())
+
+
+def wait_for_tick(server, tick):
+    deadline = time.monotonic() + 5
+    while get(server, "/status")["tick"] < tick:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+class Client:
+    """A minimal WebSocket client over a plain socket."""
+
+    def __init__(self, port, origin=None, host=None):
+        self.sock = socket.create_connection(("127.0.0.1", port), timeout=5)
+        self.file = self.sock.makefile("rb")
+        key = base64.b64encode(os.urandom(16))
+        host = host or f"127.0.0.1:{port}"
+        request = (f"GET /ws HTTP/1.1\r\nHost: {host}\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                   f"Sec-WebSocket-Key: {key.decode()}\r\nSec-WebSocket-Version: 13\r\n")
+        if origin:
+            request += f"Origin: {origin}\r\n"
+        self.sock.sendall((request + "\r\n").encode())
+        self.status = self.file.readline().split()[1]
+        headers = {}
+        for line in iter(self.file.readline, b"\r\n"):
+            name, _, value = line.decode().partition(":")
+            headers[name.lower()] = value.strip()
+        self.accept = headers.get("sec-websocket-accept")
+        assert self.accept in (None, base64.b64encode(hashlib.sha1(key + WEBSOCKET_GUID).digest()).decode())
+
+    def read_frame(self):
+        head = self.file.read(2)
+        length = head[1] & 0x7F
+        if length == 126:
+            length = int.from_bytes(self.file.read(2), "big")
+        elif length == 127:
+            length = int.from_bytes(self.file.read(8), "big")
+        return head[0] & 0x0F, self.file.read(length)
+
+    def read_message(self):
+        return json.loads(self.read_frame()[1])
+
+    def send(self, opcode, payload):
+        mask = os.urandom(4)
+        masked = bytes(byte ^ mask[index & 3] for index, byte in enumerate(payload))
+        self.sock.sendall(bytes((0x80 | opcode, 0x80 | len(payload))) + mask + masked)
+
+    def close(self):
+        self.file.close()
+        self.sock.close()
+
+
+def test_snapshot_is_encoded_once_per_tick(server):
+    server.publish([access_point(A), access_point(B, essid="Office, 2nd floor")])
+    wait_for_tick(server, 1)
+    snapshots = [get(server, "/aps") for _ in range(5)]
+    assert snapshots[0]["tick"] == 1
+    assert [ap["essid"] for ap in snapshots[0]["aps"]] == ["office", "Office, 2nd floor"]
+    assert all(snapshot == snapshots[0] for snapshot in snapshots)
+    assert get(server, "/status")["snapshots_encoded"] == 1
+    # Nothing changed: no new tick.
+    server.publish([access_point(A)])
+    server.publish([access_point(A, power=-50)])
+    wait_for_tick(server, 2)
+    assert get(server, "/")["aps"][0]["power"] == -50
+    assert get(server, "/status")["snapshots_encoded"] == 2
+
+
+def test_websocket_deltas_rebuild_the_registry(server):
+    server.publish([access_point(A)])
+    wait_for_tick(server, 1)
+    clients = [Client(server.port) for _ in range(3)]
+    try:
+        views = []
+        for client in clients:
+            snapshot = client.read_message()
+            assert (client.status, snapshot["type"], snapshot["tick"]) == (b"101", "snapshot", 1)
+            views.append({ap["bssid"]: ap for ap in snapshot["aps"]})
+        server.publish([access_point(A, power=-48), access_point(B)])
+        server.publish([access_point(B, channel=11)], [ChangeEvent(DISAPPEARED, A, 0.0)])
+        for client, view in zip(clients, views):
+            first, second = client.read_message(), client.read_message()
+            assert first["aps"] == [{"power": -48, "bssid": A}, access_point(B).as_dict()]
+            assert (second["tick"], second["aps"], second["disappeared"]) == (3, [{"channel": 11, "bssid": B}], [A])
+            for delta in (first, second):
+                for ap in delta["aps"]:
+                    view.setdefault(ap["bssid"], {}).update(ap)
+            assert view == {ap["bssid"]: ap for ap in get(server, "/aps")["aps"]}
+        # Three viewers, one encoding per tick.
+        assert get(server, "/status")["deltas_encoded"] == 2
+        clients[0].send(OP_PING, b"hi")
+        assert clients[0].read_frame() == (OP_PONG, b"hi")
+    finally:
+        for client in clients:
+            client.close()
+
+
+def test_rejects_other_requests(server):
+    client = Client(server.port, origin="http://attacker.example")
+    assert (client.status, client.accept) == (b"403", None)
+    client.close()
+    with pytest.raises(urllib.error.HTTPError) as excinfo:
+        get(server, "/missing")
+    assert excinfo.value.code == 404
+    excinfo.value.close()
+
+
+def raw_get(port, path, host):
+    with socket.create_connection(("127.0.0.1", port), timeout=5) as sock:
+        sock.sendall(f"GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode())
+        return sock.makefile("rb").readline().split()[1]
+
+
+def test_rejects_dns_rebinding(server):
+    # A page of evil.example whose name now resolves to 127.0.0.1: Origin and Host agree, but name another host.
+    rebound = f"evil.example:{server.port}"
+    client = Client(server.port, origin=f"http://{rebound}", host=rebound)
+    assert (client.status, client.accept) == (b"403", None)
+    client.close()
+    for path in ("/", "/aps", "/status"):
+        assert raw_get(server.port, path, rebound) == b"403"
+        assert raw_get(server.port, path, f"localhost:{server.port}") == b"200"
+    assert raw_get(server.port, "/aps", "127.0.0.1") == b"403"
+    client = Client(server.port, origin=f"http://localhost:{server.port}", host=f"localhost:{server.port}")
+    assert client.status == b"101"
+    client.close()
+
+
+def test_port_in_use(server):
+    with pytest.raises(OSError):
+        StatusServer(port=server.port).start()
@@ -0,0 +1,80 @@
+import collections
+import os
+import random
+from datetime import timedelta
+
+from wifiscan.airodump import parse_csv
+from wifiscan.ingest import CsvIngestor
+from wifiscan.records import Station
+from wifiscan.stations import StationIndex
+from wifiscan.synthetic import generate_aps, generate_stations, write_csv
+
+AP1 = "00:11:22:00:00:01"
+AP2 = "00:11:22:00:00:02"
+
+
+def station(mac, second, bssid=None, packets=10):
+    return Station(mac, last_seen=f"2025-03-13 15:00:{second:02d}", packets=packets, bssid=bssid)
+
+
+def test_counts_and_roaming():
+    index = StationIndex(age_out=None)
+    index.update([station("02:00:00:00:00:01", 0, AP1), station("02:00:00:00:00:02", 0, AP1),
+                  station("02:00:00:00:00:03", 0)])
+    assert index.clients(AP1) == {"02:00:00:00:00:01", "02:00:00:00:00:02"}
+    assert (index.associated, index.unassociated, index.busy_aps) == (2, 1, 1)
+    assert index.load(AP1).packets == 20
+
+    index.update([station("02:00:00:00:00:02", 1, AP2, packets=15)])
+    assert index.bssid_of("02:00:00:00:00:02") == AP2
+    assert (index.load(AP1).clients, index.load(AP1).leaves) == (1, 1)
+    assert (index.load(AP2).clients, index.load(AP2).joins, index.load(AP2).packets) == (1, 1, 15)
+    assert index.load(AP1).churn == 3
+    assert [load.bssid for load in index.busiest(2)] == [AP2, AP1]
+
+    index.update([station("02:00:00:00:00:03", 2, AP2)])
+    assert (index.associated, index.unassociated, index.busy_aps) == (3, 0, 2)
+    assert index.packets == 10 + 15 + 10
+
+
+def test_age_out_by_latest_sighting():
+    index = StationIndex(age_out=10)
+    index.update([station("02:00:00:00:00:01", 0, AP1), station("02:00:00:00:00:02", 5, AP1)])
+    # A change without a newer sighting does not make the station any younger.
+    index.update([station("02:00:00:00:00:01", 0, AP1, packets=50)])
+    assert index.expire(index.now + 9) == 1
+    assert index.clients(AP1) == {"02:00:00:00:00:02"}
+    assert (index.load(AP1).leaves, index.packets) == (1, 10)
+
+
+def test_incremental_matches_full_count(tmp_path):
+    rng = random.Random(4)
+    aps = generate_aps(200)
+    stations = generate_stations(300, aps)
+    path = os.path.join(tmp_path, "file-01.csv")
+    ingestor = CsvIngestor(str(tmp_path), stations=True)
+    index = StationIndex(age_out=None)
+    for _tick in range(4):
+        write_csv(path, aps, stations)
+        ingestor.poll()
+        index.update(ingestor.take_stations())
+        for moved in rng.sample(stations, 30):
+            moved.bssid = rng.choice(aps).bssid if rng.random() < 0.8 else None
+            moved.packets += rng.randrange(100)
+            moved.last_seen += timedelta(seconds=1)
+
+    with open(path, "rb") as fh:
+        parsed = parse_csv(fh.read()).stations
+    counts = collections.Counter(parsed_station.bssid for parsed_station in parsed if parsed_station.bssid)
+    assert {load.bssid: load.clients for load in index.loads() if load.clients} == counts
+    assert index.associated == sum(counts.values())
+    assert index.unassociated == len(parsed) - index.associated
+    assert index.packets == sum(parsed_station.packets for parsed_station in parsed if parsed_station.bssid)
+
+
+def test_ingestor_skips_stations_by_default(tmp_path):
+    aps = generate_aps(20)
+    write_csv(os.path.join(tmp_path, "file-01.csv"), aps, generate_stations(10, aps))
+    ingestor = CsvIngestor(str(tmp_path))
+    assert len(ingestor.poll()) == 20
+    assert ingestor.take_stations() == []
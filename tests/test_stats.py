@@ -0,0 +1,73 @@
+import json
+
+import pytest
+
+from wifiscan.stats import LATENCY_BUCKETS_MS, Histogram, Profiler, ScanStats
+
+
+def test_histogram_percentiles():
+    histogram = Histogram(LATENCY_BUCKETS_MS)
+    assert histogram.percentile(0.5) == 0.0
+    for value in [0.3] * 90 + [40] * 9 + [5000]:
+        histogram.add(value)
+    assert (histogram.percentile(0.5), histogram.percentile(0.9), histogram.percentile(0.99)) == (0.5, 0.5, 50)
+    assert histogram.percentile(1.0) == float("inf")
+    assert histogram.as_dict() == {"0.5": 90, "50": 9, "inf": 1}
+
+
+def test_stages_ticks_and_tasks():
+    stats = ScanStats()
+    for rows in (0, 5, 500):
+        stats.begin_tick()
+        with stats.stage("parse"):
+            pass
+        stats.add("render", 0.004)
+        stats.end_tick(rows)
+    stats.add("render", 0.012)
+    stats.task("ingest").add(0.002, late=0.01, overrun=True, interval=0.5, idle=None)
+    stats.task("ingest").add(0.004, late=0.03, overrun=False, interval=1.0, idle=None)
+    data = stats.as_dict()
+    assert (data["ticks"], data["rows_total"], data["rows_per_tick"]) == (3, 505, {"0": 1, "10": 1, "1000": 1})
+    assert data["tick"]["calls"] == 3
+    assert list(data["stages"]) == ["parse", "render"]
+    render = data["stages"]["render"]
+    assert (render["calls"], render["total_ms"], render["mean_ms"], render["last_ms"], render["max_ms"]) == (
+        4, 24.0, 6.0, 12.0, 12.0)
+    assert (render["p50_ms"], render["p99_ms"]) == (5, 25)
+    assert data["tasks"]["ingest"] == {"runs": 2, "overruns": 1, "late_mean_ms": 20.0, "late_max_ms": 30.0,
+                                       "busy_ms": 6.0, "interval_s": 1.0, "idle_s": None}
+    line = stats.status_line()
+    assert "render 12.0" in line and "rows 505/3 ticks" in line
+    assert "every ingest 1 s, overruns 1" in line
+
+
+def test_dump(tmp_path):
+    path = str(tmp_path / "stats.json")
+    stats = ScanStats(dump_path=path, dump_interval=0)
+    stats.add("parse", 0.001)
+    stats.end_tick(3)
+    with open(path) as fh:
+        assert json.load(fh)["stages"]["parse"]["calls"] == 1
+    other = str(tmp_path / "other.json")
+    stats.dump(other)
+    with open(other) as fh:
+        assert json.load(fh)["rows_total"] == 3
+    ScanStats().dump()
+
+
+@pytest.mark.parametrize("mode, marker", [("cprofile", "cumulative"), ("tracemalloc", "peak")])
+def test_profiler_writes_report_after_ticks(tmp_path, mode, marker):
+    output = tmp_path / f"{mode}.txt"
+    profiler = Profiler(mode, ticks=2, output=str(output))
+    profiler.tick()
+    profiler.start()
+    profiler.tick()
+    assert profiler.active and not output.exists()
+    profiler.tick()
+    assert not profiler.active
+    assert marker in output.read_text()
+
+
+def test_profiler_rejects_unknown_mode():
+    with pytest.raises(ValueError):
+        Profiler("perf")
@@ -0,0 +1,82 @@
+import sqlite3
+
+import pytest
+
+from wifiscan.records import AccessPoint
+from wifiscan.store import SurveyStore
+
+A = "02:00:00:00:00:0A"
+B = "02:00:00:00:00:0B"
+
+
+def access_point(bssid, first_seen, last_seen, essid="office", channel=6, power=-60):
+    return AccessPoint(bssid, first_seen, last_seen, channel=channel, power=power, essid=essid, privacy="WPA2")
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SurveyStore(str(tmp_path / "survey.db"))
+    yield store
+    store.close()
+
+
+def test_upsert_keeps_first_seen_and_advances_last_seen(store):
+    store.start_scan(interface="wlan0mon", started=1000.0)
+    store.record([access_point(A, "2025-03-13 15:00:00", "2025-03-13 15:00:05")], recorded=1001.0)
+    # A later row of the same AP: its first sighting is kept, the rest follows the row.
+    store.record([access_point(A, "2025-03-13 15:01:00", "2025-03-13 15:01:30", essid="lobby", channel=11)],
+                 recorded=1002.0)
+    # An older row (e.g. an archive imported afterwards) moves the first sighting back, not the last one.
+    store.record([access_point(A, "2025-03-13 14:00:00", "2025-03-13 14:00:10")], recorded=1003.0)
+    assert store.first_seen(A) == "2025-03-13 14:00:00"
+    assert store.db.execute("SELECT last_seen FROM access_points WHERE bssid = ?", (A,)).fetchone() == (
+        "2025-03-13 15:01:30",)
+    assert store.first_seen(B) is None
+    assert [row[0] for row in store.history(A)] == [1001.0, 1002.0, 1003.0]
+    assert store.history(A, limit=1) == [(1001.0, "2025-03-13 15:00:05", -60, 0, 6, "office")]
+    assert store.bssids_for_essid("office") == [(A, "2025-03-13 14:00:00", "2025-03-13 15:01:30")]
+
+
+def test_tick_is_one_transaction(store):
+    statements = []
+    store.db.set_trace_callback(statements.append)
+    store.record([access_point(f"02:00:00:00:01:{index:02X}", "2025-03-13 15:00:00", "2025-03-13 15:00:01")
+                  for index in range(50)])
+    # One commit for the scan record() started, one for the 50 APs.
+    assert sum(statement.startswith("COMMIT") for statement in statements) == 2
+    assert len(store.on_channel(6)) == 50
+    # A row that cannot be stored rolls back the whole tick.
+    statements.clear()
+    with pytest.raises(sqlite3.IntegrityError):
+        store.record([access_point(B, "2025-03-13 15:00:00", "2025-03-13 15:00:02"),
+                      access_point(None, "2025-03-13 15:00:00", "2025-03-13 15:00:02")])
+    assert store.first_seen(B) is None
+    assert any(statement.startswith("ROLLBACK") for statement in statements)
+
+
+def test_wal_lets_readers_see_committed_ticks(store):
+    assert store.db.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+    reader = sqlite3.connect(store.path)
+    try:
+        store.record([access_point(A, "2025-03-13 15:00:00", "2025-03-13 15:00:05")])
+        assert reader.execute("SELECT bssid FROM access_points").fetchall() == [(A,)]
+        # Reading while the writer holds a transaction open is not blocked.
+        store.db.execute("BEGIN")
+        store.db.execute("DELETE FROM access_points")
+        assert reader.execute("SELECT count(*) FROM access_points").fetchone() == (1,)
+        store.db.rollback()
+    finally:
+        reader.close()
+
+
+def test_scans(store):
+    first = store.start_scan(interface="wlan0mon", source="airodump-ng", started=1000.0)
+    store.record([access_point(A, "2025-03-13 15:00:00", "2025-03-13 15:00:05")])
+    second = store.start_scan(started=2000.0)
+    store.record([access_point(A, "2025-03-13 16:00:00", "2025-03-13 16:00:05")])
+    store.end_scan(ended=2100.0)
+    assert store.db.execute("SELECT first_scan, last_scan FROM access_points").fetchone() == (first, second)
+    assert store.db.execute("SELECT id, started, ended, interface FROM scans ORDER BY id").fetchall()[1] == (
+        second, 2000.0, 2100.0, None)
+    # Starting the second scan ended the first one.
+    assert store.db.execute("SELECT ended FROM scans WHERE id = ?", (first,)).fetchone()[0] is not None
@@ -0,0 +1,103 @@
+import os
+import sys
+import time
+
+from wifiscan.supervisor import CaptureSupervisor
+from wifiscan.tools import ToolBackend
+
+# Writes scan-01.csv into the directory it is given every 50 ms until terminated.
+WRITER = """
+import os, sys, time
+while True:
+    with open(os.path.join(sys.argv[1], "scan-01.csv"), "w") as fh:
+        fh.write("ok")
+    time.sleep(0.05)
+"""
+
+# Prints an error and exits, like airodump-ng when the adapter is unplugged.
+CRASHER = """
+import sys
+print("wlan0mon: No such device", file=sys.stderr)
+sys.exit(1)
+"""
+
+# Runs without writing anything and ignores SIGTERM.
+HANGER = """
+import signal, time
+signal.signal(signal.SIGTERM, signal.SIG_IGN)
+time.sleep(60)
+"""
+
+
+def supervisor_for(tmp_path, script, **kwargs):
+    tool = tmp_path / "airodump-ng"
+    tool.write_text(f"#!{sys.executable}\n{script}")
+    tool.chmod(0o755)
+    output = tmp_path / "output"
+    output.mkdir()
+    kwargs.setdefault("check_interval", 0.05)
+    kwargs.setdefault("backoff", 0.05)
+    return CaptureSupervisor(ToolBackend(str(tmp_path)), [str(output)], directory=str(output), **kwargs)
+
+
+def wait_for(condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.02)
+
+
+def running(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+def test_stop_terminates_a_healthy_capture(tmp_path):
+    supervisor = supervisor_for(tmp_path, WRITER, stale_after=1.0).start()
+    try:
+        wait_for(lambda: supervisor.state == "running")
+        pid = supervisor.pid
+    finally:
+        supervisor.stop(timeout=10)
+    assert (supervisor.state, supervisor.starts, supervisor.restarts, supervisor.pid) == ("stopped", 1, 0, None)
+    assert not running(pid)
+    assert supervisor.status_line() == "airodump-ng stopped"
+
+
+def test_restarts_with_growing_backoff_after_exits(tmp_path):
+    supervisor = supervisor_for(tmp_path, CRASHER, max_backoff=0.2).start()
+    try:
+        wait_for(lambda: supervisor.restarts >= 4)
+    finally:
+        supervisor.stop(timeout=10)
+    assert supervisor.last_failure == "exited with status 1: wlan0mon: No such device"
+    assert supervisor.starts >= 4
+    assert "restarts (last: exited with status 1: wlan0mon: No such device)" in supervisor.status_line()
+
+
+def test_stalled_capture_is_killed_and_restarted(tmp_path):
+    supervisor = supervisor_for(tmp_path, HANGER, stale_after=0.3, kill_after=0.2, backoff=5.0).start()
+    try:
+        wait_for(lambda: supervisor.pid is not None)
+        pid = supervisor.pid
+        wait_for(lambda: supervisor.restarts == 1)
+        assert supervisor.last_failure.startswith("no output for")
+        # SIGTERM was ignored, so it took a SIGKILL.
+        assert not running(pid)
+        assert supervisor.state == "restarting in 5 s"
+    finally:
+        supervisor.stop(timeout=10)
+    assert supervisor.state == "stopped"
+
+
+def test_missing_tool(tmp_path):
+    supervisor = CaptureSupervisor(ToolBackend(str(tmp_path)), [], directory=str(tmp_path), backoff=0.05).start()
+    try:
+        wait_for(lambda: supervisor.restarts >= 1)
+    finally:
+        supervisor.stop(timeout=10)
+    assert supervisor.starts == 0
+    assert supervisor.last_failure.startswith("cannot start: ")
@@ -0,0 +1,134 @@
+import csv
+import json
+import os
+import subprocess
+import sys
+
+from wifiscan.events import ChangeTracker
+from wifiscan.records import AccessPoint
+from wifiscan.registry import AccessPointRegistry
+from wifiscan.survey import DELTA_COLUMNS, SurveyLimit, SurveyWriter
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+A = "02:00:00:00:00:0A"
+B = "02:00:00:00:00:0B"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def access_point(bssid, second, essid="office", channel=6):
+    return AccessPoint(bssid, last_seen=f"2025-03-13 15:00:{second:02d}", channel=channel, essid=essid)
+
+
+def test_csv_deltas_with_commas_in_essids(tmp_path):
+    path = str(tmp_path / "survey.csv")
+    tracker = ChangeTracker(age_out=10)
+    writer = tracker.subscribe(SurveyWriter(path, "csv"))
+    tracker.update([access_point(A, 0, 'Office, "2nd" floor'), access_point(B, 1)])
+    tracker.update([access_point(A, 2, 'Office, "2nd" floor', channel=11)])
+    tracker.expire(tracker.now + 20)
+    writer.close()
+    with open(path, newline="", encoding="utf-8") as fh:
+        rows = list(csv.DictReader(fh))
+    assert [(row["event"], row["bssid"]) for row in rows] == [
+        ("appeared", A), ("appeared", B), ("updated", A), ("disappeared", B), ("disappeared", A)]
+    assert rows[0]["essid"] == 'Office, "2nd" floor'
+    assert (rows[2]["channel"], rows[2]["changed"]) == ("11", "channel")
+    assert list(rows[0]) == list(DELTA_COLUMNS)
+
+
+def test_appending_keeps_one_header(tmp_path):
+    path = str(tmp_path / "survey.csv")
+    for second in (0, 1):
+        tracker = ChangeTracker()
+        writer = tracker.subscribe(SurveyWriter(path, "csv"))
+        tracker.update([access_point(A, second)])
+        writer.close()
+    with open(path, encoding="utf-8") as fh:
+        lines = fh.read().splitlines()
+    assert len(lines) == 3 and lines[0].startswith("event,")
+
+
+def test_buffer_is_bounded(tmp_path):
+    path = str(tmp_path / "survey.jsonl")
+    tracker = ChangeTracker()
+    writer = tracker.subscribe(SurveyWriter(path, buffer_lines=4))
+    tracker.update([access_point(f"02:00:00:00:01:{index:02X}", 0) for index in range(10)])
+    # 10 events of one tick: written 4, 4, then the remaining 2 at the end of the tick.
+    assert (writer.written, writer.writes) == (10, 3)
+    writer.close()
+    with open(path, encoding="utf-8") as fh:
+        assert [json.loads(line)["event"] for line in fh] == ["appeared"] * 10
+
+
+def test_snapshots(tmp_path):
+    path = str(tmp_path / "survey.jsonl")
+    registry = AccessPointRegistry()
+    registry.update_many([access_point(A, 0), access_point(B, 1, "lobby")])
+    writer = SurveyWriter(path, emit="snapshots")
+    writer([])
+    writer.snapshot(registry, 1.0)
+    registry.upsert(access_point(A, 2, channel=11))
+    writer.snapshot(registry, 2.0)
+    writer.close()
+    with open(path, encoding="utf-8") as fh:
+        rows = [json.loads(line) for line in fh]
+    assert [(row["time"], row["bssid"], row["channel"]) for row in rows] == [
+        (1.0, A, 6), (1.0, B, 6), (2.0, A, 11), (2.0, B, 6)]
+
+
+def test_limit_duration_and_stable():
+    clock = FakeClock()
+    tracker = ChangeTracker(age_out=5)
+    limit = tracker.subscribe(SurveyLimit(duration=60, stable_for=10, clock=clock))
+    tracker.update([access_point(A, 0)])
+    clock.now += 8
+    tracker.update([access_point(B, 8)])
+    assert (limit.reached(), limit.next_check()) == (None, 10)
+    # A ages out and comes back: not a new AP.
+    tracker.update([access_point(B, 20)])
+    clock.now += 5
+    tracker.update([access_point(A, 21)])
+    clock.now += 5
+    assert limit.reached() == "stable"
+    assert SurveyLimit(duration=60, clock=clock).reached() is None
+    clock.now += 60
+    assert SurveyLimit(duration=60, stable_for=10, clock=clock).next_check() == 10
+
+
+def test_headless_survey_with_stand_in_tools(tmp_path):
+    output = tmp_path / "survey" / "aps.jsonl"
+    output.parent.mkdir()
+    scan_dir = tmp_path / "scan"
+    scan_dir.mkdir()
+    result = subprocess.run(
+        [sys.executable, os.path.join(ROOT, "dos-wifi.py"), "--tools", os.path.join(ROOT, "benchmarks", "fake-tools"),
+         "--headless", "--interface", "wlan0", "--duration", "2", "--output", str(output)],
+        cwd=scan_dir, stdin=subprocess.DEVNULL, capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    # No prompt, no table and nothing but the survey on stdout.
+    assert result.stdout == ""
+    assert "Survey finished (--duration reached)" in result.stderr
+    with open(output, encoding="utf-8") as fh:
+        events = [json.loads(line) for line in fh]
+    assert events and events[0]["event"] == "appeared"
+
+
+def test_headless_survey_ages_out_when_airodump_stops_writing(tmp_path):
+    output = tmp_path / "aps.jsonl"
+    env = dict(os.environ, FAKE_AIRODUMP_APS="5", FAKE_AIRODUMP_CHURN="1", FAKE_AIRODUMP_STALL="1")
+    result = subprocess.run(
+        [sys.executable, os.path.join(ROOT, "dos-wifi.py"), "--tools", os.path.join(ROOT, "benchmarks", "fake-tools"),
+         "--headless", "--interface", "wlan0", "--duration", "5", "--age-out", "2", "--output", str(output)],
+        cwd=tmp_path, env=env, stdin=subprocess.DEVNULL, capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    with open(output, encoding="utf-8") as fh:
+        events = [json.loads(line) for line in fh]
+    # No rows come in after the first second, yet every AP is reported gone.
+    assert len({event["bssid"] for event in events if event["event"] == "disappeared"}) == 5
@@ -0,0 +1,43 @@
+import subprocess
+import sys
+
+from wifiscan.tools import TOOLS_ENVIRONMENT_VARIABLE, ToolBackend
+
+
+def test_real_tools_go_through_sudo():
+    tools = ToolBackend()
+    assert (tools.simulated, tools.needs_root, tools.sysfs_root) == (False, True, "/sys")
+    assert tools.command("airmon-ng", "check", "kill", root=True) == ["sudo", "airmon-ng", "check", "kill"]
+    assert tools.command("iwconfig") == ["iwconfig"]
+
+
+def test_stand_ins_run_from_their_directory(monkeypatch, tmp_path):
+    tools = ToolBackend(str(tmp_path))
+    assert (tools.simulated, tools.needs_root, tools.sysfs_root) == (True, False, str(tmp_path / "sys"))
+    assert tools.command("airodump-ng", "-w", "file", "wlan0mon", root=True) == [
+        str(tmp_path / "airodump-ng"), "-w", "file", "wlan0mon"]
+    # A relative directory is resolved once, so changing directory later does not lose the tools.
+    monkeypatch.chdir(tmp_path)
+    assert ToolBackend(".").directory == str(tmp_path)
+
+
+def test_run_and_popen(tmp_path):
+    script = tmp_path / "airmon-ng"
+    script.write_text(f"#!{sys.executable}\nimport sys\nprint(' '.join(sys.argv[1:]))\n")
+    script.chmod(0o755)
+    tools = ToolBackend(str(tmp_path))
+    result = tools.run("airmon-ng", "check", "kill", root=True, capture_output=True, text=True)
+    assert (result.returncode, result.stdout) == (0, "check kill\n")
+    process = tools.popen("airmon-ng", "start", "wlan0", stdout=subprocess.PIPE, text=True)
+    assert process.communicate(timeout=10)[0] == "start wlan0\n"
+
+
+def test_from_environment(monkeypatch, tmp_path):
+    monkeypatch.delenv(TOOLS_ENVIRONMENT_VARIABLE, raising=False)
+    assert not ToolBackend.from_environment().simulated
+    monkeypatch.setenv(TOOLS_ENVIRONMENT_VARIABLE, str(tmp_path))
+    assert ToolBackend.from_environment().directory == str(tmp_path)
+    # An explicit directory (--tools) wins over the environment.
+    assert ToolBackend.from_environment(str(tmp_path / "other")).directory == str(tmp_path / "other")
+    monkeypatch.setenv(TOOLS_ENVIRONMENT_VARIABLE, "")
+    assert not ToolBackend.from_environment().simulated
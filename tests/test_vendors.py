@@ -0,0 +1,75 @@
+from wifiscan.vendors import BUNDLED_PATH, PRIVATE, SYSTEM_PATHS, VendorIndex, parse_oui, short_name
+
+IEEE = """\
+OUI/MA-L                                                    Organization
+company_id                                                  Organization
+                                                            Address
+
+00-00-0C   (hex)\t\tCisco Systems, Inc
+00000C     (base 16)\t\tCisco Systems, Inc
+\t\t\t\t170 West Tasman Dr.
+
+F4-F2-6D   (hex)\t\tTP-LINK TECHNOLOGIES CO.,LTD.
+00-09-5B   (hex)\t\tNETGEAR
+00-0F-B5   (hex)\t\tNETGEAR
+"""
+
+MANUF = """\
+# Wireshark manuf
+00:00:0C\tCisco\tCisco Systems, Inc
+00:1B:C5:00:00:00/36\tConvergi\tConverging Systems Inc.
+F4:F2:6D\tTp-LinkT
+"""
+
+
+def test_parse_both_formats():
+    assert parse_oui(IEEE) == {0x00000C: "Cisco Systems, Inc", 0xF4F26D: "TP-LINK TECHNOLOGIES CO.,LTD.",
+                               0x00095B: "NETGEAR", 0x000FB5: "NETGEAR"}
+    # The full name when manuf has one; 36-bit prefixes are skipped.
+    assert parse_oui(MANUF) == {0x00000C: "Cisco Systems, Inc", 0xF4F26D: "Tp-LinkT"}
+
+
+def test_short_name():
+    assert short_name("TP-LINK TECHNOLOGIES CO.,LTD.") == "TP-LINK"
+    assert short_name("Cisco Systems, Inc") == "Cisco"
+    assert short_name("AVM GmbH") == "AVM"
+    assert short_name("NETGEAR") == "NETGEAR"
+
+
+def test_lookup(tmp_path):
+    path = tmp_path / "oui.txt"
+    path.write_text(IEEE)
+    vendors = VendorIndex(str(path))
+    assert vendors.lookup("F4:F2:6D:01:02:03") == "TP-LINK"
+    assert vendors.lookup("f4:f2:6d:01:02:03") == "TP-LINK"
+    assert vendors.lookup("00:09:5B:00:00:01") == vendors.lookup("00:0F:B5:00:00:01") == "NETGEAR"
+    assert vendors.lookup("00:00:0D:00:00:01") is None
+    # Locally administered addresses have no vendor, whatever the file says.
+    assert vendors.lookup("02:00:0C:00:00:01") == vendors.lookup("DA:A1:19:00:00:01") == PRIVATE
+    assert vendors.lookup("not a mac") is vendors.lookup("") is None
+    assert VendorIndex(str(path), short=False).lookup("F4:F2:6D:01:02:03") == "TP-LINK TECHNOLOGIES CO.,LTD."
+    assert (vendors.source, vendors.error, len(vendors)) == (str(path), None, 4)
+    assert vendors.nbytes() == 4 * 4 * 2
+
+
+def test_loaded_on_first_lookup_and_memoized(tmp_path):
+    path = tmp_path / "oui.txt"
+    path.write_text(IEEE)
+    vendors = VendorIndex(str(path), cache_size=2)
+    assert vendors.source is None
+    vendors.lookup("00:00:0C:00:00:01")
+    vendors.lookup("00:00:0C:00:00:01")
+    assert vendors.source == str(path)
+    assert (vendors.lookup.cache_info().hits, vendors.lookup.cache_info().currsize) == (1, 1)
+    for index in range(10):
+        vendors.lookup(f"00:00:0C:00:00:{index:02X}")
+    assert vendors.lookup.cache_info().currsize == 2
+    preloaded = VendorIndex(str(path)).preload()
+    assert preloaded.lookup("00:09:5B:00:00:01") == "NETGEAR"
+
+
+def test_unreadable_path_falls_back(tmp_path):
+    vendors = VendorIndex(str(tmp_path / "missing.txt"))
+    assert vendors.lookup("00:00:0C:00:00:01") == "Cisco"
+    assert isinstance(vendors.error, FileNotFoundError)
+    assert vendors.source in (*SYSTEM_PATHS, BUNDLED_PATH)
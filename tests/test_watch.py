@@ -0,0 +1,72 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from wifiscan.watch import InotifyWatcher, PollingWatcher
+
+WRITER = """
+import sys, time
+time.sleep(float(sys.argv[2]))
+with open(sys.argv[1], "w") as fh:
+    fh.write("BSSID, First time seen\\n")
+"""
+
+
+def make_inotify(directory):
+    try:
+        return InotifyWatcher(str(directory))
+    except (OSError, AttributeError):
+        pytest.skip("inotify is not available")
+
+
+def make_polling(directory):
+    return PollingWatcher(str(directory), interval=0.02)
+
+
+@pytest.fixture(params=[make_inotify, make_polling], ids=["inotify", "polling"])
+def watcher(request, tmp_path):
+    with request.param(tmp_path) as watcher:
+        yield watcher
+
+
+def start_writer(path, delay=0.1):
+    return subprocess.Popen([sys.executable, "-c", WRITER, str(path), str(delay)])
+
+
+def test_wait_returns_true_when_a_writer_process_writes(watcher, tmp_path):
+    writer = start_writer(tmp_path / "file-01.csv")
+    try:
+        start = time.monotonic()
+        assert watcher.wait(timeout=5) is True
+        assert time.monotonic() - start < 4
+        assert watcher.wakeups == 1
+    finally:
+        writer.wait()
+
+
+def test_wait_ignores_other_files(watcher, tmp_path):
+    writer = start_writer(tmp_path / "notes.txt", delay=0)
+    writer.wait()
+    assert watcher.wait(timeout=0.3) is False
+
+
+def test_wait_returns_false_on_timeout(watcher):
+    start = time.monotonic()
+    assert watcher.wait(timeout=0.2) is False
+    assert 0.15 <= time.monotonic() - start < 2
+
+
+def test_wait_returns_false_when_a_wake_fd_is_readable(watcher):
+    read_fd, write_fd = os.pipe()
+    try:
+        os.write(write_fd, b"q")
+        start = time.monotonic()
+        assert watcher.wait(timeout=5, wake_fds=(read_fd,)) is False
+        assert time.monotonic() - start < 1
+        assert watcher.wakeups == 0
+    finally:
+        os.close(read_fd)
+        os.close(write_fd)
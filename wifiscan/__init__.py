@@ -0,0 +1,12 @@
+"""
+Helper modules for the scanning side of dos-wifi.py.
+
+The main script stays a single top-to-bottom walkthrough; the pieces that grew
+too large to explain inline (reading airodump-ng output, keeping track of the
+networks that were seen, drawing the table) live here instead.
+"""
+
+from wifiscan.airodump import ParsedCsv, parse_csv
+from wifiscan.ingest import AP_FIELDNAMES, CsvIngestor, read_access_points
+from wifiscan.records import AccessPoint, Station
+from wifiscan.registry import AccessPointRegistry
@@ -0,0 +1,220 @@
+"""
+A parser for the CSV files airodump-ng writes.
+
+They look like CSV but are not: airodump-ng writes every field as it is,
+without quoting, separated by ", ". csv.reader (and the csv.DictReader the
+script started with) therefore cuts an ESSID containing a comma into two
+columns and shifts the Key into the wrong place, treats a quote at the start
+of an ESSID as the start of a quoted field that swallows the rest of the
+line, and splits a row at a newline inside an ESSID. The column layout is
+fixed, though, which is enough to parse it exactly:
+
+- an access point row has 13 columns without commas (BSSID to ID-length),
+  then the ESSID, then the Key, which has no commas either. Splitting at the
+  first 13 commas and at the last one leaves the ESSID intact, whatever it
+  contains;
+- a station row has 6 columns, then the probed ESSIDs;
+- every row starts with a MAC address (and the two headers with "BSSID" and
+  "Station MAC"), so a line that starts with anything else is the rest of an
+  ESSID that contained a newline, and is joined back to the row before it.
+  Lines are split at "\\n" only, not at the other characters str.splitlines()
+  treats as line breaks, which can appear in ESSIDs too.
+
+Most columns take few distinct values (channels, powers, "WPA2", "CCMP",
+...), so each distinct text of a number or label column is converted once
+and then looked up in a dict, and a row costs one split and a handful of
+dict lookups.
+
+airodump-ng rewrites the file in place on every --write-interval, so it can
+be read halfway through a write. The last line of such a file has no
+terminating newline; it is reported as torn and left out. Rows that do not
+have the columns of their section or whose BSSID and times are malformed are
+counted as rejected instead of being turned into bogus records.
+
+parse_csv() parses a whole file (both sections, in one pass over its lines);
+CsvIngestor (wifiscan/ingest.py) uses join_rows() and parse_ap_line() on the
+lines that changed. Run benchmarks/parser.py to compare it with csv.DictReader
+and csv.reader.
+"""
+
+import sys
+
+from wifiscan.records import AccessPoint, Station, _to_int
+
+AP_HEADER = "BSSID"
+STATION_HEADER = "Station MAC"
+
+_intern = sys.intern
+
+
+class _Numbers(dict):
+    """Raw (padded) number column -> int, converted once per distinct text."""
+
+    def __init__(self, default):
+        super().__init__()
+        self.default = default
+
+    def __missing__(self, raw):
+        if len(self) > 65536:
+            self.clear()
+        value = self[raw] = _to_int(raw.strip(), self.default)
+        return value
+
+
+# Channel, Speed and Power (-1 when missing); # beacons, # IV and ID-length (0).
+_numbers = _Numbers(-1)
+_counts = _Numbers(0)
+# Raw Privacy/Cipher/Authentication columns (with their padding) -> the stripped, interned value.
+_labels = {}
+
+
+def _is_row_start(line):
+    """True for lines starting with a MAC address ("00:11:22:33:44:55,")."""
+    return len(line) > 17 and line[17] == "," and line[2] == ":" and line[14] == ":"
+
+
+def _is_time(text):
+    return len(text) == 19 and text[4] == "-" and text[13] == ":"
+
+
+def _label(raw):
+    value = _labels.get(raw)
+    if value is None:
+        if len(_labels) > 1024:
+            _labels.clear()
+        value = _labels[raw] = _intern(raw.strip())
+    return value
+
+
+def join_rows(lines):
+    """
+    Yields the rows made of the given lines (split at "\\n"; a trailing "\\r"
+    is left on, parse_ap_line() and parse_station_line() ignore it). A line
+    that does not start with a MAC address or a header continues the row
+    before it, which had an ESSID with a newline in it. Blank lines are
+    skipped.
+    """
+    row = None
+    # Whether row is a data row (which a continuation line can belong to) rather than a header.
+    data = False
+    for line in lines:
+        if _is_row_start(line):
+            if row is not None:
+                yield row
+            row, data = line, True
+        elif line.startswith(AP_HEADER) or line.startswith(STATION_HEADER):
+            if row is not None:
+                yield row
+            row, data = line, False
+        elif data and line and line != "\r":
+            row = (row[:-1] if row.endswith("\r") else row) + "\n" + line
+        else:
+            # A blank line ends the row; any other text is not something airodump-ng writes,
+            # and is passed on as a row of its own to be rejected.
+            if row is not None:
+                yield row
+            row, data = (line if line.strip() else None), False
+    if row is not None:
+        yield row
+
+
+def parse_ap_line(line):
+    """An AccessPoint from one row of the access point section, or None if the row is malformed."""
+    parts = line.split(",", 13)
+    if len(parts) < 14:
+        return None
+    essid, comma, key = parts[13].rpartition(",")
+    bssid = parts[0]
+    # Times are written as " 2025-03-16 05:00:00".
+    first_seen = parts[1][1:]
+    last_seen = parts[2][1:]
+    if len(first_seen) != 19 or len(last_seen) != 19:
+        first_seen = parts[1].strip()
+        last_seen = parts[2].strip()
+    if not comma or len(bssid) != 17 or first_seen[4:5] != "-" or last_seen[4:5] != "-":
+        return None
+    numbers, counts, labels = _numbers, _counts, _labels
+    return AccessPoint(
+        bssid,
+        first_seen,
+        last_seen,
+        numbers[parts[3]],
+        numbers[parts[4]],
+        labels.get(parts[5]) or _label(parts[5]),
+        labels.get(parts[6]) or _label(parts[6]),
+        labels.get(parts[7]) or _label(parts[7]),
+        numbers[parts[8]],
+        counts[parts[9]],
+        counts[parts[10]],
+        parts[11].replace(" ", ""),
+        counts[parts[12]],
+        essid[1:] if essid[:1] == " " else essid,
+        key.strip(),
+    )
+
+
+def parse_station_line(line):
+    """A Station from one row of the station section, or None if the row is malformed."""
+    parts = line.split(",", 6)
+    if len(parts) < 6:
+        return None
+    first_seen = parts[1].strip()
+    last_seen = parts[2].strip()
+    if len(parts[0]) != 17 or not _is_time(first_seen) or not _is_time(last_seen):
+        return None
+    bssid = parts[5].strip()
+    # "(not associated)".
+    if not bssid or bssid[0] == "(":
+        bssid = None
+    probed = ()
+    if len(parts) == 7 and parts[6].strip():
+        probed = tuple(_intern(essid.strip()) for essid in parts[6].split(",") if essid.strip())
+    return Station(parts[0], first_seen, last_seen, _numbers[parts[3]], _counts[parts[4]], bssid, probed)
+
+
+class ParsedCsv:
+    """The result of parse_csv()."""
+
+    __slots__ = ("aps", "stations", "rejected", "torn")
+
+    def __init__(self):
+        self.aps = []
+        self.stations = []
+        # Rows that did not parse, and whether the last line was cut off.
+        self.rejected = 0
+        self.torn = False
+
+    def __repr__(self):
+        return f"ParsedCsv({len(self.aps)} APs, {len(self.stations)} stations, rejected={self.rejected}, torn={self.torn})"
+
+
+def parse_csv(data, stations=True):
+    """
+    Parses the text (str, or bytes decoded as UTF-8) of an airodump-ng CSV
+    file. With stations=False, stops at the station section.
+    """
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        data = bytes(data).decode(errors="replace")
+    result = ParsedCsv()
+    lines = data.split("\n")
+    # A file that does not end with a newline was read in the middle of a write.
+    if lines[-1]:
+        result.torn = True
+    lines.pop()
+    parse = parse_ap_line
+    records = result.aps
+    for row in join_rows(lines):
+        if row.startswith(AP_HEADER):
+            continue
+        if row.startswith(STATION_HEADER):
+            if not stations:
+                break
+            parse = parse_station_line
+            records = result.stations
+            continue
+        record = parse(row)
+        if record is None:
+            result.rejected += 1
+        else:
+            records.append(record)
+    return result
@@ -0,0 +1,247 @@
+"""
+Analyzing the archived scans in backup/ in parallel.
+
+Every run of dos-wifi.py moves the CSV files of the previous one into backup/
+under a timestamped name, so after a few months of surveys there are
+thousands of them and nothing that reads them together. analyze() does, and
+produces one BssidHistory per BSSID across the whole archive:
+
+- first and last sighting (the earliest First time seen and the latest Last
+  time seen of any file);
+- the number of files it appears in, its latest ESSID and its strongest
+  Power reading;
+- its channel over time, as a list of (time, channel) runs: a new entry
+  only when the channel differs from the previous file's, so
+  channel_changes counts the moves.
+
+Parsing is the expensive part and every file is independent, so the files
+(in name order, which is time order for the timestamped names) are cut into
+contiguous chunks and handed to a ProcessPoolExecutor. Each worker parses
+its chunk with parse_csv() (wifiscan/airodump.py) and aggregates it into
+partial histories itself, so what comes back is one small entry per BSSID
+per chunk rather than every row. The chunks are merged in order: first and
+last sightings by min/max, and the channel runs of a chunk appended to
+those of the chunks before it, dropping a first run that only repeats the
+last channel. The result is the same for any number of workers, and the work
+done in the parent grows with the number of BSSIDs, not rows, which keeps
+the speed-up close to the number of cores.
+
+Usage:
+    python3 -m wifiscan.batch backup/ [--workers N] [--output histories.jsonl]
+"""
+
+import argparse
+import concurrent.futures
+import json
+import os
+import sys
+import time
+
+from wifiscan.airodump import parse_csv
+
+# Positions in the lists the workers send back (cheaper to pickle than objects).
+_FIRST, _LAST, _FILES, _ESSID, _POWER, _CHANNELS = range(6)
+
+
+class BssidHistory:
+    """One BSSID across the archive. Times are as airodump-ng writes them ("2025-03-16 05:00:00")."""
+
+    __slots__ = ("bssid", "first_seen", "last_seen", "files", "essid", "best_power", "channels")
+
+    def __init__(self, bssid, first_seen, last_seen, files, essid, best_power, channels):
+        self.bssid = bssid
+        self.first_seen = first_seen
+        self.last_seen = last_seen
+        self.files = files
+        self.essid = essid
+        # -1 when no file had a Power reading for it.
+        self.best_power = best_power
+        # [(time, channel)], a new entry each time the channel changed.
+        self.channels = channels
+
+    @property
+    def channel_changes(self):
+        return max(0, len(self.channels) - 1)
+
+    def as_dict(self):
+        return {"bssid": self.bssid, "essid": self.essid, "first_seen": self.first_seen, "last_seen": self.last_seen,
+                "files": self.files, "best_power": self.best_power, "channels": [list(run) for run in self.channels]}
+
+    def __repr__(self):
+        return f"BssidHistory({self.bssid!r}, files={self.files}, channel_changes={self.channel_changes})"
+
+
+class BatchResult:
+    """The histories produced by analyze(), with what it took to produce them."""
+
+    def __init__(self, histories, files, rows, rejected, unreadable, elapsed, workers):
+        # BSSID -> BssidHistory.
+        self.histories = histories
+        self.files = files
+        self.rows = rows
+        self.rejected = rejected
+        # Paths that could not be read.
+        self.unreadable = unreadable
+        self.elapsed = elapsed
+        self.workers = workers
+
+    @property
+    def files_per_second(self):
+        return self.files / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.elapsed if self.elapsed else 0.0
+
+    def describe(self):
+        moved = sum(1 for history in self.histories.values() if history.channel_changes)
+        return (f"{self.files} files, {self.rows} rows, {len(self.histories)} BSSIDs ({moved} changed channel) "
+                f"in {self.elapsed:.2f} s with {self.workers} workers: {self.files_per_second:.0f} files/s, "
+                f"{self.rows_per_second:.0f} rows/s")
+
+
+def archive_files(paths):
+    """The .csv files in the given files and directories, in name order."""
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            found.extend(os.path.join(path, name) for name in os.listdir(path) if ".csv" in name)
+        else:
+            found.append(path)
+    return sorted(found, key=os.path.basename)
+
+
+def _analyze_chunk(paths):
+    """Parses a chunk of files (in time order) into partial histories; runs in a worker."""
+    partial = {}
+    rows = rejected = 0
+    unreadable = []
+    for path in paths:
+        try:
+            with open(path, "rb") as fh:
+                parsed = parse_csv(fh.read(), stations=False)
+        except OSError:
+            unreadable.append(path)
+            continue
+        rows += len(parsed.aps)
+        rejected += parsed.rejected
+        for ap in parsed.aps:
+            entry = partial.get(ap.bssid)
+            channel = ap.channel
+            if entry is None:
+                partial[ap.bssid] = [ap.first_seen, ap.last_seen, 1, ap.essid, ap.power,
+                                     [(ap.last_seen, channel)] if channel > 0 else []]
+                continue
+            if ap.first_seen < entry[_FIRST]:
+                entry[_FIRST] = ap.first_seen
+            if ap.last_seen >= entry[_LAST]:
+                entry[_LAST] = ap.last_seen
+                entry[_ESSID] = ap.essid
+            entry[_FILES] += 1
+            if ap.power != -1 and (entry[_POWER] == -1 or ap.power > entry[_POWER]):
+                entry[_POWER] = ap.power
+            runs = entry[_CHANNELS]
+            if channel > 0 and (not runs or runs[-1][1] != channel):
+                runs.append((ap.last_seen, channel))
+    return partial, len(paths) - len(unreadable), rows, rejected, unreadable
+
+
+def _merge(merged, partial):
+    """Adds the partial histories of a chunk to those of the chunks before it."""
+    for bssid, entry in partial.items():
+        known = merged.get(bssid)
+        if known is None:
+            merged[bssid] = entry
+            continue
+        if entry[_FIRST] < known[_FIRST]:
+            known[_FIRST] = entry[_FIRST]
+        if entry[_LAST] >= known[_LAST]:
+            known[_LAST] = entry[_LAST]
+            known[_ESSID] = entry[_ESSID]
+        known[_FILES] += entry[_FILES]
+        if entry[_POWER] != -1 and (known[_POWER] == -1 or entry[_POWER] > known[_POWER]):
+            known[_POWER] = entry[_POWER]
+        runs, more = known[_CHANNELS], entry[_CHANNELS]
+        if more and runs and runs[-1][1] == more[0][1]:
+            more = more[1:]
+        runs.extend(more)
+
+
+def analyze(paths, workers=None, chunks_per_worker=4):
+    """
+    Analyzes the archived CSV files in paths (files or directories) and
+    returns a BatchResult. workers defaults to the number of CPUs; with 1,
+    everything runs in this process.
+    """
+    start = time.perf_counter()
+    files = archive_files(paths)
+    workers = max(1, workers or os.cpu_count() or 1)
+    merged = {}
+    totals = [0, 0, 0]
+    unreadable = []
+
+    def add(result):
+        partial, read, rows, rejected, failed = result
+        _merge(merged, partial)
+        totals[0] += read
+        totals[1] += rows
+        totals[2] += rejected
+        unreadable.extend(failed)
+
+    if workers == 1 or len(files) < 2:
+        add(_analyze_chunk(files))
+    else:
+        count = min(len(files), workers * chunks_per_worker)
+        size, extra = divmod(len(files), count)
+        chunks, position = [], 0
+        for index in range(count):
+            end = position + size + (index < extra)
+            chunks.append(files[position:end])
+            position = end
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+            # map() yields in submission order, which keeps the merge in time order.
+            for result in pool.map(_analyze_chunk, chunks):
+                add(result)
+
+    histories = {bssid: BssidHistory(bssid, *entry) for bssid, entry in merged.items()}
+    return BatchResult(histories, totals[0], totals[1], totals[2], unreadable, time.perf_counter() - start, workers)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python3 -m wifiscan.batch", description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("paths", nargs="+", metavar="path", help="archived CSV files, or directories of them (e.g. backup/)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--output", metavar="PATH", help="write one JSON object per BSSID to PATH ('-' for stdout)")
+    parser.add_argument("--top", type=int, default=10, metavar="N", help="list the N BSSIDs that changed channel most (default 10)")
+    args = parser.parse_args(argv)
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+    for path in args.paths:
+        if not os.path.exists(path):
+            parser.error(f"no such file or directory: {path}")
+
+    result = analyze(args.paths, workers=args.workers)
+    if args.output:
+        out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+        try:
+            for history in result.histories.values():
+                out.write(json.dumps(history.as_dict(), ensure_ascii=False) + "\n")
+        finally:
+            if out is not sys.stdout:
+                out.close()
+    if args.output != "-":
+        movers = sorted(result.histories.values(), key=lambda history: history.channel_changes, reverse=True)
+        for history in movers[:args.top]:
+            if not history.channel_changes:
+                break
+            channels = " -> ".join(str(channel) for _time, channel in history.channels)
+            print(f"{history.bssid}  {history.essid!r}: {history.channel_changes} channel changes ({channels}), "
+                  f"seen {history.first_seen} to {history.last_seen} in {history.files} files")
+    for path in result.unreadable:
+        print(f"could not read {path}", file=sys.stderr)
+    print(result.describe(), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+"""
+How crowded each channel is.
+
+The table lists every AP with its channel, but choosing a channel means
+adding up, by hand, how many networks share or overlap each one and how loud
+they are. ChannelOccupancy keeps the registry in columnar form, one array
+per field (channel, power, beacons, last seen, and the power converted to
+milliwatts), indexed by the order in which the APs were first seen and
+updated from the APs that changed in each tick. analyze() then works out, per
+channel:
+
+- the number of APs on it;
+- its congestion: the sum of the power (in mW) of every AP whose signal
+  reaches it. In the 2.4 GHz band a channel is 22 MHz wide but channels are
+  only 5 MHz apart, so an AP on channel n also covers n-4 .. n+4, weighted by
+  how much of the 22 MHz the two channels share (1, 0.77, 0.55, 0.32, 0.09).
+  5 GHz channels do not overlap;
+
+and recommends the least congested of channels 1, 6 and 11 and of the
+non-DFS 5 GHz channels.
+
+With NumPy installed, analyze() runs over zero-copy views of the columns:
+one bincount per band and a small matrix product for the 2.4 GHz overlap,
+so it stays well under a millisecond with tens of thousands of APs. Without
+NumPy the per-channel sums are kept up to date as APs change instead, and
+analyze() only walks the channels. Either way it can run on every tick.
+
+APs with an unknown channel or power (airodump-ng reports -1) are counted but
+do not add to the congestion.
+"""
+
+import math
+from array import array
+
+from wifiscan.records import parse_time
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+MAX_CHANNEL = 200
+CHANNELS_24 = tuple(range(1, 15))
+CANDIDATES_24 = (1, 6, 11)
+CANDIDATES_5 = (36, 40, 44, 48, 149, 153, 157, 161, 165)
+CHANNEL_WIDTH_24_MHZ = 22
+CHANNEL_SPACING_24_MHZ = 5
+# Congestion sums of the fallback path are kept in whole femtowatts, so that
+# adding and removing APs millions of times cannot drift.
+_FEMTOWATTS_PER_MW = 10 ** 12
+
+
+def overlap_24(distance):
+    """Fraction of a 2.4 GHz channel shared with one `distance` channels away."""
+    return max(0.0, 1 - abs(distance) * CHANNEL_SPACING_24_MHZ / CHANNEL_WIDTH_24_MHZ)
+
+
+def power_mw(power):
+    """Power in milliwatts for a reading in dBm; 0 for an unknown reading (-1)."""
+    if not -150 < power < -1:
+        return 0.0
+    return 10 ** (power / 10)
+
+
+class ChannelAnalysis:
+    """The result of ChannelOccupancy.analyze()."""
+
+    __slots__ = ("counts", "congestion", "recommended_24", "recommended_5", "aps")
+
+    def __init__(self, counts, congestion, recommended_24, recommended_5, aps):
+        self.counts = counts
+        self.congestion = congestion
+        self.recommended_24 = recommended_24
+        self.recommended_5 = recommended_5
+        self.aps = aps
+
+    def busiest(self, count=3):
+        """The `count` channels with the most APs, as (channel, APs)."""
+        return sorted(self.counts.items(), key=lambda item: (-item[1], item[0]))[:count]
+
+    def describe(self):
+        """One line for the bottom of the scan table."""
+        if not self.aps:
+            return "Channels: no APs yet"
+        busiest = ", ".join(f"ch{channel} {count}" for channel, count in self.busiest())
+        parts = [f"Busiest: {busiest}"]
+        if self.recommended_24 is not None:
+            parts.append(f"best 2.4 GHz: ch{self.recommended_24} ({_dbm(self.congestion.get(self.recommended_24, 0.0))})")
+        if self.recommended_5 is not None:
+            parts.append(f"best 5 GHz: ch{self.recommended_5} ({_dbm(self.congestion.get(self.recommended_5, 0.0))})")
+        return " | ".join(parts)
+
+
+def _dbm(milliwatts):
+    return f"{10 * math.log10(milliwatts):.0f} dBm" if milliwatts > 0 else "clear"
+
+
+class ChannelOccupancy:
+    """
+    Columnar copy of the registry for channel analysis. Call update() with the
+    APs that changed in each tick and analyze() whenever the numbers are needed.
+    """
+
+    def __init__(self, use_numpy=None):
+        self.use_numpy = numpy is not None if use_numpy is None else use_numpy
+        if self.use_numpy and numpy is None:
+            raise RuntimeError("NumPy is not installed")
+        self._slots = {}
+        self.channel = array("h")
+        self.power = array("h")
+        self.beacons = array("q")
+        self.last_seen = array("d")
+        self.weight = array("d")
+        # Kept up to date for the pure Python path.
+        self._counts = [0] * (MAX_CHANNEL + 1)
+        self._sums = [0] * (MAX_CHANNEL + 1)
+        if self.use_numpy:
+            # Row and column 0 hold the APs with an unknown channel, which overlap nothing.
+            self._overlap = numpy.array([[overlap_24(a - b) if a and b else 0.0 for b in range(15)] for a in range(15)])
+
+    def __len__(self):
+        return len(self._slots)
+
+    def update(self, aps):
+        for ap in aps:
+            channel = ap.channel if 0 < ap.channel <= MAX_CHANNEL else 0
+            weight = power_mw(ap.power)
+            slot = self._slots.get(ap.bssid)
+            if slot is None:
+                slot = self._slots[ap.bssid] = len(self.channel)
+                self.channel.append(channel)
+                self.power.append(ap.power)
+                self.beacons.append(ap.beacons)
+                self.last_seen.append(parse_time(ap.last_seen))
+                self.weight.append(weight)
+            else:
+                old = self.channel[slot]
+                self._counts[old] -= 1
+                self._sums[old] -= round(self.weight[slot] * _FEMTOWATTS_PER_MW)
+                self.channel[slot] = channel
+                self.power[slot] = ap.power
+                self.beacons[slot] = ap.beacons
+                self.last_seen[slot] = parse_time(ap.last_seen)
+                self.weight[slot] = weight
+            self._counts[channel] += 1
+            self._sums[channel] += round(weight * _FEMTOWATTS_PER_MW)
+
+    def analyze(self, max_age=None):
+        """
+        Per-channel AP counts and congestion, and the recommended channels.
+        With max_age (seconds), only APs seen within max_age of the most
+        recently seen one are included.
+        """
+        overlapped = None
+        if self.use_numpy:
+            counts, sums, overlapped = self._totals_numpy(max_age)
+        elif max_age is not None:
+            counts, sums = self._totals_python(max_age)
+        else:
+            counts, sums = self._counts, [total / _FEMTOWATTS_PER_MW for total in self._sums]
+        if overlapped is None:
+            overlapped = [0.0] * 15
+            for channel in CHANNELS_24:
+                for other in range(max(1, channel - 4), min(14, channel + 4) + 1):
+                    if sums[other]:
+                        overlapped[channel] += sums[other] * overlap_24(channel - other)
+
+        congestion = {}
+        for channel in CHANNELS_24:
+            if overlapped[channel] or counts[channel]:
+                congestion[channel] = overlapped[channel]
+        for channel in range(15, MAX_CHANNEL + 1):
+            if counts[channel]:
+                congestion[channel] = float(sums[channel])
+        by_channel = {channel: int(counts[channel]) for channel in range(1, MAX_CHANNEL + 1) if counts[channel]}
+        return ChannelAnalysis(
+            by_channel, congestion,
+            min(CANDIDATES_24, key=lambda channel: (congestion.get(channel, 0.0), channel)),
+            min(CANDIDATES_5, key=lambda channel: (congestion.get(channel, 0.0), channel)),
+            int(sum(counts)))
+
+    def _totals_numpy(self, max_age):
+        if not self.channel:
+            return [0] * (MAX_CHANNEL + 1), [0.0] * (MAX_CHANNEL + 1), None
+        channel = numpy.frombuffer(self.channel, dtype=numpy.int16)
+        weight = numpy.frombuffer(self.weight, dtype=numpy.float64)
+        if max_age is not None:
+            last_seen = numpy.frombuffer(self.last_seen, dtype=numpy.float64)
+            recent = last_seen >= last_seen.max() - max_age
+            channel, weight = channel[recent], weight[recent]
+        counts = numpy.bincount(channel, minlength=MAX_CHANNEL + 1)
+        sums = numpy.bincount(channel, weights=weight, minlength=MAX_CHANNEL + 1)
+        overlapped = self._overlap @ sums[:15]
+        return counts.tolist(), sums.tolist(), overlapped.tolist()
+
+    def _totals_python(self, max_age):
+        counts = [0] * (MAX_CHANNEL + 1)
+        sums = [0.0] * (MAX_CHANNEL + 1)
+        if not self.channel:
+            return counts, sums
+        oldest = max(self.last_seen) - max_age
+        for channel, weight, seen in zip(self.channel, self.weight, self.last_seen):
+            if seen >= oldest:
+                counts[channel] += 1
+                sums[channel] += weight
+        return counts, sums
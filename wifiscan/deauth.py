@@ -0,0 +1,349 @@
+"""
+Noticing a deauthentication flood.
+
+A deauth attack (like the one dos-wifi.py ends with) sends a stream of
+deauthentication or disassociation frames on behalf of an AP, knocking its
+clients off. Legitimate APs send those frames only now and then, so a
+sustained rate of them is easy to tell apart, provided someone is counting.
+
+DeauthMonitor reads 802.11 frames (from wifiscan.pcap.iter_frames, or live
+from a monitor-mode interface) and, for every deauthentication or
+disassociation frame, counts it against
+
+- the BSSID it was sent for, and
+- the address it was sent from (the attacker usually spoofs the AP, but a
+  sloppy one shows its own address),
+
+in a sliding window of `window` seconds made of one-second buckets. When a
+window count reaches the threshold a "flood-started" FloodAlert is raised;
+when it falls back under half the threshold, "flood-ended", with the number
+of frames the flood lasted for.
+
+Memory stays constant however long the capture: every counter is a ring of
+`window` buckets in a shared array, there are at most max_addresses counters
+per kind (the least recently active address is dropped first) and frames are
+looked at in place, without copies. Frames other than deauthentication and
+disassociation are skipped after reading one byte of their header.
+
+Usage:
+    python3 -m wifiscan.deauth capture.pcap [capture2.pcapng ...]
+    python3 -m wifiscan.deauth --follow file-01.cap     # a capture still being written
+    sudo python3 -m wifiscan.deauth --interface wlan0mon
+Options: --window SECONDS (default 10), --threshold FRAMES (default 50).
+"""
+
+import argparse
+import collections
+import os
+import socket
+import sys
+import time
+from array import array
+
+from wifiscan.pcap import LINKTYPE_IEEE802_11, LINKTYPE_IEEE802_11_RADIOTAP, iter_frames
+
+FLOOD_STARTED = "flood-started"
+FLOOD_ENDED = "flood-ended"
+
+# Frame control byte 0 (version 0, type management) of the two subtypes.
+_DISASSOCIATION = 0xA0
+_DEAUTHENTICATION = 0xC0
+_BROADCAST = b"\xff" * 6
+_ETH_P_ALL = 0x0003
+
+
+def _format_mac(address):
+    return address.hex(":").upper()
+
+
+class FloodAlert:
+    __slots__ = ("kind", "scope", "address", "time", "count", "frames", "deauth", "disassoc", "broadcast")
+
+    def __init__(self, kind, scope, address, time, count, frames=0, deauth=0, disassoc=0, broadcast=0):
+        self.kind = kind
+        # "bssid" or "source".
+        self.scope = scope
+        self.address = address
+        # Capture time, in seconds since the epoch.
+        self.time = time
+        # Frames in the window when the alert was raised.
+        self.count = count
+        # For "flood-ended": frames counted since the flood was detected, by kind.
+        self.frames = frames
+        self.deauth = deauth
+        self.disassoc = disassoc
+        self.broadcast = broadcast
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def describe(self):
+        stamp = time.strftime("%H:%M:%S", time.localtime(self.time))
+        if self.kind == FLOOD_STARTED:
+            return f"{stamp} deauth flood against {self.scope} {self.address}: {self.count} frames in the window"
+        return (f"{stamp} deauth flood on {self.scope} {self.address} ended: {self.frames} frames since detected "
+                f"({self.deauth} deauthentication, {self.disassoc} disassociation, {self.broadcast} broadcast)")
+
+    def __repr__(self):
+        return f"FloodAlert({self.kind!r}, {self.scope!r}, {self.address!r}, count={self.count})"
+
+
+class _Flood:
+    """Running totals of one ongoing flood."""
+
+    __slots__ = ("frames", "deauth", "disassoc", "broadcast")
+
+    def __init__(self):
+        self.frames = self.deauth = self.disassoc = self.broadcast = 0
+
+
+class SlidingCounter:
+    """
+    Per-address frame counts over the last `window` one-second buckets, for
+    at most max_addresses addresses. All rings share one array("I").
+    """
+
+    def __init__(self, window, max_addresses):
+        self.window = window
+        self.max_addresses = max_addresses
+        self._slots = collections.OrderedDict()
+        self._empty = array("I", [0]) * window
+        self._buckets = array("I")
+        self._last = array("q")
+        self._totals = array("I")
+
+    def __len__(self):
+        return len(self._slots)
+
+    def _slot(self, address):
+        slot = self._slots.get(address)
+        if slot is not None:
+            self._slots.move_to_end(address)
+            return slot
+        if len(self._slots) >= self.max_addresses:
+            # Reuse the ring of the address that was active least recently.
+            _, slot = self._slots.popitem(last=False)
+            self._buckets[slot * self.window:(slot + 1) * self.window] = self._empty
+            self._last[slot] = 0
+            self._totals[slot] = 0
+        else:
+            slot = len(self._totals)
+            self._buckets.extend(self._empty)
+            self._last.append(0)
+            self._totals.append(0)
+        self._slots[address] = slot
+        return slot
+
+    def _advance(self, slot, second):
+        last = self._last[slot]
+        if second <= last:
+            return
+        window = self.window
+        base = slot * window
+        if second - last >= window:
+            self._buckets[base:base + window] = self._empty
+            self._totals[slot] = 0
+        else:
+            for bucket in range(last + 1, second + 1):
+                index = base + bucket % window
+                self._totals[slot] -= self._buckets[index]
+                self._buckets[index] = 0
+        self._last[slot] = second
+
+    def add(self, address, second):
+        """Counts one frame from address in second. Returns the count over the window."""
+        slot = self._slot(address)
+        self._advance(slot, second)
+        self._buckets[slot * self.window + second % self.window] += 1
+        self._totals[slot] += 1
+        return self._totals[slot]
+
+    def count(self, address, second):
+        """Frames from address over the window ending at second."""
+        slot = self._slots.get(address)
+        if slot is None:
+            return 0
+        self._advance(slot, second)
+        return self._totals[slot]
+
+    def nbytes(self):
+        return sum(buffer.buffer_info()[1] * buffer.itemsize for buffer in (self._buckets, self._last, self._totals))
+
+
+class DeauthMonitor:
+    """
+    Sliding-window deauthentication/disassociation counts per BSSID and per
+    source address, with FloodAlerts passed to subscribers as they happen.
+    """
+
+    def __init__(self, window=10, threshold=50, source_threshold=None, max_addresses=4096):
+        if window < 1:
+            raise ValueError("window must be at least 1 second")
+        self.window = int(window)
+        self.threshold = threshold
+        self.source_threshold = threshold if source_threshold is None else source_threshold
+        self.frames = 0
+        self.management = 0
+        self.counts = {FLOOD_STARTED: 0, FLOOD_ENDED: 0}
+        self._counters = {"bssid": SlidingCounter(self.window, max_addresses),
+                          "source": SlidingCounter(self.window, max_addresses)}
+        # (scope, address) -> _Flood, for the floods in progress.
+        self._floods = {}
+        self._last_second = None
+        self._next_check = 0.0
+        self._subscribers = []
+
+    def subscribe(self, callback):
+        """Calls callback(alert) for every FloodAlert. Returns callback."""
+        self._subscribers.append(callback)
+        return callback
+
+    def _raise(self, alert):
+        self.counts[alert.kind] += 1
+        for callback in self._subscribers:
+            callback(alert)
+
+    def feed(self, ts, linktype, frame):
+        """Counts one captured frame if it is a deauthentication or disassociation."""
+        self.frames += 1
+        # Floods in progress are checked once per second of capture time, whatever the frame.
+        if self._floods and ts >= self._next_check:
+            self._check_ended(int(ts), ts)
+        if linktype == LINKTYPE_IEEE802_11_RADIOTAP:
+            if len(frame) < 4:
+                return
+            offset = frame[2] | frame[3] << 8
+        elif linktype == LINKTYPE_IEEE802_11:
+            offset = 0
+        else:
+            return
+        # Header (24 bytes) + reason code.
+        if len(frame) < offset + 26:
+            return
+        fc = frame[offset]
+        if fc != _DEAUTHENTICATION and fc != _DISASSOCIATION:
+            return
+        self.management += 1
+        second = int(ts)
+        self._last_second = second
+        receiver = frame[offset + 4:offset + 10]
+        source = bytes(frame[offset + 10:offset + 16])
+        bssid = bytes(frame[offset + 16:offset + 22])
+        for scope, address, threshold in (("bssid", bssid, self.threshold), ("source", source, self.source_threshold)):
+            count = self._counters[scope].add(address, second)
+            flood = self._floods.get((scope, address))
+            if flood is None:
+                if count < threshold:
+                    continue
+                flood = self._floods[(scope, address)] = _Flood()
+                self._raise(FloodAlert(FLOOD_STARTED, scope, _format_mac(address), ts, count))
+            flood.frames += 1
+            if fc == _DEAUTHENTICATION:
+                flood.deauth += 1
+            else:
+                flood.disassoc += 1
+            if receiver == _BROADCAST:
+                flood.broadcast += 1
+
+    def _check_ended(self, second, ts):
+        self._next_check = second + 1
+        for key in list(self._floods):
+            scope, address = key
+            threshold = self.threshold if scope == "bssid" else self.source_threshold
+            count = self._counters[scope].count(address, second)
+            if count < threshold / 2:
+                flood = self._floods.pop(key)
+                self._raise(FloodAlert(FLOOD_ENDED, scope, _format_mac(address), ts, count,
+                                       flood.frames, flood.deauth, flood.disassoc, flood.broadcast))
+
+    def flush(self, ts=None):
+        """Ends the floods still in progress (e.g. at the end of a capture file), at ts or `window` seconds later."""
+        if self._last_second is not None:
+            ts = self._last_second + self.window if ts is None else ts
+            self._check_ended(int(ts), ts)
+
+    def feed_frames(self, frames):
+        """Feeds every (timestamp, linktype, frame) of an iterator such as wifiscan.pcap.iter_frames()."""
+        feed = self.feed
+        for ts, linktype, frame in frames:
+            feed(ts, linktype, frame)
+
+    def feed_file(self, path, follow=False):
+        """Reads a capture file; with follow=True, keeps waiting for frames appended to it."""
+        with open(path, "rb") as fh:
+            self.feed_frames(iter_frames(_Follow(fh) if follow else fh))
+
+    def nbytes(self):
+        return sum(counter.nbytes() for counter in self._counters.values())
+
+
+class _Follow:
+    """A file whose read() waits for more data at the end instead of returning b"" (like tail -f)."""
+
+    def __init__(self, fh, interval=0.2):
+        self.fh = fh
+        self.interval = interval
+
+    def read(self, size=-1):
+        while True:
+            data = self.fh.read(size)
+            if data:
+                return data
+            time.sleep(self.interval)
+
+
+def iter_interface(name):
+    """
+    Yields (timestamp, linktype, frame) for the frames received on a monitor
+    mode interface (radiotap headers). Needs root.
+    """
+    sock = socket.socket(socket.AF_PACKET, socket.SOCK_RAW, socket.htons(_ETH_P_ALL))
+    try:
+        sock.bind((name, 0))
+        buf = bytearray(65536)
+        view = memoryview(buf)
+        while True:
+            length = sock.recv_into(buf)
+            yield time.time(), LINKTYPE_IEEE802_11_RADIOTAP, view[:length]
+    finally:
+        sock.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python3 -m wifiscan.deauth", description=__doc__.split("\n\n")[0].strip())
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("paths", nargs="*", default=[], metavar="capture", help="pcap or pcapng files, read in order")
+    source.add_argument("--interface", help="read live from this monitor mode interface (needs root)")
+    parser.add_argument("--follow", action="store_true", help="keep reading the last capture as it grows")
+    parser.add_argument("--window", type=int, default=10, metavar="SECONDS", help="sliding window (default 10)")
+    parser.add_argument("--threshold", type=int, default=50, metavar="FRAMES",
+                        help="frames in the window that make a flood (default 50)")
+    args = parser.parse_args(argv)
+    if not args.paths and args.interface is None:
+        parser.error("give capture files or --interface")
+    if args.window < 1 or args.threshold < 1:
+        parser.error("--window and --threshold must be at least 1")
+    for path in args.paths:
+        if not os.access(path, os.R_OK):
+            parser.error(f"cannot read capture {path}")
+    monitor = DeauthMonitor(window=args.window, threshold=args.threshold)
+    monitor.subscribe(lambda alert: print(alert.describe(), flush=True))
+    start = time.perf_counter()
+    try:
+        if args.interface is not None:
+            monitor.feed_frames(iter_interface(args.interface))
+        for index, path in enumerate(args.paths):
+            # Following never reaches the end of a file, so only the last one is followed.
+            monitor.feed_file(path, follow=args.follow and index == len(args.paths) - 1)
+    except KeyboardInterrupt:
+        pass
+    monitor.flush()
+    elapsed = time.perf_counter() - start
+    print(f"{monitor.frames} frames ({monitor.management} deauthentication/disassociation), "
+          f"{monitor.counts[FLOOD_STARTED]} floods in {elapsed:.2f} s "
+          f"({monitor.frames / elapsed if elapsed else 0:.0f} frames/s)", file=sys.stderr)
+    return 1 if monitor.counts[FLOOD_STARTED] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+"""
+What changed in each tick, as a stream of events.
+
+The table is redrawn from the registry; anything else that wants to react to
+the scan (a log, an alert, another program) would have to keep a copy of the
+previous snapshot and diff the whole registry against it every tick.
+ChangeTracker works from the rows the ingestor returns instead (only the APs
+whose line changed) and turns them into ChangeEvents:
+
+- "appeared": a BSSID seen for the first time (or again after it aged out);
+- "updated": one or more of the tracked fields changed, with the old and new
+  value of each;
+- "disappeared": no sighting for age_out seconds.
+
+"Seconds" are measured on the capture's clock, i.e. the newest Last time
+seen reported so far, not the wall clock, so ageing works the same when a
+recording is replayed ten times faster. The tracker keeps the tracked fields
+of every AP in a dict and the last sightings in a heap, so finding the APs
+that aged out means popping the oldest sightings off it, whatever order the
+rows arrive in (a field can change without a newer sighting, and a restarted
+airodump-ng may report older times); the work per tick is proportional to
+the number of changed rows and expired APs, not to the size of the registry.
+
+Subscribers are callables that receive the list of events of each tick;
+JsonlSink is one that appends them to a file as JSON lines:
+
+    tracker = ChangeTracker(age_out=120)
+    tracker.subscribe(JsonlSink("events.jsonl"))
+    tracker.update(changed_aps)
+"""
+
+import heapq
+import json
+import operator
+import sys
+
+from wifiscan.records import parse_time
+
+APPEARED = "appeared"
+UPDATED = "updated"
+DISAPPEARED = "disappeared"
+
+# Last time seen and beacons change on every sighting; they are not reported as updates.
+TRACKED_FIELDS = ("essid", "channel", "speed", "privacy", "cipher", "authentication", "power", "lan_ip", "key")
+
+
+def _first(item):
+    return item[0]
+
+
+class ChangeEvent:
+    """One change to one AP. changes maps field name to (old, new) for "updated" events."""
+
+    __slots__ = ("kind", "bssid", "time", "changes", "ap")
+
+    def __init__(self, kind, bssid, time, changes=None, ap=None):
+        self.kind = kind
+        self.bssid = bssid
+        # Seconds since the epoch, on the capture's clock.
+        self.time = time
+        self.changes = changes
+        # The AccessPoint the event was derived from ("appeared" and "updated").
+        self.ap = ap
+
+    def as_dict(self):
+        data = {"event": self.kind, "bssid": self.bssid, "time": self.time}
+        if self.kind == APPEARED:
+            data.update((name, getattr(self.ap, name)) for name in TRACKED_FIELDS)
+        elif self.kind == UPDATED:
+            data["changes"] = {name: list(values) for name, values in self.changes.items()}
+        return data
+
+    def __repr__(self):
+        return f"ChangeEvent({self.kind!r}, {self.bssid!r}, changes={self.changes!r})"
+
+
+class ChangeTracker:
+    """
+    Turns the APs changed in each tick into ChangeEvents. age_out (seconds,
+    or None to never expire APs) sets when an AP that is no longer seen is
+    reported as disappeared.
+    """
+
+    def __init__(self, age_out=60.0, fields=TRACKED_FIELDS):
+        self.age_out = age_out
+        self.fields = tuple(fields)
+        getter = operator.attrgetter(*self.fields)
+        # attrgetter() of a single name returns the value itself rather than a tuple.
+        self._values = getter if len(self.fields) > 1 else lambda ap: (getter(ap),)
+        self.now = 0.0
+        self.counts = {APPEARED: 0, UPDATED: 0, DISAPPEARED: 0}
+        # BSSID -> (tracked field values, last sighting).
+        self._state = {}
+        # (last sighting, BSSID), oldest first; entries superseded by a later sighting are skipped when popped.
+        self._sightings = []
+        self._subscribers = []
+
+    def __len__(self):
+        return len(self._state)
+
+    def __contains__(self, bssid):
+        return bssid in self._state
+
+    def subscribe(self, callback):
+        """Calls callback(events) with the (non-empty) list of events of every tick. Returns callback."""
+        self._subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        self._subscribers.remove(callback)
+
+    def update(self, aps):
+        """Events for the APs changed in this tick, then for the APs that aged out. Delivers and returns them."""
+        events = []
+        state, sightings = self._state, self._sightings
+        fields, get_values = self.fields, self._values
+        # In order of Last time seen, so that events come out in capture order.
+        for seen, ap in sorted(((parse_time(ap.last_seen), ap) for ap in aps), key=_first):
+            seen = seen or self.now
+            if seen > self.now:
+                self.now = seen
+            values = get_values(ap)
+            previous = state.get(ap.bssid)
+            if previous is None:
+                events.append(ChangeEvent(APPEARED, ap.bssid, seen, ap=ap))
+                heapq.heappush(sightings, (seen, ap.bssid))
+            else:
+                if previous[0] != values:
+                    changes = {name: (old, new) for name, old, new in zip(fields, previous[0], values) if old != new}
+                    events.append(ChangeEvent(UPDATED, ap.bssid, seen, changes, ap))
+                if seen > previous[1]:
+                    heapq.heappush(sightings, (seen, ap.bssid))
+                else:
+                    # A change without a newer sighting does not make the AP any younger.
+                    seen = previous[1]
+            state[ap.bssid] = (values, seen)
+        if len(sightings) > 2 * len(state) + 64:
+            self._sightings = sightings = [(seen, bssid) for bssid, (_values, seen) in state.items()]
+            heapq.heapify(sightings)
+        events.extend(self._expired())
+        return self._deliver(events)
+
+    def expire(self, now=None):
+        """
+        Ages out the APs not seen for age_out seconds before now (by default
+        the capture's clock), which update() does on its own. Call it to age
+        APs out while no rows change. Delivers and returns the events.
+        """
+        if now is not None and now > self.now:
+            self.now = now
+        return self._deliver(self._expired())
+
+    def _expired(self):
+        if self.age_out is None:
+            return []
+        cutoff = self.now - self.age_out
+        state, sightings = self._state, self._sightings
+        events = []
+        while sightings and sightings[0][0] < cutoff:
+            seen, bssid = heapq.heappop(sightings)
+            current = state.get(bssid)
+            if current is not None and current[1] == seen:
+                del state[bssid]
+                events.append(ChangeEvent(DISAPPEARED, bssid, seen))
+        return events
+
+    def _deliver(self, events):
+        for event in events:
+            self.counts[event.kind] += 1
+        if events:
+            for callback in self._subscribers:
+                callback(events)
+        return events
+
+
+class JsonlSink:
+    """A subscriber writing one JSON object per event to path ("-" for stdout), flushed every tick."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = sys.stdout if path == "-" else open(path, "a", encoding="utf-8")
+        self.written = 0
+
+    def __call__(self, events):
+        self._file.write("".join(json.dumps(event.as_dict(), ensure_ascii=False) + "\n" for event in events))
+        self._file.flush()
+        self.written += len(events)
+
+    def close(self):
+        if self._file is not sys.stdout:
+            self._file.close()
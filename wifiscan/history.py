@@ -0,0 +1,165 @@
+"""
+Signal history per access point.
+
+An AccessPoint only holds the latest Power reported by airodump-ng, which is
+not enough for a site survey: a reading of -60 means little if the last
+minute went from -45 to -85. SignalHistory keeps, for every BSSID, the last
+`window` updates of
+
+- Power (dBm), and
+- the number of beacons received since the previous update,
+
+in ring buffers. All BSSIDs share a few flat array("h") / array("H") buffers
+(one slot of `window` entries per BSSID) instead of a Python list per AP, so
+memory stays at about half a kilobyte per AP however long the scan runs.
+
+Alongside each ring, the running sums and a histogram of the power samples
+(one counter per dBm from -1 to -127) are updated as samples go in and fall
+out. The rolling mean is therefore a division, and the minimum, maximum and
+percentiles a walk over a fixed 128 counters, whatever the window size.
+
+airodump-ng reports a Power of -1 when it has no reading; those updates count
+towards the beacon figures but not towards the signal statistics.
+"""
+
+from array import array
+
+POWER_BINS = 128
+# Marks a ring entry that holds no power reading.
+NO_SAMPLE = 1
+BEACON_DELTA_MAX = 32767
+
+
+class SignalHistory:
+    """Rolling Power and beacon statistics per BSSID over the last `window` updates."""
+
+    def __init__(self, window=60):
+        if not 1 <= window <= 65535:
+            raise ValueError("window must be between 1 and 65535 updates")
+        self.window = window
+        self._slots = {}
+        self._power = array("h")
+        self._beacons = array("h")
+        self._histogram = array("H")
+        self._position = array("H")
+        self._filled = array("H")
+        self._power_count = array("H")
+        self._power_sum = array("l")
+        self._beacon_sum = array("l")
+        self._last_beacons = array("l")
+        self._empty_ring = array("h", [NO_SAMPLE]) * window
+        self._empty_beacons = array("h", [0]) * window
+        self._empty_histogram = array("H", [0]) * POWER_BINS
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __contains__(self, bssid):
+        return bssid in self._slots
+
+    def _add_slot(self, bssid, beacons):
+        slot = self._slots[bssid] = len(self._position)
+        self._power.extend(self._empty_ring)
+        self._beacons.extend(self._empty_beacons)
+        self._histogram.extend(self._empty_histogram)
+        self._position.append(0)
+        self._filled.append(0)
+        self._power_count.append(0)
+        self._power_sum.append(0)
+        self._beacon_sum.append(0)
+        self._last_beacons.append(beacons)
+        return slot
+
+    def record(self, aps):
+        """Adds one sample per AccessPoint in aps (the APs updated in this tick)."""
+        window = self.window
+        power_ring, beacon_ring, histogram = self._power, self._beacons, self._histogram
+        for ap in aps:
+            slot = self._slots.get(ap.bssid)
+            if slot is None:
+                slot = self._add_slot(ap.bssid, ap.beacons)
+            index = slot * window + self._position[slot]
+            bins = slot * POWER_BINS
+            if self._filled[slot] == window:
+                old = power_ring[index]
+                if old != NO_SAMPLE:
+                    self._power_sum[slot] -= old
+                    self._power_count[slot] -= 1
+                    histogram[bins - old] -= 1
+                self._beacon_sum[slot] -= beacon_ring[index]
+            else:
+                self._filled[slot] += 1
+
+            power = ap.power
+            if -POWER_BINS < power < -1:
+                power_ring[index] = power
+                self._power_sum[slot] += power
+                self._power_count[slot] += 1
+                histogram[bins - power] += 1
+            else:
+                power_ring[index] = NO_SAMPLE
+
+            # The counter restarts from zero if airodump-ng is restarted.
+            delta = min(max(ap.beacons - self._last_beacons[slot], 0), BEACON_DELTA_MAX)
+            self._last_beacons[slot] = ap.beacons
+            beacon_ring[index] = delta
+            self._beacon_sum[slot] += delta
+
+            self._position[slot] = (self._position[slot] + 1) % window
+
+    def samples(self, bssid):
+        """Number of power readings in the window of bssid."""
+        slot = self._slots.get(bssid)
+        return 0 if slot is None else self._power_count[slot]
+
+    def mean(self, bssid):
+        """Mean power (dBm) over the window, or None without readings."""
+        slot = self._slots.get(bssid)
+        if slot is None or not self._power_count[slot]:
+            return None
+        return self._power_sum[slot] / self._power_count[slot]
+
+    def percentile(self, bssid, fraction):
+        """
+        Power (dBm) below which `fraction` of the readings in the window fall:
+        0.0 gives the weakest reading, 1.0 the strongest. None without readings.
+        """
+        slot = self._slots.get(bssid)
+        if slot is None or not self._power_count[slot]:
+            return None
+        target = max(1, round(fraction * self._power_count[slot]))
+        histogram = self._histogram
+        bins = slot * POWER_BINS
+        running = 0
+        # From the weakest bin (-127 dBm) to the strongest (-1 dBm).
+        for offset in range(POWER_BINS - 1, 0, -1):
+            running += histogram[bins + offset]
+            if running >= target:
+                return -offset
+        return -1
+
+    def minimum(self, bssid):
+        return self.percentile(bssid, 0.0)
+
+    def maximum(self, bssid):
+        return self.percentile(bssid, 1.0)
+
+    def beacons_per_update(self, bssid):
+        """Mean number of beacons received between two updates, over the window."""
+        slot = self._slots.get(bssid)
+        if slot is None or not self._filled[slot]:
+            return None
+        return self._beacon_sum[slot] / self._filled[slot]
+
+    def summary(self, bssid):
+        """(mean, minimum, median, maximum) power over the window, or None without readings."""
+        mean = self.mean(bssid)
+        if mean is None:
+            return None
+        return mean, self.minimum(bssid), self.percentile(bssid, 0.5), self.maximum(bssid)
+
+    def nbytes(self):
+        """Bytes held by the sample buffers."""
+        buffers = (self._power, self._beacons, self._histogram, self._position, self._filled,
+                   self._power_count, self._power_sum, self._beacon_sum, self._last_beacons)
+        return sum(buffer.buffer_info()[1] * buffer.itemsize for buffer in buffers)
@@ -0,0 +1,187 @@
+"""
+Incremental reading of the .csv files written by airodump-ng.
+
+The original scan loop opened every .csv file in the working directory once a
+second and parsed it from the top, so the work done per tick grew with the
+length of the survey. CsvIngestor remembers, for every file, the inode,
+modification time and size it had on the previous tick, plus the raw lines it
+already parsed:
+
+- A file whose (inode, mtime, size) did not change is skipped without being
+  opened.
+- A file that only grew (everything parsed last time is still there, byte for
+  byte) is parsed from the old end onwards.
+- A file that was rewritten in place (airodump-ng rewrites the whole file on
+  every --write-interval) is split into lines again, but only the lines that
+  differ from the previous version are parsed (wifiscan/airodump.py) into
+  AccessPoint records.
+
+The cost of a tick therefore depends on how much changed, not on how long the
+scan has been running.
+
+The station (client) section is skipped unless the ingestor is created with
+stations=True; its changed rows are then parsed into Station records as well,
+collected until take_stations() is called (wifiscan/stations.py).
+"""
+
+import os
+import zlib
+
+from wifiscan.airodump import AP_HEADER, join_rows, parse_ap_line, parse_csv, parse_station_line
+
+AP_FIELDNAMES = ['BSSID', 'First_time_seen', 'Last_time_seen', 'channel', 'Speed', 'Privacy', 'Cipher', 'Authentication', 'Power', 'beacons', 'IV', 'LAN_IP', 'ID_length', 'ESSID', 'Key']
+
+STATION_MARKER = "Station MAC"
+
+
+class _FileState:
+    __slots__ = ("signature", "offset", "prefix_crc", "lines", "in_stations")
+
+    def __init__(self):
+        self.signature = None
+        self.offset = 0
+        self.prefix_crc = 0
+        self.lines = set()
+        self.in_stations = False
+
+
+class CsvIngestor:
+    """
+    Tracks the .csv files in a directory and returns only the access points
+    whose rows are new or changed since the previous call to poll().
+    """
+
+    def __init__(self, directory=".", suffix=".csv", stations=False):
+        self.directory = directory
+        self.suffix = suffix
+        self.stations = stations
+        self._files = {}
+        self._changed_stations = []
+        self.files_skipped = 0
+        self.files_read = 0
+        self.bytes_read = 0
+        self.rows_rejected = 0
+
+    def poll(self):
+        """
+        Checks every matching file once and returns a list of AccessPoint
+        records for the access point lines that changed.
+        """
+        return self.read_files(self.changed_files())
+
+    def take_stations(self):
+        """
+        Returns the Station records of the station lines that changed since
+        the previous call (only with stations=True), oldest read first.
+        """
+        stations, self._changed_stations = self._changed_stations, []
+        return stations
+
+    def read_files(self, changed):
+        """Reads every file in the list returned by changed_files() and returns their changed access points."""
+        changed_rows = []
+        for path, state, signature in changed:
+            changed_rows.extend(self.read(path, state, signature))
+        return changed_rows
+
+    def changed_files(self):
+        """
+        Lists the directory and returns (path, state, signature) for every
+        matching file whose (inode, mtime, size) changed since it was last read.
+        """
+        changed = []
+        present = set()
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if self.suffix not in entry.name or not entry.is_file():
+                    continue
+                try:
+                    st = entry.stat()
+                except FileNotFoundError:
+                    # Moved or deleted since the directory was listed (e.g. to backup/).
+                    continue
+                present.add(entry.name)
+                signature = (st.st_ino, st.st_mtime_ns, st.st_size)
+                state = self._files.get(entry.name)
+                if state is None:
+                    state = self._files[entry.name] = _FileState()
+                elif state.signature == signature:
+                    self.files_skipped += 1
+                    continue
+                changed.append((entry.path, state, signature))
+        for name in list(self._files):
+            if name not in present:
+                del self._files[name]
+        return changed
+
+    def read(self, path, state, signature):
+        """Reads one file returned by changed_files() and returns its changed access points."""
+        try:
+            with open(path, "rb") as fh:
+                data = fh.read()
+        except FileNotFoundError:
+            # Gone since changed_files(); forget it, as if it had not been listed.
+            self._files.pop(os.path.basename(path), None)
+            return []
+        self.files_read += 1
+        self.bytes_read += len(data)
+        state.signature = signature
+
+        # The file only grew if the bytes parsed last time are still there
+        # unchanged. Checking a CRC of them is far cheaper than decoding and
+        # splitting them into rows again.
+        appended = 0 < state.offset <= len(data) and zlib.crc32(data[:state.offset]) == state.prefix_crc
+        if not appended:
+            state.offset = 0
+            state.prefix_crc = 0
+            state.in_stations = False
+
+        # A line without its terminating newline is still being written;
+        # leave it for the next tick.
+        end = data.rfind(b"\n") + 1
+        if end <= state.offset:
+            return []
+        chunk = data[state.offset:end]
+        state.prefix_crc = zlib.crc32(chunk, state.prefix_crc)
+        state.offset = end
+
+        new_rows = []
+        new_station_rows = []
+        seen = state.lines if appended else set()
+        in_stations = state.in_stations
+        with_stations = self.stations
+        for row in join_rows(chunk.decode(errors="replace").split("\n")):
+            if row.startswith(STATION_MARKER):
+                in_stations = True
+                continue
+            if row.startswith(AP_HEADER) or (in_stations and not with_stations):
+                continue
+            if row not in state.lines:
+                (new_station_rows if in_stations else new_rows).append(row)
+            seen.add(row)
+        state.lines = seen
+        state.in_stations = in_stations
+
+        aps = []
+        for row in new_rows:
+            ap = parse_ap_line(row)
+            if ap is None:
+                self.rows_rejected += 1
+            else:
+                aps.append(ap)
+        for row in new_station_rows:
+            station = parse_station_line(row)
+            if station is None:
+                self.rows_rejected += 1
+            else:
+                self._changed_stations.append(station)
+        return aps
+
+
+def read_access_points(path):
+    """
+    Parses a complete airodump-ng CSV file (e.g. an archived one in backup/)
+    and returns its access points as a list of AccessPoint records.
+    """
+    with open(path, "rb") as fh:
+        return parse_csv(fh.read(), stations=False).aps
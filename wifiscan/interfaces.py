@@ -0,0 +1,213 @@
+"""
+Finding the WiFi interfaces without iwconfig.
+
+dos-wifi.py used to run iwconfig (deprecated, and slow to start) and match
+"^wlan[0-9]+" against its output, which missed predictably named interfaces
+such as wlp3s0 and anything already in monitor mode (wlan0mon). The kernel
+publishes everything needed under /sys/class/net:
+
+- an interface is wireless if it has a "wireless" directory or a
+  "phy80211" link (the link points to its radio, e.g. phy0);
+- "device/driver" links to the driver (e.g. ath9k_htc);
+- "type" is 803 (ARPHRD_IEEE80211_RADIOTAP) for an interface in monitor
+  mode;
+- "address" and "operstate" are the MAC address and the link state.
+
+Whether a radio can be put in monitor mode at all is not in sysfs; it is
+asked from the kernel over nl80211 (a generic netlink socket, no extra
+packages) when the real /sys is read. With any other root, e.g. a fake tree
+for tests or the stand-in tools, capabilities can be passed in as a mapping
+of phy name to the set of supported interface types.
+
+Results are cached per sysfs root; pass refresh=True after the interfaces
+changed (e.g. after airmon-ng start).
+"""
+
+import os
+import socket
+import struct
+
+ARPHRD_IEEE80211_RADIOTAP = 803
+
+# nl80211 interface types (enum nl80211_iftype).
+IFTYPE_NAMES = {1: "adhoc", 2: "managed", 3: "AP", 4: "AP/VLAN", 5: "WDS", 6: "monitor", 7: "mesh point",
+                8: "P2P-client", 9: "P2P-GO", 10: "P2P-device", 11: "outside context of a BSS", 12: "NAN"}
+
+_NETLINK_GENERIC = 16
+_NLMSG_ERROR = 2
+_NLMSG_DONE = 3
+_NLM_F_REQUEST = 0x1
+_NLM_F_DUMP = 0x300
+_GENL_ID_CTRL = 0x10
+_CTRL_CMD_GETFAMILY = 3
+_CTRL_ATTR_FAMILY_ID = 1
+_CTRL_ATTR_FAMILY_NAME = 2
+_NL80211_CMD_GET_WIPHY = 1
+_NL80211_ATTR_WIPHY_NAME = 2
+_NL80211_ATTR_SUPPORTED_IFTYPES = 32
+_NL80211_ATTR_SPLIT_WIPHY_DUMP = 174
+
+_NLMSGHDR = struct.Struct("=IHHII")
+_GENLMSGHDR = struct.Struct("=BBH")
+_NLATTR = struct.Struct("=HH")
+
+_cache = {}
+
+
+class WirelessInterface:
+    __slots__ = ("name", "phy", "driver", "mode", "address", "operstate", "iftypes")
+
+    def __init__(self, name, phy=None, driver=None, mode="managed", address=None, operstate=None, iftypes=None):
+        self.name = name
+        self.phy = phy
+        self.driver = driver
+        self.mode = mode
+        self.address = address
+        self.operstate = operstate
+        self.iftypes = iftypes
+
+    @property
+    def monitor_capable(self):
+        """True or False if known, None if the supported interface types could not be read."""
+        if self.mode == "monitor":
+            return True
+        if self.iftypes is None:
+            return None
+        return "monitor" in self.iftypes
+
+    def describe(self):
+        monitor = {True: "monitor mode supported", False: "no monitor mode", None: "monitor mode unknown"}[self.monitor_capable]
+        parts = [self.phy or "no phy", f"driver {self.driver or 'unknown'}"]
+        parts.append("in monitor mode" if self.mode == "monitor" else monitor)
+        return ", ".join(parts)
+
+    def __repr__(self):
+        return f"WirelessInterface({self.name!r}, phy={self.phy!r}, driver={self.driver!r}, mode={self.mode!r})"
+
+
+def _read(path):
+    try:
+        with open(path) as fh:
+            return fh.read().strip()
+    except OSError:
+        return None
+
+
+def _link_name(path):
+    """Last component of the path a sysfs link points to, or None."""
+    if not os.path.exists(path):
+        return None
+    return os.path.basename(os.path.realpath(path))
+
+
+def read_sysfs(root="/sys", capabilities=None):
+    """The wireless interfaces under root/class/net, sorted by name."""
+    net = os.path.join(root, "class", "net")
+    try:
+        names = sorted(os.listdir(net))
+    except FileNotFoundError:
+        return []
+    interfaces = []
+    for name in names:
+        base = os.path.join(net, name)
+        phy = _link_name(os.path.join(base, "phy80211"))
+        if phy is None and not os.path.isdir(os.path.join(base, "wireless")):
+            continue
+        mode = "monitor" if _read(os.path.join(base, "type")) == str(ARPHRD_IEEE80211_RADIOTAP) else "managed"
+        iftypes = capabilities.get(phy) if capabilities is not None else None
+        interfaces.append(WirelessInterface(
+            name, phy, _link_name(os.path.join(base, "device", "driver")), mode,
+            _read(os.path.join(base, "address")), _read(os.path.join(base, "operstate")), iftypes))
+    return interfaces
+
+
+def _attributes(data, offset=0, end=None):
+    end = len(data) if end is None else end
+    while offset + _NLATTR.size <= end:
+        length, kind = _NLATTR.unpack_from(data, offset)
+        if length < _NLATTR.size:
+            return
+        yield kind & 0x3FFF, data[offset + _NLATTR.size:offset + length]
+        offset += (length + 3) & ~3
+
+
+def _attribute(kind, payload):
+    data = _NLATTR.pack(_NLATTR.size + len(payload), kind) + payload
+    return data + b"\0" * (-len(data) % 4)
+
+
+def _request(sock, family, flags, command, attributes, seq):
+    payload = _GENLMSGHDR.pack(command, 1, 0) + b"".join(attributes)
+    sock.send(_NLMSGHDR.pack(_NLMSGHDR.size + len(payload), family, _NLM_F_REQUEST | flags, seq, 0) + payload)
+    while True:
+        data = sock.recv(65536)
+        offset = 0
+        while offset + _NLMSGHDR.size <= len(data):
+            length, kind, _flags, _seq, _pid = _NLMSGHDR.unpack_from(data, offset)
+            if length < _NLMSGHDR.size:
+                return
+            if kind == _NLMSG_DONE:
+                return
+            if kind == _NLMSG_ERROR:
+                error = struct.unpack_from("=i", data, offset + _NLMSGHDR.size)[0]
+                if error:
+                    raise OSError(-error, os.strerror(-error))
+                return
+            yield data[offset + _NLMSGHDR.size + _GENLMSGHDR.size:offset + length]
+            offset += (length + 3) & ~3
+        if not flags & _NLM_F_DUMP:
+            return
+
+
+def nl80211_capabilities():
+    """
+    Asks the kernel over nl80211 which interface types every radio supports:
+    {"phy0": {"managed", "monitor", ...}}. Returns None if nl80211 cannot be
+    reached (no wireless support, not Linux, sandboxed).
+    """
+    try:
+        sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, _NETLINK_GENERIC)
+    except (AttributeError, OSError):
+        return None
+    try:
+        sock.settimeout(1.0)
+        sock.bind((0, 0))
+        family = None
+        for message in _request(sock, _GENL_ID_CTRL, 0, _CTRL_CMD_GETFAMILY,
+                                [_attribute(_CTRL_ATTR_FAMILY_NAME, b"nl80211\0")], 1):
+            for kind, value in _attributes(message):
+                if kind == _CTRL_ATTR_FAMILY_ID:
+                    family = struct.unpack_from("=H", value)[0]
+        if family is None:
+            return None
+        capabilities = {}
+        # Split dumps spread one radio over several messages; each carries the radio's name.
+        for message in _request(sock, family, _NLM_F_DUMP, _NL80211_CMD_GET_WIPHY,
+                                [_attribute(_NL80211_ATTR_SPLIT_WIPHY_DUMP, b"")], 2):
+            name, iftypes = None, None
+            for kind, value in _attributes(message):
+                if kind == _NL80211_ATTR_WIPHY_NAME:
+                    name = value.rstrip(b"\0").decode()
+                elif kind == _NL80211_ATTR_SUPPORTED_IFTYPES:
+                    iftypes = {IFTYPE_NAMES.get(iftype, str(iftype)) for iftype, _ in _attributes(value)}
+            if name is not None:
+                capabilities.setdefault(name, set()).update(iftypes or ())
+        return capabilities
+    except OSError:
+        return None
+    finally:
+        sock.close()
+
+
+def discover_interfaces(root="/sys", capabilities=None, refresh=False):
+    """
+    The wireless interfaces of the system (or of a fake sysfs tree at root),
+    cached until refresh=True. For the real /sys, capabilities are read over
+    nl80211 unless given.
+    """
+    if not refresh and root in _cache:
+        return _cache[root]
+    if capabilities is None and os.path.abspath(root) == "/sys":
+        capabilities = nl80211_capabilities()
+    interfaces = _cache[root] = read_sysfs(root, capabilities)
+    return interfaces
@@ -0,0 +1,433 @@
+"""
+Reading access points straight from pcap / pcapng capture files.
+
+airodump-ng's CSV output is written once a second, loses everything that
+happened between two writes and has to be parsed as text. This module reads
+the 802.11 frames themselves, from a classic pcap or a pcapng file with
+radiotap (or plain 802.11) link-layer headers, and turns beacons and probe
+responses into the same AccessPoint records the scan table uses.
+
+The file is read in fixed-size chunks and every frame is handed out as a
+memoryview into the current chunk, decoded with struct.unpack_from, so no
+per-frame copies are made and memory stays constant however large the
+capture is. The information elements of an AP are only decoded again when
+its SSID, channel (DS parameter, HT operation or radiotap) or security (RSN,
+WPA) elements change, which a CRC of those elements shows; repeated beacons
+just update the power, beacon count and last-seen time. Frames whose headers
+are cut short are skipped rather than read past their end.
+
+Usage:
+    python3 -m wifiscan.pcap capture.pcapng
+"""
+
+import struct
+import sys
+import time
+import zlib
+from datetime import datetime
+
+from wifiscan.records import AccessPoint
+
+LINKTYPE_IEEE802_11 = 105
+LINKTYPE_IEEE802_11_RADIOTAP = 127
+
+CHUNK_SIZE = 1 << 20
+
+_PCAP_MAGIC = {
+    b"\xd4\xc3\xb2\xa1": ("<", 1e-6),
+    b"\xa1\xb2\xc3\xd4": (">", 1e-6),
+    b"\x4d\x3c\xb2\xa1": ("<", 1e-9),
+    b"\xa1\xb2\x3c\x4d": (">", 1e-9),
+}
+_PCAPNG_SHB = b"\x0a\x0d\x0d\x0a"
+
+# Radiotap fields that come before "dBm antenna signal" (bit 5), as
+# (alignment, size), indexed by bit number.
+_RADIOTAP_FIELDS = ((8, 8), (1, 1), (1, 1), (2, 4), (1, 2))
+_RADIOTAP_FLAG_FCS = 0x10
+
+_SUBTYPE_PROBE_RESPONSE = 5
+_SUBTYPE_BEACON = 8
+_CAPABILITY_PRIVACY = 0x0010
+
+_IE_SSID = 0
+_IE_DS_PARAMETER = 3
+_IE_RSN = 48
+_IE_HT_OPERATION = 61
+_IE_VENDOR = 221
+_WPA_OUI_TYPE = b"\x00\x50\xf2\x01"
+# The elements (and, for HT operation, the bytes of it) that parse_elements() decodes; the
+# others, like the TIM, change from one beacon to the next without changing the AP.
+_SIGNATURE_ELEMENTS = {_IE_SSID: 0, _IE_DS_PARAMETER: 0, _IE_RSN: 0, _IE_HT_OPERATION: 3}
+
+_CIPHERS = {1: "WEP40", 2: "TKIP", 4: "CCMP", 5: "WEP104", 8: "GCMP", 9: "GCMP-256", 10: "CCMP-256"}
+_AKMS = {1: "MGT", 2: "PSK", 3: "MGT", 4: "PSK", 5: "MGT", 6: "PSK", 8: "SAE", 9: "SAE", 18: "OWE"}
+
+
+class CaptureFormatError(ValueError):
+    """Raised when a file is not a pcap or pcapng capture this module can read."""
+
+
+def _chunks(fh, chunk_size, buf=b""):
+    """
+    Yields buffers that hold the unconsumed tail of the previous buffer (or
+    the bytes already read, for the first one) followed by the next chunk of
+    the file. The caller sends back how many bytes of the buffer it consumed.
+    """
+    while True:
+        data = fh.read(chunk_size)
+        if not data:
+            return
+        buf = buf + data if buf else data
+        consumed = yield buf
+        buf = buf[consumed:]
+
+
+def _iter_pcap(fh, header, chunk_size):
+    endian, resolution = _PCAP_MAGIC[header[:4]]
+    header += fh.read(24 - len(header))
+    if len(header) < 24:
+        raise CaptureFormatError("truncated pcap header")
+    linktype = struct.unpack_from(endian + "I", header, 20)[0] & 0x0FFFFFFF
+    record = struct.Struct(endian + "IIII")
+    reader = _chunks(fh, chunk_size)
+    try:
+        buf = next(reader)
+        while True:
+            view = memoryview(buf)
+            offset = 0
+            end = len(buf)
+            while offset + 16 <= end:
+                ts_sec, ts_frac, caplen, _origlen = record.unpack_from(buf, offset)
+                if offset + 16 + caplen > end:
+                    break
+                yield ts_sec + ts_frac * resolution, linktype, view[offset + 16:offset + 16 + caplen]
+                offset += 16 + caplen
+            view.release()
+            buf = reader.send(offset)
+    except StopIteration:
+        return
+
+
+def _iter_pcapng(fh, header, chunk_size):
+    reader = _chunks(fh, chunk_size, header)
+    # Per section: byte order, and (linktype, timestamp resolution) per interface.
+    endian = "<"
+    interfaces = []
+    try:
+        buf = next(reader)
+        while True:
+            view = memoryview(buf)
+            offset = 0
+            end = len(buf)
+            while offset + 12 <= end:
+                block_type = buf[offset:offset + 4]
+                if block_type == _PCAPNG_SHB:
+                    bom = buf[offset + 8:offset + 12]
+                    endian = "<" if bom == b"\x4d\x3c\x2b\x1a" else ">"
+                block_len = struct.unpack_from(endian + "I", buf, offset + 4)[0]
+                if block_len < 12:
+                    raise CaptureFormatError("corrupt pcapng block length")
+                if offset + block_len > end:
+                    break
+                btype = struct.unpack_from(endian + "I", buf, offset)[0]
+                if btype == 0x0A0D0D0A:
+                    interfaces = []
+                elif btype == 1:
+                    linktype = struct.unpack_from(endian + "H", buf, offset + 8)[0]
+                    interfaces.append((linktype, _if_tsresol(buf, offset + 16, offset + block_len - 4, endian)))
+                elif btype == 6:
+                    if block_len < 32:
+                        raise CaptureFormatError("corrupt pcapng enhanced packet block length")
+                    iface, ts_high, ts_low, caplen = struct.unpack_from(endian + "IIII", buf, offset + 8)
+                    linktype, resolution = interfaces[iface] if iface < len(interfaces) else (LINKTYPE_IEEE802_11_RADIOTAP, 1e-6)
+                    start = offset + 28
+                    yield ((ts_high << 32) | ts_low) * resolution, linktype, view[start:start + min(caplen, block_len - 32)]
+                elif btype == 3:
+                    linktype = interfaces[0][0] if interfaces else LINKTYPE_IEEE802_11_RADIOTAP
+                    origlen = struct.unpack_from(endian + "I", buf, offset + 8)[0]
+                    start = offset + 12
+                    yield 0.0, linktype, view[start:start + min(origlen, block_len - 16)]
+                offset += block_len
+            view.release()
+            buf = reader.send(offset)
+    except StopIteration:
+        return
+
+
+def _if_tsresol(buf, offset, end, endian):
+    """Reads the if_tsresol option of an Interface Description Block."""
+    while offset + 4 <= end:
+        code, length = struct.unpack_from(endian + "HH", buf, offset)
+        if code == 0:
+            break
+        if code == 9 and length >= 1:
+            value = buf[offset + 4]
+            return 2.0 ** -(value & 0x7F) if value & 0x80 else 10.0 ** -value
+        offset += 4 + ((length + 3) & ~3)
+    return 1e-6
+
+
+def iter_frames(fh, chunk_size=CHUNK_SIZE):
+    """
+    Yields (timestamp, linktype, frame) for every packet in an open binary
+    pcap or pcapng file. frame is a memoryview that is only valid until the
+    next frame is requested; copy it with bytes(frame) to keep it.
+    """
+    header = fh.read(4)
+    if header in _PCAP_MAGIC:
+        return _iter_pcap(fh, header, chunk_size)
+    if header == _PCAPNG_SHB:
+        return _iter_pcapng(fh, header, chunk_size)
+    raise CaptureFormatError("not a pcap or pcapng file")
+
+
+def _frequency_to_channel(freq):
+    if freq == 2484:
+        return 14
+    if 2412 <= freq < 2484:
+        return (freq - 2407) // 5
+    if 5000 <= freq < 5925:
+        return (freq - 5000) // 5
+    if 5955 <= freq < 7125:
+        return (freq - 5950) // 5
+    return -1
+
+
+def parse_radiotap(frame):
+    """
+    Returns (header_length, power_dbm, channel, has_fcs) for a radiotap frame.
+    power_dbm and channel are -1 when the header does not carry them.
+    Returns None for a malformed header: shorter than 8 bytes, or longer
+    than the frame.
+    """
+    if len(frame) < 8:
+        return None
+    length, present = struct.unpack_from("<HI", frame, 2)
+    if length < 8 or length > len(frame):
+        return None
+    offset = 8
+    word = present
+    while word & 0x80000000:
+        if offset + 4 > length:
+            return None
+        word = struct.unpack_from("<I", frame, offset)[0]
+        offset += 4
+    power = -1
+    channel = -1
+    flags = 0
+    for bit, (align, size) in enumerate(_RADIOTAP_FIELDS):
+        if not present & (1 << bit):
+            continue
+        offset = (offset + align - 1) & ~(align - 1)
+        if offset + size > length:
+            return None
+        if bit == 1:
+            flags = frame[offset]
+        elif bit == 3:
+            channel = _frequency_to_channel(struct.unpack_from("<H", frame, offset)[0])
+        offset += size
+    if present & (1 << 5) and offset < length:
+        power = struct.unpack_from("b", frame, offset)[0]
+    return length, power, channel, bool(flags & _RADIOTAP_FLAG_FCS)
+
+
+def _suites(body, offset, end):
+    """Reads a suite count followed by that many 4-byte suite selectors."""
+    if offset + 2 > end:
+        return [], end
+    count = struct.unpack_from("<H", body, offset)[0]
+    offset += 2
+    suites = []
+    for _ in range(count):
+        if offset + 4 > end:
+            break
+        suites.append(body[offset + 3])
+        offset += 4
+    return suites, offset
+
+
+def _security(body, offset, end):
+    """Returns (ciphers, akms) from the body of an RSN or WPA element."""
+    offset += 2  # version
+    offset += 4  # group cipher
+    ciphers, offset = _suites(body, offset, end)
+    akms, offset = _suites(body, offset, end)
+    return ciphers, akms
+
+
+def parse_elements(body, offset, end, capability):
+    """
+    Decodes the information elements of a beacon or probe response body.
+    Returns (essid, id_length, channel, privacy, cipher, authentication).
+    """
+    essid = ""
+    id_length = 0
+    channel = -1
+    rsn = wpa = None
+    while offset + 2 <= end:
+        ie_id = body[offset]
+        ie_len = body[offset + 1]
+        start = offset + 2
+        offset = start + ie_len
+        if offset > end:
+            break
+        if ie_id == _IE_SSID:
+            id_length = ie_len
+            essid = bytes(body[start:offset]).decode("utf-8", "replace").rstrip("\0")
+        elif ie_id == _IE_DS_PARAMETER and ie_len >= 1:
+            channel = body[start]
+        elif ie_id == _IE_HT_OPERATION and ie_len >= 1 and channel < 0:
+            channel = body[start]
+        elif ie_id == _IE_RSN:
+            rsn = _security(body, start, offset)
+        elif ie_id == _IE_VENDOR and ie_len >= 4 and body[start:start + 4] == _WPA_OUI_TYPE:
+            wpa = _security(body, start + 4, offset)
+
+    privacy = []
+    ciphers = set()
+    akms = set()
+    if rsn is not None:
+        privacy.append("WPA3" if 8 in rsn[1] or 9 in rsn[1] else "WPA2")
+        if 2 in rsn[1] and privacy[0] == "WPA3":
+            privacy.append("WPA2")
+        ciphers.update(rsn[0])
+        akms.update(rsn[1])
+    if wpa is not None:
+        privacy.append("WPA")
+        ciphers.update(wpa[0])
+        akms.update(wpa[1])
+    if not privacy:
+        privacy.append("WEP" if capability & _CAPABILITY_PRIVACY else "OPN")
+    cipher = " ".join(sorted({_CIPHERS.get(c, str(c)) for c in ciphers}))
+    authentication = " ".join(sorted({_AKMS.get(a, str(a)) for a in akms}))
+    return essid, id_length, channel, " ".join(privacy), cipher, authentication
+
+
+def element_signature(body, offset, end):
+    """A CRC of the SSID, DS parameter, HT operation, RSN and WPA elements of a beacon or probe response body."""
+    crc = 0
+    while offset + 2 <= end:
+        ie_id = body[offset]
+        start = offset
+        offset += 2 + body[offset + 1]
+        size = _SIGNATURE_ELEMENTS.get(ie_id)
+        if size is not None:
+            crc = zlib.crc32(body[start:min(start + size, offset) if size else offset], crc)
+        elif ie_id == _IE_VENDOR and body[start + 2:start + 6] == _WPA_OUI_TYPE:
+            crc = zlib.crc32(body[start:offset], crc)
+    return crc
+
+
+def _mac(frame, offset):
+    return frame[offset:offset + 6].hex(":").upper()
+
+
+class BeaconDecoder:
+    """
+    Turns beacons and probe responses into AccessPoint records and upserts
+    them into a registry (e.g. the scan's AccessPointRegistry).
+    """
+
+    def __init__(self, registry):
+        self.registry = registry
+        self.frames = 0
+        self.decoded = 0
+        # BSSID -> (element_signature(), radiotap channel) of the frame last decoded in full.
+        self._signatures = {}
+        self._clock_second = None
+        self._clock_text = ""
+
+    def _timestamp(self, ts):
+        second = int(ts)
+        if second != self._clock_second:
+            self._clock_second = second
+            self._clock_text = datetime.fromtimestamp(second).strftime("%Y-%m-%d %H:%M:%S")
+        return self._clock_text
+
+    def feed(self, ts, linktype, frame):
+        """Decodes one captured frame. Returns the AccessPoint it updated, or None."""
+        self.frames += 1
+        power = -1
+        channel = -1
+        end = len(frame)
+        if linktype == LINKTYPE_IEEE802_11_RADIOTAP:
+            radiotap = parse_radiotap(frame)
+            if radiotap is None:
+                return None
+            offset, power, channel, has_fcs = radiotap
+            if has_fcs:
+                end -= 4
+        elif linktype == LINKTYPE_IEEE802_11:
+            offset = 0
+        else:
+            return None
+        # 24-byte management header + 12 bytes of fixed beacon fields.
+        if end - offset < 36:
+            return None
+        fc = frame[offset]
+        if fc & 0x0C or (fc >> 4) not in (_SUBTYPE_BEACON, _SUBTYPE_PROBE_RESPONSE):
+            return None
+
+        self.decoded += 1
+        bssid = _mac(frame, offset + 16)
+        seen = self._timestamp(ts)
+        signature = (element_signature(frame, offset + 36, end), channel)
+        ap = self.registry.get(bssid)
+        if ap is not None and self._signatures.get(bssid) == signature:
+            ap.last_seen = seen
+            ap.beacons += 1
+            if power != -1:
+                ap.power = power
+            return ap
+
+        capability = struct.unpack_from("<H", frame, offset + 34)[0]
+        essid, id_length, ie_channel, privacy, cipher, authentication = parse_elements(frame, offset + 36, end, capability)
+        self._signatures[bssid] = signature
+        record = AccessPoint(
+            bssid,
+            first_seen=ap.first_seen if ap is not None else seen,
+            last_seen=seen,
+            channel=ie_channel if ie_channel > 0 else channel,
+            privacy=sys.intern(privacy),
+            cipher=sys.intern(cipher),
+            authentication=sys.intern(authentication),
+            power=power if power != -1 or ap is None else ap.power,
+            beacons=ap.beacons + 1 if ap is not None else 1,
+            id_length=id_length,
+            essid=essid,
+        )
+        self.registry.upsert(record)
+        return self.registry.get(bssid)
+
+    def feed_file(self, path, chunk_size=CHUNK_SIZE):
+        """Decodes every frame of a capture file. Returns the number of frames read."""
+        before = self.frames
+        with open(path, "rb") as fh:
+            for ts, linktype, frame in iter_frames(fh, chunk_size):
+                self.feed(ts, linktype, frame)
+        return self.frames - before
+
+
+def main(argv=None):
+    from wifiscan.registry import AccessPointRegistry
+
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("Usage: python3 -m wifiscan.pcap capture.pcap [capture2.pcapng ...]")
+        return 2
+    registry = AccessPointRegistry()
+    decoder = BeaconDecoder(registry)
+    start = time.perf_counter()
+    for path in argv:
+        decoder.feed_file(path)
+    elapsed = time.perf_counter() - start
+    for index, ap in enumerate(registry):
+        print(f"{index}\t{ap.bssid}\t{ap.channel}\t{ap.power}\t{ap.privacy}\t{ap.essid}")
+    print(f"{decoder.frames} frames ({decoder.decoded} beacons/probe responses), {len(registry)} APs "
+          f"in {elapsed:.2f} s ({decoder.frames / elapsed if elapsed else 0:.0f} frames/s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+"""
+Compact records for the rows airodump-ng writes.
+
+csv.DictReader gives one dict of 15 untrimmed strings per access point, and the
+script kept those dicts for the whole scan, calling .strip() on the channel
+every time the table was drawn. AccessPoint and Station store each field once,
+already cleaned up:
+
+- __slots__ instead of a per-instance __dict__;
+- numbers (channel, speed, power, beacons, ...) parsed to int when the row is
+  read, not on every render;
+- the few distinct values of Privacy, Cipher and Authentication (e.g. "WPA2",
+  "CCMP", "PSK") interned, so thousands of APs share the same string objects.
+
+Run benchmarks/records.py to see the memory used per AP by a dict row and by
+an AccessPoint.
+"""
+
+import functools
+import sys
+from datetime import datetime
+
+_intern = sys.intern
+
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _to_int(text, default=-1):
+    try:
+        return int(text)
+    except ValueError:
+        return default
+
+
+# Many rows share the same First/Last time seen second; parsing each distinct one once is enough.
+@functools.lru_cache(maxsize=4096)
+def parse_time(text):
+    """Seconds since the epoch for a time as airodump-ng writes it ("2025-03-16 05:00:00"), 0.0 if invalid."""
+    try:
+        return datetime.strptime(text, TIME_FORMAT).timestamp()
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class AccessPoint:
+    """One line of the access point section of an airodump-ng CSV file."""
+
+    __slots__ = ("bssid", "first_seen", "last_seen", "channel", "speed", "privacy", "cipher",
+                 "authentication", "power", "beacons", "iv", "lan_ip", "id_length", "essid", "key")
+
+    def __init__(self, bssid, first_seen="", last_seen="", channel=-1, speed=-1, privacy="", cipher="",
+                 authentication="", power=-1, beacons=0, iv=0, lan_ip="", id_length=0, essid="", key=""):
+        self.bssid = bssid
+        self.first_seen = first_seen
+        self.last_seen = last_seen
+        self.channel = channel
+        self.speed = speed
+        self.privacy = privacy
+        self.cipher = cipher
+        self.authentication = authentication
+        self.power = power
+        self.beacons = beacons
+        self.iv = iv
+        self.lan_ip = lan_ip
+        self.id_length = id_length
+        self.essid = essid
+        self.key = key
+
+    @classmethod
+    def from_fields(cls, fields):
+        """
+        Builds an AccessPoint from the list of raw column values of one CSV
+        line, in airodump-ng's column order (see wifiscan.ingest.AP_FIELDNAMES).
+        Returns None if the line has too few columns to be an access point.
+        """
+        if len(fields) < 14:
+            return None
+        return cls(
+            fields[0].strip(),
+            fields[1].strip(),
+            fields[2].strip(),
+            _to_int(fields[3].strip()),
+            _to_int(fields[4].strip()),
+            _intern(fields[5].strip()),
+            _intern(fields[6].strip()),
+            _intern(fields[7].strip()),
+            _to_int(fields[8].strip()),
+            _to_int(fields[9].strip(), 0),
+            _to_int(fields[10].strip(), 0),
+            fields[11].replace(" ", ""),
+            _to_int(fields[12].strip(), 0),
+            fields[13][1:] if fields[13].startswith(" ") else fields[13],
+            fields[14].strip() if len(fields) > 14 else "",
+        )
+
+    def update_from(self, other):
+        """Copies every field of other (an AccessPoint for the same BSSID) into self."""
+        for name in self.__slots__:
+            setattr(self, name, getattr(other, name))
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self):
+        return f"AccessPoint({self.bssid!r}, essid={self.essid!r}, channel={self.channel}, power={self.power})"
+
+
+class Station:
+    """One line of the station (client) section of an airodump-ng CSV file."""
+
+    __slots__ = ("mac", "first_seen", "last_seen", "power", "packets", "bssid", "probed")
+
+    def __init__(self, mac, first_seen="", last_seen="", power=-1, packets=0, bssid=None, probed=()):
+        self.mac = mac
+        self.first_seen = first_seen
+        self.last_seen = last_seen
+        self.power = power
+        self.packets = packets
+        # None when airodump-ng reports "(not associated)".
+        self.bssid = bssid
+        self.probed = probed
+
+    @classmethod
+    def from_fields(cls, fields):
+        """
+        Builds a Station from the raw column values of one line of the station
+        section. Returns None if the line has too few columns.
+        """
+        if len(fields) < 6:
+            return None
+        bssid = fields[5].strip()
+        if not bssid or bssid.startswith("("):
+            bssid = None
+        probed = tuple(_intern(essid.strip()) for essid in fields[6:] if essid.strip())
+        return cls(
+            fields[0].strip(),
+            fields[1].strip(),
+            fields[2].strip(),
+            _to_int(fields[3].strip()),
+            _to_int(fields[4].strip(), 0),
+            bssid,
+            probed,
+        )
+
+    def update_from(self, other):
+        """Copies every field of other (a Station with the same MAC) into self."""
+        for name in self.__slots__:
+            setattr(self, name, getattr(other, name))
+
+    def as_dict(self):
+        data = {name: getattr(self, name) for name in self.__slots__}
+        data["probed"] = list(self.probed)
+        return data
+
+    def __repr__(self):
+        return f"Station({self.mac!r}, bssid={self.bssid!r}, power={self.power})"
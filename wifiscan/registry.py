@@ -0,0 +1,86 @@
+"""
+The table of access points seen during a scan, keyed by BSSID.
+
+The original script kept a plain list and, for every CSV row, walked the whole
+list looking for the same ESSID. That cost O(rows x APs) per tick, dropped
+every additional AP broadcasting an ESSID that was already listed, and never
+refreshed Power or Last_time_seen after the first sighting.
+
+AccessPointRegistry keeps:
+
+- a dict BSSID -> AccessPoint, so adding or updating an AP is a single lookup;
+- a list of BSSIDs in the order they were first seen, so the table numbering
+  stays stable and registry[i] is still O(1);
+- a dict ESSID -> set of BSSIDs, for "which APs broadcast this name?".
+"""
+
+
+class AccessPointRegistry:
+    """
+    Access points keyed by BSSID, in first-seen order.
+
+    Iterating, len() and integer indexing behave like the list the script
+    used to keep, so the table and target selection code read the same.
+    """
+
+    def __init__(self):
+        self._by_bssid = {}
+        self._order = []
+        self._by_essid = {}
+
+    def __len__(self):
+        return len(self._order)
+
+    def __iter__(self):
+        by_bssid = self._by_bssid
+        for bssid in self._order:
+            yield by_bssid[bssid]
+
+    def __getitem__(self, index):
+        return self._by_bssid[self._order[index]]
+
+    def __contains__(self, bssid):
+        return bssid in self._by_bssid
+
+    def get(self, bssid, default=None):
+        return self._by_bssid.get(bssid, default)
+
+    def bssids_for_essid(self, essid):
+        """Returns the set of BSSIDs currently seen broadcasting essid."""
+        return frozenset(self._by_essid.get(essid, ()))
+
+    def upsert(self, ap):
+        """
+        Adds a new AccessPoint or updates the stored one for the same BSSID in
+        place.
+
+        Returns True if the BSSID had not been seen before, False if an
+        existing entry was updated.
+        """
+        bssid = ap.bssid
+        current = self._by_bssid.get(bssid)
+        if current is None:
+            self._by_bssid[bssid] = ap
+            self._order.append(bssid)
+            self._by_essid.setdefault(ap.essid, set()).add(bssid)
+            return True
+        if current.essid != ap.essid:
+            self._unlink_essid(current.essid, bssid)
+            self._by_essid.setdefault(ap.essid, set()).add(bssid)
+        current.update_from(ap)
+        return False
+
+    def update_many(self, aps):
+        """Upserts every AccessPoint and returns the number of newly seen APs."""
+        added = 0
+        for ap in aps:
+            if self.upsert(ap):
+                added += 1
+        return added
+
+    def _unlink_essid(self, essid, bssid):
+        members = self._by_essid.get(essid)
+        if members is not None:
+            members.discard(bssid)
+            if not members:
+                del self._by_essid[essid]
@@ -0,0 +1,263 @@
+"""
+Drawing the live table of access points.
+
+The scan loop used to fork a shell to run `clear` on every pass and then print
+the whole table again. That flickers, costs a fork per refresh and sends the
+full table over the terminal (or SSH connection) each time, however little
+changed.
+
+TableRenderer keeps the previous frame in memory and writes ANSI escape
+sequences that move the cursor to, and overwrite, only the cells whose text
+changed. It also:
+
+- shows only as many rows as fit in the terminal, with the arrow keys and
+  PgUp/PgDn scrolling through the rest;
+- sorts the table by first-seen order ("n"), channel ("c") or power ("p")
+  without changing the numbers shown in the No column, which are the ones
+  used to pick a network afterwards;
+- draws at most max_fps frames per second, however often new data arrives;
+- writes control characters in ESSIDs (any beacon in range can send them) as
+  "\\xNN" instead of passing them to the terminal, and lines columns up by
+  display width, so wide characters do not shift the cells after them.
+
+Given a SignalHistory (wifiscan/history.py), the table also shows the mean,
+minimum, median and maximum power of each AP over its recent updates, and
+given a VendorIndex (wifiscan/vendors.py), the manufacturer of each AP.
+"""
+
+import os
+import select
+import shutil
+import sys
+import time
+import unicodedata
+
+try:
+    import termios
+    import tty
+except ImportError:
+    termios = None
+
+CLEAR_SCREEN = "\x1b[H\x1b[2J"
+CLEAR_TO_EOL = "\x1b[K"
+
+# (title, width, alignment) of each column.
+COLUMNS = (("No", 4, ">"), ("BSSID", 17, "<"), ("CH", 3, ">"), ("PWR", 4, ">"), ("ESSID", 32, "<"))
+# Inserted before ESSID when a SignalHistory is given.
+HISTORY_COLUMNS = (("AVG", 4, ">"), ("MIN", 4, ">"), ("MED", 4, ">"), ("MAX", 4, ">"))
+# Inserted before ESSID when a VendorIndex is given.
+VENDOR_COLUMNS = (("VENDOR", 12, "<"),)
+
+SORT_KEYS = {
+    "n": ("first seen", None),
+    "c": ("channel", lambda item: (item[1].channel, item[0])),
+    # Strongest signal first; airodump-ng reports -1 when it has no reading.
+    "p": ("power", lambda item: (item[1].power >= -1, -item[1].power, item[0])),
+}
+
+_HEADER_LINES = 4
+
+# C0 and C1 control characters (and DEL) -> "\xNN": a newline would break the cursor positioning of the
+# cell updates, and an escape sequence would be obeyed by the terminal.
+_ESCAPES = {code: f"\\x{code:02x}" for code in (*range(0x20), *range(0x7F, 0xA0))}
+
+
+def _char_width(char):
+    if unicodedata.combining(char):
+        return 0
+    return 2 if unicodedata.east_asian_width(char) in "WF" else 1
+
+
+def _width(text):
+    """Columns text takes in the terminal (wide CJK characters take two, combining marks none)."""
+    if text.isascii():
+        return len(text)
+    return sum(_char_width(char) for char in text)
+
+
+def _clip(text, width):
+    """The longest start of text that fits in width columns."""
+    if text.isascii():
+        return text[:width]
+    used = 0
+    for index, char in enumerate(text):
+        used += _char_width(char)
+        if used > width:
+            return text[:index]
+    return text
+
+
+def _format_cells(values, columns=COLUMNS):
+    cells = []
+    for (_title, width, align), value in zip(columns, values):
+        text = str(value).translate(_ESCAPES)
+        used = _width(text)
+        if used > width:
+            text = _clip(text, width - 1) + "~"
+            used = _width(text)
+        padding = " " * (width - used)
+        cells.append(f"{padding}{text} " if align == ">" else f"{text}{padding} ")
+    return tuple(cells)
+
+
+class TableRenderer:
+    """
+    Incremental terminal renderer for an AccessPointRegistry (or any sequence
+    of AccessPoint records).
+    """
+
+    def __init__(self, out=None, max_fps=4.0, title="", keyboard=True, size=None, history=None, vendors=None):
+        self.out = out if out is not None else sys.stdout
+        self.history = history
+        self.vendors = vendors
+        self.columns = (COLUMNS[:-1] + (HISTORY_COLUMNS if history is not None else ())
+                        + (VENDOR_COLUMNS if vendors is not None else ()) + COLUMNS[-1:])
+        self.min_interval = 1.0 / max_fps if max_fps else 0.0
+        self.title = title
+        self.size = size
+        self.sort = "n"
+        self.scroll = 0
+        self.frames = 0
+        self.bytes_written = 0
+        self._previous = None
+        self._last_frame = 0.0
+        self._dirty = True
+        self._status_lines = 1
+        self._saved_tty = None
+        self.input_fd = None
+        if keyboard and termios is not None and sys.stdin.isatty():
+            self.input_fd = sys.stdin.fileno()
+            self._saved_tty = termios.tcgetattr(self.input_fd)
+            tty.setcbreak(self.input_fd)
+
+    def _page_height(self):
+        lines = (self.size or shutil.get_terminal_size())[1]
+        return max(1, lines - _HEADER_LINES - self._status_lines)
+
+    def handle_keys(self):
+        """Reads any pending key presses and applies sorting and scrolling."""
+        if self.input_fd is None:
+            return
+        while select.select([self.input_fd], [], [], 0)[0]:
+            keys = os.read(self.input_fd, 64).decode(errors="ignore")
+            if not keys:
+                return
+            page = self._page_height()
+            for key in keys.replace("\x1b[A", "k").replace("\x1b[B", "j").replace("\x1b[5~", "u").replace("\x1b[6~", "d"):
+                if key in SORT_KEYS:
+                    self.sort = key
+                elif key == "k":
+                    self.scroll -= 1
+                elif key == "j":
+                    self.scroll += 1
+                elif key == "u":
+                    self.scroll -= page
+                elif key == "d":
+                    self.scroll += page
+                else:
+                    continue
+                self._dirty = True
+
+    def next_frame_delay(self):
+        """Seconds until the frame rate cap allows another frame."""
+        return max(0.0, self._last_frame + self.min_interval - time.monotonic())
+
+    @property
+    def pending(self):
+        """True if the table changed since the last frame that was drawn."""
+        return self._dirty
+
+    @property
+    def wake_fds(self):
+        """File descriptors whose input should wake the scan loop (the terminal, for key presses)."""
+        return () if self.input_fd is None else (self.input_fd,)
+
+    def invalidate(self):
+        """Marks the table as changed, so the next render() call draws a frame."""
+        self._dirty = True
+
+    def render(self, aps, status="", force=False):
+        """
+        Draws the table if it changed and the frame rate cap allows it.
+        status is one line, or a list of lines, shown under the table.
+        Returns True if a frame was drawn.
+        """
+        if not (self._dirty or force):
+            return False
+        if not force and self.next_frame_delay() > 0:
+            return False
+
+        status = [status] if isinstance(status, str) else list(status)
+        self._status_lines = max(1, len(status))
+        columns, _lines = self.size or shutil.get_terminal_size()
+        page = self._page_height()
+        items = list(enumerate(aps))
+        key = SORT_KEYS[self.sort][1]
+        if key is not None:
+            items.sort(key=key)
+        self.scroll = max(0, min(self.scroll, len(items) - page))
+        visible = items[self.scroll:self.scroll + page]
+
+        first = self.scroll + 1 if visible else 0
+        frame = [
+            (self.title.translate(_ESCAPES),),
+            (f"Sort: {SORT_KEYS[self.sort][0]} ([n]o, [c]hannel, [p]ower)   Rows {first}-{self.scroll + len(visible)} of {len(items)} (arrows, PgUp/PgDn)",),
+            _format_cells((title for title, _width, _align in self.columns), self.columns),
+            _format_cells(("_" * width for _title, width, _align in self.columns), self.columns),
+        ]
+        history, vendors = self.history, self.vendors
+        for index, ap in visible:
+            if history is None and vendors is None:
+                frame.append(_format_cells((index, ap.bssid, ap.channel, ap.power, ap.essid)))
+                continue
+            values = [index, ap.bssid, ap.channel, ap.power]
+            if history is not None:
+                summary = history.summary(ap.bssid)
+                values.extend(("", "", "", "") if summary is None else (round(summary[0]), *summary[1:]))
+            if vendors is not None:
+                values.append(vendors.lookup(ap.bssid) or "")
+            values.append(ap.essid)
+            frame.append(_format_cells(values, self.columns))
+        frame.extend((line.translate(_ESCAPES),) for line in status)
+
+        self._write(self._diff(frame, columns))
+        self._previous = frame
+        self._last_frame = time.monotonic()
+        self._dirty = False
+        self.frames += 1
+        return True
+
+    def _diff(self, frame, columns):
+        previous = self._previous
+        parts = []
+        if previous is None:
+            parts.append(CLEAR_SCREEN)
+            previous = []
+        for y, cells in enumerate(frame):
+            old = previous[y] if y < len(previous) else None
+            if old == cells:
+                continue
+            if old is None or len(cells) == 1 or len(old) != len(cells):
+                parts.append(f"\x1b[{y + 1};1H{_clip(''.join(cells), columns)}{CLEAR_TO_EOL}")
+                continue
+            x = 0
+            for new_cell, old_cell in zip(cells, old):
+                if new_cell != old_cell and x < columns:
+                    parts.append(f"\x1b[{y + 1};{x + 1}H{_clip(new_cell, columns - x)}")
+                x += _width(new_cell)
+        for y in range(len(frame), len(previous)):
+            parts.append(f"\x1b[{y + 1};1H{CLEAR_TO_EOL}")
+        # Park the cursor under the table.
+        parts.append(f"\x1b[{len(frame) + 1};1H")
+        return "".join(parts)
+
+    def _write(self, text):
+        self.out.write(text)
+        self.out.flush()
+        self.bytes_written += len(text.encode())
+
+    def close(self):
+        """Restores the terminal settings changed for keyboard input."""
+        if self._saved_tty is not None:
+            termios.tcsetattr(self.input_fd, termios.TCSADRAIN, self._saved_tty)
+            self._saved_tty = None
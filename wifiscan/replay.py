@@ -0,0 +1,149 @@
+"""
+Feeding recorded scans back through the scan loop.
+
+Everything in the live scan depends on iwconfig, airmon-ng and a running
+airodump-ng, which makes the ingestion and display code impossible to test or
+tune away from the hardware. A Replayer plays the part of airodump-ng instead:
+from a background thread it writes airodump-ng-style CSV output into a
+directory, and the scan loop reads that directory exactly as it would read
+airodump-ng's.
+
+Two kinds of recordings can be replayed:
+
+- a directory of CSV snapshots (e.g. copies of file-01.csv taken during a
+  scan, or the output of benchmarks/dataset.py with ticks > 1). They are
+  replayed in name order, spaced by the differences between their
+  modification times (one second apart if those are all equal);
+- a pcap/pcapng capture. Its beacons are decoded with wifiscan.pcap and the
+  resulting table is written out once per second of capture time, as
+  airodump-ng does with --write-interval 1.
+
+speed=1 replays at the original timing, speed=N N times faster and speed=0 as
+fast as possible.
+"""
+
+import os
+import threading
+import time
+
+from wifiscan.pcap import BeaconDecoder, iter_frames
+from wifiscan.registry import AccessPointRegistry
+
+AP_HEADER = "BSSID, First time seen, Last time seen, channel, Speed, Privacy, Cipher, Authentication, Power, # beacons, # IV, LAN IP, ID-length, ESSID, Key"
+STATION_HEADER = "Station MAC, First time seen, Last time seen, Power, # packets, BSSID, Probed ESSIDs"
+
+# Spacing of snapshots whose modification times carry no information.
+DEFAULT_INTERVAL = 1.0
+
+
+def format_access_point(ap):
+    """One access point line in airodump-ng's CSV layout."""
+    lan_ip = ".".join(f"{part:>3}" for part in (ap.lan_ip or "0.0.0.0").split("."))
+    return (f"{ap.bssid}, {ap.first_seen}, {ap.last_seen}, {ap.channel:2d}, {ap.speed:3d}, {ap.privacy:<4}, "
+            f"{ap.cipher:<4}, {ap.authentication:<3}, {ap.power:3d}, {ap.beacons:8d}, {ap.iv:8d}, {lan_ip}, "
+            f"{ap.id_length:3d}, {ap.essid}, {ap.key}")
+
+
+def format_station(station):
+    """One station line in airodump-ng's CSV layout."""
+    bssid = station.bssid or "(not associated) "
+    return (f"{station.mac}, {station.first_seen}, {station.last_seen}, {station.power:3d}, {station.packets:8d}, "
+            f"{bssid}, {','.join(station.probed)}")
+
+
+def write_airodump_csv(path, aps, stations=()):
+    """
+    Writes access points (and stations) to path the way airodump-ng does:
+    rewriting the file in place rather than replacing it.
+    """
+    lines = ["", AP_HEADER]
+    lines.extend(format_access_point(ap) for ap in aps)
+    lines.extend(["", STATION_HEADER])
+    lines.extend(format_station(station) for station in stations)
+    lines.append("")
+    with open(path, "w", encoding="utf-8", newline="") as fh:
+        fh.write("\r\n".join(lines) + "\r\n")
+
+
+class Replayer:
+    """
+    Replays a snapshot directory or a capture file into output_dir/name from a
+    background thread. Call start(), and stop() to end early; finished is set
+    once the whole recording has been written.
+    """
+
+    def __init__(self, source, output_dir, speed=1.0, name="replay-01.csv"):
+        self.source = source
+        self.output = os.path.join(output_dir, name)
+        self.speed = speed
+        self.finished = threading.Event()
+        self.snapshots_written = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="replay", daemon=True)
+        self._start = None
+        self._origin = None
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _sleep_until(self, recorded_time):
+        """Waits until recorded_time (in the recording's clock) is due, given the speed."""
+        if self._origin is None:
+            self._origin = recorded_time
+            self._start = time.monotonic()
+            return not self._stop.is_set()
+        if self.speed <= 0:
+            return not self._stop.is_set()
+        due = self._start + (recorded_time - self._origin) / self.speed
+        delay = due - time.monotonic()
+        if delay > 0:
+            return not self._stop.wait(delay)
+        return not self._stop.is_set()
+
+    def _run(self):
+        try:
+            if os.path.isdir(self.source):
+                self._replay_snapshots()
+            else:
+                self._replay_capture()
+        finally:
+            self.finished.set()
+
+    def _replay_snapshots(self):
+        names = sorted(name for name in os.listdir(self.source) if ".csv" in name)
+        paths = [os.path.join(self.source, name) for name in names]
+        mtimes = [os.path.getmtime(path) for path in paths]
+        if len(set(mtimes)) <= 1:
+            mtimes = [index * DEFAULT_INTERVAL for index in range(len(paths))]
+        for path, mtime in zip(paths, mtimes):
+            if not self._sleep_until(mtime):
+                return
+            with open(path, "rb") as src:
+                data = src.read()
+            with open(self.output, "wb") as dst:
+                dst.write(data)
+            self.snapshots_written += 1
+
+    def _replay_capture(self):
+        registry = AccessPointRegistry()
+        decoder = BeaconDecoder(registry)
+        next_write = None
+        with open(self.source, "rb") as fh:
+            for ts, linktype, frame in iter_frames(fh):
+                if next_write is None:
+                    next_write = ts + DEFAULT_INTERVAL
+                elif ts >= next_write:
+                    if not self._sleep_until(next_write):
+                        return
+                    write_airodump_csv(self.output, registry)
+                    self.snapshots_written += 1
+                    next_write += DEFAULT_INTERVAL * max(1, int((ts - next_write) // DEFAULT_INTERVAL) + 1)
+                decoder.feed(ts, linktype, frame)
+        if next_write is not None and self._sleep_until(next_write):
+            write_airodump_csv(self.output, registry)
+            self.snapshots_written += 1
@@ -0,0 +1,274 @@
+"""
+Spotting evil twins and other rogue access points.
+
+The original script's check_for_essid() dropped every AP whose ESSID was
+already in the table, but a second BSSID broadcasting a known name is exactly
+what an evil twin looks like. RogueDetector keeps an index
+
+    ESSID -> {BSSID: (channel, privacy, vendor)}
+
+up to date from the events of a ChangeTracker (wifiscan/events.py), so each
+tick costs time proportional to the APs that appeared or changed, and raises
+a RogueAlert when:
+
+- "encryption": a BSSID broadcasts a known ESSID with an encryption none of
+  its other BSSIDs use (e.g. an open clone of a WPA2 network), or a known
+  BSSID changes its encryption. Severity "high". A BSSID that raised it does
+  not make its encryption one the network uses;
+- "new-bssid": a known ESSID shows up on a new BSSID. Severity "medium" if
+  the BSSID is unrelated to the ones already seen for it (a different vendor
+  and OUI, and not a neighbouring address of the same radio: virtual BSSIDs
+  differ only in the first or last bytes), "low" if it is related: additional
+  APs of a mesh or enterprise network come from the same vendor, but so does
+  an evil twin cloning the OUI of the real AP;
+- "channel": a known BSSID moves to another channel, as when a rogue relays
+  a cloned BSSID on a different channel, or a related new BSSID shows up on
+  a channel none of the known ones use. Severity "medium".
+
+Hidden ESSIDs are not indexed, and neither are ESSIDs whose length differs
+from the ID-length column: a name read wrong would otherwise be taken for
+another network. ESSIDs with commas, quotes or newlines are read whole by
+wifiscan/airodump.py (csv.reader cut them short, so such networks were never
+checked). Vendors come from a VendorIndex (wifiscan/vendors.py) when one is
+given; the OUI alone is compared otherwise.
+
+Recorded CSV files (e.g. the ones in backup/) can be checked offline, oldest
+first; the exit status is 1 if there were alerts.
+
+Usage:
+    python3 -m wifiscan.rogue [--min-severity low] [--oui manuf] backup/*.csv
+"""
+
+import argparse
+import os
+import sys
+
+from wifiscan.events import APPEARED, UPDATED, ChangeTracker
+from wifiscan.ingest import read_access_points
+from wifiscan.vendors import PRIVATE, VendorIndex
+
+ENCRYPTION = "encryption"
+NEW_BSSID = "new-bssid"
+CHANNEL = "channel"
+SEVERITIES = ("low", "medium", "high")
+
+# An "updated" event only matters here if one of these fields changed.
+_RELEVANT_FIELDS = frozenset(("essid", "channel", "privacy"))
+
+
+class RogueAlert:
+    __slots__ = ("kind", "severity", "essid", "bssid", "time", "detail")
+
+    def __init__(self, kind, severity, essid, bssid, time, detail):
+        self.kind = kind
+        self.severity = severity
+        self.essid = essid
+        self.bssid = bssid
+        # Seconds since the epoch, on the capture's clock.
+        self.time = time
+        self.detail = detail
+
+    def as_dict(self):
+        return {"event": "rogue", "kind": self.kind, "severity": self.severity, "essid": self.essid,
+                "bssid": self.bssid, "time": self.time, "detail": self.detail}
+
+    def describe(self):
+        return f"[{self.severity}] {self.essid!r} on {self.bssid}: {self.detail}"
+
+    def __repr__(self):
+        return f"RogueAlert({self.kind!r}, {self.severity!r}, {self.essid!r}, {self.bssid!r})"
+
+
+def _comparable(ap):
+    """False for hidden ESSIDs and ESSIDs that do not match their ID-length."""
+    essid = ap.essid
+    if not essid or essid.startswith("\x00") or essid.startswith("<length:"):
+        return False
+    return ap.id_length <= 0 or len(essid.encode()) == ap.id_length
+
+
+class _Network:
+    """The BSSIDs seen for one ESSID."""
+
+    __slots__ = ("bssids", "keys", "privacies", "suspects")
+
+    def __init__(self):
+        self.bssids = {}
+        # Reference counts of the vendors, OUIs and address suffixes of the BSSIDs.
+        self.keys = {}
+        # Reference counts of the encryptions of the BSSIDs, but for the suspects: those that raised an
+        # "encryption" alert.
+        self.privacies = {}
+        self.suspects = set()
+
+    def add(self, bssid, entry, suspect=False):
+        self.bssids[bssid] = entry
+        for key in _keys(bssid, entry[2]):
+            self.keys[key] = self.keys.get(key, 0) + 1
+        if suspect:
+            self.suspects.add(bssid)
+        else:
+            self.privacies[entry[1]] = self.privacies.get(entry[1], 0) + 1
+
+    def remove(self, bssid):
+        """Removes bssid; returns whether it was a suspect."""
+        entry = self.bssids.pop(bssid)
+        for key in _keys(bssid, entry[2]):
+            if self.keys[key] == 1:
+                del self.keys[key]
+            else:
+                self.keys[key] -= 1
+        if bssid in self.suspects:
+            self.suspects.discard(bssid)
+            return True
+        if self.privacies[entry[1]] == 1:
+            del self.privacies[entry[1]]
+        else:
+            self.privacies[entry[1]] -= 1
+        return False
+
+    def related(self, bssid, vendor):
+        return any(key in self.keys for key in _keys(bssid, vendor))
+
+    def channels(self):
+        return sorted({entry[0] for entry in self.bssids.values() if entry[0] > 0})
+
+
+def _keys(bssid, vendor):
+    keys = [bssid[:8].upper(), "~" + bssid[3:14].upper()]
+    if vendor and vendor != PRIVATE:
+        keys.append("@" + vendor)
+    return keys
+
+
+class RogueDetector:
+    """
+    Subscribe on_events to a ChangeTracker; alerts are kept in alerts (the
+    most recent `keep`) and passed to subscribers as a list per tick.
+    """
+
+    def __init__(self, vendors=None, min_severity="medium", keep=100):
+        self.vendors = vendors
+        self.min_severity = SEVERITIES.index(min_severity)
+        self.keep = keep
+        self.alerts = []
+        self.counts = {ENCRYPTION: 0, NEW_BSSID: 0, CHANNEL: 0}
+        self._networks = {}
+        self._essid_of = {}
+        self._subscribers = []
+
+    def __len__(self):
+        """Number of ESSIDs indexed."""
+        return len(self._networks)
+
+    def bssids(self, essid):
+        """{BSSID: (channel, privacy, vendor)} of the BSSIDs seen broadcasting essid."""
+        network = self._networks.get(essid)
+        return dict(network.bssids) if network else {}
+
+    def subscribe(self, callback):
+        """Calls callback(alerts) with the (non-empty) list of alerts of every tick. Returns callback."""
+        self._subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        self._subscribers.remove(callback)
+
+    def on_events(self, events):
+        """Updates the index from a tick's ChangeEvents and delivers and returns the alerts raised."""
+        alerts = []
+        for event in events:
+            if event.kind == APPEARED or (event.kind == UPDATED and not _RELEVANT_FIELDS.isdisjoint(event.changes)):
+                self._observe(event.ap, event.time, alerts)
+        alerts = [alert for alert in alerts if SEVERITIES.index(alert.severity) >= self.min_severity]
+        if alerts:
+            for alert in alerts:
+                self.counts[alert.kind] += 1
+            self.alerts.extend(alerts)
+            del self.alerts[:-self.keep]
+            for callback in self._subscribers:
+                callback(alerts)
+        return alerts
+
+    def _vendor(self, bssid):
+        return self.vendors.lookup(bssid) if self.vendors is not None else None
+
+    def _observe(self, ap, time, alerts):
+        bssid, essid = ap.bssid, ap.essid
+        previous_essid = self._essid_of.get(bssid)
+        if previous_essid is not None and previous_essid != essid:
+            old = self._networks[previous_essid]
+            old.remove(bssid)
+            if not old.bssids:
+                del self._networks[previous_essid]
+            del self._essid_of[bssid]
+        if not _comparable(ap):
+            return
+        self._essid_of[bssid] = essid
+        vendor = self._vendor(bssid)
+        entry = (ap.channel, ap.privacy, vendor)
+        network = self._networks.get(essid)
+        if network is None:
+            network = self._networks[essid] = _Network()
+            network.add(bssid, entry)
+            return
+
+        known = network.bssids.get(bssid)
+        if known is None:
+            suspect = bool(network.privacies) and ap.privacy not in network.privacies
+            channels = network.channels()
+            listed = ", ".join(map(str, channels)) or "unknown"
+            if suspect:
+                alerts.append(RogueAlert(ENCRYPTION, "high", essid, bssid, time,
+                                         f"new BSSID with {ap.privacy or 'no'} encryption, network uses "
+                                         f"{' / '.join(sorted(network.privacies))}"))
+            elif not network.related(bssid, vendor):
+                alerts.append(RogueAlert(NEW_BSSID, "medium", essid, bssid, time,
+                                         f"new BSSID from {vendor or bssid[:8]} on channel {ap.channel}, "
+                                         f"{len(network.bssids)} known on channel {listed}"))
+            elif ap.channel > 0 and channels and ap.channel not in channels:
+                alerts.append(RogueAlert(CHANNEL, "medium", essid, bssid, time,
+                                         f"new BSSID related to a known one on channel {ap.channel}, "
+                                         f"network on channel {listed}"))
+            else:
+                alerts.append(RogueAlert(NEW_BSSID, "low", essid, bssid, time,
+                                         f"new BSSID related to a known one on channel {ap.channel}, "
+                                         f"{len(network.bssids)} known"))
+        else:
+            suspect = network.remove(bssid)
+            if ap.privacy != known[1]:
+                suspect = True
+                alerts.append(RogueAlert(ENCRYPTION, "high", essid, bssid, time,
+                                         f"encryption changed from {known[1]} to {ap.privacy or 'none'}"))
+            if ap.channel > 0 and known[0] > 0 and ap.channel != known[0]:
+                alerts.append(RogueAlert(CHANNEL, "medium", essid, bssid, time,
+                                         f"moved from channel {known[0]} to {ap.channel}"))
+        network.add(bssid, entry, suspect)
+
+    def status_line(self):
+        if not self.alerts:
+            return f"Rogue AP check: no alerts ({len(self._networks)} ESSIDs)"
+        return f"Rogue AP check: {sum(self.counts.values())} alerts, last {self.alerts[-1].describe()}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python3 -m wifiscan.rogue", description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("paths", nargs="+", metavar="csv", help="airodump-ng CSV files, oldest first")
+    parser.add_argument("--min-severity", choices=SEVERITIES, default="medium")
+    parser.add_argument("--oui", help="OUI/manuf file for the vendor comparison")
+    args = parser.parse_args(argv)
+    for path in [args.oui] * bool(args.oui) + args.paths:
+        if not os.access(path, os.R_OK):
+            parser.error(f"cannot read {path}")
+    tracker = ChangeTracker(age_out=None)
+    detector = RogueDetector(VendorIndex(args.oui), args.min_severity)
+    tracker.subscribe(detector.on_events)
+    detector.subscribe(lambda alerts: print("\n".join(alert.describe() for alert in alerts)))
+    for path in args.paths:
+        tracker.update(read_access_points(path))
+    print(f"{sum(detector.counts.values())} alerts for {len(tracker)} BSSIDs in {len(detector)} ESSIDs", file=sys.stderr)
+    return 1 if detector.alerts else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
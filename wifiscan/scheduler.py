@@ -0,0 +1,186 @@
+"""
+Running ingestion, analysis and drawing at their own rates.
+
+The scan loop used to do everything in one pass: read the changed rows,
+update the registry, analyze the channels and draw the table, then wait for
+the next write. A slow redraw (a big table over SSH) therefore held up
+ingestion, and the analysis ran as often as airodump-ng wrote, needed or
+not. Scheduler runs each of them as a separate task:
+
+- interval is the shortest time between two runs of a task (its rate cap);
+- idle, if set, is the longest: a task nobody triggers still runs that often
+  (None: only when triggered);
+- trigger(name) asks for a run as soon as the rate cap allows, e.g. the
+  ingest task triggers the render task when rows changed.
+
+A task can adapt its own rates after each run through an adapter:
+
+- CadenceAdapter (ingestion): airodump-ng writes every --write-interval, and
+  the watcher wakes the ingest task on every write. Its idle period is the
+  fallback for writes the watcher misses, and follows the cadence actually
+  seen: twice the smoothed time between writes that brought rows, backing
+  off by half again on every run that found nothing, up to max_idle. An
+  idle environment therefore wakes the process less and less often.
+- CostAdapter (drawing): the time a frame takes is mostly the terminal
+  taking the output. The interval is set so that drawing uses at most
+  `budget` of the time (a 40 ms frame with budget 0.1 means at most one
+  frame every 0.4 s), between min_interval and max_interval.
+
+A run that starts more than one interval (or `slack` seconds, for tasks
+without a rate cap) after it was due, or takes longer than its interval, is
+an overrun: the task could not keep to its rate. Runs, overruns, lateness and
+the current interval of each task are kept in the ScanStats
+(wifiscan/stats.py) given to the scheduler, so they appear in the status line
+and in the --stats file.
+
+    scheduler = Scheduler(stats)
+    scheduler.add("ingest", ingest, idle=1.0, adapter=CadenceAdapter())
+    scheduler.add("render", render, interval=0.25, idle=5.0, adapter=CostAdapter())
+    scheduler.run(wait)   # wait(timeout) blocks until something happens
+"""
+
+import math
+import time
+
+
+class PeriodicTask:
+    __slots__ = ("name", "callback", "interval", "idle", "adapter", "next_due", "last_run", "triggered", "stats")
+
+    def __init__(self, name, callback, interval, idle, adapter, stats):
+        self.name = name
+        self.callback = callback
+        self.interval = interval
+        self.idle = idle
+        self.adapter = adapter
+        self.next_due = math.inf
+        self.last_run = -math.inf
+        self.triggered = False
+        # The TaskStats in the scheduler's ScanStats, or None.
+        self.stats = stats
+
+    def __repr__(self):
+        return f"PeriodicTask({self.name!r}, interval={self.interval}, idle={self.idle})"
+
+
+class CadenceAdapter:
+    """Sets a task's idle period from the spacing of the runs whose callback returned something truthy."""
+
+    def __init__(self, min_idle=0.5, max_idle=30.0, backoff=1.5, smoothing=0.3):
+        self.min_idle = min_idle
+        self.max_idle = max_idle
+        self.backoff = backoff
+        self.smoothing = smoothing
+        # Smoothed seconds between productive runs, once two have been seen.
+        self.cadence = None
+        self._last_change = None
+
+    def __call__(self, task, now, duration, result):
+        if result:
+            if self._last_change is not None:
+                gap = now - self._last_change
+                self.cadence = gap if self.cadence is None else self.cadence + self.smoothing * (gap - self.cadence)
+            self._last_change = now
+            idle = 2 * self.cadence if self.cadence is not None else task.idle
+        else:
+            idle = task.idle * self.backoff
+        task.idle = min(self.max_idle, max(self.min_idle, idle))
+
+
+class CostAdapter:
+    """Sets a task's interval so that its runs take at most `budget` of the time."""
+
+    def __init__(self, budget=0.1, min_interval=0.25, max_interval=2.0, smoothing=0.3):
+        self.budget = budget
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.smoothing = smoothing
+        self.cost = None
+
+    def __call__(self, task, now, duration, result):
+        # Runs that had nothing to do (the callback returned a falsy value) say nothing about the cost.
+        if not result:
+            return
+        self.cost = duration if self.cost is None else self.cost + self.smoothing * (duration - self.cost)
+        task.interval = min(self.max_interval, max(self.min_interval, self.cost / self.budget))
+
+
+class Scheduler:
+    """Runs named tasks at their own rates; see the module docstring."""
+
+    def __init__(self, stats=None, slack=0.1, clock=time.monotonic):
+        self.stats = stats
+        self.slack = slack
+        self.clock = clock
+        self.tasks = {}
+        self._stopping = False
+
+    def add(self, name, callback, interval=0.0, idle=None, adapter=None):
+        """
+        Adds a task calling callback() (its return value is passed to the
+        adapter). It first runs right away if it has an idle period, and when
+        triggered otherwise. Returns the PeriodicTask.
+        """
+        stats = self.stats.task(name) if self.stats is not None else None
+        task = self.tasks[name] = PeriodicTask(name, callback, interval, idle, adapter, stats)
+        if idle is not None:
+            task.next_due = self.clock()
+        return task
+
+    def trigger(self, name):
+        """Asks for a run of the task as soon as its interval allows."""
+        task = self.tasks[name]
+        task.triggered = True
+        due = max(self.clock(), task.last_run + task.interval)
+        if due < task.next_due:
+            task.next_due = due
+
+    def next_delay(self):
+        """Seconds until the next task is due (0 if one is overdue), or None if none is scheduled."""
+        due = min((task.next_due for task in self.tasks.values()), default=math.inf)
+        if due == math.inf:
+            return None
+        return max(0.0, due - self.clock())
+
+    def run_due(self):
+        """Runs every task that is due, in the order they were added. Returns how many ran."""
+        ran = 0
+        for task in self.tasks.values():
+            if task.next_due <= self.clock():
+                self._run(task)
+                ran += 1
+        return ran
+
+    def run(self, wait):
+        """
+        Runs tasks as they come due until stop() is called, calling
+        wait(timeout) in between (timeout None: nothing is scheduled).
+        """
+        self._stopping = False
+        while True:
+            self.run_due()
+            if self._stopping:
+                break
+            wait(self.next_delay())
+        # Whatever was asked for before stopping (e.g. the last frame) still runs once.
+        for task in self.tasks.values():
+            if task.triggered:
+                self._run(task)
+
+    def stop(self):
+        """Ends run() after the current pass."""
+        self._stopping = True
+
+    def _run(self, task):
+        start = self.clock()
+        late = start - task.next_due
+        result = task.callback()
+        end = self.clock()
+        duration = end - start
+        task.last_run = start
+        task.triggered = False
+        if task.adapter is not None:
+            task.adapter(task, start, duration, result)
+        task.next_due = end + task.idle if task.idle is not None else math.inf
+        if task.stats is not None:
+            limit = task.interval or self.slack
+            task.stats.add(duration, max(0.0, late), late > limit or duration > limit, task.interval, task.idle)
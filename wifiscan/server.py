@@ -0,0 +1,309 @@
+"""
+A local HTTP/WebSocket view of the scan, for wall displays and monitoring.
+
+The only view of a running scan used to be the terminal the script runs in.
+StatusServer serves the access point registry from an asyncio event loop in
+a background thread (like CaptureSupervisor in wifiscan/supervisor.py), with
+nothing but the standard library:
+
+- GET /aps (or /) returns every AP seen so far as JSON:
+  {"type": "snapshot", "tick": N, "aps": [AccessPoint.as_dict(), ...]};
+- GET /status returns the tick, the number of APs and WebSocket subscribers
+  and how many times each message was encoded;
+- a WebSocket on /ws first receives the snapshot, then one message per tick
+  that changed anything: {"type": "delta", "tick": N, "aps": [...],
+  "disappeared": [BSSID, ...]}. An AP seen for the first time comes with
+  all its fields, a known one with its BSSID and only the fields that
+  changed, so a client keeping a dict per BSSID and updating it with each
+  entry has the same registry as /aps. Disappeared APs (not seen for
+  --age-out seconds) are listed, but stay in the registry as they stay in
+  the table.
+
+The scan loop calls publish() with the APs changed in each tick; everything
+else happens on the event loop, which keeps its own copy of the registry as
+dicts, so the scan never waits for a viewer and the registry is never read
+from two threads. Serialization is done once per tick, not per viewer: the
+delta is encoded and framed once and the same bytes written to every
+subscriber, and the snapshot is encoded on the first request after a tick
+and served from the cache until the next one. A subscriber that does not
+keep up (more than max_buffer bytes waiting to be sent) is disconnected
+rather than buffered for without limit.
+
+The server listens on 127.0.0.1 unless told otherwise. On a loopback address
+every request must be addressed to it by a loopback name (a Host header of
+127.0.0.1, localhost or [::1], with the port): a page open in a browser can
+get its own host name resolved to 127.0.0.1 (DNS rebinding), but its
+requests then carry that name and are refused. WebSocket handshakes from a
+web page of another site (an Origin header that does not match the Host) are
+refused too.
+
+    server = StatusServer(port=8080).start()
+    server.publish(changed_aps, events)   # once per tick
+    server.stop()
+"""
+
+import asyncio
+import base64
+import hashlib
+import ipaddress
+import json
+import threading
+
+from wifiscan.events import DISAPPEARED
+
+# Appended to the client's key to compute Sec-WebSocket-Accept (RFC 6455, section 4.2.2).
+WEBSOCKET_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+OP_TEXT, OP_CLOSE, OP_PING, OP_PONG = 0x1, 0x8, 0x9, 0xA
+# Viewers only send control frames; anything larger is not one of ours.
+MAX_CLIENT_FRAME = 1 << 16
+_LOOPBACK_NAMES = ("127.0.0.1", "localhost", "[::1]")
+_REASONS = {200: "OK", 400: "Bad Request", 403: "Forbidden", 404: "Not Found", 405: "Method Not Allowed"}
+
+
+def websocket_frame(payload, opcode=OP_TEXT):
+    """One unmasked, unfragmented WebSocket frame, as a server sends it."""
+    length = len(payload)
+    if length < 126:
+        header = bytes((0x80 | opcode, length))
+    elif length < 1 << 16:
+        header = bytes((0x80 | opcode, 126)) + length.to_bytes(2, "big")
+    else:
+        header = bytes((0x80 | opcode, 127)) + length.to_bytes(8, "big")
+    return header + payload
+
+
+async def read_websocket_frame(reader, max_length=MAX_CLIENT_FRAME):
+    """Reads one frame (masked or not) and returns (opcode, payload). Raises ValueError if it is too large."""
+    head = await reader.readexactly(2)
+    length = head[1] & 0x7F
+    if length == 126:
+        length = int.from_bytes(await reader.readexactly(2), "big")
+    elif length == 127:
+        length = int.from_bytes(await reader.readexactly(8), "big")
+    if length > max_length:
+        raise ValueError(f"WebSocket frame of {length} bytes")
+    mask = await reader.readexactly(4) if head[1] & 0x80 else b""
+    payload = await reader.readexactly(length)
+    if mask:
+        payload = bytes(byte ^ mask[index & 3] for index, byte in enumerate(payload))
+    return head[0] & 0x0F, payload
+
+
+class StatusServer:
+    """Serves the registry as JSON and pushes delta-encoded updates over WebSocket; see the module docstring."""
+
+    def __init__(self, host="127.0.0.1", port=8080, max_buffer=1 << 20):
+        self.host = host
+        # With port 0, the port picked by the system once started.
+        self.port = port
+        self.max_buffer = max_buffer
+        self.tick = 0
+        self.snapshots_encoded = 0
+        self.deltas_encoded = 0
+        self.dropped = 0
+        # StreamWriters of the WebSocket subscribers, and of every open connection (event loop thread only).
+        self.subscribers = set()
+        self._connections = set()
+        # BSSID -> AccessPoint.as_dict() as last published (event loop thread only).
+        self._state = {}
+        # [tick, JSON body, WebSocket frame or None] of the snapshot, encoded on first use after each tick.
+        self._snapshot = None
+        self._loop = None
+        self._server = None
+        self._error = None
+        # Accepted Host headers, set once listening (None: any).
+        self._hosts = None
+        self._thread = threading.Thread(target=self._run, name="status-server", daemon=True)
+        self._ready = threading.Event()
+
+    @property
+    def url(self):
+        host = f"[{self.host}]" if ":" in self.host else self.host
+        return f"http://{host}:{self.port}/"
+
+    def start(self):
+        """Starts listening; raises OSError if the address cannot be used (e.g. the port is taken)."""
+        self._thread.start()
+        self._ready.wait()
+        if self._error is not None:
+            raise self._error
+        return self
+
+    def stop(self, timeout=None):
+        """Closes the WebSocket connections and stops the server thread."""
+        if self._loop is not None and self._thread.is_alive():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout)
+
+    def publish(self, aps, events=()):
+        """
+        Hands the APs changed in this tick (and the ChangeTracker events, for
+        the disappeared ones) to the server. Called from the scan loop.
+        """
+        rows = [ap.as_dict() for ap in aps]
+        gone = [event.bssid for event in events if event.kind == DISAPPEARED]
+        if (rows or gone) and self._loop is not None:
+            try:
+                self._loop.call_soon_threadsafe(self._apply, rows, gone)
+            except RuntimeError:
+                # The server has been stopped.
+                pass
+
+    def status_line(self):
+        return f"Serving {self.url}: {len(self.subscribers)} WebSocket viewers, tick {self.tick}"
+
+    def _allowed_hosts(self):
+        """The Host headers accepted, or None for any (when listening on an address other than loopback)."""
+        try:
+            loopback = self.host == "localhost" or ipaddress.ip_address(self.host).is_loopback
+        except ValueError:
+            loopback = False
+        if not loopback:
+            return None
+        hosts = {f"{name}:{self.port}" for name in _LOOPBACK_NAMES}
+        if self.port == 80:
+            hosts.update(_LOOPBACK_NAMES)
+        return hosts
+
+    def _run(self):
+        loop = self._loop = asyncio.new_event_loop()
+        try:
+            self._server = loop.run_until_complete(asyncio.start_server(self._handle, self.host, self.port))
+        except OSError as error:
+            self._error = error
+            self._loop = None
+            loop.close()
+            self._ready.set()
+            return
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._hosts = self._allowed_hosts()
+        self._ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            self._server.close()
+            for writer in list(self._connections):
+                if writer in self.subscribers:
+                    # 1001: going away.
+                    writer.write(websocket_frame((1001).to_bytes(2, "big"), OP_CLOSE))
+                writer.close()
+            # Closing the connections ends their handlers; any still running after a second are cancelled.
+            tasks = asyncio.all_tasks(loop)
+            if tasks:
+                _done, pending = loop.run_until_complete(asyncio.wait(tasks, timeout=1.0))
+                for task in pending:
+                    task.cancel()
+                if pending:
+                    loop.run_until_complete(asyncio.wait(pending))
+            loop.close()
+
+    def _apply(self, rows, gone):
+        state = self._state
+        changed = []
+        for row in rows:
+            bssid = row["bssid"]
+            known = state.get(bssid)
+            if known is None:
+                state[bssid] = row
+                changed.append(row)
+                continue
+            delta = {name: value for name, value in row.items() if known[name] != value}
+            if delta:
+                known.update(delta)
+                delta["bssid"] = bssid
+                changed.append(delta)
+        if not changed and not gone:
+            return
+        self.tick += 1
+        self._snapshot = None
+        if self.subscribers:
+            message = {"type": "delta", "tick": self.tick, "aps": changed, "disappeared": gone}
+            frame = websocket_frame(json.dumps(message, ensure_ascii=False).encode())
+            self.deltas_encoded += 1
+            for writer in list(self.subscribers):
+                self._send(writer, frame)
+
+    def _send(self, writer, frame):
+        if writer.transport.get_write_buffer_size() > self.max_buffer:
+            self.dropped += 1
+            self.subscribers.discard(writer)
+            writer.transport.abort()
+            return
+        writer.write(frame)
+
+    def _snapshot_entry(self):
+        if self._snapshot is None:
+            message = {"type": "snapshot", "tick": self.tick, "aps": list(self._state.values())}
+            self._snapshot = [self.tick, json.dumps(message, ensure_ascii=False).encode(), None]
+            self.snapshots_encoded += 1
+        return self._snapshot
+
+    def _status(self):
+        return json.dumps({"tick": self.tick, "aps": len(self._state), "subscribers": len(self.subscribers),
+                           "snapshots_encoded": self.snapshots_encoded, "deltas_encoded": self.deltas_encoded,
+                           "dropped": self.dropped}).encode()
+
+    async def _handle(self, reader, writer):
+        self._connections.add(writer)
+        try:
+            await self._serve(reader, writer)
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError, ConnectionError,
+                ValueError):
+            pass
+        finally:
+            self._connections.discard(writer)
+            self.subscribers.discard(writer)
+            writer.close()
+
+    async def _serve(self, reader, writer):
+        request = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), 10)
+        lines = request.decode("latin-1").split("\r\n")
+        method, _, target = lines[0].partition(" ")
+        path = target.partition(" ")[0].partition("?")[0]
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if self._hosts is not None and headers.get("host", "").lower() not in self._hosts:
+            status, body = 403, b""
+        elif method != "GET":
+            status, body = 405, b""
+        elif path == "/ws":
+            key = headers.get("sec-websocket-key")
+            origin = headers.get("origin")
+            if headers.get("upgrade", "").lower() != "websocket" or not key:
+                status, body = 400, b""
+            elif origin is not None and origin.partition("://")[2] != headers.get("host"):
+                status, body = 403, b""
+            else:
+                await self._websocket(reader, writer, key)
+                return
+        elif path in ("/", "/aps"):
+            status, body = 200, self._snapshot_entry()[1]
+        elif path == "/status":
+            status, body = 200, self._status()
+        else:
+            status, body = 404, b""
+        writer.write(f"HTTP/1.1 {status} {_REASONS[status]}\r\nContent-Type: application/json\r\n"
+                     f"Content-Length: {len(body)}\r\nCache-Control: no-store\r\nConnection: close\r\n\r\n".encode()
+                     + body)
+        await writer.drain()
+
+    async def _websocket(self, reader, writer, key):
+        accept = base64.b64encode(hashlib.sha1(key.encode() + WEBSOCKET_GUID).digest())
+        writer.write(b"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                     b"Sec-WebSocket-Accept: " + accept + b"\r\n\r\n")
+        snapshot = self._snapshot_entry()
+        if snapshot[2] is None:
+            snapshot[2] = websocket_frame(snapshot[1])
+        # Sent and subscribed in one step of the event loop, so no delta is missed or sent twice.
+        writer.write(snapshot[2])
+        self.subscribers.add(writer)
+        while True:
+            opcode, payload = await read_websocket_frame(reader)
+            if opcode == OP_CLOSE:
+                writer.write(websocket_frame(payload[:2], OP_CLOSE))
+                return
+            if opcode == OP_PING:
+                writer.write(websocket_frame(payload, OP_PONG))
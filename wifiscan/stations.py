@@ -0,0 +1,204 @@
+"""
+Clients per access point, from the station section.
+
+The original loop stopped reading at the "Station MAC" line, so everything
+airodump-ng reports about clients was thrown away. For capacity planning the
+question is the other way round from the table: not "which networks are
+there" but "how many clients does each AP carry, and how often do they come
+and go". StationIndex keeps
+
+    station MAC -> (BSSID or None, packets, last sighting)
+    BSSID -> {station MAC}
+
+up to date from the station rows that changed in each tick (CsvIngestor with
+stations=True returns only those), together with an ApLoad per BSSID:
+
+- clients: stations currently associated with it;
+- joins / leaves: associations gained and lost since the scan started (a
+  station roaming from one AP to another is a leave for the first and a join
+  for the second, and a station not seen for age_out seconds leaves);
+- packets: the packets counted by airodump-ng for its current clients.
+
+The totals over all APs (associated and unassociated stations, packets) are
+adjusted by the same deltas, so none of the figures needs a pass over the
+whole station list; the work per tick is proportional to the changed rows
+and the stations that aged out, which are found with a heap of last
+sightings as in ChangeTracker (wifiscan/events.py). Times are on the
+capture's clock.
+
+    index = StationIndex(age_out=300)
+    index.update(ingestor.take_stations())
+    index.load("00:11:22:33:44:55").clients
+"""
+
+import heapq
+
+from wifiscan.records import parse_time
+
+
+class ApLoad:
+    """Client figures of one BSSID."""
+
+    __slots__ = ("bssid", "clients", "joins", "leaves", "packets")
+
+    def __init__(self, bssid):
+        self.bssid = bssid
+        self.clients = 0
+        self.joins = 0
+        self.leaves = 0
+        self.packets = 0
+
+    @property
+    def churn(self):
+        """Associations gained and lost."""
+        return self.joins + self.leaves
+
+    def as_dict(self):
+        return {"bssid": self.bssid, "clients": self.clients, "joins": self.joins, "leaves": self.leaves,
+                "packets": self.packets}
+
+    def __repr__(self):
+        return f"ApLoad({self.bssid!r}, clients={self.clients}, joins={self.joins}, leaves={self.leaves})"
+
+
+class StationIndex:
+    """
+    Station MAC -> association, and BSSID -> clients, updated from the changed
+    station rows of each tick. age_out (seconds, or None to keep stations
+    forever) sets when a station that is no longer seen is dropped.
+    """
+
+    def __init__(self, age_out=300.0):
+        self.age_out = age_out
+        self.now = 0.0
+        self.associated = 0
+        self.unassociated = 0
+        # BSSIDs with at least one client.
+        self.busy_aps = 0
+        self.packets = 0
+        self.joins = 0
+        self.leaves = 0
+        # MAC -> (BSSID or None, packets, last sighting).
+        self._stations = {}
+        self._clients = {}
+        self._loads = {}
+        # (last sighting, MAC), oldest first; superseded entries are skipped when popped.
+        self._sightings = []
+
+    def __len__(self):
+        return len(self._stations)
+
+    def __contains__(self, mac):
+        return mac in self._stations
+
+    def bssid_of(self, mac):
+        """The BSSID mac is associated with, or None (also for unknown stations)."""
+        entry = self._stations.get(mac)
+        return entry[0] if entry else None
+
+    def clients(self, bssid):
+        """The MACs of the stations associated with bssid."""
+        return frozenset(self._clients.get(bssid, ()))
+
+    def load(self, bssid):
+        """The ApLoad of bssid (all zero for a BSSID without clients so far)."""
+        return self._loads.get(bssid) or ApLoad(bssid)
+
+    def loads(self):
+        """The ApLoad of every BSSID that had clients, in no particular order."""
+        return list(self._loads.values())
+
+    def busiest(self, count=5):
+        """The count BSSIDs with the most clients, as ApLoads."""
+        return heapq.nlargest(count, (load for load in self._loads.values() if load.clients),
+                              key=lambda load: (load.clients, load.packets))
+
+    def update(self, stations):
+        """Applies the changed Station records of one tick. Returns the number of stations that aged out."""
+        entries, sightings = self._stations, self._sightings
+        for station in stations:
+            seen = parse_time(station.last_seen) or self.now
+            if seen > self.now:
+                self.now = seen
+            previous = entries.get(station.mac)
+            if previous is None:
+                self._attach(station.mac, station.bssid, station.packets)
+                heapq.heappush(sightings, (seen, station.mac))
+            else:
+                old_bssid, old_packets, old_seen = previous
+                if old_bssid != station.bssid:
+                    self._detach(station.mac, old_bssid, old_packets)
+                    self._attach(station.mac, station.bssid, station.packets)
+                elif station.packets != old_packets:
+                    self._add_packets(old_bssid, station.packets - old_packets)
+                if seen > old_seen:
+                    heapq.heappush(sightings, (seen, station.mac))
+                else:
+                    seen = old_seen
+            entries[station.mac] = (station.bssid, station.packets, seen)
+        if len(sightings) > 2 * len(entries) + 64:
+            self._sightings = sightings = [(seen, mac) for mac, (_bssid, _packets, seen) in entries.items()]
+            heapq.heapify(sightings)
+        return self.expire()
+
+    def expire(self, now=None):
+        """Drops the stations not seen for age_out seconds before now (by default the capture's clock)."""
+        if now is not None and now > self.now:
+            self.now = now
+        if self.age_out is None:
+            return 0
+        cutoff = self.now - self.age_out
+        entries, sightings = self._stations, self._sightings
+        expired = 0
+        while sightings and sightings[0][0] < cutoff:
+            seen, mac = heapq.heappop(sightings)
+            entry = entries.get(mac)
+            if entry is not None and entry[2] == seen:
+                del entries[mac]
+                self._detach(mac, entry[0], entry[1])
+                expired += 1
+        return expired
+
+    def _add_packets(self, bssid, delta):
+        if bssid is not None:
+            self._loads[bssid].packets += delta
+            self.packets += delta
+
+    def _attach(self, mac, bssid, packets):
+        if bssid is None:
+            self.unassociated += 1
+            return
+        load = self._loads.get(bssid)
+        if load is None:
+            load = self._loads[bssid] = ApLoad(bssid)
+            self._clients[bssid] = set()
+        self._clients[bssid].add(mac)
+        if not load.clients:
+            self.busy_aps += 1
+        load.clients += 1
+        load.joins += 1
+        load.packets += packets
+        self.associated += 1
+        self.joins += 1
+        self.packets += packets
+
+    def _detach(self, mac, bssid, packets):
+        if bssid is None:
+            self.unassociated -= 1
+            return
+        load = self._loads[bssid]
+        self._clients[bssid].discard(mac)
+        load.clients -= 1
+        if not load.clients:
+            self.busy_aps -= 1
+        load.leaves += 1
+        load.packets -= packets
+        self.associated -= 1
+        self.leaves += 1
+        self.packets -= packets
+
+    def status_line(self):
+        busiest = ", ".join(f"{load.bssid} {load.clients}" for load in self.busiest(3))
+        return (f"Clients: {self.associated} associated with {self.busy_aps} APs, "
+                f"{self.unassociated} unassociated, churn {self.joins + self.leaves}"
+                + (f" | busiest: {busiest}" if busiest else ""))
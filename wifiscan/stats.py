@@ -0,0 +1,275 @@
+"""
+Timing counters for the scan loop.
+
+When the live table lags, ScanStats shows where the time goes. The loop wraps
+each stage (listdir, parse, stations, dedup, events, history, channels,
+analysis, store, serve, render, survey) in stats.stage(name) and calls stats.end_tick(rows)
+once per pass of ingestion. ScanStats keeps, per stage and for the whole
+tick:
+
+- the number of calls and the total, last and maximum time;
+- a fixed-bucket histogram of latencies (constant memory, however long the
+  scan runs), from which p50/p90/p99 are estimated;
+
+plus a histogram of the number of rows processed per tick. The Scheduler
+(wifiscan/scheduler.py) that runs the loop's tasks reports each task's runs,
+overruns, lateness and current interval to task(name). status_line()
+formats a one-line summary for the bottom of the table and dump() writes
+everything as JSON.
+
+Profiler turns cProfile or tracemalloc on for a given number of ticks and
+writes the result to a file, so a slow scan can be profiled from the command
+line (--profile cprofile --profile-ticks 50) without editing the script.
+"""
+
+import bisect
+import cProfile
+import json
+import os
+import pstats
+import time
+import tracemalloc
+
+# Upper bounds of the latency histogram buckets, in milliseconds.
+LATENCY_BUCKETS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, float("inf"))
+# Upper bounds of the rows-per-tick histogram buckets.
+ROW_BUCKETS = (0, 1, 10, 100, 1000, 10000, 100000, float("inf"))
+
+
+class Histogram:
+    __slots__ = ("bounds", "counts", "total")
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * len(bounds)
+        self.total = 0
+
+    def add(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.total += 1
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the given fraction of samples."""
+        if not self.total:
+            return 0.0
+        target = fraction * self.total
+        running = 0
+        for bound, count in zip(self.bounds, self.counts):
+            running += count
+            if running >= target:
+                return bound
+        return self.bounds[-1]
+
+    def as_dict(self):
+        return {str(bound): count for bound, count in zip(self.bounds, self.counts) if count}
+
+
+class StageStats:
+    __slots__ = ("calls", "total", "last", "max", "histogram")
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.last = 0.0
+        self.max = 0.0
+        self.histogram = Histogram(LATENCY_BUCKETS_MS)
+
+    def add(self, seconds):
+        self.calls += 1
+        self.total += seconds
+        self.last = seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.histogram.add(seconds * 1e3)
+
+    def as_dict(self):
+        return {
+            "calls": self.calls,
+            "total_ms": round(self.total * 1e3, 3),
+            "mean_ms": round(self.total * 1e3 / self.calls, 3) if self.calls else 0.0,
+            "last_ms": round(self.last * 1e3, 3),
+            "max_ms": round(self.max * 1e3, 3),
+            "p50_ms": self.histogram.percentile(0.5),
+            "p90_ms": self.histogram.percentile(0.9),
+            "p99_ms": self.histogram.percentile(0.99),
+            "histogram_ms": self.histogram.as_dict(),
+        }
+
+
+class TaskStats:
+    """What a Scheduler task did: runs, overruns and lateness, and its current rates."""
+
+    __slots__ = ("runs", "overruns", "late_total", "late_max", "busy", "interval", "idle")
+
+    def __init__(self):
+        self.runs = 0
+        self.overruns = 0
+        self.late_total = 0.0
+        self.late_max = 0.0
+        self.busy = 0.0
+        self.interval = 0.0
+        self.idle = None
+
+    def add(self, duration, late, overrun, interval, idle):
+        self.runs += 1
+        self.overruns += overrun
+        self.late_total += late
+        if late > self.late_max:
+            self.late_max = late
+        self.busy += duration
+        self.interval = interval
+        self.idle = idle
+
+    def as_dict(self):
+        return {
+            "runs": self.runs,
+            "overruns": self.overruns,
+            "late_mean_ms": round(self.late_total * 1e3 / self.runs, 3) if self.runs else 0.0,
+            "late_max_ms": round(self.late_max * 1e3, 3),
+            "busy_ms": round(self.busy * 1e3, 3),
+            "interval_s": round(self.interval, 3),
+            "idle_s": None if self.idle is None else round(self.idle, 3),
+        }
+
+
+class _Timer:
+    __slots__ = ("stats", "name", "start")
+
+    def __init__(self, stats, name):
+        self.stats = stats
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stats.add(self.name, time.perf_counter() - self.start)
+
+
+class ScanStats:
+    """Per-stage and per-tick timing counters for the scan loop."""
+
+    def __init__(self, dump_path=None, dump_interval=10.0):
+        self.stages = {}
+        self.tasks = {}
+        self.tick = StageStats()
+        self.rows = Histogram(ROW_BUCKETS)
+        self.rows_total = 0
+        self.ticks = 0
+        self.started = time.time()
+        self.dump_path = dump_path
+        self.dump_interval = dump_interval
+        self._last_dump = time.monotonic()
+        self._tick_start = time.perf_counter()
+
+    def stage(self, name):
+        """Context manager timing one stage of the current tick."""
+        return _Timer(self, name)
+
+    def add(self, name, seconds):
+        stage = self.stages.get(name)
+        if stage is None:
+            stage = self.stages[name] = StageStats()
+        stage.add(seconds)
+
+    def task(self, name):
+        """The TaskStats of the scheduler task name, created on first use."""
+        task = self.tasks.get(name)
+        if task is None:
+            task = self.tasks[name] = TaskStats()
+        return task
+
+    def begin_tick(self):
+        self._tick_start = time.perf_counter()
+
+    def end_tick(self, rows=0):
+        """Closes the current tick; rows is the number of rows it processed."""
+        self.tick.add(time.perf_counter() - self._tick_start)
+        self.rows.add(rows)
+        self.rows_total += rows
+        self.ticks += 1
+        if self.dump_path and time.monotonic() - self._last_dump >= self.dump_interval:
+            self.dump()
+
+    def status_line(self):
+        parts = [f"tick {self.tick.last * 1e3:.1f} ms (p90 {self.tick.histogram.percentile(0.9)} ms)"]
+        for name, stage in self.stages.items():
+            parts.append(f"{name} {stage.last * 1e3:.1f}")
+        parts.append(f"rows {self.rows_total}/{self.ticks} ticks")
+        if self.tasks:
+            rates = ", ".join(f"{name} {task.idle if task.interval == 0 and task.idle else task.interval:.2g} s"
+                              for name, task in self.tasks.items())
+            parts.append(f"every {rates}, overruns {sum(task.overruns for task in self.tasks.values())}")
+        return " | ".join(parts)
+
+    def as_dict(self):
+        return {
+            "started": self.started,
+            "ticks": self.ticks,
+            "rows_total": self.rows_total,
+            "rows_per_tick": self.rows.as_dict(),
+            "tick": self.tick.as_dict(),
+            "stages": {name: stage.as_dict() for name, stage in self.stages.items()},
+            "tasks": {name: task.as_dict() for name, task in self.tasks.items()},
+        }
+
+    def dump(self, path=None):
+        """Writes the counters as JSON to path (or the dump_path given at creation)."""
+        path = path or self.dump_path
+        if not path:
+            return
+        tmp = path + ".tmp"
+        with open(tmp, "w") as fh:
+            json.dump(self.as_dict(), fh, indent=2)
+        os.replace(tmp, path)
+        self._last_dump = time.monotonic()
+
+
+class Profiler:
+    """
+    Runs cProfile ("cprofile") or tracemalloc ("tracemalloc") for the next
+    `ticks` ticks of the scan loop, then writes a report to output.
+    """
+
+    def __init__(self, mode, ticks=50, output=None):
+        if mode not in ("cprofile", "tracemalloc"):
+            raise ValueError(f"unknown profiler: {mode}")
+        self.mode = mode
+        self.remaining = ticks
+        self.output = output or f"scan-{mode}.txt"
+        self.active = False
+        self._profile = None
+
+    def start(self):
+        if self.mode == "cprofile":
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        else:
+            tracemalloc.start(10)
+        self.active = True
+
+    def tick(self):
+        """Call once per tick; stops and writes the report after the requested number of ticks."""
+        if not self.active:
+            return
+        self.remaining -= 1
+        if self.remaining <= 0:
+            self.stop()
+
+    def stop(self):
+        if not self.active:
+            return
+        self.active = False
+        with open(self.output, "w") as fh:
+            if self.mode == "cprofile":
+                self._profile.disable()
+                stats = pstats.Stats(self._profile, stream=fh)
+                stats.sort_stats("cumulative").print_stats(40)
+            else:
+                snapshot = tracemalloc.take_snapshot()
+                current, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                fh.write(f"current {current} bytes, peak {peak} bytes\n\n")
+                for stat in snapshot.statistics("lineno")[:40]:
+                    fh.write(f"{stat}\n")
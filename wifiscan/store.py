@@ -0,0 +1,214 @@
+"""
+A SQLite database of surveys.
+
+Without it, every run moves the previous CSV files into backup/ under a
+timestamped name, and answering "when did this BSSID first show up?" means
+parsing every one of them again. SurveyStore keeps:
+
+- scans: one row per run (start/end time, interface, where the data came from);
+- access_points: one row per BSSID with its latest ESSID, channel and
+  encryption and its first/last sighting across all scans;
+- observations: one row per AP update (time, power, beacons, channel).
+
+BSSID, ESSID, channel and time are indexed, so questions about the history of
+an AP are answered from the indexes in milliseconds. Each tick of the scan loop
+is written with record() in a single transaction, which keeps up with dense
+environments where thousands of APs change every second.
+
+Usage:
+    python3 -m wifiscan.store survey.db first-seen 00:11:22:33:44:55
+    python3 -m wifiscan.store survey.db history 00:11:22:33:44:55
+    python3 -m wifiscan.store survey.db essid MyWiFi
+    python3 -m wifiscan.store survey.db import backup/*.csv
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scans (
+    id INTEGER PRIMARY KEY,
+    started REAL NOT NULL,
+    ended REAL,
+    interface TEXT,
+    source TEXT
+);
+CREATE TABLE IF NOT EXISTS access_points (
+    bssid TEXT PRIMARY KEY,
+    essid TEXT,
+    channel INTEGER,
+    privacy TEXT,
+    cipher TEXT,
+    authentication TEXT,
+    first_seen TEXT,
+    last_seen TEXT,
+    first_scan INTEGER REFERENCES scans(id),
+    last_scan INTEGER REFERENCES scans(id)
+);
+CREATE INDEX IF NOT EXISTS access_points_essid ON access_points(essid);
+CREATE INDEX IF NOT EXISTS access_points_channel ON access_points(channel);
+CREATE TABLE IF NOT EXISTS observations (
+    scan_id INTEGER NOT NULL REFERENCES scans(id),
+    bssid TEXT NOT NULL,
+    seen TEXT,
+    recorded REAL NOT NULL,
+    power INTEGER,
+    beacons INTEGER,
+    channel INTEGER,
+    essid TEXT
+);
+CREATE INDEX IF NOT EXISTS observations_bssid ON observations(bssid, recorded);
+CREATE INDEX IF NOT EXISTS observations_recorded ON observations(recorded);
+CREATE INDEX IF NOT EXISTS observations_channel ON observations(channel, recorded);
+CREATE INDEX IF NOT EXISTS observations_essid ON observations(essid);
+"""
+
+_UPSERT_AP = """
+INSERT INTO access_points (bssid, essid, channel, privacy, cipher, authentication, first_seen, last_seen, first_scan, last_scan)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(bssid) DO UPDATE SET
+    essid = excluded.essid,
+    channel = excluded.channel,
+    privacy = excluded.privacy,
+    cipher = excluded.cipher,
+    authentication = excluded.authentication,
+    first_seen = CASE WHEN coalesce(access_points.first_seen, '') = '' OR excluded.first_seen < access_points.first_seen
+                      THEN excluded.first_seen ELSE access_points.first_seen END,
+    last_seen = CASE WHEN excluded.last_seen > coalesce(access_points.last_seen, '')
+                     THEN excluded.last_seen ELSE access_points.last_seen END,
+    last_scan = excluded.last_scan
+"""
+
+_INSERT_OBSERVATION = """
+INSERT INTO observations (scan_id, bssid, seen, recorded, power, beacons, channel, essid)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+class SurveyStore:
+    """A survey database file, opened (and created if needed) at path."""
+
+    def __init__(self, path):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+        self.scan_id = None
+
+    def _insert_scan(self, interface, source, started):
+        with self.db:
+            cursor = self.db.execute("INSERT INTO scans (started, interface, source) VALUES (?, ?, ?)",
+                                     (started or time.time(), interface, source))
+        return cursor.lastrowid
+
+    def start_scan(self, interface=None, source="airodump-ng", started=None):
+        """Opens a new scan; later record() calls are attached to it."""
+        self.end_scan()
+        self.scan_id = self._insert_scan(interface, source, started)
+        return self.scan_id
+
+    def end_scan(self, ended=None):
+        if self.scan_id is not None:
+            with self.db:
+                self.db.execute("UPDATE scans SET ended = ? WHERE id = ?", (ended or time.time(), self.scan_id))
+            self.scan_id = None
+
+    def record(self, aps, recorded=None, scan_id=None):
+        """
+        Writes the APs that changed in one tick (AccessPoint records) in a
+        single transaction, as part of the current scan (or scan_id).
+        """
+        if not aps:
+            return
+        if scan_id is None:
+            if self.scan_id is None:
+                self.start_scan()
+            scan_id = self.scan_id
+        recorded = recorded or time.time()
+        with self.db:
+            self.db.executemany(_UPSERT_AP, [
+                (ap.bssid, ap.essid, ap.channel, ap.privacy, ap.cipher, ap.authentication,
+                 ap.first_seen, ap.last_seen, scan_id, scan_id) for ap in aps])
+            self.db.executemany(_INSERT_OBSERVATION, [
+                (scan_id, ap.bssid, ap.last_seen, recorded, ap.power, ap.beacons, ap.channel, ap.essid) for ap in aps])
+
+    def import_csv(self, path):
+        """Stores an archived airodump-ng CSV file as a scan of its own."""
+        from wifiscan.ingest import read_access_points
+
+        aps = read_access_points(path)
+        mtime = os.path.getmtime(path)
+        scan_id = self._insert_scan(None, os.path.abspath(path), mtime)
+        self.record(aps, recorded=mtime, scan_id=scan_id)
+        with self.db:
+            self.db.execute("UPDATE scans SET ended = ? WHERE id = ?", (mtime, scan_id))
+        return len(aps)
+
+    def first_seen(self, bssid):
+        """When bssid was first seen across all scans, or None."""
+        row = self.db.execute("SELECT first_seen FROM access_points WHERE bssid = ?", (bssid,)).fetchone()
+        return row[0] if row else None
+
+    def history(self, bssid, limit=None):
+        """The observations of bssid, oldest first, as (recorded, seen, power, beacons, channel, essid)."""
+        query = "SELECT recorded, seen, power, beacons, channel, essid FROM observations WHERE bssid = ? ORDER BY recorded"
+        if limit:
+            query += f" LIMIT {int(limit)}"
+        return self.db.execute(query, (bssid,)).fetchall()
+
+    def bssids_for_essid(self, essid):
+        """Every BSSID ever seen broadcasting essid, with its first and last sighting."""
+        return self.db.execute("SELECT bssid, first_seen, last_seen FROM access_points WHERE essid = ? ORDER BY first_seen",
+                               (essid,)).fetchall()
+
+    def on_channel(self, channel):
+        return self.db.execute("SELECT bssid, essid, last_seen FROM access_points WHERE channel = ? ORDER BY bssid",
+                               (channel,)).fetchall()
+
+    def close(self):
+        self.end_scan()
+        self.db.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python3 -m wifiscan.store", description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("path", metavar="survey.db")
+    commands = parser.add_subparsers(dest="command", required=True, metavar="command")
+    commands.add_parser("first-seen", help="first sighting of a BSSID").add_argument("bssid")
+    commands.add_parser("history", help="observations of a BSSID").add_argument("bssid")
+    commands.add_parser("essid", help="BSSIDs seen broadcasting an ESSID").add_argument("essid")
+    commands.add_parser("channel", help="APs last seen on a channel").add_argument("channel", type=int)
+    commands.add_parser("import", help="record airodump-ng CSV files").add_argument("paths", nargs="+", metavar="csv")
+    args = parser.parse_args(argv)
+    if args.command != "import" and not os.path.exists(args.path):
+        parser.error(f"no survey database at {args.path}")
+    for name in getattr(args, "paths", ()):
+        if not os.access(name, os.R_OK):
+            parser.error(f"cannot read {name}")
+    store = SurveyStore(args.path)
+    start = time.perf_counter()
+    rows = ()
+    if args.command == "first-seen":
+        print(store.first_seen(args.bssid))
+    elif args.command == "history":
+        rows = store.history(args.bssid)
+    elif args.command == "essid":
+        rows = store.bssids_for_essid(args.essid)
+    elif args.command == "channel":
+        rows = store.on_channel(args.channel)
+    else:
+        for name in args.paths:
+            print(f"{name}: {store.import_csv(name)} APs")
+    for row in rows:
+        print("\t".join(str(value) for value in row))
+    print(f"({1e3 * (time.perf_counter() - start):.2f} ms)", file=sys.stderr)
+    store.db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
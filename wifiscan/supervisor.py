@@ -0,0 +1,180 @@
+"""
+Keeping airodump-ng running for the length of a scan.
+
+Started as a bare Popen with its output thrown away, airodump-ng could exit
+(adapter unplugged, driver reset) or hang without writing, and the table
+would simply stop changing. CaptureSupervisor runs it from an asyncio event
+loop in a background thread and, every check_interval seconds, checks that:
+
+- the process is still running, and
+- one of the .csv files in the output directory was written within the last
+  stale_after seconds (airodump-ng rewrites it every --write-interval).
+
+If either check fails, the process is stopped (SIGTERM, then SIGKILL after
+kill_after seconds) and started again after a backoff delay that doubles
+from backoff to max_backoff while it keeps failing, and goes back to backoff
+once a run has stayed healthy for reset_after seconds. The last lines it
+wrote to stderr are kept for the status line. stop() shuts it down cleanly.
+
+airodump-ng numbers its output files, so a restarted capture writes
+file-02.csv next to file-01.csv; the scan loop reads both.
+"""
+
+import asyncio
+import collections
+import os
+import signal
+import subprocess
+import threading
+import time
+
+
+class CaptureSupervisor:
+    """Runs tool (through a ToolBackend) with args, restarting it when it dies or stops writing."""
+
+    def __init__(self, tools, args, tool="airodump-ng", directory=".", suffix=".csv", root=True,
+                 check_interval=0.5, stale_after=5.0, kill_after=3.0, backoff=1.0, max_backoff=30.0, reset_after=60.0):
+        self.tools = tools
+        self.args = list(args)
+        self.tool = tool
+        self.directory = directory
+        self.suffix = suffix
+        self.root = root
+        self.check_interval = check_interval
+        self.stale_after = stale_after
+        self.kill_after = kill_after
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.reset_after = reset_after
+        self.state = "idle"
+        self.pid = None
+        self.starts = 0
+        self.restarts = 0
+        self.last_failure = None
+        self.stderr_tail = collections.deque(maxlen=5)
+        self._delay = backoff
+        self._loop = None
+        self._stopping = None
+        self._thread = threading.Thread(target=self._run, name="capture-supervisor", daemon=True)
+        self._ready = threading.Event()
+
+    def start(self):
+        self._thread.start()
+        self._ready.wait()
+        return self
+
+    def stop(self, timeout=None):
+        """Stops the capture process and the supervisor thread."""
+        if self._loop is not None and self._thread.is_alive():
+            self._loop.call_soon_threadsafe(self._stopping.set)
+        self._thread.join(timeout)
+
+    def status_line(self):
+        parts = [f"{self.tool} {self.state}"]
+        if self.restarts:
+            parts.append(f"{self.restarts} restarts (last: {self.last_failure})")
+        return ", ".join(parts)
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._loop.run_until_complete(self._supervise())
+        finally:
+            self._loop.close()
+
+    def _last_write(self):
+        newest = 0.0
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if self.suffix in entry.name:
+                        try:
+                            newest = max(newest, entry.stat().st_mtime)
+                        except FileNotFoundError:
+                            continue
+        except FileNotFoundError:
+            pass
+        return newest
+
+    async def _supervise(self):
+        self._stopping = asyncio.Event()
+        self._ready.set()
+        while not self._stopping.is_set():
+            self.state = "starting"
+            started = time.monotonic()
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *self.tools.command(self.tool, *self.args, root=self.root),
+                    stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                    start_new_session=True)
+            except OSError as error:
+                self.last_failure = f"cannot start: {error.strerror}"
+            else:
+                self.starts += 1
+                self.pid = process.pid
+                stderr_reader = asyncio.ensure_future(self._read_stderr(process.stderr))
+                self.last_failure = await self._watch(process)
+                await self._terminate(process)
+                await stderr_reader
+                self.pid = None
+            if self._stopping.is_set():
+                break
+            self.restarts += 1
+            if time.monotonic() - started >= self.reset_after:
+                self._delay = self.backoff
+            self.state = f"restarting in {self._delay:g} s"
+            try:
+                await asyncio.wait_for(self._stopping.wait(), self._delay)
+            except asyncio.TimeoutError:
+                pass
+            self._delay = min(self._delay * 2, self.max_backoff)
+        self.state = "stopped"
+
+    async def _watch(self, process):
+        """Returns why process has to be restarted, or None when stopping."""
+        spawned = time.time()
+        exited = asyncio.ensure_future(process.wait())
+        stopping = asyncio.ensure_future(self._stopping.wait())
+        try:
+            while True:
+                done, _ = await asyncio.wait((exited, stopping), timeout=self.check_interval,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                if stopping in done:
+                    return None
+                if exited in done:
+                    detail = f": {self.stderr_tail[-1]}" if self.stderr_tail else ""
+                    return f"exited with status {process.returncode}{detail}"
+                idle = time.time() - max(self._last_write(), spawned)
+                if idle > self.stale_after:
+                    self.state = "stalled"
+                    return f"no output for {idle:.0f} s"
+                self.state = "running"
+        finally:
+            stopping.cancel()
+            if not exited.done():
+                exited.cancel()
+
+    async def _terminate(self, process):
+        if process.returncode is not None:
+            return
+        self.state = "stopping"
+        for signum, wait in ((signal.SIGTERM, self.kill_after), (signal.SIGKILL, None)):
+            try:
+                # The whole process group, so that airodump-ng is reached even when it runs under sudo.
+                os.killpg(process.pid, signum)
+            except ProcessLookupError:
+                return
+            try:
+                await asyncio.wait_for(process.wait(), wait)
+                return
+            except asyncio.TimeoutError:
+                continue
+
+    async def _read_stderr(self, stream):
+        while True:
+            line = await stream.readline()
+            if not line:
+                return
+            line = line.decode(errors="replace").strip()
+            if line:
+                self.stderr_tail.append(line)
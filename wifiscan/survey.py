@@ -0,0 +1,188 @@
+"""
+Unattended surveys: streaming the scan as JSON lines or CSV.
+
+The scan phase of dos-wifi.py ends on Ctrl+C and then waits for a target to
+be typed in, so it cannot run from cron or systemd, and what it found is only
+on the screen. With --headless it asks nothing, draws nothing, never gets to
+the attack, and streams what it sees through a SurveyWriter:
+
+- "deltas": the ChangeEvents of every tick (appeared, updated, disappeared;
+  see wifiscan/events.py), the writer being subscribed to the ChangeTracker;
+- "snapshots": every AP of the registry, every snapshot interval and once
+  more at the end.
+
+As JSON lines, a delta is ChangeEvent.as_dict() and a snapshot row is
+{"event": "snapshot", "time": ..., **AccessPoint.as_dict()}. As CSV, every
+row has the same columns (DELTA_COLUMNS or SNAPSHOT_COLUMNS): an updated AP
+carries all its tracked fields with the names of the changed ones in
+"changed", and a disappeared AP only its BSSID. ESSIDs with commas or quotes
+are quoted by the csv module. The header is written when the file is empty,
+so a file that is appended to by every run keeps a single one.
+
+Lines are kept in memory until the end of the tick and then written in one
+go, but never more than buffer_lines of them: a tick that produces more
+(the first tick of a busy site) is written out in pieces, so memory stays
+bounded however many APs there are. A reader that goes away (a closed pipe)
+stops the survey instead of failing it.
+
+SurveyLimit ends the survey after a fixed duration, or once no new BSSID has
+appeared for stable_for seconds, whichever comes first:
+
+    writer = tracker.subscribe(SurveyWriter("-", "csv"))
+    limit = tracker.subscribe(SurveyLimit(duration=3600, stable_for=300))
+    tracker.update(changed_aps)      # the events of the tick are written
+    if limit.reached():
+        writer.close()
+"""
+
+import csv
+import io
+import json
+import os
+import sys
+import time
+
+from wifiscan.events import APPEARED, DISAPPEARED, TRACKED_FIELDS, UPDATED
+from wifiscan.records import AccessPoint
+
+FORMATS = ("jsonl", "csv")
+DELTAS = "deltas"
+SNAPSHOTS = "snapshots"
+EMIT = (DELTAS, SNAPSHOTS)
+
+DELTA_COLUMNS = ("event", "time", "bssid") + TRACKED_FIELDS + ("changed",)
+SNAPSHOT_COLUMNS = ("event", "time") + AccessPoint.__slots__
+
+
+class SurveyWriter:
+    """
+    Writes ChangeEvents (as a ChangeTracker subscriber) or registry snapshots
+    to path ('-' for stdout) as JSON lines or CSV, at most buffer_lines at a
+    time.
+    """
+
+    def __init__(self, path="-", format="jsonl", emit=DELTAS, buffer_lines=1000):
+        if format not in FORMATS:
+            raise ValueError(f"unknown format {format!r} (expected one of {', '.join(FORMATS)})")
+        if emit not in EMIT:
+            raise ValueError(f"unknown output {emit!r} (expected one of {', '.join(EMIT)})")
+        self.path = path
+        self.format = format
+        self.emit = emit
+        self.buffer_lines = max(1, buffer_lines)
+        self.written = 0
+        self.writes = 0
+        self.snapshots = 0
+        # Set when the reader went away (BrokenPipeError); nothing more is written.
+        self.broken = False
+        self._file = sys.stdout if path == "-" else open(path, "a", encoding="utf-8", newline="")
+        self._lines = []
+        self._text = io.StringIO()
+        self._csv = csv.writer(self._text, lineterminator="\n")
+        if format == "csv" and (path == "-" or self._file.tell() == 0):
+            self._csv.writerow(DELTA_COLUMNS if emit == DELTAS else SNAPSHOT_COLUMNS)
+            self._take_csv()
+
+    def __call__(self, events):
+        if self.emit != DELTAS:
+            return
+        for event in events:
+            if self.format == "jsonl":
+                self._add(json.dumps(event.as_dict(), ensure_ascii=False) + "\n")
+                continue
+            ap = event.ap
+            if event.kind == DISAPPEARED:
+                values = [""] * len(TRACKED_FIELDS)
+            else:
+                values = [getattr(ap, name) for name in TRACKED_FIELDS]
+            changed = " ".join(event.changes) if event.kind == UPDATED else ""
+            self._csv.writerow([event.kind, event.time, event.bssid, *values, changed])
+            self._take_csv()
+        self.flush()
+
+    def snapshot(self, aps, now):
+        """Writes every AccessPoint in aps (e.g. the registry) as of now (seconds on the capture's clock)."""
+        for ap in aps:
+            if self.format == "jsonl":
+                data = {"event": "snapshot", "time": now}
+                data.update(ap.as_dict())
+                self._add(json.dumps(data, ensure_ascii=False) + "\n")
+            else:
+                self._csv.writerow(["snapshot", now, *(getattr(ap, name) for name in AccessPoint.__slots__)])
+                self._take_csv()
+        self.snapshots += 1
+        self.flush()
+
+    def flush(self):
+        """Writes out the buffered lines. Returns False once the reader has gone away."""
+        if self._lines and not self.broken:
+            try:
+                self._file.write("".join(self._lines))
+                self._file.flush()
+                self.written += len(self._lines)
+                self.writes += 1
+            except BrokenPipeError:
+                self.broken = True
+                if self._file is sys.stdout:
+                    # Python flushes stdout again on exit; pointed at /dev/null, that does not fail too.
+                    os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        self._lines.clear()
+        return not self.broken
+
+    def close(self):
+        self.flush()
+        if self._file is not sys.stdout:
+            self._file.close()
+
+    def _take_csv(self):
+        self._add(self._text.getvalue())
+        self._text.seek(0)
+        self._text.truncate()
+
+    def _add(self, line):
+        self._lines.append(line)
+        if len(self._lines) >= self.buffer_lines:
+            self.flush()
+
+
+class SurveyLimit:
+    """
+    When an unattended survey is done: after duration seconds, or once no
+    new BSSID has appeared for stable_for seconds (either may be None).
+    Subscribe it to the ChangeTracker so that it sees the appearances.
+    """
+
+    def __init__(self, duration=None, stable_for=None, clock=time.monotonic):
+        self.duration = duration
+        self.stable_for = stable_for
+        self.clock = clock
+        self.started = clock()
+        self.last_new = self.started
+        # An AP that ages out and comes back is not new.
+        self._seen = set()
+
+    def __call__(self, events):
+        seen = self._seen
+        for event in events:
+            if event.kind == APPEARED and event.bssid not in seen:
+                seen.add(event.bssid)
+                self.last_new = self.clock()
+
+    def reached(self):
+        """None while the survey should go on, else why it is over: "duration" or "stable"."""
+        now = self.clock()
+        if self.duration is not None and now - self.started >= self.duration:
+            return "duration"
+        if self.stable_for is not None and now - self.last_new >= self.stable_for:
+            return "stable"
+        return None
+
+    def next_check(self):
+        """Seconds until reached() can next change, or None if there is no limit."""
+        now = self.clock()
+        due = []
+        if self.duration is not None:
+            due.append(self.started + self.duration - now)
+        if self.stable_for is not None:
+            due.append(self.last_new + self.stable_for - now)
+        return max(0.0, min(due)) if due else None
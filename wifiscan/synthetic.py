@@ -0,0 +1,262 @@
+"""
+Synthetic airodump-ng CSV files and 802.11 captures, for exercising the
+scanning side without a monitor-mode adapter.
+
+The CSV files follow airodump-ng's layout (a blank line, the access point
+header and rows, a blank line, the station header and rows) and include the
+awkward cases seen in the field:
+
+- ESSIDs containing commas, quotes and non-ASCII characters, and hidden
+  (empty) ESSIDs;
+- several BSSIDs sharing one ESSID;
+- associated and unassociated stations with probed ESSID lists;
+- optionally, a torn last row, as when the file is read while airodump-ng is
+  halfway through rewriting it.
+
+The captures are classic pcap or pcapng files of radiotap + 802.11 management
+frames (beacons, deauthentications), as wifiscan.pcap reads them.
+
+The tests, the benchmarks and the stand-in airodump-ng in
+benchmarks/fake-tools/ all build their input here.
+"""
+
+import os
+import random
+import struct
+from datetime import datetime, timedelta
+
+AP_HEADER = "BSSID, First time seen, Last time seen, channel, Speed, Privacy, Cipher, Authentication, Power, # beacons, # IV, LAN IP, ID-length, ESSID, Key"
+STATION_HEADER = "Station MAC, First time seen, Last time seen, Power, # packets, BSSID, Probed ESSIDs"
+
+CHANNELS = (1, 1, 6, 6, 6, 11, 11, 2, 3, 4, 5, 7, 8, 9, 10, 36, 40, 44, 48, 149, 153, 157, 161)
+SECURITY = (("WPA2", "CCMP", "PSK"), ("WPA2", "CCMP", "PSK"), ("WPA2 WPA", "CCMP TKIP", "PSK"), ("WPA3 WPA2", "CCMP", "SAE PSK"),
+            ("WPA2", "CCMP", "MGT"), ("OPN", "", ""), ("WEP", "WEP", ""))
+ESSID_WORDS = ("Home", "Office", "Guest", "Cafe", "Lab", "IoT", "FRITZ!Box", "Vodafone", "Büro", "Café", "Wohnung", "東京", "Net",
+               "Hotspot", "Printer", "Linksys", "NETGEAR", "TP-Link", "Free WiFi")
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+class SyntheticAP:
+    __slots__ = ("bssid", "first_seen", "last_seen", "channel", "speed", "privacy", "cipher", "authentication",
+                 "power", "beacons", "iv", "essid")
+
+    def line(self):
+        essid = self.essid
+        length = len(essid.encode())
+        return (f"{self.bssid}, {self.first_seen:{TIME_FORMAT}}, {self.last_seen:{TIME_FORMAT}}, {self.channel:2d}, "
+                f"{self.speed:3d}, {self.privacy:<4}, {self.cipher:<4}, {self.authentication:<3}, {self.power:3d}, "
+                f"{self.beacons:8d}, {self.iv:8d},   0.  0.  0.  0, {length:3d}, {essid}, ")
+
+
+class SyntheticStation:
+    __slots__ = ("mac", "first_seen", "last_seen", "power", "packets", "bssid", "probed")
+
+    def line(self):
+        bssid = self.bssid or "(not associated) "
+        return (f"{self.mac}, {self.first_seen:{TIME_FORMAT}}, {self.last_seen:{TIME_FORMAT}}, {self.power:3d}, "
+                f"{self.packets:8d}, {bssid}, {','.join(self.probed)}")
+
+
+def _mac(rng, index, prefix):
+    return f"{prefix:02X}:{rng.randrange(256):02X}:{index >> 24 & 0xFF:02X}:{index >> 16 & 0xFF:02X}:{index >> 8 & 0xFF:02X}:{index & 0xFF:02X}"
+
+
+def _essid(rng):
+    roll = rng.random()
+    if roll < 0.05:
+        return ""
+    if roll < 0.10:
+        return f"{rng.choice(ESSID_WORDS)}, {rng.choice(ESSID_WORDS)}"
+    if roll < 0.12:
+        return f'"{rng.choice(ESSID_WORDS)}"'
+    return f"{rng.choice(ESSID_WORDS)}-{rng.randrange(1000)}"
+
+
+def generate_aps(count, seed=1, start=None):
+    rng = random.Random(seed)
+    start = start or datetime(2025, 3, 13, 15, 0, 0)
+    aps = []
+    shared = [_essid(rng) for _ in range(max(1, count // 20))]
+    for i in range(count):
+        ap = SyntheticAP()
+        ap.bssid = _mac(rng, i, rng.choice((0x00, 0x02, 0x0A, 0x1C, 0x3C, 0x50, 0xA4, 0xF0)))
+        ap.first_seen = start + timedelta(seconds=rng.randrange(600))
+        ap.last_seen = ap.first_seen + timedelta(seconds=rng.randrange(60))
+        ap.channel = rng.choice(CHANNELS)
+        ap.speed = rng.choice((54, 130, 195, 270, 360, 540, 866, 1300))
+        ap.privacy, ap.cipher, ap.authentication = rng.choice(SECURITY)
+        ap.power = -rng.randrange(20, 95) if rng.random() > 0.02 else -1
+        ap.beacons = rng.randrange(1, 5000)
+        ap.iv = rng.randrange(0, 100) if ap.privacy == "WEP" else 0
+        # About a third of the APs share an ESSID with others (mesh/enterprise setups).
+        ap.essid = rng.choice(shared) if rng.random() < 0.3 else _essid(rng)
+        aps.append(ap)
+    return aps
+
+
+def generate_stations(count, aps, seed=2):
+    rng = random.Random(seed)
+    stations = []
+    for i in range(count):
+        station = SyntheticStation()
+        station.mac = _mac(rng, i, rng.choice((0x00, 0x02, 0x12, 0x5C, 0xAC, 0xDA)))
+        station.first_seen = aps[0].first_seen if aps else datetime(2025, 3, 13, 15, 0, 0)
+        station.last_seen = station.first_seen + timedelta(seconds=rng.randrange(600))
+        station.power = -rng.randrange(20, 95)
+        station.packets = rng.randrange(1, 10000)
+        station.bssid = rng.choice(aps).bssid if aps and rng.random() < 0.7 else None
+        station.probed = tuple(rng.choice(ESSID_WORDS) for _ in range(rng.randrange(3)))
+        stations.append(station)
+    return stations
+
+
+def mutate(aps, fraction, rng, now):
+    """Updates power, beacons and last-seen time of about fraction of the APs, as one airodump-ng write would."""
+    changed = rng.sample(aps, max(1, int(len(aps) * fraction))) if aps else []
+    for ap in changed:
+        ap.last_seen = now
+        ap.power = max(-95, min(-20, ap.power + rng.randrange(-3, 4)))
+        ap.beacons += rng.randrange(1, 20)
+    return changed
+
+
+def render_csv(aps, stations=(), torn=False, rng=None):
+    """Returns the text of one airodump-ng CSV file."""
+    parts = ["\r\n", AP_HEADER, "\r\n"]
+    for ap in aps:
+        parts.append(ap.line())
+        parts.append("\r\n")
+    parts.append("\r\n")
+    parts.append(STATION_HEADER)
+    parts.append("\r\n")
+    for station in stations:
+        parts.append(station.line())
+        parts.append("\r\n")
+    parts.append("\r\n")
+    text = "".join(parts)
+    if torn:
+        # Cut the file in the middle of one of the last rows.
+        rng = rng or random.Random(3)
+        cut = text.rfind("\r\n", 0, len(text) - 4)
+        cut = text.rfind("\r\n", 0, cut)
+        text = text[:cut + 2 + rng.randrange(1, 40)]
+    return text
+
+
+def write_csv(path, aps, stations=(), torn=False, rng=None):
+    with open(path, "w", encoding="utf-8", newline="") as fh:
+        fh.write(render_csv(aps, stations, torn, rng))
+
+
+def consistent_baseline(count, seed=1):
+    """Synthetic APs in which every BSSID of an ESSID shares its encryption, OUI and channel."""
+    aps = generate_aps(count, seed)
+    first = {}
+    for ap in aps:
+        if not ap.essid:
+            continue
+        model = first.setdefault(ap.essid, ap)
+        ap.privacy, ap.cipher, ap.authentication = model.privacy, model.cipher, model.authentication
+        ap.channel = model.channel
+        ap.bssid = model.bssid[:8] + ap.bssid[8:]
+    return aps
+
+
+def write_archive(directory, files, count, seed=1):
+    """Writes files scans of count APs; returns the number of channel moves planted."""
+    rng = random.Random(seed)
+    aps = generate_aps(count, seed)
+    now = max(ap.last_seen for ap in aps)
+    moves = 0
+    for index in range(files):
+        now += timedelta(minutes=10)
+        mutate(aps, 0.05, rng, now)
+        for ap in rng.sample(aps, max(1, count // 200)):
+            channel = rng.choice(CHANNELS)
+            if channel != ap.channel:
+                ap.channel, ap.last_seen = channel, now
+                # A move before the first file is not one the archive can show.
+                moves += index > 0
+        write_csv(os.path.join(directory, f"{now:%Y-%m-%d %H:%M:%S}.{index:06d}-file-01.csv"), aps)
+    return moves
+
+
+LINKTYPE_IEEE802_11_RADIOTAP = 127
+
+# Radiotap header with Flags, Channel and dBm antenna signal present.
+_RADIOTAP = struct.Struct("<BBHIBxHHbx")
+_RADIOTAP_PRESENT = (1 << 1) | (1 << 3) | (1 << 5)
+
+_RSN_PSK_CCMP = bytes([1, 0, 0x00, 0x0F, 0xAC, 4, 1, 0, 0x00, 0x0F, 0xAC, 4, 1, 0, 0x00, 0x0F, 0xAC, 2, 0, 0])
+
+
+def mac_bytes(index, prefix=0x02):
+    return bytes([prefix, 0x00, index >> 24 & 0xFF, index >> 16 & 0xFF, index >> 8 & 0xFF, index & 0xFF])
+
+
+def channel_frequency(channel):
+    return 2407 + 5 * channel if channel <= 13 else 5000 + 5 * channel
+
+
+def radiotap(channel, power):
+    return _RADIOTAP.pack(0, 0, _RADIOTAP.size, _RADIOTAP_PRESENT, 0, channel_frequency(channel), 0x00A0, power)
+
+
+def management_frame(subtype, receiver, transmitter, bssid, body=b"", seq=0):
+    """An 802.11 management frame header (type 0) followed by body."""
+    return struct.pack("<BBH6s6s6sH", subtype << 4, 0, 0, receiver, transmitter, bssid, seq << 4) + body
+
+
+def beacon(bssid, essid, channel, power, privacy=True, seq=0):
+    """Radiotap + beacon frame for an AP with an SSID, DS parameter and (optionally) RSN element."""
+    essid_bytes = essid.encode()
+    body = struct.pack("<QHH", 0, 100, 0x0411 if privacy else 0x0401)
+    body += bytes([0, len(essid_bytes)]) + essid_bytes
+    body += bytes([1, 8, 0x82, 0x84, 0x8B, 0x96, 0x0C, 0x12, 0x18, 0x24])
+    body += bytes([3, 1, channel])
+    if privacy:
+        body += bytes([48, len(_RSN_PSK_CCMP)]) + _RSN_PSK_CCMP
+    return radiotap(channel, power) + management_frame(8, b"\xff" * 6, bssid, bssid, body, seq)
+
+
+def deauthentication(receiver, transmitter, bssid, reason=7, channel=6, power=-40, disassociation=False, seq=0):
+    """Radiotap + deauthentication (or disassociation) frame with a reason code."""
+    return radiotap(channel, power) + management_frame(10 if disassociation else 12, receiver, transmitter, bssid,
+                                                       struct.pack("<H", reason), seq)
+
+
+class PcapWriter:
+    """Minimal classic pcap (or pcapng, with pcapng=True) writer."""
+
+    def __init__(self, fh, linktype=LINKTYPE_IEEE802_11_RADIOTAP, pcapng=False):
+        self.fh = fh
+        self.pcapng = pcapng
+        if pcapng:
+            fh.write(struct.pack("<IIIHHqI", 0x0A0D0D0A, 28, 0x1A2B3C4D, 1, 0, -1, 28))
+            fh.write(struct.pack("<IIHHIHHBxxxI", 1, 28, linktype, 0, 0, 9, 1, 6, 28))
+        else:
+            fh.write(struct.pack("<IHHiIII", 0xA1B2C3D4, 2, 4, 0, 0, 65535, linktype))
+
+    def write(self, timestamp, frame):
+        if self.pcapng:
+            micros = int(timestamp * 1e6)
+            padded = len(frame) + (-len(frame) % 4)
+            block_len = 32 + padded
+            self.fh.write(struct.pack("<IIIIIII", 6, block_len, 0, micros >> 32, micros & 0xFFFFFFFF, len(frame), len(frame)))
+            self.fh.write(frame + b"\0" * (padded - len(frame)))
+            self.fh.write(struct.pack("<I", block_len))
+        else:
+            seconds = int(timestamp)
+            self.fh.write(struct.pack("<IIII", seconds, int((timestamp - seconds) * 1e6), len(frame), len(frame)))
+            self.fh.write(frame)
+
+
+def write_beacon_capture(path, frames, aps, pcapng=False, start=1700000000.0, seed=1):
+    """Writes frames beacons spread round-robin over aps synthetic APs."""
+    rng = random.Random(seed)
+    stations = [(mac_bytes(i), f"net-{i % max(1, aps // 2)}", rng.choice((1, 6, 11, 36, 44)), -rng.randrange(30, 90)) for i in range(aps)]
+    with open(path, "wb") as fh:
+        writer = PcapWriter(fh, pcapng=pcapng)
+        for n in range(frames):
+            bssid, essid, channel, power = stations[n % aps]
+            writer.write(start + n * 0.001, beacon(bssid, essid, channel, power + rng.randrange(-3, 4), privacy=bool(n % aps % 3), seq=n & 0xFFF))
@@ -0,0 +1,69 @@
+"""
+Running the external tools (airmon-ng, airodump-ng).
+
+dos-wifi.py used to build each command line itself, with "sudo" in front of
+the ones that need root. Going through a ToolBackend instead makes the tools
+replaceable: a backend created with a directory runs the executables found
+there, without sudo, so the stand-ins in benchmarks/fake-tools/ can play the
+part of the aircrack-ng suite on a machine with no WiFi adapter and no root.
+
+    tools = ToolBackend()                            # the real tools, from PATH
+    tools = ToolBackend("benchmarks/fake-tools")     # the stand-ins
+    tools.run("airmon-ng", "check", "kill", root=True)
+    tools.popen("airodump-ng", "-w", "file", "wlan0mon", root=True)
+
+The stand-ins come with a fake sysfs tree (benchmarks/fake-tools/sys), which
+sysfs_root points to, so interface discovery (wifiscan.interfaces) sees
+their made-up adapters instead of the machine's.
+
+The DOS_WIFI_TOOLS environment variable selects a directory the same way as
+the --tools option of dos-wifi.py.
+"""
+
+import os
+import subprocess
+
+TOOLS_ENVIRONMENT_VARIABLE = "DOS_WIFI_TOOLS"
+
+
+class ToolBackend:
+    """The real tools (directory=None) or the executables in directory."""
+
+    def __init__(self, directory=None):
+        self.directory = os.path.abspath(directory) if directory else None
+
+    @classmethod
+    def from_environment(cls, directory=None):
+        """A backend for directory, or for $DOS_WIFI_TOOLS if directory is not given."""
+        return cls(directory or os.environ.get(TOOLS_ENVIRONMENT_VARIABLE) or None)
+
+    @property
+    def simulated(self):
+        """True when the tools are stand-ins rather than the aircrack-ng suite."""
+        return self.directory is not None
+
+    @property
+    def sysfs_root(self):
+        """Where wifiscan.interfaces looks for network interfaces."""
+        return os.path.join(self.directory, "sys") if self.simulated else "/sys"
+
+    @property
+    def needs_root(self):
+        return not self.simulated
+
+    def command(self, name, *args, root=False):
+        """The argument list that runs tool name with args (through sudo if root and the tools are real)."""
+        if self.simulated:
+            return [os.path.join(self.directory, name), *args]
+        return ["sudo", name, *args] if root else [name, *args]
+
+    def run(self, name, *args, root=False, **kwargs):
+        """subprocess.run() of the tool; kwargs are passed on."""
+        return subprocess.run(self.command(name, *args, root=root), **kwargs)
+
+    def popen(self, name, *args, root=False, **kwargs):
+        """subprocess.Popen() of the tool; kwargs are passed on."""
+        return subprocess.Popen(self.command(name, *args, root=root), **kwargs)
+
+    def __repr__(self):
+        return f"ToolBackend({self.directory!r})"
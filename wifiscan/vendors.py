@@ -0,0 +1,163 @@
+"""
+Who made each access point.
+
+The first three bytes of a BSSID (the OUI) identify the manufacturer, but the
+table only shows the bare MAC. VendorIndex looks the OUI up in a copy of the
+IEEE registry:
+
+- the one installed by airodump-ng-oui-update or the ieee-data package when
+  present, otherwise the short list bundled in wifiscan/data/oui.txt (a file
+  given with --oui takes precedence). Both the IEEE format
+  ("00-00-0C   (hex)		Cisco Systems, Inc") and Wireshark's manuf
+  format ("00:00:0C	Cisco	Cisco Systems, Inc") are understood;
+- nothing is read until the first lookup, or until preload() reads it in a
+  background thread, so the ~35,000 entries of the full registry add nothing
+  to startup;
+- the entries are kept as a sorted array("I") of 24-bit prefixes next to an
+  array of indices into the vendor names, which are stored once each, and
+  looked up with a binary search;
+- results (with the names shortened, "TP-LINK TECHNOLOGIES CO.,LTD." to
+  "TP-LINK") are memoized per BSSID in a bounded LRU cache, so drawing the
+  same rows frame after frame costs a dictionary lookup.
+
+A BSSID with the "locally administered" bit set (randomized MACs, phone
+hotspots, virtual APs of one radio) has no registered vendor and is shown as
+"(private)".
+"""
+
+import functools
+import os
+import re
+import threading
+from array import array
+from bisect import bisect_left
+
+BUNDLED_PATH = os.path.join(os.path.dirname(__file__), "data", "oui.txt")
+SYSTEM_PATHS = (
+    "/etc/aircrack-ng/airodump-ng-oui.txt",
+    "/usr/share/ieee-data/oui.txt",
+    "/usr/share/misc/oui.txt",
+)
+PRIVATE = "(private)"
+
+_IEEE_LINE = re.compile(r"^([0-9A-Fa-f]{2})-([0-9A-Fa-f]{2})-([0-9A-Fa-f]{2})[ \t]+\(hex\)[ \t]+(\S[^\r\n]*)", re.M)
+# Only the 24-bit entries of manuf; longer prefixes ("00:1B:C5:00:00:00/36") are skipped.
+_MANUF_LINE = re.compile(r"^([0-9A-Fa-f]{2}):([0-9A-Fa-f]{2}):([0-9A-Fa-f]{2})\t([^\t\r\n]+)(?:\t([^\r\n]+))?", re.M)
+_SUFFIXES = re.compile(
+    r"[,.]?\s+(?:Inc|Incorporated|Corp|Corporation|Co|Ltd|Limited|LLC|GmbH|AG|SA|S\.A|BV|B\.V|Oy|AB|"
+    r"Co\.,\s?Ltd|Co\.,Ltd|Technologies|Technology|Communications|Systems|International)\.?$",
+    re.I)
+
+
+def short_name(name):
+    """The vendor name without company-type suffixes: "TP-LINK TECHNOLOGIES CO.,LTD." -> "TP-LINK"."""
+    while True:
+        shorter = _SUFFIXES.sub("", name).rstrip(" ,.")
+        if shorter == name or not shorter:
+            return name
+        name = shorter
+
+
+def parse_oui(text):
+    """{24-bit prefix: vendor name} for the entries in the text of an IEEE oui.txt or a manuf file."""
+    entries = {}
+    for a, b, c, name in _IEEE_LINE.findall(text):
+        entries.setdefault(int(a + b + c, 16), name.strip())
+    if not entries:
+        for a, b, c, short, full in _MANUF_LINE.findall(text):
+            entries.setdefault(int(a + b + c, 16), (full or short).strip())
+    return entries
+
+
+def _prefix(bssid):
+    """The OUI of "AA:BB:CC:DD:EE:FF" as an integer, or None for anything that is not a MAC."""
+    try:
+        return int(bssid[0:2] + bssid[3:5] + bssid[6:8], 16) if len(bssid) >= 8 else None
+    except ValueError:
+        return None
+
+
+class VendorIndex:
+    """
+    Manufacturer lookup by BSSID. path selects the OUI file; by default the
+    first of SYSTEM_PATHS that exists, or the bundled list, which are also
+    used if path cannot be read (the error is kept in error).
+    """
+
+    def __init__(self, path=None, cache_size=4096, short=True):
+        self.path = path
+        self.short = short
+        self.source = None
+        # The OSError raised by an explicit path that could not be read, if any.
+        self.error = None
+        self._prefixes = array("I")
+        self._indices = array("I")
+        self._names = ()
+        self._loaded = False
+        self._lock = threading.Lock()
+        self.lookup = functools.lru_cache(maxsize=cache_size)(self._lookup)
+
+    def _candidates(self):
+        if self.path:
+            return (self.path, *SYSTEM_PATHS, BUNDLED_PATH)
+        return (*SYSTEM_PATHS, BUNDLED_PATH)
+
+    def load(self):
+        """Reads the OUI file if that has not happened yet; preload() and lookups call this."""
+        if self._loaded:
+            return self
+        with self._lock:
+            if self._loaded:
+                return self
+            for path in self._candidates():
+                try:
+                    with open(path, encoding="utf-8", errors="replace") as fh:
+                        text = fh.read()
+                except OSError as exc:
+                    # An unreadable explicit path falls back to the defaults rather than
+                    # failing the lookup (and the frame being drawn) that triggered the load.
+                    if path == self.path:
+                        self.error = exc
+                    continue
+                self._build(parse_oui(text))
+                self.source = path
+                break
+            self._loaded = True
+        return self
+
+    def preload(self):
+        """Starts reading the OUI file in a background thread; the first lookup waits for it if needed."""
+        if not self._loaded:
+            threading.Thread(target=self.load, name="oui-loader", daemon=True).start()
+        return self
+
+    def _build(self, entries):
+        names = {}
+        prefixes = array("I", sorted(entries))
+        indices = array("I")
+        for prefix in prefixes:
+            indices.append(names.setdefault(entries[prefix], len(names)))
+        self._prefixes, self._indices, self._names = prefixes, indices, tuple(names)
+
+    def _lookup(self, bssid):
+        """The vendor of bssid, PRIVATE for a locally administered address, or None if unknown."""
+        prefix = _prefix(bssid)
+        if prefix is None:
+            return None
+        if prefix & 0x020000:
+            return PRIVATE
+        self.load()
+        position = bisect_left(self._prefixes, prefix)
+        if position < len(self._prefixes) and self._prefixes[position] == prefix:
+            name = self._names[self._indices[position]]
+            # Shortened here rather than at load time: only the vendors actually seen are, once each.
+            return short_name(name) if self.short else name
+        return None
+
+    def __len__(self):
+        self.load()
+        return len(self._prefixes)
+
+    def nbytes(self):
+        """Bytes held by the prefix and index arrays (not counting the names)."""
+        return sum(buffer.buffer_info()[1] * buffer.itemsize for buffer in (self._prefixes, self._indices))
@@ -0,0 +1,169 @@
+"""
+Waiting for airodump-ng to write new output.
+
+The scan loop used to sleep for a fixed second between passes, so a change
+could sit on disk for up to a second before being shown, and the loop woke up
+every second even when nothing had been written. The watchers here block
+until a matching file in the directory is modified, closed after writing,
+created or moved in, and then return so the loop can ingest straight away.
+
+- InotifyWatcher uses the Linux inotify API through ctypes; the kernel wakes
+  the process only when something happens in the directory.
+- PollingWatcher is the fallback for systems without inotify: it compares
+  (inode, mtime, size) of the matching files at a short interval.
+
+make_watcher() returns the inotify one when it is available.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class InotifyWatcher:
+    """
+    Blocks until a file whose name contains suffix changes in directory.
+
+    After the first event, wait() keeps collecting events until the directory
+    has been quiet for settle seconds, so a file that is written in several
+    chunks triggers one ingestion instead of one per chunk. Settling never
+    takes longer than max_settle seconds, so a writer that never pauses (a
+    fast replay) cannot hold the scan loop up.
+    """
+
+    def __init__(self, directory=".", suffix=".csv", settle=0.02, max_settle=0.25):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify is not available on this system")
+        self.suffix = suffix.encode()
+        self.settle = settle
+        self.max_settle = max_settle
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        if libc.inotify_add_watch(self.fd, os.fsencode(os.path.abspath(directory)), _WATCH_MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, os.strerror(errno))
+        self.wakeups = 0
+
+    def _drain(self):
+        matched = False
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                return matched
+            offset = 0
+            while offset < len(data):
+                _wd, _mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b"\0")
+                offset += length
+                if self.suffix in name:
+                    matched = True
+
+    def wait(self, timeout=None, wake_fds=()):
+        """
+        Returns True as soon as a matching file has changed, or False if
+        timeout seconds passed without a change or one of wake_fds (e.g. the
+        terminal, for key presses) became readable.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            ready, _, _ = select.select([self.fd, *wake_fds], [], [], remaining)
+            if self.fd not in ready:
+                return False
+            if self._drain():
+                break
+        settle_deadline = time.monotonic() + self.max_settle
+        while time.monotonic() < settle_deadline and select.select([self.fd], [], [], self.settle)[0]:
+            self._drain()
+        self.wakeups += 1
+        return True
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class PollingWatcher:
+    """
+    Same interface as InotifyWatcher, implemented by comparing the
+    (inode, mtime, size) of matching files every interval seconds.
+    """
+
+    def __init__(self, directory=".", suffix=".csv", interval=0.1):
+        self.directory = directory
+        self.suffix = suffix
+        self.interval = interval
+        self._snapshot = self._scan()
+        self.wakeups = 0
+
+    def _scan(self):
+        snapshot = {}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if self.suffix in entry.name:
+                    try:
+                        st = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    snapshot[entry.name] = (st.st_ino, st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def wait(self, timeout=None, wake_fds=()):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            snapshot = self._scan()
+            if snapshot != self._snapshot:
+                self._snapshot = snapshot
+                self.wakeups += 1
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            pause = self.interval if deadline is None else min(self.interval, max(0.0, deadline - time.monotonic()))
+            if wake_fds:
+                if select.select(list(wake_fds), [], [], pause)[0]:
+                    return False
+            else:
+                time.sleep(pause)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def make_watcher(directory=".", suffix=".csv"):
+    """Returns an InotifyWatcher, or a PollingWatcher if inotify cannot be used."""
+    try:
+        return InotifyWatcher(directory, suffix)
+    except (OSError, AttributeError):
+        return PollingWatcher(directory, suffix)